@@ -2,9 +2,35 @@ from unittest.mock import patch
 
 import pytest
 
+from upapasta import tools
+
 
 @pytest.fixture(autouse=True)
 def mock_find_pesto():
     """By default, ensure pesto is NOT found in tests unless specifically enabled."""
     with patch("upapasta.upfolder.find_pesto", return_value=None):
         yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_tool_registry(monkeypatch):
+    """Registro de ferramentas vazio e sem cache em disco: patches de find_* valem por teste."""
+    monkeypatch.setattr(tools, "_REGISTRY", tools.ToolRegistry(cache_path=None))
+
+
+@pytest.fixture(autouse=True)
+def fresh_connection_tuner(monkeypatch):
+    """Controlador de conexões sem histórico nem cache em disco."""
+    from upapasta import pacing
+
+    monkeypatch.setattr(pacing, "_TUNER", pacing.ConnectionTuner(cache_path=None))
+
+
+@pytest.fixture(autouse=True)
+def fresh_json_caches(monkeypatch):
+    """Caches TTL (sondagem NNTP, velocidade dos scratch dirs) vazios e sem disco."""
+    from upapasta import json_cache
+
+    monkeypatch.setattr(json_cache, "_cache_dir", lambda: None)
+    for cache in json_cache._CACHES:
+        cache.clear()
@@ -0,0 +1,144 @@
+"""Testes para upapasta.balancer: distribuição de jobs entre contas NNTP (--profiles)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from upapasta import config
+from upapasta.balancer import Account, AccountBalancer, account_key, posted_today
+
+GB = 1024**3
+
+
+@pytest.fixture
+def profiles_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(config, "CONFIG_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "_SETTINGS", {})
+    for key in ("NNTP_HOST", "NNTP_USER", "NNTP_CONNECTIONS"):
+        monkeypatch.delenv(key, raising=False)
+    return tmp_path
+
+
+def _profile(path: Path, name: str, **values: str) -> None:
+    (path / f"{name}.env").write_text("".join(f"{k}={v}\n" for k, v in values.items()))
+
+
+def _history(path: Path, *records: dict[str, object]) -> Path:
+    history = path / "history.jsonl"
+    history.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return history
+
+
+def _account(profile: str, **kw: int) -> Account:
+    return Account(profile=profile, env_file=f"{profile}.env", key=profile, host="h", **kw)
+
+
+def test_from_profiles_slots_quota_and_usage(profiles_dir: Path) -> None:
+    _profile(
+        profiles_dir,
+        "a",
+        NNTP_HOST="news.a",
+        NNTP_USER="ua",
+        NNTP_CONNECTIONS="20",
+        NNTP_MAX_CONNECTIONS="60",
+        DAILY_UPLOAD_QUOTA="500G",
+    )
+    _profile(profiles_dir, "b", NNTP_HOST="news.b", NNTP_USER="ub")
+    now = datetime.now(timezone.utc)
+    history = _history(
+        profiles_dir,
+        {"data_upload": now.isoformat(), "conta_nntp": "ua@news.a", "tamanho_bytes": 3 * GB},
+        # Registro antigo, sem conta_nntp: atribuído pelo servidor.
+        {"data_upload": now.isoformat(), "servidor_nntp": "news.a", "tamanho_bytes": GB},
+        {
+            "data_upload": (now - timedelta(days=1)).isoformat(),
+            "conta_nntp": "ua@news.a",
+            "tamanho_bytes": 100 * GB,
+        },
+        {"data_upload": now.isoformat(), "conta_nntp": "outra@news.a", "tamanho_bytes": GB},
+    )
+
+    balancer = AccountBalancer.from_profiles(["a", "b"], history_path=history)
+    a, b = balancer.accounts
+
+    assert (a.key, a.slots, a.quota_bytes, a.used_today) == ("ua@news.a", 3, 500 * GB, 4 * GB)
+    assert (b.key, b.slots, b.quota_bytes, b.used_today) == ("ub@news.b", 1, 0, 0)
+    assert balancer.capacity == 4
+
+
+def test_from_profiles_unknown_profile(profiles_dir: Path) -> None:
+    with pytest.raises(ValueError, match="nope"):
+        AccountBalancer.from_profiles(["nope"], history_path=profiles_dir / "h.jsonl")
+
+
+def test_acquire_spreads_by_free_slots() -> None:
+    balancer = AccountBalancer([_account("a", slots=2), _account("b", slots=1)])
+    picks = [balancer.acquire(GB) for _ in range(3)]
+    assert [p.profile for p in picks if p] == ["a", "b", "a"]
+
+
+def test_acquire_prefers_less_used_quota() -> None:
+    busy = _account("a", quota_bytes=100 * GB, used_today=80 * GB)
+    idle = _account("b", quota_bytes=100 * GB, used_today=10 * GB)
+    account = AccountBalancer([busy, idle]).acquire(GB)
+    assert account is idle
+
+
+def test_acquire_skips_exhausted_account_and_fails_when_none_fits() -> None:
+    full = _account("a", quota_bytes=10 * GB, used_today=9 * GB)
+    other = _account("b", quota_bytes=10 * GB)
+    balancer = AccountBalancer([full, other])
+    assert balancer.acquire(5 * GB) is other
+    balancer.release(other, 5 * GB, uploaded=True)
+    assert other.used_today == 5 * GB
+    assert balancer.acquire(20 * GB) is None
+
+
+def test_acquire_waits_for_release() -> None:
+    balancer = AccountBalancer([_account("a")])
+    first = balancer.acquire(GB)
+    assert first is not None
+    got: list[Account] = []
+    waiter = threading.Thread(target=lambda: got.append(balancer.acquire(GB)))  # type: ignore[arg-type]
+    waiter.start()
+    time.sleep(0.1)
+    assert not got
+    balancer.release(first, GB, uploaded=False)
+    waiter.join(timeout=2)
+    assert got == [first] and first.used_today == 0
+
+
+def test_posted_today_missing_history(tmp_path: Path) -> None:
+    assert posted_today([_account("a")], tmp_path / "missing.jsonl") == {"a": 0}
+
+
+def test_account_key() -> None:
+    assert account_key({"NNTP_HOST": "news.x", "NNTP_USER": "me"}) == "me@news.x"
+
+
+def test_multi_input_runs_each_job_on_its_account(monkeypatch: pytest.MonkeyPatch) -> None:
+    from upapasta import main as main_mod
+
+    seen: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        main_mod,
+        "_run_single_input",
+        lambda args, item, env_file: seen.append((args.profile, env_file)) or 0,
+    )
+    monkeypatch.setattr("upapasta.resources.get_total_size", lambda path: GB)
+    balancer = AccountBalancer([_account("a"), _account("b")])
+    args = SimpleNamespace(profile=None)
+
+    rc = main_mod._run_multi_input(args, ["x", "y"], "default.env", 1, balancer)
+
+    assert rc == 0
+    assert seen == [("a", "a.env"), ("a", "a.env")]  # sequencial: slot liberado a cada job
+    assert args.profile is None
+    assert balancer.accounts[0].used_today == 2 * GB
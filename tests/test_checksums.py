@@ -0,0 +1,140 @@
+"""Testes para upapasta.checksums (--checksums)."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+
+import pytest
+
+import upapasta.checksums as checksums
+from upapasta.checksums import HashCancelled, compute_digests, generate_manifests, hash_file
+
+
+def test_hash_file_single_pass_matches_references(tmp_path: Path) -> None:
+    data = os.urandom(50_000)
+    f = tmp_path / "a.bin"
+    f.write_bytes(data)
+
+    # Bloco menor que os 16 KiB do PAR2: o MD5 da cabeça atravessa blocos.
+    digest = hash_file(str(f), block_size=4096)
+
+    assert digest.crc32 == f"{zlib.crc32(data):08X}"
+    assert digest.md5 == hashlib.md5(data).hexdigest()
+    assert digest.md5_16k == hashlib.md5(data[:16384]).hexdigest()
+    assert digest.size == 50_000
+
+    empty = tmp_path / "vazio"
+    empty.write_bytes(b"")
+    assert hash_file(str(empty)).crc32 == "00000000"
+
+
+def test_digests_are_cached_until_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"x" * 100)
+    reads: list[str] = []
+    real = checksums.hash_file
+
+    def counting(
+        path: str, block_size: int = checksums.BLOCK_SIZE, cancel: object = None
+    ) -> checksums.FileDigest:
+        reads.append(path)
+        return real(path, block_size)
+
+    monkeypatch.setattr(checksums, "hash_file", counting)
+
+    first = compute_digests([str(f)])
+    assert compute_digests([str(f)]) == first
+    assert checksums.cached_digest(str(f)) == first[0]
+    assert len(reads) == 1
+
+    f.write_bytes(b"y" * 101)
+    assert compute_digests([str(f)])[0].md5 == hashlib.md5(b"y" * 101).hexdigest()
+    assert len(reads) == 2
+
+
+def test_hash_file_stops_when_cancelled(tmp_path: Path) -> None:
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"x" * 100)
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(HashCancelled):
+        compute_digests([str(f)], cancel=cancel)
+    assert checksums.cached_digest(str(f)) is None
+
+
+def test_compute_digests_keeps_order(tmp_path: Path) -> None:
+    files = []
+    for n in range(5):
+        f = tmp_path / f"{n}.bin"
+        f.write_bytes(bytes([n]) * (n + 1) * 1000)
+        files.append(str(f))
+
+    digests = compute_digests(files, jobs=3)
+
+    assert [d.path for d in digests] == files
+    assert digests[4].md5 == hashlib.md5(bytes([4]) * 5000).hexdigest()
+    assert compute_digests([]) == []
+
+
+def test_generate_manifests_for_folder(tmp_path: Path) -> None:
+    folder = tmp_path / "Release"
+    (folder / "Sub").mkdir(parents=True)
+    (folder / "a.mkv").write_bytes(b"a" * 10)
+    (folder / "Sub" / "b.srt").write_bytes(b"b" * 5)
+
+    written = generate_manifests(str(folder), str(tmp_path / "Release"), jobs=2)
+
+    assert [Path(p).name for p in written] == ["Release.sfv", "Release.md5"]
+    sfv = (tmp_path / "Release.sfv").read_bytes().decode()
+    # Ordem de input_files: arquivos da raiz, depois as subpastas.
+    assert sfv.splitlines()[1:] == [
+        f"a.mkv {zlib.crc32(b'a' * 10):08X}",
+        f"Sub/b.srt {zlib.crc32(b'b' * 5):08X}",
+    ]
+    assert "\r\n" in sfv
+    md5 = (tmp_path / "Release.md5").read_text().splitlines()
+    assert md5[0] == f"{hashlib.md5(b'a' * 10).hexdigest()} *a.mkv"
+
+
+def test_orchestrator_writes_manifests_next_to_nzb(tmp_path: Path) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    item = tmp_path / "Filme.2024.mkv"
+    item.write_bytes(b"v" * 1000)
+    out = tmp_path / "nzb"
+
+    orch = UpaPastaOrchestrator(str(item), skip_rar=True, checksums=True)
+    orch.env_vars = {"NZB_OUT_DIR": str(out)}
+    orch.input_target = str(item)
+    orch._manifests = orch._start_manifests()
+    orch._finish_manifests()
+
+    assert sorted(p.name for p in out.iterdir()) == ["Filme.2024.md5", "Filme.2024.sfv"]
+    assert orch._manifests is None
+
+
+def test_cleanup_on_error_waits_for_manifests(tmp_path: Path) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    item = tmp_path / "Filme.2024.mkv"
+    item.write_bytes(b"v" * 1000)
+    out = tmp_path / "nzb"
+
+    orch = UpaPastaOrchestrator(str(item), skip_rar=True, checksums=True)
+    orch.env_vars = {"NZB_OUT_DIR": str(out)}
+    orch.input_target = str(item)
+    orch._manifests = orch._start_manifests()
+    # PAR2 falhou: o hashing em background não fica solto nem deixa manifesto.
+    orch._cleanup_on_error(preserve_rar=True)
+
+    assert orch._manifests is None
+    assert orch._manifests_cancel.is_set()
+    assert list(out.iterdir()) == []
+    assert item.exists()
@@ -0,0 +1,97 @@
+"""Testes para upapasta.hybrid (--pack-small)."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import upapasta.hybrid as hybrid
+from upapasta.hybrid import build_hybrid_tree, plan_hybrid
+
+# "rar a ... ARQUIVO @lista": grava no arquivo a lista recebida, para conferência.
+_FAKE_RAR = """#!{python}
+import sys
+archive, listing = sys.argv[-2], sys.argv[-1][1:]
+if "FAIL" in open(listing, encoding="utf-8").read():
+    sys.exit(2)
+open(archive, "w", encoding="utf-8").write(open(listing, encoding="utf-8").read())
+"""
+
+
+def _release(root: Path) -> Path:
+    folder = root / "Show.S01"
+    (folder / "Subs").mkdir(parents=True)
+    (folder / "Show.S01E01.mkv").write_bytes(b"v" * 4096)
+    (folder / "Show.S01E02.mkv").write_bytes(b"v" * 4096)
+    for n in range(10):
+        (folder / "Subs" / f"{n}.srt").write_bytes(b"s" * 10)
+    (folder / "info.nfo").write_bytes(b"n")
+    return folder
+
+
+@pytest.fixture
+def fake_rar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = tmp_path / "fake_rar"
+    script.write_text(_FAKE_RAR.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setattr(hybrid, "tool_path", lambda name: str(script))
+
+
+def test_plan_hybrid_splits_by_threshold(tmp_path: Path) -> None:
+    folder = _release(tmp_path)
+
+    plan = plan_hybrid(str(folder), threshold=1024)
+    assert plan is not None
+    assert plan.large == ["Show.S01E01.mkv", "Show.S01E02.mkv"]
+    assert plan.small[0] == "info.nfo" and len(plan.small) == 11
+    assert plan.small_bytes == 101
+
+    assert plan_hybrid(str(folder), threshold=1024, min_files=20) is None
+    assert plan_hybrid(str(folder), threshold=1) is None
+
+
+def test_build_hybrid_tree_links_large_and_packs_small(tmp_path: Path, fake_rar: None) -> None:
+    folder = _release(tmp_path)
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    plan = plan_hybrid(str(folder), threshold=1024)
+    assert plan is not None
+
+    tree = build_hybrid_tree(str(folder), plan, str(staging))
+
+    assert tree == str(staging / "Show.S01")
+    assert sorted(os.listdir(tree)) == ["Show.S01.small.rar", "Show.S01E01.mkv", "Show.S01E02.mkv"]
+    assert os.path.samefile(os.path.join(tree, "Show.S01E01.mkv"), folder / "Show.S01E01.mkv")
+    packed = (staging / "Show.S01" / "Show.S01.small.rar").read_text().split()
+    assert packed == plan.small and os.path.join("Subs", "0.srt") in packed
+    assert list(staging.glob(".upapasta_small.lst")) == []
+    assert sorted(os.listdir(folder)) == ["Show.S01E01.mkv", "Show.S01E02.mkv", "Subs", "info.nfo"]
+
+
+def test_orchestrator_pack_small(tmp_path: Path, fake_rar: None) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    folder = _release(tmp_path)
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=True, pack_small=1024)
+
+    assert orch.run_compression(bar=None)
+    assert orch._staging_dir is not None and orch.input_target != str(folder)
+    assert os.path.basename(orch.input_target or "") == "Show.S01"
+    staging = orch._staging_dir
+
+    orch._cleanup_staging(discard=True)
+    assert not os.path.exists(staging)
+
+    # Falha do compactador: nada de pasta temporária sobrando.
+    (folder / "FAIL.txt").write_bytes(b"x")
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=True, pack_small=1024)
+    assert not orch.run_compression(bar=None)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Show.S01", "fake_rar"]
+
+    # Com ofuscação a pasta original é postada como antes.
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=True, pack_small=1024, obfuscate=True)
+    assert orch.run_compression(bar=None)
+    assert orch.input_target == str(folder) and orch._staging_dir is None
@@ -0,0 +1,66 @@
+"""
+Orçamento de importação do ponto de entrada (upapasta.main).
+
+A TUI dispara um processo `upapasta` por item da fila, e comandos utilitários
+(--version, --stats, --test-connection) não devem carregar o pipeline inteiro.
+Os testes rodam `python -X importtime` num processo limpo.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import upapasta.main as main_mod
+
+# Módulos que só os comandos que os usam devem importar.
+_LAZY_MODULES = {
+    "upapasta.orchestrator",
+    "upapasta.watch",
+    "upapasta.nntp_test",
+    "upapasta.catalog",
+    "upapasta.upfolder",
+    "upapasta.makepar",
+    "nntplib",
+    "rich",
+}
+
+# Margem generosa para CI lento; o ponto de entrada importava em ~250 ms antes
+# dos imports preguiçosos e ~100 ms depois, numa máquina de desenvolvimento.
+_BUDGET_MS = float(os.environ.get("UPAPASTA_IMPORT_BUDGET_MS", "200"))
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Retorna {módulo: tempo cumulativo em µs} de `import module` num processo novo."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line.split(":", 1)[1].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_entry_point_does_not_import_pipeline_modules() -> None:
+    imported = set(_importtime("upapasta.main"))
+    assert imported & _LAZY_MODULES == set()
+
+
+def test_entry_point_import_budget() -> None:
+    best = min(_importtime("upapasta.main")["upapasta.main"] for _ in range(3))
+    assert best / 1000 < _BUDGET_MS, f"import upapasta.main: {best / 1000:.0f} ms"
+
+
+def test_lazy_names_resolve_on_access() -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    assert main_mod.UpaPastaOrchestrator is UpaPastaOrchestrator
+    assert main_mod._lazy("UpaPastaOrchestrator") is UpaPastaOrchestrator
@@ -0,0 +1,291 @@
+"""Testes para upapasta.indexer: rate limiting por indexador e busca em lote."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+from email.message import Message
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from upapasta import indexer
+from upapasta.indexer import NewznabClient, _RateLimiter, batch_search
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(indexer, "_LIMITERS", {})
+
+
+def _response(titles: list[str]) -> bytes:
+    items = [{"title": t, "guid": t, "link": f"http://idx/get/{t}", "size": "10"} for t in titles]
+    return json.dumps({"item": items}).encode()
+
+
+class FakeServer:
+    """Substitui _http_fetch: responde por query e mede concorrência por host."""
+
+    def __init__(self, hits: dict[str, dict[str, list[str]]], delay: float = 0.0) -> None:
+        self.hits = hits
+        self.delay = delay
+        self.calls: list[str] = []
+        self.in_flight: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, timeout: int = 15) -> tuple[bytes, object]:
+        parsed = urllib.parse.urlsplit(url)
+        host = parsed.netloc
+        with self._lock:
+            self.calls.append(url)
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        try:
+            time.sleep(self.delay)
+            if "/get/" in parsed.path:
+                return b"<nzb/>", Message()
+            query = urllib.parse.parse_qs(parsed.query)["q"][0]
+            return _response(self.hits.get(host, {}).get(query, [])), Message()
+        finally:
+            with self._lock:
+                self.in_flight[host] -= 1
+
+
+def _client(host: str, *, rate: float = 0.0, concurrent: int = 2) -> NewznabClient:
+    return NewznabClient(
+        f"http://{host}/api", "key", rate_secs=rate, use_cache=False, max_concurrent=concurrent
+    )
+
+
+# ── _RateLimiter ──────────────────────────────────────────────────────────────
+
+
+def test_limiter_spaces_requests() -> None:
+    limiter = _RateLimiter(0.05, max_concurrent=4)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    # Primeiro token imediato, os outros dois a cada 50 ms.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_limiter_pause_blocks_until_expired() -> None:
+    limiter = _RateLimiter(0.0, max_concurrent=1)
+    limiter.pause(0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_clients_for_same_url_share_limiter() -> None:
+    assert _client("a")._limiter is _client("a")._limiter
+    assert _client("a")._limiter is not _client("b")._limiter
+
+
+# ── batch_search ──────────────────────────────────────────────────────────────
+
+
+def test_batch_runs_concurrently_within_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer({}, delay=0.1)
+    monkeypatch.setattr(indexer, "_http_fetch", server)
+    names = [f"Name {i}" for i in range(6)]
+
+    start = time.monotonic()
+    hits = batch_search([_client("a", concurrent=3)], names, normalize=False)
+    elapsed = time.monotonic() - start
+
+    assert [h.name for h in hits] == names
+    assert not any(h.found for h in hits)
+    assert server.peak["a"] == 3
+    assert elapsed < 0.5  # serial seriam 0.6 s
+
+
+def test_batch_falls_through_indexers_and_downloads(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    server = FakeServer({"a": {"Movie A": ["Movie.A-GRP"]}, "b": {"Movie B": ["Movie.B-GRP"]}})
+    monkeypatch.setattr(indexer, "_http_fetch", server)
+    seen: list[str] = []
+
+    hits = batch_search(
+        [_client("a"), _client("b")],
+        ["Movie A", "Movie B", "Movie C"],
+        normalize=False,
+        dest_for=lambda name, _r: str(tmp_path / f"{name}.nzb"),
+        on_result=lambda hit: seen.append(hit.name),
+    )
+
+    a, b, c = hits
+    assert a.result is not None and a.result.indexer == "http://a/api"
+    assert b.result is not None and b.result.indexer == "http://b/api"
+    assert not c.found and c.nzb_path is None
+    assert (tmp_path / "Movie A.nzb").read_bytes() == b"<nzb/>"
+    assert b.nzb_path == str(tmp_path / "Movie B.nzb")
+    assert sorted(seen) == ["Movie A", "Movie B", "Movie C"]
+    # "Movie A" não é buscado no segundo indexador.
+    assert not any("b/api" in u and "Movie+A" in u for u in server.calls)
+
+
+def test_batch_reports_search_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def boom(url: str, timeout: int = 15) -> tuple[bytes, object]:
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(indexer, "_http_fetch", boom)
+    (hit,) = batch_search([_client("a")], ["X"])
+    assert not hit.found and hit.error == "connection refused"
+
+
+# ── Sinais de rate limit do servidor ─────────────────────────────────────────
+
+
+def test_ratelimit_headers_pause_indexer(monkeypatch: pytest.MonkeyPatch) -> None:
+    headers = Message()
+    headers["X-RateLimit-Remaining"] = "0"
+    headers["X-RateLimit-Reset"] = str(int(time.time()) + 30)
+    monkeypatch.setattr(indexer, "_http_fetch", lambda url, timeout=15: (_response([]), headers))
+    paused: list[float] = []
+    client = _client("a")
+    monkeypatch.setattr(client._limiter, "pause", paused.append)
+
+    client.search("Movie", normalize=False)
+
+    assert paused and paused[0] >= 30
+
+
+def test_distant_ratelimit_reset_fails_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    headers = Message()
+    headers["X-RateLimit-Remaining"] = "0"
+    headers["X-RateLimit-Reset"] = str(int(time.time()) + 3600)
+    calls: list[str] = []
+
+    def fetch(url: str, timeout: int = 15) -> tuple[bytes, Message]:
+        calls.append(url)
+        return _response(["Movie-GRP"]), headers
+
+    monkeypatch.setattr(indexer, "_http_fetch", fetch)
+    paused: list[float] = []
+    client = _client("a")
+    monkeypatch.setattr(client._limiter, "pause", paused.append)
+
+    # A resposta que trouxe o aviso vale; as seguintes falham sem esperar 1 h.
+    assert [r.title for r in client.search("Movie", normalize=False)] == ["Movie-GRP"]
+    with pytest.raises(indexer.RateLimited):
+        client.search("Other", normalize=False)
+    assert len(calls) == 1 and not paused
+    assert client._limiter.blocked_for() > 3000
+
+
+def test_429_pauses_and_retries_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def flaky(url: str, timeout: int = 15) -> tuple[bytes, Optional[Message]]:
+        calls.append(url)
+        if len(calls) == 1:
+            hdrs = Message()
+            hdrs["Retry-After"] = "0"
+            raise urllib.error.HTTPError(url, 429, "Too Many Requests", hdrs, None)
+        return _response(["Movie-GRP"]), Message()
+
+    monkeypatch.setattr(indexer, "_http_fetch", flaky)
+    results = _client("a").search("Movie", normalize=False)
+
+    assert len(calls) == 2
+    assert [r.title for r in results] == ["Movie-GRP"]
+
+
+# ── Vários indexadores ───────────────────────────────────────────────────────
+
+
+def test_build_clients_from_env_numbered_indexers() -> None:
+    env = {
+        "INDEXER_URL": "http://a/api",
+        "INDEXER_APIKEY": "ka",
+        "INDEXER_RATE_SECS": "3",
+        "INDEXER_URL_2": "http://b/api",
+        "INDEXER_APIKEY_2": "kb",
+        "INDEXER_RATE_SECS_2": "0.5",
+        "INDEXER_URL_3": "http://c/api",
+        "INDEXER_APIKEY_3": "kc",
+        "INDEXER_URL_5": "http://ignored/api",  # lacuna em _4 encerra a lista
+        "INDEXER_APIKEY_5": "ke",
+    }
+    clients = indexer.build_clients_from_env(env)
+
+    assert [c.base_url for c in clients] == ["http://a/api", "http://b/api", "http://c/api"]
+    assert [c.rate_secs for c in clients] == [3.0, 0.5, 3.0]
+    assert indexer.build_client_from_env(env) is not None
+    assert indexer.build_clients_from_env({}) == []
+
+
+def test_search_first_returns_on_fastest_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer({"fast": {"Movie": ["Movie-FAST"]}, "slow": {"Movie": ["Movie-SLOW"]}})
+    real = server.__call__
+
+    def fetch(url: str, timeout: int = 15) -> tuple[bytes, object]:
+        if "//slow/" in url:
+            time.sleep(0.5)
+        return real(url, timeout)
+
+    monkeypatch.setattr(indexer, "_http_fetch", fetch)
+
+    start = time.monotonic()
+    hit = indexer.search_first([_client("slow"), _client("fast")], "Movie", normalize=False)
+
+    assert time.monotonic() - start < 0.4
+    assert hit.result is not None and hit.result.title == "Movie-FAST"
+
+
+def test_search_first_abandons_queued_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer({"a": {"Movie": ["Movie-A"]}})
+    monkeypatch.setattr(indexer, "_http_fetch", server)
+    busy = _client("b")
+    busy._limiter.pause(0.2)  # "b" só libera requisições daqui a 200 ms
+
+    hit = indexer.search_first([_client("a"), busy], "Movie", normalize=False)
+    time.sleep(0.3)
+
+    assert hit.found
+    assert not any("//b/" in u for u in server.calls)
+
+
+def test_search_first_without_hit_keeps_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fetch(url: str, timeout: int = 15) -> tuple[bytes, object]:
+        if "//a/" in url:
+            raise OSError("timeout")
+        return _response([]), Message()
+
+    monkeypatch.setattr(indexer, "_http_fetch", fetch)
+    hit = indexer.search_first([_client("a"), _client("b")], "Movie")
+    assert not hit.found and hit.error == "timeout"
+
+
+def test_orchestrator_starts_indexer_check_in_background(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    media = tmp_path / "Movie.2021.mkv"
+    media.write_bytes(b"x")
+    started = threading.Event()
+
+    def fake_find(name: str, env_vars: dict[str, str]) -> indexer.BatchHit:
+        started.set()
+        return indexer.BatchHit(name=name)
+
+    monkeypatch.setattr(indexer, "find_on_indexers", fake_find)
+
+    off = UpaPastaOrchestrator(input_path=str(media), check_indexer=False)
+    assert off._start_indexer_check("Movie.2021.mkv") is None
+
+    on = UpaPastaOrchestrator(input_path=str(media), check_indexer=True)
+    future = on._start_indexer_check("Movie.2021.mkv")
+    assert future is not None
+    assert future.result(timeout=2).name == "Movie.2021.mkv"
+    assert started.is_set()
@@ -0,0 +1,46 @@
+"""Testes para upapasta.json_cache (caches JSON com TTL em disco)."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from upapasta import json_cache
+from upapasta.json_cache import TTLCache, read_json, write_json
+
+
+@dataclass
+class _Entry:
+    value: int
+    at: float
+
+
+def test_read_and_write_json(tmp_path: Path) -> None:
+    path = tmp_path / "sub" / "c.json"
+    write_json(str(path), {"a": 1})
+
+    assert read_json(str(path)) == {"a": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["c.json"]
+    path.write_text("{quebrado")
+    assert read_json(str(path)) is None
+    assert read_json(None) is None
+
+
+def test_ttl_cache_persists_fresh_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_cache, "_cache_dir", lambda: str(tmp_path))
+    cache = TTLCache("t.json", _Entry, ttl=60, stamp="at")
+    cache.put("novo", _Entry(1, time.time()))
+    cache.put("velho", _Entry(2, time.time() - 120))
+
+    assert cache.get("novo") == _Entry(1, pytest.approx(time.time(), abs=5))
+    assert cache.get("velho") is None
+    # Outro processo: lê do arquivo, sem as entradas vencidas.
+    assert set(read_json(str(tmp_path / "t.json"))) == {"novo"}
+    other = TTLCache("t.json", _Entry, ttl=60, stamp="at")
+    assert other.get("novo") is not None
+
+    other.ttl = -1
+    assert other.get("novo") is None
@@ -0,0 +1,103 @@
+"""Testes para upapasta.layout (artigo, slice e volume alinhados)."""
+
+from __future__ import annotations
+
+import io
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import upapasta.makepar as makepar_module
+from upapasta.layout import plan_layout
+from upapasta.makepar import make_parity
+from upapasta.par_utils import compute_dynamic_slice
+
+GB = 1024**3
+K = 1024
+
+
+@pytest.mark.parametrize("total", [20 * GB, 80 * GB, 150 * GB, 300 * GB])
+def test_volumes_and_slices_are_whole_articles(total: int) -> None:
+    layout = plan_layout(total, 700 * K)
+
+    assert layout.slice_size % layout.article_size == 0
+    assert layout.volume_size is not None
+    assert layout.volume_size % layout.slice_size == 0
+    assert layout.articles_per_volume() * layout.article_size == layout.volume_size
+    assert 1024 * K <= layout.slice_size <= 4096 * K
+
+
+def test_small_article_rounds_slice_to_whole_articles() -> None:
+    # 2 × 300K < 1 MiB: antes virava 1M cravado, cortando o 4º artigo.
+    slice_str, _min, _max = compute_dynamic_slice(10 * GB, 300 * K)
+    assert slice_str == "1200K"
+    # Artigo maior que o teto do slice: mantém o clamp de 4 MiB.
+    assert compute_dynamic_slice(10 * GB, 10 * 1024 * K)[0] == "4M"
+
+
+def test_jitter_is_chosen_once_and_stays_aligned() -> None:
+    layout = plan_layout(40 * GB, 700 * K, jitter=True)
+
+    assert abs(layout.article_size - 700 * K) <= 7 * K
+    assert layout.article_size % 4 == 0
+    assert layout.volume_size is not None
+    assert layout.volume_size % layout.article_size == 0
+
+
+def test_user_slice_and_small_input() -> None:
+    # Slice do usuário que não fecha em artigos: volumes voltam aos 5 MB.
+    layout = plan_layout(40 * GB, 700 * K, slice_size=1024 * K)
+    assert layout.volume_multiple() is None
+    assert layout.volume_size is not None and layout.volume_size % (5 * 1024 * K) == 0
+
+    layout = plan_layout(2 * GB, 700 * K)
+    assert layout.volume_size is None and layout.articles_per_slice() == 2
+
+
+def test_make_parity_passes_slice_multiple(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    target = tmp_path / "Release.rar"
+    target.write_bytes(b"x" * 100)
+    captured: list[list[str]] = []
+
+    class _Popen:
+        def __init__(self, args: list[str], **kwargs: object) -> None:
+            captured.append(args)
+            self.stdout = io.BytesIO(b"")
+
+        def wait(self, timeout: float | None = None) -> int:
+            return 0
+
+        def poll(self) -> int:
+            return 0
+
+    monkeypatch.setattr(makepar_module, "tool_path", lambda name: "/usr/bin/parpar")
+    monkeypatch.setattr(subprocess, "Popen", _Popen)
+
+    assert make_parity(str(target), backend="parpar", force=True, article_size=700 * K) == 0
+    assert "--slice-size-multiple=700K" in captured[-1]
+
+    assert (
+        make_parity(
+            str(target), backend="parpar", force=True, article_size=700 * K, slice_size="1M"
+        )
+        == 0
+    )
+    assert not any(a.startswith("--slice-size-multiple") for a in captured[-1])
+
+
+def test_orchestrator_uses_layout(tmp_path: Path) -> None:
+    from upapasta.config import Settings
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    folder = tmp_path / "Release"
+    folder.mkdir()
+    (folder / "a.bin").write_bytes(b"x")
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=False, obfuscate=True)
+    orch._settings = Settings("", {"ARTICLE_SIZE": "768K"})
+
+    assert orch._article_size() == 768 * K
+    orch._layout = orch._plan_layout()
+    assert orch._article_size() == orch._layout.article_size
+    assert abs(orch._article_size() - 768 * K) <= 8 * K and orch._article_size() % 4 == 0
+    assert orch._volume_multiple() == orch._layout.slice_size
@@ -28,8 +28,8 @@ class TestMainConfigDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.check_or_prompt_credentials") as mock_check:
                     with pytest.raises(SystemExit) as exc_info:
@@ -48,7 +48,7 @@ class TestMainConfigDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
+            with patch("upapasta.config.resolve_env_file") as mock_resolve:
                 mock_resolve.return_value = "/config/myprofile.env"
 
                 with patch("upapasta.main.check_or_prompt_credentials"):
@@ -73,8 +73,8 @@ class TestMainStatsDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.print_stats") as mock_stats:
                     with pytest.raises(SystemExit) as exc_info:
@@ -100,8 +100,8 @@ class TestMainTestConnectionDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}  # Sem credenciais
@@ -123,8 +123,8 @@ class TestMainTestConnectionDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {
@@ -155,8 +155,8 @@ class TestMainTestConnectionDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {
@@ -191,8 +191,8 @@ class TestMainTmdbSearchDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}  # Sem TMDB_API_KEY
@@ -215,8 +215,8 @@ class TestMainTmdbSearchDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {"TMDB_API_KEY": "fake_key"}
@@ -264,8 +264,8 @@ class TestMainNoInputsDispatch:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with pytest.raises(SystemExit) as exc_info:
                     main()
@@ -301,8 +301,8 @@ class TestMainMultiInput:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}
@@ -354,8 +354,8 @@ class TestMainEachMode:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}
@@ -401,8 +401,8 @@ class TestMainEachMode:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}
@@ -444,8 +444,8 @@ class TestMainWatchMode:
             )
             mock_parse.return_value = mock_args
 
-            with patch("upapasta.main.resolve_env_file") as mock_resolve:
-                mock_resolve.return_value = "/tmp/test.env"
+            with patch("upapasta.main.env_file_for_args") as mock_env:
+                mock_env.return_value = "/tmp/test.env"
 
                 with patch("upapasta.main.load_env_file") as mock_load:
                     mock_load.return_value = {}
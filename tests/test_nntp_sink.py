@@ -0,0 +1,133 @@
+"""Testes para upapasta.nntp_sink (servidor NNTP local) e upapasta.bench."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from upapasta import bench
+from upapasta.bench import BenchResult, bench_backends, print_bench_results
+from upapasta.nntp_sink import NNTPSink
+from upapasta.nntp_verify import VerifyError, verify_nzb_articles
+from upapasta.repair import _RepairConnection
+
+
+def _article(message_id: str, body: bytes = b"hello\r\n.dot\r\n") -> bytes:
+    return (
+        f"From: a <a@b>\r\nNewsgroups: alt.test\r\nSubject: s\r\nMessage-ID: <{message_id}>\r\n\r\n"
+    ).encode() + body
+
+
+def _nzb(path: Path, ids: list[str]) -> str:
+    segs = "".join(f'<segment bytes="1" number="{n}">{m}</segment>' for n, m in enumerate(ids, 1))
+    nzb = path / "x.nzb"
+    nzb.write_text(
+        '<nzb xmlns="http://www.newzbin.com/DTD/2003/nzb"><file subject="f">'
+        f"<segments>{segs}</segments></file></nzb>"
+    )
+    return str(nzb)
+
+
+def test_post_stat_and_body_roundtrip(tmp_path: Path) -> None:
+    with NNTPSink(user="u", password="p") as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        conn.post(_article("one@test"))
+        conn.post(_article("two@test"))
+        begin, _part, _end = conn.yenc_header("one@test")
+        conn.close()
+
+        report = verify_nzb_articles(_nzb(tmp_path, ["one@test", "two@test", "x@y"]), sink.server())
+
+        assert begin == {}  # sem cabeçalho yEnc, mas BODY lido até o fim
+        assert sink.article("one@test") == _article("one@test")
+        assert (report.checked, report.missing) == (3, 1)
+        assert sink.stats.posted == 2 and sink.stats.bytes_received > 0
+
+
+def test_auth_required(tmp_path: Path) -> None:
+    with NNTPSink(user="u", password="p") as sink:
+        with pytest.raises(VerifyError, match="481"):
+            _RepairConnection({**sink.server(), "password": "wrong"}, 5)
+
+
+def test_error_injection(tmp_path: Path) -> None:
+    with NNTPSink(error_rate=1.0) as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        with pytest.raises(VerifyError, match="441"):
+            conn.post(_article("a@test"))
+        conn.close()
+        assert sink.stats.rejected == 1 and not sink.has("a@test")
+
+    with NNTPSink(drop_rate=1.0) as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        with pytest.raises(VerifyError):
+            conn.post(_article("b@test"))
+        assert sink.stats.dropped == 1
+
+
+def test_connection_limit_and_disk_retention(tmp_path: Path) -> None:
+    store = tmp_path / "articles"
+    with NNTPSink(max_connections=1, retain=str(store)) as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        conn.post(_article("disk@test"))
+        conn.close()
+
+        report = verify_nzb_articles(_nzb(tmp_path, ["disk@test"] * 200), sink.server(), 3)
+
+        assert report.ok and report.checked == 200
+        assert sink.article("disk@test") == _article("disk@test")
+        assert len(list(store.iterdir())) == 1
+
+
+def test_latency_and_bandwidth() -> None:
+    with NNTPSink(latency=0.05, bandwidth=200 * 1024) as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        start = time.monotonic()
+        for n in range(2):
+            conn.post(_article(f"big{n}@test", b"x" * 50_000 + b"\r\n"))
+        elapsed = time.monotonic() - start
+        conn.close()
+    # 100 KB a 200 KB/s + latência de 4 comandos.
+    assert elapsed >= 0.4
+
+
+def test_article_is_read_in_paced_blocks() -> None:
+    with NNTPSink(bandwidth=400 * 1024, drop_rate=1.0) as sink:
+        conn = _RepairConnection(sink.server(), 5)
+        start = time.monotonic()
+        with pytest.raises(VerifyError):
+            conn.post(_article("big@test", (b"x" * 126 + b"\r\n") * 8000))
+        elapsed = time.monotonic() - start
+    # Conexão cortada no meio: o sink não leu (nem esperou por) o artigo inteiro.
+    assert sink.stats.dropped == 1
+    assert sink.stats.bytes_received < 1_000_000
+    assert elapsed < 2.0
+
+
+def test_bench_measures_each_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_backend(backend, path, srv, article_size, nzb_target, files, working_dir):  # type: ignore[no-untyped-def]
+        conn = _RepairConnection(srv, 5)
+        for n, name in enumerate(files):
+            conn.post(_article(f"{backend}.{n}@bench", b"y" * 1000 + b"\r\n"))
+        conn.close()
+        return 0 if backend == "pesto" else 3
+
+    monkeypatch.setattr(bench, "_run_backend", fake_backend)
+    results = bench_backends(size_bytes=4096, backends=[("pesto", "/p"), ("nyuu", "/n")])
+
+    assert [(r.backend, r.ok, r.articles) for r in results] == [
+        ("pesto", True, 4),
+        ("nyuu", False, 4),
+    ]
+    assert all(r.bytes_posted > 4000 and r.mb_per_s > 0 for r in results)
+
+
+def test_print_bench_results(capsys: pytest.CaptureFixture[str]) -> None:
+    print_bench_results([])
+    assert "pesto" in capsys.readouterr().out
+
+    print_bench_results([BenchResult("nyuu", "/n", 0, 2.0, 20 * 1024 * 1024, 30, 0, 1.0)])
+    line = capsys.readouterr().out.splitlines()[-1]
+    assert "nyuu" in line and "10.0" in line and "0.050" in line
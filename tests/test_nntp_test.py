@@ -201,3 +201,121 @@ class TestNntpConnectionErrors:
             success, msg = check_nntp_connection("news.example.com", 119, False, "user", "pass")
             assert not success
             assert "Unexpected error" in msg
+
+
+# ── Sondagem paralela ─────────────────────────────────────────────────────────
+
+
+def _fake_nntp_server(replies: dict[str, str]) -> int:
+    """Servidor NNTP mínimo em 127.0.0.1 (uma conexão); retorna a porta."""
+    import socket
+    import threading
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    def serve() -> None:
+        conn, _addr = listener.accept()
+        with conn, conn.makefile("rwb") as fh:
+            fh.write(b"200 fake news server\r\n")
+            fh.flush()
+            for raw in fh:
+                verb = raw.decode().split(" ")[0].upper().strip()
+                if verb == "AUTHINFO":
+                    verb = " ".join(raw.decode().split(" ")[:2]).upper()
+                fh.write(replies.get(verb, "500 what?\r\n").encode())
+                fh.flush()
+                if verb == "QUIT":
+                    break
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return int(listener.getsockname()[1])
+
+
+_REPLIES = {
+    "CAPABILITIES": "101 caps\r\nVERSION 2\r\nREADER\r\nAUTHINFO USER\r\n.\r\n",
+    "AUTHINFO USER": "381 password required\r\n",
+    "AUTHINFO PASS": "281 ok\r\n",
+    "STAT": "430 no such article\r\n",
+    "QUIT": "205 bye\r\n",
+}
+
+
+def test_probe_server_measures_phases():
+    import pytest
+
+    from upapasta import nntp_test
+
+    if nntp_test.nntplib is None:
+        pytest.skip("nntplib indisponível")
+    port = _fake_nntp_server(_REPLIES)
+
+    result = nntp_test.probe_server("127.0.0.1", port, False, "user", "pass", timeout=5)
+
+    assert result.ok, result.message
+    assert result.connect_ms > 0 and result.auth_ms > 0 and result.rtt_ms > 0
+    assert result.tls_ms == 0
+
+
+def test_probe_server_reports_auth_failure():
+    import pytest
+
+    from upapasta import nntp_test
+
+    if nntp_test.nntplib is None:
+        pytest.skip("nntplib indisponível")
+    port = _fake_nntp_server({**_REPLIES, "AUTHINFO PASS": "481 authentication failed\r\n"})
+
+    result = nntp_test.probe_server("127.0.0.1", port, False, "user", "bad", timeout=5)
+
+    assert not result.ok
+    assert "481" in result.message
+
+
+def test_probe_servers_runs_concurrently_and_caches(monkeypatch):
+    import threading
+    import time
+
+    from upapasta import nntp_test
+    from upapasta.nntp_test import ProbeResult, probe_servers
+
+    calls = []
+    lock = threading.Lock()
+
+    def fake_probe(host, port, use_ssl, user, password, timeout=10, insecure=False):
+        with lock:
+            calls.append(host)
+        time.sleep(0.2)
+        return ProbeResult(host, port, host != "down", checked_at=time.time())
+
+    monkeypatch.setattr(nntp_test, "probe_server", fake_probe)
+    servers = [{"host": h, "port": "563", "user": "u"} for h in ("a", "b", "down")]
+
+    start = time.monotonic()
+    results = probe_servers(servers)
+    assert time.monotonic() - start < 0.5  # em série seriam 0.6 s
+    assert sorted(calls) == ["a", "b", "down"]
+    assert not results["u@down:563"].ok
+
+    probe_servers(servers)
+    assert len(calls) == 3  # dentro do TTL: vem do cache
+
+    monkeypatch.setattr(nntp_test._PROBES, "ttl", -1)
+    probe_servers(servers)
+    assert len(calls) == 6
+
+
+def test_rank_servers_fastest_healthy_first():
+    from upapasta.nntp_test import ProbeResult, rank_servers
+
+    servers = [{"host": h, "port": "563", "user": "u"} for h in ("slow", "down", "fast")]
+    results = {
+        "u@slow:563": ProbeResult("slow", 563, True, connect_ms=80),
+        "u@down:563": ProbeResult("down", 563, False),
+        "u@fast:563": ProbeResult("fast", 563, True, connect_ms=10, auth_ms=5),
+    }
+
+    assert [s["host"] for s in rank_servers(servers, results)] == ["fast", "slow", "down"]
+    assert rank_servers(servers, {}) == servers
@@ -0,0 +1,169 @@
+"""Testes para upapasta.nntp_verify: STAT em pipeline dos artigos de um NZB."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from upapasta.nntp_verify import iter_segments, verify_nzb_articles
+
+
+def _nzb(path: Path, files: dict[str, int]) -> str:
+    """NZB com `n` segmentos por arquivo; Message-IDs '<subject>.<n>@test'."""
+    body = []
+    for subject, count in files.items():
+        segments = "".join(
+            f'<segment bytes="1" number="{n}">{subject}.{n}@test</segment>'
+            for n in range(1, count + 1)
+        )
+        body.append(
+            f'<file poster="p" date="0" subject="{subject}">'
+            f"<groups><group>alt.binaries.test</group></groups>"
+            f"<segments>{segments}</segments></file>"
+        )
+    nzb = path / "post.nzb"
+    nzb.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<nzb xmlns="http://www.newzbin.com/DTD/2003/nzb">' + "".join(body) + "</nzb>"
+    )
+    return str(nzb)
+
+
+class _FakeServer:
+    """Servidor NNTP em 127.0.0.1 que responde STAT (223/430) a várias conexões."""
+
+    def __init__(self, present: set[str], max_conns: int = 10) -> None:
+        self.present = present
+        self.max_conns = max_conns
+        self.stats: list[str] = []
+        self.active = 0
+        self._lock = threading.Lock()
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(16)
+        self.port = int(self._listener.getsockname()[1])
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _addr = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        with self._lock:
+            self.active += 1
+            refuse = self.active > self.max_conns
+        with conn, conn.makefile("rwb") as fh:
+            if refuse:
+                fh.write(b"502 too many connections\r\n")
+                fh.flush()
+            else:
+                fh.write(b"200 fake\r\n")
+                fh.flush()
+                for raw in fh:
+                    line = raw.decode().strip()
+                    verb = line.split(" ")[0].upper()
+                    if line.upper().startswith("AUTHINFO USER"):
+                        reply = "381 password\r\n"
+                    elif line.upper().startswith("AUTHINFO PASS"):
+                        reply = "281 ok\r\n"
+                    elif verb == "STAT":
+                        mid = line.split(" ", 1)[1].strip("<>")
+                        with self._lock:
+                            self.stats.append(mid)
+                        reply = "223 0 <x>\r\n" if mid in self.present else "430 no\r\n"
+                    elif verb == "QUIT":
+                        fh.write(b"205 bye\r\n")
+                        fh.flush()
+                        break
+                    else:
+                        reply = "500 what?\r\n"
+                    fh.write(reply.encode())
+                    fh.flush()
+        with self._lock:
+            self.active -= 1
+
+    def server(self) -> dict[str, object]:
+        return {"host": "127.0.0.1", "port": self.port, "user": "u", "password": "p"}
+
+
+def test_iter_segments_streams_message_ids(tmp_path: Path) -> None:
+    nzb = _nzb(tmp_path, {"a": 2, "b": 1})
+    assert [(s.file_index, s.number, s.message_id) for s in iter_segments(nzb)] == [
+        (0, 1, "a.1@test"),
+        (0, 2, "a.2@test"),
+        (1, 1, "b.1@test"),
+    ]
+
+
+def test_reports_missing_segments_per_file(tmp_path: Path) -> None:
+    nzb = _nzb(tmp_path, {"a": 150, "b": 20})
+    missing = {"a.7@test", "a.120@test", "b.3@test"}
+    present = {s.message_id for s in iter_segments(nzb)} - missing
+    fake = _FakeServer(present)
+
+    report = verify_nzb_articles(nzb, fake.server(), connections=3)
+
+    assert report.error is None
+    assert (report.checked, report.missing) == (170, 3)
+    assert [(f.subject, f.segments, f.missing) for f in report.files] == [
+        ("a", 150, [7, 120]),
+        ("b", 20, [3]),
+    ]
+    assert not report.ok and report.throughput > 0
+
+
+def test_sample_always_checks_first_segment(tmp_path: Path) -> None:
+    nzb = _nzb(tmp_path, {"a": 200, "b": 200})
+    fake = _FakeServer({s.message_id for s in iter_segments(nzb)})
+
+    report = verify_nzb_articles(nzb, fake.server(), connections=2, sample=0.1, seed=1)
+
+    assert report.ok
+    assert {"a.1@test", "b.1@test"} <= set(fake.stats)
+    assert 2 < report.checked < 120
+
+
+def test_refused_extra_connections_only_reduce_parallelism(tmp_path: Path) -> None:
+    nzb = _nzb(tmp_path, {"a": 300})
+    fake = _FakeServer({s.message_id for s in iter_segments(nzb)}, max_conns=1)
+
+    report = verify_nzb_articles(nzb, fake.server(), connections=4)
+
+    assert report.ok and report.checked == 300
+
+
+def test_connection_refused_sets_error(tmp_path: Path) -> None:
+    nzb = _nzb(tmp_path, {"a": 5})
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    report = verify_nzb_articles(nzb, {"host": "127.0.0.1", "port": port}, connections=2)
+
+    assert report.error and not report.ok and report.checked == 0
+
+
+def test_main_verify_nzb_exit_code(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import sys
+
+    from upapasta import main as main_mod
+
+    nzb = _nzb(tmp_path, {"a": 3})
+    fake = _FakeServer({"a.1@test", "a.2@test"})
+    env = tmp_path / ".env"
+    env.write_text(f"NNTP_HOST=127.0.0.1\nNNTP_PORT={fake.port}\nNNTP_USER=u\nNNTP_PASS=p\n")
+    monkeypatch.setattr(sys, "argv", ["upapasta", "--verify-nzb", nzb, "--env-file", str(env)])
+
+    with pytest.raises(SystemExit) as exc:
+        main_mod.main()
+
+    assert exc.value.code == 1
+    assert set(fake.stats) == {"a.1@test", "a.2@test", "a.3@test"}
@@ -0,0 +1,210 @@
+"""Testes para --obfuscate-metadata (nomes aleatórios só na postagem)."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+import upapasta.upfolder as upfolder
+from upapasta.makepar import plan_post_names
+
+
+def _snapshot(root: Path) -> list[str]:
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*"))
+
+
+def test_plan_post_names_single_file_and_volumes(tmp_path: Path) -> None:
+    (tmp_path / "Filme.2024.mkv").write_bytes(b"v")
+    (tmp_path / "Filme.2024.par2").write_bytes(b"p")
+    (tmp_path / "Filme.2024.vol00+01.par2").write_bytes(b"p")
+    before = _snapshot(tmp_path)
+
+    names, obf_map = plan_post_names(str(tmp_path / "Filme.2024.mkv"), "abc123")
+
+    assert names == {
+        str(tmp_path / "Filme.2024.mkv"): "abc123.mkv",
+        str(tmp_path / "Filme.2024.par2"): "abc123.par2",
+        str(tmp_path / "Filme.2024.vol00+01.par2"): "abc123.vol00+01.par2",
+    }
+    assert obf_map == {"abc123": "Filme.2024"}
+    assert _snapshot(tmp_path) == before
+
+    vols = tmp_path / "vols"
+    vols.mkdir()
+    for i in (1, 2):
+        (vols / f"Rel.part{i}.rar").write_bytes(b"r")
+    names, _map = plan_post_names(str(vols / "Rel.part1.rar"), "zzz")
+    assert sorted(names.values()) == ["zzz.part1.rar", "zzz.part2.rar"]
+
+
+def test_plan_post_names_folder_keeps_extensions(tmp_path: Path) -> None:
+    folder = tmp_path / "Show.S01"
+    (folder / "Subs").mkdir(parents=True)
+    (folder / "e01.mkv").write_bytes(b"v")
+    (folder / "Subs" / "e01.srt").write_bytes(b"s")
+    (tmp_path / "Show.S01.par2").write_bytes(b"p")
+    before = _snapshot(tmp_path)
+
+    names, obf_map = plan_post_names(str(folder), "base")
+
+    mkv = names[str(folder / "e01.mkv")]
+    srt = names[str(folder / "Subs" / "e01.srt")]
+    assert mkv.endswith(".mkv") and os.sep not in mkv and "e01" not in mkv
+    assert srt.endswith(".srt") and os.path.dirname(srt) not in ("", "Subs")
+    assert names[str(tmp_path / "Show.S01.par2")] == "base.par2"
+    assert next(iter(obf_map.items())) == ("base", "Show.S01")
+    assert obf_map[srt] == os.path.join("Subs", "e01.srt")
+    assert _snapshot(tmp_path) == before
+
+
+def test_run_nyuu_posts_planned_names(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: dict[str, Any] = {}
+
+    class _Proc:
+        stdout = io.BytesIO(b"")
+
+        def wait(self) -> int:
+            return 0
+
+    @contextlib.contextmanager
+    def fake_popen(cmd: list[str], **kw: Any) -> Iterator[_Proc]:
+        seen["cmd"] = cmd
+        config = cmd[cmd.index("--config") + 1]
+        seen["config"] = config
+        seen["js"] = Path(config).read_text(encoding="utf-8")
+        yield _Proc()
+
+    monkeypatch.setattr(upfolder, "managed_popen", fake_popen)
+    srv = {"host": "news.a.com", "port": "563", "ssl": True, "user": "u", "password": "p"}
+    srv["connections"] = "4"
+
+    rc = upfolder._run_nyuu(
+        "/bin/nyuu",
+        srv,
+        "alt.binaries.a",
+        "700K",
+        str(tmp_path / "out.nzb"),
+        "Filme",
+        ["Filme.mkv", "Filme.par2"],
+        str(tmp_path),
+        obfuscated=True,
+        post_names={"Filme.mkv": "abc.mkv", "Filme.par2": "abc.par2"},
+        groups=["alt.binaries.a", "alt.binaries.b"],
+        echo=False,
+    )
+
+    assert rc == 0
+    assert "-t" not in seen["cmd"]
+    assert '["abc.mkv", "abc.par2"]' in seen["js"]
+    assert "yencName" in seen["js"] and "newsgroups" in seen["js"]
+    assert not os.path.exists(seen["config"])
+
+
+def test_upload_maps_posted_names(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "Filme.mkv").write_bytes(b"v" * 1000)
+    (tmp_path / "Filme.par2").write_bytes(b"p" * 10)
+    calls: list[dict[str, Any]] = []
+    subjects: list[list[str]] = []
+
+    def fake_nyuu(
+        nyuu_path: str, srv: Any, group: str, article_size: str, nzb: str, *a: Any, **kw: Any
+    ) -> int:
+        calls.append(kw)
+        Path(nzb).write_text('<?xml version="1.0"?><nzb/>')
+        return 0
+
+    def fake_fix(nzb: str, all_files: list[str], *a: Any, **kw: Any) -> None:
+        subjects.append(all_files)
+
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "find_pesto", lambda: None)
+    monkeypatch.setattr(upfolder, "_run_nyuu", fake_nyuu)
+    monkeypatch.setattr(upfolder, "fix_nzb_subjects", fake_fix)
+    post_names, obf_map = plan_post_names(str(tmp_path / "Filme.mkv"), "abc")
+    env = {"NNTP_HOST": "news.a.com", "NNTP_USER": "u", "NNTP_PASS": "p", "USENET_GROUP": "a.b"}
+
+    rc = upfolder.upload_to_usenet(
+        str(tmp_path / "Filme.mkv"),
+        env_vars=env,
+        skip_rar=True,
+        obfuscated_map=obf_map,
+        nzb_out_abs=str(tmp_path / "abc.nzb"),
+        post_names=post_names,
+    )
+
+    assert rc == 0
+    assert calls[0]["post_names"] == {"Filme.mkv": "abc.mkv", "Filme.par2": "abc.par2"}
+    assert sorted(subjects[0]) == ["abc.mkv", "abc.par2"]
+
+
+def test_orchestrator_metadata_obfuscation_leaves_disk_alone(tmp_path: Path) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    item = tmp_path / "Filme.2024.mkv"
+    item.write_bytes(b"v")
+    (tmp_path / "Filme.2024.par2").write_bytes(b"p")
+    before = _snapshot(tmp_path)
+
+    orch = UpaPastaOrchestrator(str(item), skip_rar=True, obfuscate=True, obfuscate_metadata=True)
+    orch.input_target = str(item)
+    assert orch.run_obfuscation(bar=None)
+
+    assert _snapshot(tmp_path) == before
+    assert orch.input_target == str(item)
+    assert orch._post_names[str(item)] == orch.subject + ".mkv"
+    assert orch.obfuscated_map[orch.subject] == "Filme.2024"
+
+    orch._revert_obfuscation()
+    assert orch.input_target == str(item) and _snapshot(tmp_path) == before
+
+
+def test_pesto_posts_real_files_with_metadata_names(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "Filme.mkv").write_bytes(b"v" * 1000)
+    (tmp_path / "Filme.par2").write_bytes(b"p" * 10)
+    calls: list[dict[str, Any]] = []
+
+    def fake_pesto(**kw: Any) -> int:
+        calls.append(kw)
+        Path(kw["nzb_target"]).write_text('<?xml version="1.0"?><nzb/>')
+        return 0
+
+    monkeypatch.setattr(upfolder, "find_pesto", lambda: "/bin/pesto")
+    monkeypatch.setattr(upfolder, "_run_pesto", fake_pesto)
+    monkeypatch.setattr(upfolder, "fix_nzb_subjects", lambda *a, **kw: None)
+    post_names, obf_map = plan_post_names(str(tmp_path / "Filme.mkv"), "abc")
+    env = {"NNTP_HOST": "news.a.com", "NNTP_USER": "u", "NNTP_PASS": "p", "USENET_GROUP": "a.b"}
+
+    rc = upfolder.upload_to_usenet(
+        str(tmp_path / "Filme.mkv"),
+        env_vars=env,
+        skip_rar=True,
+        obfuscated_map=obf_map,
+        nzb_out_abs=str(tmp_path / "abc.nzb"),
+        post_names=post_names,
+    )
+
+    # O pesto gera o PAR2 do que lê: os arquivos seguem com os nomes reais.
+    assert rc == 0
+    assert calls[0]["working_dir"] == str(tmp_path)
+    assert "Filme.mkv" in calls[0]["files"]
+    assert not list(tmp_path.glob("*upapasta-names-*"))
+
+
+def test_named_view_lives_outside_the_input(tmp_path: Path) -> None:
+    (tmp_path / "Rel.part1.rar").write_bytes(b"r")
+
+    with upfolder._named_view(
+        str(tmp_path), ["Rel.part1.rar"], {"Rel.part1.rar": "Rel.part01.rar"}
+    ) as (view, files):
+        assert not view.startswith(str(tmp_path))
+        assert files == ["Rel.part01.rar"]
+        assert Path(view, "Rel.part01.rar").read_bytes() == b"r"
+    assert not os.path.exists(view)
+    assert [p.name for p in tmp_path.iterdir()] == ["Rel.part1.rar"]
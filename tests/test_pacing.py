@@ -0,0 +1,97 @@
+"""Testes para upapasta.pacing: ajuste adaptativo (AIMD) de conexões por servidor."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from upapasta import pacing
+from upapasta.pacing import ConnectionTuner, UploadSample, estimate_upload_bps, parse_speed
+
+MB = 1024 * 1024
+SRV = {"host": "news.x", "port": "563", "user": "me", "connections": "50"}
+
+
+def _sample(connections: int, mbps: float, errors: int = 0) -> UploadSample:
+    sample = UploadSample(connections, total_bytes=1024 * MB)
+    sample.speeds = [mbps * MB] * 10
+    sample.errors = errors
+    return sample.finish()
+
+
+def test_parse_speed() -> None:
+    assert parse_speed("12.5 MB/s") == 12.5 * MB
+    assert parse_speed("850 KiB/s") == 850 * 1024
+    assert parse_speed("sem velocidade") is None
+
+
+def test_sample_observes_pesto_events() -> None:
+    sample = UploadSample(10)
+    sample.observe({"type": "started", "total_bytes": 500 * MB})
+    for speed in ("1 MB/s", "20 MB/s", "22 MB/s", "24 MB/s"):
+        sample.observe({"type": "segment_done", "speed_human": speed})
+    sample.observe({"type": "segment_failed"})
+
+    assert sample.total_bytes == 500 * MB
+    assert sample.throughput() == 23 * MB  # descarta a rampa inicial
+    assert sample.errors == 1
+
+
+def test_unknown_server_uses_ceiling() -> None:
+    assert ConnectionTuner().connections_for(SRV) == 50
+
+
+def test_additive_increase_then_knee() -> None:
+    tuner = ConnectionTuner()
+    assert tuner.record(SRV, _sample(30, 20), failed=False) == 35
+    # Mais conexões, mais vazão: continua subindo.
+    assert tuner.record(SRV, _sample(35, 24), failed=False) == 40
+    # Sem ganho: volta ao melhor ponto conhecido.
+    assert tuner.record(SRV, _sample(40, 24.5), failed=False) == 35
+    assert tuner.connections_for(SRV) == 35
+
+
+def test_multiplicative_decrease_on_errors_and_congestion() -> None:
+    tuner = ConnectionTuner()
+    assert tuner.record(SRV, _sample(40, 20, errors=5), failed=False) == 30
+    congested = _sample(30, 0)
+    congested.note("502 Too many connections")
+    assert tuner.record(SRV, congested, failed=True) == 22
+
+
+def test_failure_without_congestion_is_not_recorded() -> None:
+    tuner = ConnectionTuner()
+    assert tuner.record(SRV, _sample(40, 20), failed=False) == 45
+    auth = _sample(45, 0)
+    auth.note("481 Authentication failed")
+    assert tuner.record(SRV, auth, failed=True) == 45
+
+    sample = UploadSample(10)
+    sample.observe({"type": "failed", "description": "connection timed out"})
+    assert sample.congested
+
+
+def test_never_exceeds_ceiling_and_ignores_small_uploads() -> None:
+    tuner = ConnectionTuner()
+    assert tuner.record(SRV, _sample(50, 30), failed=False) == 50
+    tiny = UploadSample(50, total_bytes=MB)
+    tiny.speeds = [MB]
+    assert tuner.record({**SRV, "connections": "20"}, tiny.finish(), failed=False) == 20
+
+
+def test_state_persists(tmp_path: Path) -> None:
+    cache = str(tmp_path / "pacing.json")
+    ConnectionTuner(cache).record(SRV, _sample(40, 20, errors=5), failed=False)
+    assert ConnectionTuner(cache).connections_for(SRV) == 30
+
+
+def test_eta_uses_measured_throughput(monkeypatch: pytest.MonkeyPatch) -> None:
+    env = {"NNTP_HOST": "news.x", "NNTP_PORT": "563", "NNTP_USER": "me"}
+    assert estimate_upload_bps(env, 20) == 20 * 500 * 1024
+
+    pacing.get_tuner().record(SRV, _sample(20, 40), failed=False)
+    assert estimate_upload_bps(env, 20) == pytest.approx(40 * MB)
+    assert estimate_upload_bps({**env, "NNTP_ADAPTIVE_CONNECTIONS": "false"}, 20) == (
+        20 * 500 * 1024
+    )
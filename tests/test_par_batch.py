@@ -0,0 +1,129 @@
+"""Testes para upapasta.par_batch (--par2-batch)."""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+import upapasta.orchestrator as orch_module
+import upapasta.tools as tools_module
+from upapasta.orchestrator import UpaPastaOrchestrator
+from upapasta.par_batch import ParityBatch, start_parity_batch
+
+
+@pytest.fixture
+def no_pesto(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tools_module, "tool_path", lambda name: None)
+
+
+def _episodes(root: Path, count: int = 3) -> list[Path]:
+    items = []
+    for n in range(1, count + 1):
+        item = root / f"Show.S01E{n:02d}.mkv"
+        item.write_bytes(b"v" * 1000)
+        items.append(item)
+    return items
+
+
+def _fake_parity(calls: list[str], rc: int = 0, forced: Optional[list[bool]] = None) -> Any:
+    def fake(target: str, **kw: Any) -> int:
+        calls.append(os.path.basename(target))
+        if forced is not None:
+            forced.append(kw["force"])
+        if rc == 0:
+            Path(os.path.splitext(target)[0] + ".par2").write_bytes(b"p")
+        return rc
+
+    return fake
+
+
+def test_can_prefetch_parity(tmp_path: Path, no_pesto: None) -> None:
+    (item,) = _episodes(tmp_path, 1)
+
+    assert UpaPastaOrchestrator(str(item), skip_rar=True).can_prefetch_parity(2000)
+    assert not UpaPastaOrchestrator(str(item), skip_rar=True).can_prefetch_parity(10)
+    assert not UpaPastaOrchestrator(str(item), skip_rar=False).can_prefetch_parity(2000)
+    assert not UpaPastaOrchestrator(str(item), skip_rar=True, obfuscate=True).can_prefetch_parity(
+        2000
+    )
+    assert not UpaPastaOrchestrator(str(tmp_path), skip_rar=True).can_prefetch_parity(2000)
+
+    # PAR2 já existente: só entra no lote com --force.
+    item.with_suffix(".par2").write_bytes(b"p")
+    assert not UpaPastaOrchestrator(str(item), skip_rar=True).can_prefetch_parity(2000)
+    assert UpaPastaOrchestrator(str(item), skip_rar=True, force=True).can_prefetch_parity(2000)
+
+
+def test_batch_parity_is_consumed_by_run_makepar(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_pesto: None
+) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(orch_module, "make_parity", _fake_parity(calls))
+    items = _episodes(tmp_path)
+    orchs = [UpaPastaOrchestrator(str(i), skip_rar=True) for i in items]
+
+    batch = ParityBatch(max_bytes=2000, jobs=2, threads=8, memory_mb=1024)
+    assert all(batch.add(o) for o in orchs)
+    assert (batch.threads, batch.memory_mb) == (4, 512)
+
+    for orch in orchs:
+        orch.input_target = str(orch.input_path)
+        assert orch.run_makepar(bar=None)
+        assert orch.par_file == str(orch.input_path.with_suffix(".par2"))
+        assert not orch.parity_prefetch_pending()
+    batch.close()
+
+    # Só as gerações do lote; nenhum item gerou de novo.
+    assert sorted(calls) == [i.name for i in items]
+    assert all(i.with_suffix(".par2").exists() for i in items)
+
+
+def test_failed_batch_item_falls_back(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_pesto: None
+) -> None:
+    calls: list[str] = []
+    forced: list[bool] = []
+    monkeypatch.setattr(orch_module, "make_parity", _fake_parity(calls, rc=5, forced=forced))
+    (item,) = _episodes(tmp_path, 1)
+    orch = UpaPastaOrchestrator(str(item), skip_rar=True)
+    batch = ParityBatch(max_bytes=2000, jobs=1)
+    batch.add(orch)
+
+    assert orch._parity_prefetch is not None and orch._parity_prefetch.result() == 5
+
+    orch.input_target = str(item)
+    monkeypatch.setattr(orch_module, "make_parity", _fake_parity(calls, forced=forced))
+    assert orch.run_makepar(bar=None)
+    # O lote respeita --force; só a geração de reserva sobrescreve o que ele deixou.
+    assert calls == [item.name, item.name] and forced == [False, True]
+    assert not orch.force
+    batch.close()
+
+
+def test_close_removes_unconsumed_parity(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_pesto: None
+) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(orch_module, "make_parity", _fake_parity(calls))
+    items = _episodes(tmp_path, 2)
+    (tmp_path / "Show.S01E010.par2").write_bytes(b"outro item")
+    (tmp_path / "Show.S01E01.vol00+01.par2").write_bytes(b"do usuario")
+
+    args = argparse.Namespace(par2_batch="1K", par2_jobs=1)
+    monkeypatch.setattr(
+        UpaPastaOrchestrator, "from_args", classmethod(lambda cls, a, p: cls(p, skip_rar=True))
+    )
+    batch, prepared = start_parity_batch(args, items)
+    assert batch is not None and set(prepared) == set(items)
+
+    batch.close()
+    assert sorted(p.name for p in tmp_path.glob("*.par2")) == [
+        "Show.S01E01.vol00+01.par2",
+        "Show.S01E010.par2",
+    ]
+
+    assert start_parity_batch(argparse.Namespace(par2_batch=None), items) == (None, {})
@@ -0,0 +1,211 @@
+"""Testes para upapasta.par_overlap (PAR2 gerado durante o PACK)."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import upapasta.makepar as makepar_module
+from upapasta.makepar import make_parity
+from upapasta.makerar import planned_volumes
+from upapasta.par_overlap import OverlappedParity
+
+
+class _FakeRar:
+    """Escreve volumes base.partN.rar um a um e, como o rar, renomeia ao passar de 9."""
+
+    def __init__(self, base: Path, count: int, delay: float = 0.02) -> None:
+        self.base = base
+        self.count = count
+        self.delay = delay
+        self.thread = threading.Thread(target=self._run)
+
+    def _run(self) -> None:
+        for n in range(1, self.count + 1):
+            (self.base.parent / f"{self.base.name}.part{n}.rar").write_bytes(b"v" * n)
+            time.sleep(self.delay)
+        if self.count > 9:
+            for n in range(1, 10):
+                src = self.base.parent / f"{self.base.name}.part{n}.rar"
+                src.rename(self.base.parent / f"{self.base.name}.part{n:02d}.rar")
+
+
+def _recorder(log: list[tuple[list[str], list[str], str]], rc: int = 0):  # type: ignore[no-untyped-def]
+    def make_set(files: list[str], names: list[str], set_name: str) -> int:
+        assert all(os.path.exists(f) for f in files)
+        log.append(([os.path.basename(f) for f in files], names, set_name))
+        Path(os.path.dirname(files[0]), set_name + ".par2").write_bytes(b"par2")
+        return rc
+
+    return make_set
+
+
+def test_sets_start_before_pack_ends(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    calls: list[tuple[list[str], list[str], str]] = []
+    rar = _FakeRar(base, 8, delay=0.1)
+    overlap = OverlappedParity(str(base), 8, _recorder(calls), sets=4, poll_interval=0.01)
+
+    overlap.start()
+    rar.thread.start()
+    while not calls and rar.thread.is_alive():
+        time.sleep(0.01)
+    started_during_pack = rar.thread.is_alive()
+    rar.thread.join()
+
+    assert started_during_pack
+    assert overlap.finish()
+    assert [c[0] for c in calls] == [
+        [f"Release.part{n}.rar", f"Release.part{n + 1}.rar"] for n in (1, 3, 5, 7)
+    ]
+    assert [s.name for s in overlap.sets] == [f"Release.set0{n}" for n in range(1, 5)]
+    assert overlap.par2_files()[0] == str(tmp_path / "Release.set01.par2")
+
+
+def test_renamed_volumes_get_final_names_or_regenerate(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    calls: list[tuple[list[str], list[str], str]] = []
+    rar = _FakeRar(base, 12, delay=0.02)
+    # Estimativa certa (12 → 2 dígitos): nomes finais já vão para o PAR2.
+    overlap = OverlappedParity(str(base), 12, _recorder(calls), sets=3, poll_interval=0.01)
+
+    overlap.start()
+    rar.thread.start()
+    rar.thread.join()
+
+    assert overlap.finish()
+    first = [c for c in calls if c[2] == "Release.set01"]
+    assert first[0][1] == [f"Release.part{n:02d}.rar" for n in range(1, 5)]
+    assert len(calls) == 3  # nada regerado
+
+    # Estimativa errada (1 dígito): o conjunto dos volumes renomeados é regerado.
+    for f in tmp_path.iterdir():
+        f.unlink()
+    calls.clear()
+    rar = _FakeRar(base, 12, delay=0.02)
+    overlap = OverlappedParity(str(base), 9, _recorder(calls), sets=3, poll_interval=0.01)
+    overlap.start()
+    rar.thread.start()
+    rar.thread.join()
+
+    assert overlap.finish()
+    regenerated = [c for c in calls if c[2] == "Release.set01"]
+    assert len(regenerated) == 2
+    assert regenerated[-1][0] == ["Release.part01.rar", "Release.part02.rar", "Release.part03.rar"]
+
+
+def test_failed_set_is_retried_and_reported(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    for n in range(1, 5):
+        (tmp_path / f"Release.part{n}.rar").write_bytes(b"x")
+    calls: list[tuple[list[str], list[str], str]] = []
+
+    overlap = OverlappedParity(str(base), 4, _recorder(calls, rc=5), sets=2)
+    assert not overlap.finish()
+    assert [c[2] for c in calls] == ["Release.set01", "Release.set02"]
+
+
+def test_finish_without_volumes_fails(tmp_path: Path) -> None:
+    (tmp_path / "Release.rar").write_bytes(b"x")
+    overlap = OverlappedParity(str(tmp_path / "Release"), 3, _recorder([]))
+    assert not overlap.finish()
+
+
+def test_cancel_stops_worker(tmp_path: Path) -> None:
+    overlap = OverlappedParity(str(tmp_path / "Release"), 4, _recorder([]), poll_interval=0.01)
+    overlap.start()
+    overlap.cancel()
+    assert overlap.sets == []
+
+
+def test_planned_volumes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import upapasta.makerar as makerar_module
+
+    (tmp_path / "a.bin").write_bytes(b"x")
+    assert planned_volumes(str(tmp_path / "a.bin")) == 1
+    assert planned_volumes(str(tmp_path)) == 1
+    monkeypatch.setattr(makerar_module, "_folder_size", lambda path: 50 * 1024**3)
+    assert planned_volumes(str(tmp_path)) == 50
+
+
+def test_make_parity_explicit_files_and_set_name(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    vols = []
+    for n in range(1, 4):
+        vol = tmp_path / f"Release.part{n}.rar"
+        vol.write_bytes(b"x" * 100)
+        vols.append(str(vol))
+    captured: list[list[str]] = []
+
+    class _Popen:
+        def __init__(self, args: list[str], **kwargs: object) -> None:
+            import io
+
+            captured.append(args)
+            self.stdout = io.BytesIO(b"")
+
+        def wait(self, timeout: float | None = None) -> int:
+            return 0
+
+        def poll(self) -> int:
+            return 0
+
+    monkeypatch.setattr(makepar_module, "tool_path", lambda name: "/usr/bin/parpar")
+    monkeypatch.setattr(subprocess, "Popen", _Popen)
+
+    rc = make_parity(
+        vols[0],
+        backend="parpar",
+        force=True,
+        article_size=700 * 1024,
+        input_files=vols[:2],
+        input_names=["Release.part01.rar", "Release.part02.rar"],
+        par2_name="Release.set01",
+    )
+
+    assert rc == 0
+    cmd = captured[0]
+    assert cmd[cmd.index("-o") + 1] == str(tmp_path / "Release.set01.par2")
+    assert cmd[-6:] == [
+        "--input-name",
+        "Release.part01.rar",
+        vols[0],
+        "--input-name",
+        "Release.part02.rar",
+        vols[1],
+    ]
+
+
+def test_orchestrator_starts_overlap_only_for_rar_volume_sets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+    from upapasta.par_overlap import QuietBar
+
+    folder = tmp_path / "Release"
+    folder.mkdir()
+    monkeypatch.setattr("upapasta.orchestrator.planned_volumes", lambda path, multiple=None: 8)
+
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=False, par2_overlap=4)
+    overlap = orch._start_par2_overlap(QuietBar())
+    assert overlap is not None
+    assert overlap.rar_base == str(folder) and overlap.batch_size == 2
+    overlap.cancel()
+
+    for kwargs in ({"compressor": "7z"}, {"backend": "par2"}, {"par2_overlap": 0}):
+        opts = {"skip_rar": False, "par2_overlap": 4, **kwargs}
+        assert UpaPastaOrchestrator(str(folder), **opts)._start_par2_overlap(QuietBar()) is None
+
+    monkeypatch.setattr("upapasta.orchestrator.planned_volumes", lambda path, multiple=None: 1)
+    assert (
+        UpaPastaOrchestrator(str(folder), skip_rar=False, par2_overlap=4)._start_par2_overlap(
+            QuietBar()
+        )
+        is None
+    )
@@ -0,0 +1,129 @@
+"""Testes para upapasta.par_split (--par2-split)."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+import upapasta.orchestrator as orch_module
+import upapasta.tools as tools_module
+from upapasta.par_split import SplitParity, parse_split_spec, partition
+
+
+def _release(root: Path) -> Path:
+    folder = root / "Show.S01"
+    for season in ("Disc1", "Disc2"):
+        (folder / season).mkdir(parents=True)
+        for n in range(3):
+            (folder / season / f"e{n}.mkv").write_bytes(b"v" * 100)
+    (folder / "info.nfo").write_bytes(b"n" * 10)
+    return folder
+
+
+def test_parse_split_spec() -> None:
+    assert parse_split_spec("folder") == ("folder", 0)
+    assert parse_split_spec("volumes:20") == ("volumes", 20)
+    assert parse_split_spec("size:50G") == ("size", 50 * 1024**3)
+    for bad in ("folder:2", "volumes:0", "volumes:x", "size:", "bytes:1"):
+        with pytest.raises(ValueError):
+            parse_split_spec(bad)
+
+
+def test_partition_modes(tmp_path: Path) -> None:
+    folder = _release(tmp_path)
+
+    by_folder = partition(str(folder), "folder", 0)
+    assert [len(p) for p in by_folder] == [1, 3, 3]
+    assert by_folder[0] == [str(folder / "info.nfo")]
+
+    assert [len(p) for p in partition(str(folder), "volumes", 4)] == [4, 3]
+    # NFO (10 bytes) + 2 episódios de 100 cabem em 250; depois, 2 por parte.
+    assert [len(p) for p in partition(str(folder), "size", 250)] == [3, 2, 2]
+
+    vols = tmp_path / "vols"
+    vols.mkdir()
+    for i in range(1, 6):
+        (vols / f"Filme.part{i}.rar").write_bytes(b"r")
+    parts = partition(str(vols / "Filme.part1.rar"), "volumes", 2)
+    assert [[Path(f).name for f in p] for p in parts] == [
+        ["Filme.part1.rar", "Filme.part2.rar"],
+        ["Filme.part3.rar", "Filme.part4.rar"],
+        ["Filme.part5.rar"],
+    ]
+    assert len(partition(str(vols / "Filme.part1.rar"), "folder", 0)) == 1
+
+
+def test_split_parity_runs_concurrently_and_retries_one_set() -> None:
+    calls: list[tuple[str, int, Optional[int]]] = []
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def make_set(files: list[str], name: str, threads: int, memory_mb: Optional[int]) -> int:
+        nonlocal running, peak
+        with lock:
+            calls.append((name, threads, memory_mb))
+            running += 1
+            peak = max(peak, running)
+            first_try = sum(1 for c in calls if c[0] == name) == 1
+        if len(calls) <= 2:
+            barrier.wait()
+        with lock:
+            running -= 1
+        return 5 if name == "Show.set02" and first_try else 0
+
+    split = SplitParity("Show", [["a"], ["b"], ["c"]], make_set, jobs=2, threads=8, memory_mb=2048)
+
+    assert split.run()
+    assert peak == 2
+    assert [s.attempts for s in split.sets] == [1, 2, 1]
+    assert {(c[1], c[2]) for c in calls} == {(4, 1024)}
+
+
+def test_split_parity_reports_failure() -> None:
+    split = SplitParity("Show", [["a"], ["b"]], lambda *a: 5, jobs=4, retries=1)
+    assert not split.run()
+    assert split.jobs == 2
+    assert [s.attempts for s in split.sets] == [2, 2]
+
+
+def test_orchestrator_split_parity(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    folder = _release(tmp_path)
+    calls: list[dict[str, Any]] = []
+
+    def fake_make_parity(target: str, **kw: Any) -> int:
+        calls.append(kw)
+        return 0
+
+    monkeypatch.setattr(orch_module, "make_parity", fake_make_parity)
+    monkeypatch.setattr(tools_module, "tool_path", lambda name: "/usr/bin/parpar")
+
+    orch = UpaPastaOrchestrator(
+        str(folder), skip_rar=True, par2_split="folder", par2_jobs=3, backend="parpar"
+    )
+    orch.input_target = str(folder)
+    orch.par_memory_mb = 3000
+
+    assert orch.run_makepar(bar=None)
+    assert sorted(c["par2_name"] for c in calls) == [
+        "Show.S01.set01",
+        "Show.S01.set02",
+        "Show.S01.set03",
+    ]
+    assert {c["filepath_base"] for c in calls} == {str(folder)}
+    assert {c["memory_mb"] for c in calls} == {1000}
+    assert {c["output_dir"] for c in calls} == {str(tmp_path)}
+    assert orch.par_file == str(tmp_path / "Show.S01.set01.par2")
+
+    # Uma parte só: conjunto único de sempre.
+    calls.clear()
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=True, par2_split="volumes:100")
+    orch.input_target = str(folder)
+    assert orch._run_split_parity(None) is None
+    assert calls == []
@@ -0,0 +1,251 @@
+"""Testes para upapasta.repair: reenvio dirigido dos artigos ausentes de um NZB."""
+
+from __future__ import annotations
+
+import os
+import re
+import socket
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+from pathlib import Path
+
+import pytest
+
+from upapasta import checksums, repair
+from upapasta.nntp_verify import verify_nzb_articles
+from upapasta.repair import YencInfo, _build_article, _Task, repair_nzb, yenc_encode
+
+NS = "{http://www.newzbin.com/DTD/2003/nzb}"
+PART = 1000
+
+
+def _yenc_decode(body: bytes) -> bytes:
+    out = bytearray()
+    for line in body.split(b"\r\n"):
+        if line.startswith(b"=y") or not line:
+            continue
+        escaped = False
+        for c in line:
+            if escaped:
+                out.append((c - 64 - 42) % 256)
+                escaped = False
+            elif c == 0x3D:
+                escaped = True
+            else:
+                out.append((c - 42) % 256)
+    return bytes(out)
+
+
+class _NewsServer:
+    """Servidor NNTP em 127.0.0.1 com STAT, BODY e POST sobre um dict de artigos."""
+
+    def __init__(self) -> None:
+        self.articles: dict[str, bytes] = {}
+        self.posted: list[str] = []
+        self._lock = threading.Lock()
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(16)
+        self.port = int(self._listener.getsockname()[1])
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _addr = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        with conn, conn.makefile("rwb") as fh:
+            fh.write(b"200 fake\r\n")
+            fh.flush()
+            for raw in fh:
+                line = raw.decode().strip()
+                verb = line.split(" ")[0].upper()
+                mid = line.split(" ", 1)[1].strip("<>") if " " in line else ""
+                with self._lock:
+                    article = self.articles.get(mid)
+                if verb == "AUTHINFO":
+                    reply = b"381 more\r\n" if "USER" in line.upper() else b"281 ok\r\n"
+                elif verb == "STAT":
+                    reply = b"223 0 <x>\r\n" if article is not None else b"430 no\r\n"
+                elif verb == "BODY":
+                    if article is None:
+                        reply = b"430 no\r\n"
+                    else:
+                        body = article.split(b"\r\n\r\n", 1)[1].replace(b"\r\n.", b"\r\n..")
+                        reply = b"222 0 <x>\r\n" + body + b".\r\n"
+                elif verb == "POST":
+                    fh.write(b"340 send\r\n")
+                    fh.flush()
+                    lines = []
+                    for data in fh:
+                        if data == b".\r\n":
+                            break
+                        lines.append(data[1:] if data.startswith(b"..") else data)
+                    posted = b"".join(lines)
+                    found = re.search(rb"^Message-ID: <([^>]+)>", posted, re.M)
+                    assert found is not None
+                    with self._lock:
+                        self.articles[found.group(1).decode()] = posted
+                        self.posted.append(found.group(1).decode())
+                    reply = b"240 posted\r\n"
+                elif verb == "QUIT":
+                    fh.write(b"205 bye\r\n")
+                    fh.flush()
+                    break
+                else:
+                    reply = b"500 what?\r\n"
+                fh.write(reply)
+                fh.flush()
+
+    def server(self) -> dict[str, object]:
+        return {"host": "127.0.0.1", "port": self.port, "user": "u", "password": "p"}
+
+
+def _upload(news: _NewsServer, tmp_path: Path, files: dict[str, bytes]) -> str:
+    """Posta `files` no servidor falso (nome yEnc = nome do arquivo) e grava o NZB."""
+    body = []
+    for name, data in files.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+        total = -(-len(data) // PART)
+        info = YencInfo(name, len(data), PART)
+        segments = []
+        for n in range(1, total + 1):
+            mid = f"{name}.{n}@orig"
+            task = _Task(0, n, total, str(path), info, f'"{name}" yEnc (1/{total})', "p", "g", "")
+            news.articles[mid] = _build_article(task, mid)
+            segments.append(f'<segment bytes="1" number="{n}">{mid}</segment>')
+        body.append(
+            f'<file poster="p &lt;p@x&gt;" date="0" subject="&quot;{name}&quot; yEnc (1/{total})">'
+            f"<groups><group>alt.binaries.test</group></groups>"
+            f"<segments>{''.join(segments)}</segments></file>"
+        )
+    nzb = tmp_path / "post.nzb"
+    nzb.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<nzb xmlns="http://www.newzbin.com/DTD/2003/nzb">' + "".join(body) + "</nzb>"
+    )
+    return str(nzb)
+
+
+def _segment_ids(nzb: str) -> list[list[str]]:
+    root = ET.parse(nzb).getroot()
+    return [[s.text or "" for s in f.iter(f"{NS}segment")] for f in root.iter(f"{NS}file")]
+
+
+def test_yenc_encode_roundtrip_and_escapes() -> None:
+    data = bytes(range(256)) * 9 + b"\xf6\xf6" + bytes([214, 227, 4]) * 50
+    encoded = yenc_encode(data, line_length=32)
+
+    assert _yenc_decode(encoded) == data
+    for line in encoded.split(b"\r\n")[:-1]:
+        assert not line.startswith((b".", b" ", b"\t")) and not line.endswith((b" ", b"\t"))
+        assert b"\r" not in line and b"\n" not in line and b"\x00" not in line
+
+
+def test_repair_reposts_only_missing_segments(tmp_path: Path) -> None:
+    news = _NewsServer()
+    data_a = os.urandom(PART * 5 + 321)
+    data_b = os.urandom(PART * 2)
+    nzb = _upload(news, tmp_path, {"a.bin": data_a, "b.bin": data_b})
+    before = _segment_ids(nzb)
+    del news.articles["a.bin.2@orig"], news.articles["a.bin.6@orig"], news.articles["b.bin.1@orig"]
+
+    report = verify_nzb_articles(nzb, news.server())
+    result = repair_nzb(nzb, str(tmp_path / "src"), news.server(), report, connections=2)
+
+    assert result.ok, result.failed
+    assert result.reposted == 3 and len(news.posted) == 3
+    after = _segment_ids(nzb)
+    changed = {
+        (f, n) for f in range(2) for n in range(len(before[f])) if before[f][n] != after[f][n]
+    }
+    assert changed == {(0, 1), (0, 5), (1, 0)}
+    assert verify_nzb_articles(nzb, news.server()).ok
+
+    # O artigo novo decodifica para o trecho original, com a mesma partição.
+    article = news.articles[after[0][5]]
+    assert b"=ypart begin=5001 end=5321" in article
+    assert b'Subject: "a.bin" yEnc (6/6)' in article
+    payload = article.split(b"\r\n\r\n", 1)[1]
+    assert _yenc_decode(payload) == data_a[5000:]
+    assert f"pcrc32={zlib.crc32(data_a[5000:]):08x}".encode() in payload
+
+
+def test_repair_matches_obfuscated_file_by_size(tmp_path: Path) -> None:
+    news = _NewsServer()
+    data = os.urandom(PART * 3)
+    nzb = _upload(news, tmp_path, {"x7f3k2.bin": data})
+    (tmp_path / "src" / "x7f3k2.bin").rename(tmp_path / "src" / "Movie.2024.mkv")
+    del news.articles["x7f3k2.bin.3@orig"]
+
+    report = verify_nzb_articles(nzb, news.server())
+    result = repair_nzb(nzb, str(tmp_path / "src"), news.server(), report)
+
+    assert result.ok and result.reposted == 1
+    assert b"name=x7f3k2.bin" in news.articles[news.posted[0]]
+
+
+def test_repair_picks_same_size_file_by_crc32(tmp_path: Path) -> None:
+    news = _NewsServer()
+    data = os.urandom(PART * 3)
+    nzb = _upload(news, tmp_path, {"x7f3k2.bin": data})
+    src = tmp_path / "src"
+    (src / "x7f3k2.bin").rename(src / "B.mkv")
+    (src / "A.mkv").write_bytes(os.urandom(PART * 3))
+    # Poster que informa o CRC32 do arquivo inteiro no =yend.
+    first = news.articles["x7f3k2.bin.1@orig"]
+    news.articles["x7f3k2.bin.1@orig"] = first.replace(
+        b" pcrc32=", f" crc32={zlib.crc32(data):08x} pcrc32=".encode()
+    )
+    del news.articles["x7f3k2.bin.3@orig"]
+    checksums.compute_digests([str(src / "A.mkv"), str(src / "B.mkv")])
+
+    report = verify_nzb_articles(nzb, news.server())
+    result = repair_nzb(nzb, str(src), news.server(), report)
+
+    assert result.ok and result.reposted == 1
+    payload = news.articles[news.posted[0]].split(b"\r\n\r\n", 1)[1]
+    assert _yenc_decode(payload) == data[2 * PART :]
+
+
+def test_repair_without_local_file_fails(tmp_path: Path) -> None:
+    news = _NewsServer()
+    nzb = _upload(news, tmp_path, {"a.bin": os.urandom(PART * 2)})
+    (tmp_path / "src" / "a.bin").write_bytes(b"outro tamanho")
+    del news.articles["a.bin.1@orig"]
+
+    report = verify_nzb_articles(nzb, news.server())
+    result = repair_nzb(nzb, str(tmp_path / "src"), news.server(), report)
+
+    assert not result.ok and not news.posted
+    assert _segment_ids(nzb)[0][0] == "a.bin.1@orig"
+
+
+def test_repair_whole_files_replaces_file_entry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    news = _NewsServer()
+    nzb = _upload(news, tmp_path, {"a.bin": os.urandom(PART * 2), "b.bin": os.urandom(PART)})
+    del news.articles["a.bin.2@orig"]
+    reposted: list[str] = []
+
+    def fake_repost(path, name, server, group, article_size):  # type: ignore[no-untyped-def]
+        reposted.append(os.path.basename(path))
+        elem = ET.Element(f"{NS}file", subject=f'"{name}" yEnc (1/1)')
+        segs = ET.SubElement(elem, f"{NS}segments")
+        ET.SubElement(segs, f"{NS}segment", number="1").text = "new@repost"
+        return elem
+
+    monkeypatch.setattr(repair, "_repost_whole_file", fake_repost)
+    report = verify_nzb_articles(nzb, news.server())
+    result = repair_nzb(nzb, str(tmp_path / "src"), news.server(), report, whole_files=True)
+
+    assert result.ok and result.files_reposted == ["a.bin"] and reposted == ["a.bin"]
+    assert _segment_ids(nzb) == [["new@repost"], ["b.bin.1@orig"]]
@@ -0,0 +1,174 @@
+"""Testes para upapasta.scratch (planejador de diretórios de trabalho)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from upapasta import scratch
+from upapasta.scratch import (
+    ScratchLocation,
+    discover_locations,
+    measure_write_speed,
+    parse_scratch_dirs,
+    plan_scratch,
+)
+
+GB = 1024**3
+
+
+def _loc(path: str, kind: str, free_gb: float, device: int, speed: float = 0.0) -> ScratchLocation:
+    return ScratchLocation(path, kind, int(free_gb * GB), device, write_mb_s=speed)
+
+
+def test_archive_avoids_input_spindle_and_parity_takes_fastest() -> None:
+    source = _loc("/lib", "input", 500, 1)
+    source.rotational = True
+    same_disk = _loc("/lib-scratch", "scratch", 500, 1, speed=900)
+    nvme = _loc("/nvme", "scratch", 100, 2, speed=600)
+    shm = _loc("/dev/shm", "tmpfs", 8, 3, speed=4000)
+
+    plan = plan_scratch([shm, same_disk, nvme, source], archive_bytes=50 * GB, parity_bytes=5 * GB)
+
+    assert [loc.path for loc in plan.parity] == ["/dev/shm", "/lib-scratch", "/nvme", "/lib"]
+    assert [loc.path for loc in plan.archive] == ["/nvme", "/lib-scratch", "/lib"]
+
+
+def test_parity_reservation_and_fallback_to_input() -> None:
+    source = _loc("/lib", "input", 500, 1)
+    shm = _loc("/dev/shm", "tmpfs", 13, 3, speed=4000)
+
+    # 10 GB de volumes + 2 GB de PAR2 não cabem juntos em 13 GB com margem.
+    plan = plan_scratch([shm, source], archive_bytes=10 * GB, parity_bytes=2 * GB)
+    assert [loc.path for loc in plan.parity] == ["/dev/shm", "/lib"]
+    assert [loc.path for loc in plan.archive] == ["/lib"]
+
+    # Sem compactação só o PAR2 é planejado.
+    plan = plan_scratch([shm, source], archive_bytes=0, parity_bytes=2 * GB)
+    assert plan.archive == [] and plan.parity[0].path == "/dev/shm"
+
+
+def test_discover_locations(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fast = tmp_path / "fast"
+    fast.mkdir()
+    measured: list[str] = []
+
+    def fake_measure(path: str, size: int = 0) -> float:
+        measured.append(path)
+        return 123.0
+
+    monkeypatch.setattr(scratch, "measure_write_speed", fake_measure)
+    dirs = [str(fast), str(fast) + "/", str(tmp_path / "missing"), str(tmp_path)]
+
+    locations = discover_locations(str(tmp_path), dirs)
+    assert [(loc.path, loc.kind) for loc in locations] == [
+        (str(fast), "scratch"),
+        (str(tmp_path), "input"),
+    ]
+    assert locations[0].write_mb_s == 123.0 and locations[0].free_bytes > 0
+    assert locations[1].write_mb_s == 0.0  # a pasta da entrada não é medida
+
+    discover_locations(str(tmp_path), dirs)
+    assert measured == [str(fast)]  # segunda vez vem do cache
+
+
+def test_measure_write_speed_and_parse(tmp_path: Path) -> None:
+    assert measure_write_speed(str(tmp_path), size=256 * 1024) > 0
+    assert list(tmp_path.iterdir()) == []
+    assert measure_write_speed(str(tmp_path / "missing")) == 0.0
+    assert parse_scratch_dirs(" /a, ,/b ") == ["/a", "/b"]
+
+
+def _orch(folder: Path, scratch_dir: Path, skip_rar: bool = False):  # type: ignore[no-untyped-def]
+    from upapasta.config import Settings
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    orch = UpaPastaOrchestrator(str(folder), skip_rar=skip_rar, scratch_dirs=[str(scratch_dir)])
+    orch._settings = Settings("", {})
+    return orch
+
+
+def test_orchestrator_stages_volumes_and_spills(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import upapasta.orchestrator as orchestrator
+    from upapasta.par_overlap import QuietBar
+
+    folder = tmp_path / "lib" / "Release"
+    folder.mkdir(parents=True)
+    (folder / "a.mkv").write_bytes(b"x" * 1000)
+    nvme = tmp_path / "nvme"
+    nvme.mkdir()
+    monkeypatch.setattr(scratch, "measure_write_speed", lambda path, size=0: 500.0)
+
+    calls: list[Optional[str]] = []
+
+    def fake_make_rar(path, force, threads=None, password=None, bar=None, output_dir=None, **kw):  # type: ignore[no-untyped-def]
+        calls.append(output_dir)
+        out = Path(output_dir or folder.parent) / "Release.rar"
+        out.write_bytes(b"r")
+        return (5, None) if len(calls) == 1 else (0, str(out))
+
+    monkeypatch.setattr(orchestrator, "make_rar", fake_make_rar)
+    monkeypatch.setattr(orchestrator, "out_of_space", lambda path: True)
+
+    orch = _orch(folder, nvme)
+    orch._scratch = orch._plan_scratch(QuietBar())
+    assert orch._scratch is not None
+    orch._stage_archive(QuietBar())
+    staged = orch._staging_dir
+    assert staged is not None and os.path.dirname(staged) == str(nvme)
+    assert orch._archive_dir() == staged
+
+    assert orch.run_compression(bar=QuietBar())
+    assert calls == [staged, None]  # cheio → refeito ao lado da entrada
+    assert not os.path.exists(staged)
+    assert orch.rar_file == str(folder.parent / "Release.rar")
+
+
+def test_orchestrator_stages_parity_and_cleans_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from upapasta.par_overlap import QuietBar
+
+    folder = tmp_path / "lib" / "Release"
+    folder.mkdir(parents=True)
+    (folder / "a.mkv").write_bytes(b"x" * 1000)
+    nvme = tmp_path / "nvme"
+    nvme.mkdir()
+    monkeypatch.setattr(scratch, "measure_write_speed", lambda path, size=0: 500.0)
+
+    orch = _orch(folder, nvme, skip_rar=True)
+    orch._scratch = orch._plan_scratch(QuietBar())
+    orch.input_target = str(folder)
+    orch._stage_parity(QuietBar())
+    assert orch.ramdisk_path is not None and os.path.dirname(orch.ramdisk_path) == str(nvme)
+    orch._cleanup_ramdisk()
+
+    # Volumes já no scratch: o PAR2 fica ao lado deles.
+    orch = _orch(folder, nvme)
+    orch._scratch = orch._plan_scratch(QuietBar())
+    orch._stage_archive(QuietBar())
+    staged = orch._staging_dir
+    assert staged is not None
+    orch.input_target = os.path.join(staged, "Release.rar")
+    Path(orch.input_target).write_bytes(b"r")
+    orch._stage_parity(QuietBar())
+    assert orch.ramdisk_path is None
+
+    orch._cleanup_staging(discard=True)
+    assert not os.path.exists(staged) and orch._staging_dir is None
+
+
+def test_no_scratch_dirs_keeps_default_behaviour(tmp_path: Path) -> None:
+    from upapasta.par_overlap import QuietBar
+
+    folder = tmp_path / "Release"
+    folder.mkdir()
+    orch = _orch(folder, tmp_path)
+    orch.scratch_dirs = []
+    assert orch._plan_scratch(QuietBar()) is None
+    assert orch._archive_dir() == str(tmp_path)
@@ -0,0 +1,85 @@
+"""Testes para upapasta.config.Settings / load_settings (configuração tipada e em cache)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from upapasta import config
+from upapasta.config import Settings, env_file_for_args, load_env_file, load_settings
+from upapasta.par_utils import get_article_size_bytes
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "_SETTINGS", {})
+    for key in ("ARTICLE_SIZE", "NNTP_CONNECTIONS", "EXTRA_KEY"):
+        monkeypatch.delenv(key, raising=False)
+
+
+def _write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parsed_once_and_shared(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    env = tmp_path / ".env"
+    env.write_text("NNTP_HOST=news.host\n# comentário\nNNTP_PASS=segredo\n")
+    calls: list[str] = []
+    real = config._parse_env_file
+    monkeypatch.setattr(config, "_parse_env_file", lambda p: calls.append(p) or real(p))
+
+    first = load_settings(str(env))
+    assert load_settings(str(env)) is first
+    assert load_env_file(str(env)) == {"NNTP_HOST": "news.host", "NNTP_PASS": "segredo"}
+    assert len(calls) == 1
+    assert "segredo" not in repr(first)
+
+
+def test_edit_invalidates_cache(tmp_path: Path) -> None:
+    env = tmp_path / ".env"
+    _write(env, "NNTP_CONNECTIONS=20\n", 1_000_000_000)
+    assert load_settings(str(env)).nntp_connections == 20
+
+    _write(env, "NNTP_CONNECTIONS=30\n", 2_000_000_000)
+    assert load_settings(str(env)).nntp_connections == 30
+
+
+def test_load_env_file_returns_independent_copy(tmp_path: Path) -> None:
+    env = tmp_path / ".env"
+    env.write_text("NZB_CONFLICT=rename\n")
+    load_env_file(str(env))["NZB_CONFLICT"] = "overwrite"
+    assert load_settings(str(env))["NZB_CONFLICT"] == "rename"
+
+
+def test_typed_accessors_defaults_and_environ(monkeypatch: pytest.MonkeyPatch) -> None:
+    empty = Settings("/nonexistent/.env", {"ARTICLE_SIZE": "", "NNTP_CONNECTIONS": "muitas"})
+    assert empty.article_size == "700K"
+    assert empty.article_size_bytes == 700 * 1024
+    assert empty.nntp_connections == 50  # valor inválido → default
+
+    monkeypatch.setenv("ARTICLE_SIZE", "1M")
+    assert empty.article_size_bytes == 1024 * 1024
+
+    # Valor do arquivo tem precedência sobre o ambiente.
+    s = Settings("/x/.env", {"EXTRA_KEY": "true"})
+    monkeypatch.setenv("EXTRA_KEY", "false")
+    assert s.get_bool("EXTRA_KEY") is True
+
+
+def test_article_size_follows_env_file(tmp_path: Path) -> None:
+    env = tmp_path / "perfil.env"
+    env.write_text("ARTICLE_SIZE=512K\n")
+    assert get_article_size_bytes(str(env)) == 512 * 1024
+    assert get_article_size_bytes(str(tmp_path / "missing.env")) == 700 * 1024
+
+
+def test_env_file_for_args_prefers_profile() -> None:
+    assert env_file_for_args(SimpleNamespace(profile="work", env_file="/tmp/x.env")) == (
+        config.resolve_env_file("work")
+    )
+    assert env_file_for_args(SimpleNamespace(profile=None, env_file="/tmp/x.env")) == "/tmp/x.env"
+    assert env_file_for_args(SimpleNamespace()) == config.DEFAULT_ENV_FILE
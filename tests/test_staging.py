@@ -0,0 +1,106 @@
+"""Testes para upapasta.staging (hardlink → reflink → cópia pelo kernel)."""
+
+from __future__ import annotations
+
+import errno
+import os
+from collections import namedtuple
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import upapasta.staging as staging
+from upapasta.makepar import perform_obfuscation
+from upapasta.staging import COPY, HARDLINK, kernel_copy, stage_files, stage_tree
+
+
+def _tree(root: Path) -> Path:
+    src = root / "Release"
+    (src / "Sub").mkdir(parents=True)
+    (src / "a.mkv").write_bytes(b"a" * 5000)
+    (src / "Sub" / "b.srt").write_bytes(b"b" * 300)
+    return src
+
+
+@pytest.fixture
+def no_links(monkeypatch: pytest.MonkeyPatch) -> None:
+    def cross_device(src: str, dst: str) -> None:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    def no_reflink(src: str, dst: str) -> None:
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    monkeypatch.setattr(staging.os, "link", cross_device)
+    monkeypatch.setattr(staging, "reflink", no_reflink)
+
+
+def test_stage_tree_prefers_hardlinks(tmp_path: Path) -> None:
+    src = _tree(tmp_path)
+    stats = stage_tree(str(src), str(tmp_path / "view"))
+
+    assert stats.methods == {HARDLINK: 2} and stats.bytes_copied == 0
+    assert (tmp_path / "view" / "Sub" / "b.srt").stat().st_ino == (
+        src / "Sub" / "b.srt"
+    ).stat().st_ino
+
+
+def test_stage_tree_copies_when_links_fail(tmp_path: Path, no_links: None) -> None:
+    src = _tree(tmp_path)
+    dst = tmp_path / "view"
+
+    stats = stage_tree(str(src), str(dst), jobs=2)
+
+    assert stats.methods == {COPY: 2} and stats.bytes_copied == 5300
+    assert (dst / "a.mkv").read_bytes() == b"a" * 5000
+    assert (dst / "a.mkv").stat().st_ino != (src / "a.mkv").stat().st_ino
+    assert (dst / "a.mkv").stat().st_mtime == pytest.approx((src / "a.mkv").stat().st_mtime)
+
+
+def test_copy_refused_without_room(
+    tmp_path: Path, no_links: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(staging.shutil, "disk_usage", lambda p: usage(0, 0, 100))
+    src = _tree(tmp_path)
+
+    with pytest.raises(OSError) as exc:
+        stage_files([(str(src / "a.mkv"), str(tmp_path / "x.mkv"))])
+    assert exc.value.errno == errno.ENOSPC
+    assert not (tmp_path / "x.mkv").exists()
+
+    with pytest.raises(OSError):
+        stage_files([(str(src / "a.mkv"), str(tmp_path / "x.mkv"))], allow_copy=False)
+
+
+@pytest.mark.skipif(not hasattr(os, "sendfile"), reason="sendfile indisponível")
+def test_kernel_copy_falls_back_to_sendfile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def refuse(*a: Any) -> int:
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(staging.os, "copy_file_range", refuse, raising=False)
+    monkeypatch.setattr(staging, "COPY_CHUNK", 1000)
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(4500))
+    seen: list[int] = []
+
+    assert kernel_copy(str(src), str(tmp_path / "dst.bin"), seen.append) == 4500
+    assert (tmp_path / "dst.bin").read_bytes() == src.read_bytes()
+    assert seen == [1000, 1000, 1000, 1000, 500]
+
+
+def test_obfuscation_keeps_original_without_hardlinks(tmp_path: Path, no_links: None) -> None:
+    src = _tree(tmp_path)
+
+    obf_path, _map, was_linked = perform_obfuscation(str(src), random_base="rnd")
+
+    # Cópia em vez de rename: o original continua no lugar.
+    assert was_linked and obf_path == str(tmp_path / "rnd")
+    assert (src / "a.mkv").exists() and (tmp_path / "rnd" / "Sub" / "b.srt").exists()
+
+    item = tmp_path / "Filme.mkv"
+    item.write_bytes(b"v" * 10)
+    obf_path, _map, was_linked = perform_obfuscation(str(item), random_base="zz")
+    assert was_linked and item.exists() and Path(obf_path).read_bytes() == b"v" * 10
@@ -7,9 +7,20 @@ from __future__ import annotations
 import os
 import sys
 import urllib.error
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from upapasta.tools import download_tool, get_app_data_dir, get_base_dir, get_tool_path
+import pytest
+
+from upapasta import upfolder
+from upapasta.tools import (
+    ToolInfo,
+    ToolRegistry,
+    download_tool,
+    get_app_data_dir,
+    get_base_dir,
+    get_tool_path,
+)
 
 
 class TestGetBaseDir:
@@ -178,3 +189,72 @@ class TestDownloadTool:
                             call for call in mock_print.call_args_list if "Falha" in str(call)
                         ]
                         assert len(error_call) > 0
+
+
+def _fake_pesto(tmp_path: Path, help_text: str) -> str:
+    script = tmp_path / "pesto"
+    script.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "--version" ]; then echo "pesto 1.4.2"; exit 0; fi\n'
+        f"echo '{help_text}'\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="script sh como binário falso")
+class TestToolRegistry:
+    """Testes para ToolRegistry (resolução única, sondagem e cache em disco)."""
+
+    def test_resolves_once_per_process(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setattr(upfolder, "find_pesto", lambda: calls.append(1) or "/x/pesto")
+        registry = ToolRegistry()
+
+        assert registry.path("pesto") == "/x/pesto"
+        assert registry.path("pesto") == "/x/pesto"
+        assert len(calls) == 1
+
+    def test_probe_reads_version_and_capabilities(self, tmp_path, monkeypatch):
+        path = _fake_pesto(tmp_path, "--resume  retoma upload")
+        monkeypatch.setattr(upfolder, "find_pesto", lambda: path)
+
+        info = ToolRegistry().probe("pesto")
+
+        assert info is not None and info.version == "1.4.2"
+        assert info.supports("resume") and not info.supports("verify")
+
+    def test_disk_cache_keyed_by_mtime(self, tmp_path, monkeypatch):
+        path = _fake_pesto(tmp_path, "--resume --verify")
+        cache = str(tmp_path / "tools_cache.json")
+        calls = []
+        monkeypatch.setattr(upfolder, "find_pesto", lambda: calls.append(1) or path)
+
+        assert ToolRegistry(cache).probe("pesto") is not None
+        cached = ToolRegistry(cache).get("pesto")
+        assert len(calls) == 1
+        assert cached is not None and cached.capabilities == frozenset({"resume", "verify"})
+
+        os.utime(path, ns=(1, 1))  # binário atualizado → nova resolução, sem sondagem
+        fresh = ToolRegistry(cache).get("pesto")
+        assert len(calls) == 2
+        assert fresh is not None and fresh.capabilities is None
+
+    def test_disk_cache_ignored_when_path_changes(self, tmp_path, monkeypatch):
+        path = _fake_pesto(tmp_path, "")
+        cache = str(tmp_path / "tools_cache.json")
+        calls = []
+        monkeypatch.setattr(upfolder, "find_pesto", lambda: calls.append(1) or path)
+
+        ToolRegistry(cache).get("pesto")
+        monkeypatch.setenv("PATH", str(tmp_path))
+        ToolRegistry(cache).get("pesto")
+        assert len(calls) == 2
+
+    def test_missing_tool_not_persisted(self, tmp_path):
+        cache = tmp_path / "tools_cache.json"
+        assert ToolRegistry(str(cache)).get("pesto") is None  # conftest: find_pesto → None
+        assert not cache.exists()
+
+    def test_unprobed_tool_assumes_support(self):
+        assert ToolInfo("parpar", "/usr/bin/parpar").supports("file-list")
@@ -1,4 +1,5 @@
 import io
+import os
 
 from upapasta.upfolder import upload_to_usenet
 
@@ -263,3 +264,181 @@ def test_upload_to_usenet_missing_creds(tmp_path):
     par2_file.write_text("p")
     rc = upload_to_usenet(str(rar_file), {})
     assert rc == 2
+
+
+# ── Striping entre servidores (NNTP_STRIPE) ──────────────────────────────────
+
+_NZB_NS = "http://www.newzbin.com/DTD/2003/nzb"
+
+
+def _stripe_env(**extra):
+    env = {
+        "NNTP_HOST": "news.a.com",
+        "NNTP_USER": "user",
+        "NNTP_PASS": "pass",
+        "NNTP_CONNECTIONS": "30",
+        "NNTP_HOST_2": "news.b.com",
+        "NNTP_CONNECTIONS_2": "10",
+        "USENET_GROUP": "alt.binaries.test",
+        "NNTP_STRIPE": "true",
+    }
+    env.update(extra)
+    return env
+
+
+def _stripe_folder(tmp_path):
+    folder = tmp_path / "Release"
+    folder.mkdir()
+    for n in range(6):
+        (folder / f"part{n}.bin").write_bytes(b"x" * (1000 * (n + 1)))
+    (tmp_path / "Release.par2").write_bytes(b"p" * 100)
+    return folder
+
+
+def _fake_nyuu(calls, fail_hosts=()):
+    import threading
+
+    def run(nyuu_path, srv, group, article_size, nzb_target, subject, files, working_dir, **kw):
+        calls.append((srv["host"], list(files), threading.get_ident()))
+        if srv["host"] in fail_hosts:
+            return 3
+        body = "".join(
+            f'<file subject="&quot;{os.path.basename(f)}&quot; yEnc (1/1)"><segments/></file>'
+            for f in files
+        )
+        with open(nzb_target, "w") as fh:
+            fh.write(f'<?xml version="1.0"?><nzb xmlns="{_NZB_NS}">{body}</nzb>')
+        return 0
+
+    return run
+
+
+def test_plan_stripes_weights_by_connections(tmp_path):
+    from upapasta.upfolder import _plan_stripes
+
+    for n in range(8):
+        (tmp_path / f"f{n}").write_bytes(b"x" * 1000)
+    files = [f"f{n}" for n in range(8)]
+    servers = [{"connections": "30"}, {"connections": "10"}]
+
+    plan = _plan_stripes(files, str(tmp_path), servers)
+
+    assert [(i, len(fs)) for i, fs, _b in plan] == [(0, 6), (1, 2)]
+    assert sorted(f for _i, fs, _b in plan for f in fs) == files
+
+
+def test_stripe_posts_on_all_servers_and_merges(monkeypatch, tmp_path):
+    import upapasta.upfolder as upfolder
+    from upapasta.upfolder import _get_uploaded_files_from_nzb
+
+    folder = _stripe_folder(tmp_path)
+    calls = []
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", _fake_nyuu(calls))
+    monkeypatch.setattr(upfolder, "fix_nzb_subjects", lambda *a, **k: None)
+    nzb = tmp_path / "out" / "Release.nzb"
+
+    rc = upload_to_usenet(str(folder), env_vars=_stripe_env(), nzb_out_abs=str(nzb), skip_rar=True)
+
+    assert rc == 0
+    assert {host for host, _f, _t in calls} == {"news.a.com", "news.b.com"}
+    posted = [os.path.basename(f) for _h, files, _t in calls for f in files]
+    assert sorted(posted) == sorted([f"part{n}.bin" for n in range(6)] + ["Release.par2"])
+    assert _get_uploaded_files_from_nzb(str(nzb)) == set(posted)
+    assert list(nzb.parent.glob("*.stripe*.nzb")) == []
+
+
+def test_failed_stripe_reposted_on_next_server(monkeypatch, tmp_path):
+    import upapasta.upfolder as upfolder
+
+    folder = _stripe_folder(tmp_path)
+    calls = []
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", _fake_nyuu(calls, fail_hosts={"news.b.com"}))
+    monkeypatch.setattr(upfolder, "fix_nzb_subjects", lambda *a, **k: None)
+    monkeypatch.setattr(upfolder.time, "sleep", lambda s: None)
+    nzb = tmp_path / "Release.nzb"
+
+    rc = upload_to_usenet(
+        str(folder),
+        env_vars=_stripe_env(),
+        nzb_out_abs=str(nzb),
+        skip_rar=True,
+        upload_retries=1,
+    )
+
+    assert rc == 0
+    b_files = next(files for host, files, _t in calls if host == "news.b.com")
+    # Segunda tentativa: a parte do servidor B vai inteira para o A.
+    assert calls[-1][0] == "news.a.com" and calls[-1][1] == b_files
+
+
+def test_poster_uses_adaptive_connections(monkeypatch, tmp_path):
+    import upapasta.upfolder as upfolder
+    from upapasta import pacing
+
+    folder = _stripe_folder(tmp_path)
+    seen = []
+
+    def run(nyuu_path, srv, *a, **kw):
+        seen.append(srv["connections"])
+        if kw.get("monitor") is not None:
+            kw["monitor"].note("502 Too many connections")
+        return 3
+
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", run)
+    monkeypatch.setattr(upfolder.time, "sleep", lambda s: None)
+    env = _stripe_env(NNTP_STRIPE="false", NNTP_HOST_2="")
+
+    rc = upload_to_usenet(str(folder), env_vars=env, skip_rar=True, upload_retries=1)
+
+    # Falha por excesso de conexões → redução multiplicativa antes da nova
+    # tentativa (teto: NNTP_CONNECTIONS=30).
+    assert rc == 3
+    assert seen == [30, 22]
+    assert (
+        pacing.get_tuner().connections_for(
+            {"host": "news.a.com", "port": "119", "user": "user", "connections": "30"}
+        )
+        == 16
+    )
+
+    seen.clear()
+    upload_to_usenet(
+        str(folder),
+        env_vars={**env, "NNTP_ADAPTIVE_CONNECTIONS": "false"},
+        skip_rar=True,
+    )
+    assert seen == ["30"]
+
+
+def test_upload_reorders_servers_by_probe(monkeypatch, tmp_path):
+    from concurrent.futures import Future
+
+    import upapasta.upfolder as upfolder
+    from upapasta.nntp_test import ProbeResult
+
+    folder = _stripe_folder(tmp_path)
+    calls = []
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", _fake_nyuu(calls))
+    monkeypatch.setattr(upfolder, "fix_nzb_subjects", lambda *a, **k: None)
+    probe: Future = Future()
+    probe.set_result(
+        {
+            "user@news.a.com:119": ProbeResult("news.a.com", 119, True, connect_ms=90),
+            "user@news.b.com:119": ProbeResult("news.b.com", 119, True, connect_ms=20),
+        }
+    )
+
+    rc = upload_to_usenet(
+        str(folder),
+        env_vars=_stripe_env(NNTP_STRIPE="false"),
+        nzb_out_abs=str(tmp_path / "Release.nzb"),
+        skip_rar=True,
+        server_probe=probe,
+    )
+
+    assert rc == 0
+    assert [host for host, _f, _t in calls] == ["news.b.com"]
@@ -0,0 +1,229 @@
+"""Testes para upapasta.volume_feed e o upload em streaming (--stream-upload)."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from upapasta.upfolder import _get_uploaded_files_from_nzb, upload_to_usenet
+from upapasta.volume_feed import StreamAborted, VolumeFeed
+
+_NZB_NS = "http://www.newzbin.com/DTD/2003/nzb"
+
+_ENV = {
+    "NNTP_HOST": "news.a.com",
+    "NNTP_USER": "user",
+    "NNTP_PASS": "pass",
+    "NNTP_CONNECTIONS": "10",
+    "USENET_GROUP": "alt.binaries.test",
+}
+
+
+def _write_volumes(base: Path, count: int, delay: float) -> None:
+    for n in range(1, count + 1):
+        (base.parent / f"{base.name}.part{n}.rar").write_bytes(b"v" * 100)
+        time.sleep(delay)
+
+
+def _fake_nyuu(calls: list[tuple[str, list[str]]], fail_once: set[str] | None = None):  # type: ignore[no-untyped-def]
+    failed: set[str] = set()
+
+    def run(nyuu_path, srv, group, article_size, nzb_target, subject, files, working_dir, **kw):  # type: ignore[no-untyped-def]
+        calls.append((str(srv["host"]), list(files)))
+        hit = set(files) & (fail_once or set())
+        if hit - failed:
+            failed.update(hit)
+            return 3
+        names = kw.get("post_names") or {}
+        body = "".join(
+            f'<file subject="&quot;{names.get(f, f)}&quot; yEnc (1/1)"><segments/></file>'
+            for f in files
+        )
+        with open(nzb_target, "w") as fh:
+            fh.write(f'<?xml version="1.0"?><nzb xmlns="{_NZB_NS}">{body}</nzb>')
+        return 0
+
+    return run
+
+
+def test_batches_follow_closed_volumes(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+
+    def rar() -> None:
+        _write_volumes(base, 4, 0.05)
+        feed.mark_packed(True)
+
+    writer = threading.Thread(target=rar)
+    writer.start()
+    batches = [[feed.final_name(i) for i in batch] for batch in feed.batches()]
+    writer.join()
+
+    flat = [name for batch in batches for name in batch]
+    assert flat == [f"Release.part{n}.rar" for n in range(1, 5)]
+    assert len(batches) > 1  # volumes entregues antes do fim do PACK
+
+
+def test_last_volume_waits_for_pack(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    _write_volumes(base, 2, 0)
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+    gen = feed.batches()
+
+    assert next(gen) == [1]
+    threading.Timer(0.05, feed.mark_packed, args=(True,)).start()
+    assert next(gen) == [2]
+    assert feed.path(2) == str(tmp_path / "Release.part2.rar")
+    assert list(gen) == []
+
+
+def test_abort_and_failed_pack(tmp_path: Path) -> None:
+    base = tmp_path / "Release"
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+    threading.Timer(0.05, feed.mark_packed, args=(False,)).start()
+    with pytest.raises(StreamAborted):
+        list(feed.batches())
+    with pytest.raises(StreamAborted):
+        feed.parity()
+
+    # PACK concluído sem nenhum volume (RAR único): nada a postar.
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+    feed.mark_packed(True)
+    with pytest.raises(StreamAborted):
+        list(feed.batches())
+
+
+def test_stream_upload_posts_volumes_then_par2(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import upapasta.upfolder as upfolder
+
+    base = tmp_path / "Release"
+    calls: list[tuple[str, list[str]]] = []
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", _fake_nyuu(calls, fail_once={"Release.part2.rar"}))
+    monkeypatch.setattr(upfolder.time, "sleep", lambda s: None)
+    nzb = tmp_path / "out" / "Release.nzb"
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+
+    def orchestrator() -> None:
+        _write_volumes(base, 3, 0.05)
+        feed.mark_packed(True)
+        (tmp_path / "Release.par2").write_bytes(b"p")
+        (tmp_path / "Release.vol0+1.par2").write_bytes(b"p")
+        feed.set_parity(sorted(str(p) for p in tmp_path.glob("Release*.par2")))
+
+    producer = threading.Thread(target=orchestrator)
+    producer.start()
+    rc = upload_to_usenet(
+        feed.archive_path,
+        env_vars=_ENV,
+        nzb_out_abs=str(nzb),
+        upload_retries=1,
+        feed=feed,
+    )
+    producer.join()
+
+    assert rc == 0
+    posted = [f for _host, files in calls for f in files]
+    assert posted[-2:] == ["Release.par2", "Release.vol0+1.par2"]
+    assert posted.count("Release.part2.rar") == 2  # lote repostado após falha
+    assert _get_uploaded_files_from_nzb(str(nzb)) == {
+        "Release.part1.rar",
+        "Release.part2.rar",
+        "Release.part3.rar",
+        "Release.par2",
+        "Release.vol0+1.par2",
+    }
+    assert list(nzb.parent.glob("*.stream*.nzb")) == []
+
+
+def test_stream_upload_follows_renamed_volumes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import upapasta.upfolder as upfolder
+
+    base = tmp_path / "Release"
+    _write_volumes(base, 3, 0)
+    (tmp_path / "Release.par2").write_bytes(b"p")
+    calls: list[tuple[str, list[str]]] = []
+    fake = _fake_nyuu(calls)
+
+    def run(*a, **kw):  # type: ignore[no-untyped-def]
+        if len(calls) == 0:
+            # O rar passa de 9 volumes e renomeia os já escritos antes do post.
+            calls.append(("", []))
+            for n in range(1, 4):
+                os.replace(
+                    base.parent / f"Release.part{n}.rar", base.parent / f"Release.part{n:02d}.rar"
+                )
+            return 3
+        return fake(*a, **kw)
+
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", run)
+    monkeypatch.setattr(upfolder.time, "sleep", lambda s: None)
+    feed = VolumeFeed(str(base), poll_interval=0.01, expected_volumes=12)
+    feed.mark_packed(True)
+    feed.set_parity([str(tmp_path / "Release.par2")])
+    nzb = tmp_path / "Release.nzb"
+
+    rc = upload_to_usenet(
+        feed.archive_path, env_vars=_ENV, nzb_out_abs=str(nzb), upload_retries=1, feed=feed
+    )
+
+    assert rc == 0
+    # A nova tentativa acha os volumes pelo índice, já com o nome novo.
+    assert calls[1][1] == [f"Release.part{n:02d}.rar" for n in range(1, 4)]
+    assert _get_uploaded_files_from_nzb(str(nzb)) == {
+        "Release.part01.rar",
+        "Release.part02.rar",
+        "Release.part03.rar",
+        "Release.par2",
+    }
+
+
+def test_stream_upload_stops_when_par2_fails(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import upapasta.upfolder as upfolder
+
+    base = tmp_path / "Release"
+    _write_volumes(base, 2, 0)
+    calls: list[tuple[str, list[str]]] = []
+    monkeypatch.setattr(upfolder, "find_nyuu", lambda: "/bin/true")
+    monkeypatch.setattr(upfolder, "_run_nyuu", _fake_nyuu(calls))
+    feed = VolumeFeed(str(base), poll_interval=0.01)
+    feed.mark_packed(True)
+    threading.Timer(0.05, feed.abort).start()
+
+    rc = upload_to_usenet(
+        feed.archive_path, env_vars=_ENV, nzb_out_abs=str(tmp_path / "R.nzb"), feed=feed
+    )
+
+    assert rc == 5
+    assert not (tmp_path / "R.nzb").exists()
+    assert list(tmp_path.glob("*.stream*.nzb")) == []
+
+
+def test_orchestrator_stream_gating(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from upapasta.orchestrator import UpaPastaOrchestrator
+
+    folder = tmp_path / "Release"
+    folder.mkdir()
+    monkeypatch.setattr("upapasta.orchestrator.planned_volumes", lambda path, multiple=None: 5)
+
+    def orch(**kwargs: object) -> UpaPastaOrchestrator:
+        return UpaPastaOrchestrator(str(folder), skip_rar=False, stream_upload=True, **kwargs)  # type: ignore[arg-type]
+
+    assert orch()._can_stream_upload()
+    assert not orch(obfuscate=True)._can_stream_upload()
+    assert not orch(compressor="7z")._can_stream_upload()
+    assert not orch(skip_upload=True)._can_stream_upload()
+    assert not UpaPastaOrchestrator(str(folder), skip_rar=False)._can_stream_upload()
+    monkeypatch.setattr("upapasta.orchestrator.planned_volumes", lambda path, multiple=None: 1)
+    assert not orch()._can_stream_upload()
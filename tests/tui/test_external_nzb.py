@@ -6,8 +6,11 @@ e para a integração próprio + externo no scanner de filesystem.
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
+import pytest
+
 from upapasta.tui.catalog_index import CatalogIndex
 from upapasta.tui.external_nzb import ExternalNzbIndex, nzb_has_password
 from upapasta.tui.fs_scanner import scan_single
@@ -241,3 +244,70 @@ def test_node_external_only(tmp_path: Path) -> None:
     assert node.has_own_nzb is False
     assert node.has_external_nzb is True
     assert node.status == UploadStatus.EXTERNAL
+
+
+# ── Cache persistente ─────────────────────────────────────────────────────────
+
+
+def test_external_index_persisted_cache_skips_password_read(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Diretório inalterado: segundo processo não relê o .nzb para detectar senha."""
+    from upapasta.tui import external_nzb
+
+    store = tmp_path / "store"
+    (store / "sub").mkdir(parents=True)
+    _write_nzb(store / "sub" / "Filme.mkv.nzb", password="x")
+    cache_file = tmp_path / "cfg" / "external_nzb_cache.json"
+
+    first = ExternalNzbIndex([store], cache_path=cache_file)
+    first.scan()
+    assert cache_file.exists()
+
+    def _fail(_path: Path) -> bool:
+        raise AssertionError("nzb_has_password não deveria ser chamado")
+
+    monkeypatch.setattr(external_nzb, "nzb_has_password", _fail)
+    second = ExternalNzbIndex([store], cache_path=cache_file)
+    second.scan()
+    info = second.lookup("Filme.mkv")
+    assert info is not None and info.has_password is True
+
+
+def test_external_index_cache_picks_up_new_nzb(tmp_path: Path) -> None:
+    cache_file = tmp_path / "external_nzb_cache.json"
+    store = tmp_path / "store"
+    store.mkdir()
+    idx = ExternalNzbIndex([store], cache_path=cache_file)
+    idx.scan()
+    assert idx.lookup("Novo.mkv") is None
+
+    _write_nzb(store / "Novo.mkv.nzb")
+    os.utime(store, ns=(0, 10**18))  # mtime garantidamente diferente
+    idx.scan()
+    assert idx.is_present("Novo.mkv") is True
+
+
+def test_external_index_cache_drops_removed_dir(tmp_path: Path) -> None:
+    store = tmp_path / "store"
+    sub = store / "old"
+    sub.mkdir(parents=True)
+    _write_nzb(sub / "Velho.nzb")
+    idx = ExternalNzbIndex([store], cache_path=tmp_path / "c.json")
+    idx.scan()
+    assert idx.is_present("Velho") is True
+
+    (sub / "Velho.nzb").unlink()
+    sub.rmdir()
+    os.utime(store, ns=(0, 10**18))
+    idx.scan()
+    assert idx.is_present("Velho") is False
+
+
+def test_external_index_corrupt_cache_ignored(tmp_path: Path) -> None:
+    cache_file = tmp_path / "external_nzb_cache.json"
+    cache_file.write_text("[]")
+    _write_nzb(tmp_path / "Filme.nzb")
+    idx = ExternalNzbIndex([tmp_path], cache_path=cache_file)
+    idx.scan()
+    assert idx.is_present("Filme") is True
@@ -0,0 +1,142 @@
+"""Testes para upapasta.tui.fs_cache (cache persistente de listagens do dashboard)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from upapasta.tui import fs_cache
+from upapasta.tui.catalog_index import CatalogIndex
+from upapasta.tui.fs_cache import DirCache
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+
+def _catalog(tmp_path: Path, names: list[str]) -> CatalogIndex:
+    history = tmp_path / "history.jsonl"
+    with history.open("w") as fh:
+        for name in names:
+            fh.write(
+                json.dumps({"nome_original": name, "data_upload": "2025-01-15T10:00:00+00:00"})
+                + "\n"
+            )
+    idx = CatalogIndex(history)
+    idx.load()
+    return idx
+
+
+def _release(parent: Path, name: str, size: int = 10) -> Path:
+    d = parent / name
+    d.mkdir(parents=True)
+    (d / "video.mkv").write_bytes(b"x" * size)
+    return d
+
+
+@pytest.fixture
+def scandir_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    real = os.scandir
+
+    def counting(path):  # type: ignore[no-untyped-def]
+        calls.append(str(path))
+        return real(path)
+
+    monkeypatch.setattr(fs_cache.os, "scandir", counting)
+    return calls
+
+
+# ── Testes: DirCache ──────────────────────────────────────────────────────────
+
+
+def test_listing_reused_when_unchanged(tmp_path: Path, scandir_calls: list[str]) -> None:
+    _release(tmp_path, "Movie.A")
+    cache = DirCache()
+
+    first = cache.listing(tmp_path)
+    second = cache.listing(tmp_path)
+
+    assert first is second
+    assert scandir_calls.count(str(tmp_path)) == 1
+    assert first is not None and first.subdirs == ["Movie.A"]
+
+
+def test_listing_reread_after_new_child(tmp_path: Path) -> None:
+    cache = DirCache()
+    assert cache.listing(tmp_path).files == {}  # type: ignore[union-attr]
+
+    (tmp_path / "new.mkv").write_bytes(b"abc")
+    os.utime(tmp_path, ns=(0, 10**18))  # garante mtime diferente mesmo em FS de baixa resolução
+
+    assert cache.listing(tmp_path).files == {"new.mkv": 3}  # type: ignore[union-attr]
+
+
+def test_listing_missing_dir_returns_none(tmp_path: Path) -> None:
+    assert DirCache().listing(tmp_path / "nope") is None
+
+
+def test_total_size_tracks_nested_changes(tmp_path: Path) -> None:
+    rel = _release(tmp_path, "Show", size=5)
+    season = rel / "S01"
+    season.mkdir()
+    (season / "ep1.mkv").write_bytes(b"x" * 7)
+    cache = DirCache()
+    assert cache.total_size(rel) == 12
+
+    (season / "ep2.mkv").write_bytes(b"x" * 3)
+    os.utime(season, ns=(0, 10**18))
+
+    assert cache.total_size(rel) == 15
+
+
+def test_persisted_cache_skips_rescan(tmp_path: Path, scandir_calls: list[str]) -> None:
+    media = tmp_path / "media"
+    _release(media, "Movie.A", size=4)
+    cache_file = tmp_path / "cfg" / "fs_stats_cache.json"
+
+    first = DirCache(cache_file)
+    assert first.total_size(media) == 4
+    first.save()
+    assert cache_file.exists()
+
+    scandir_calls.clear()
+    second = DirCache(cache_file)
+    assert second.total_size(media) == 4
+    assert scandir_calls == []
+
+
+def test_corrupt_cache_file_ignored(tmp_path: Path) -> None:
+    cache_file = tmp_path / "fs_stats_cache.json"
+    cache_file.write_text("{not json")
+    _release(tmp_path, "Movie.A", size=2)
+
+    assert DirCache(cache_file).total_size(tmp_path / "Movie.A") == 2
+
+
+def test_save_without_changes_does_not_write(tmp_path: Path) -> None:
+    cache_file = tmp_path / "fs_stats_cache.json"
+    DirCache(cache_file).save()
+    assert not cache_file.exists()
+
+
+# ── Testes: integração com compute_fs_stats ──────────────────────────────────
+
+
+def test_compute_fs_stats_with_cache_matches_fresh_scan(tmp_path: Path) -> None:
+    textual = pytest.importorskip("textual")  # noqa: F841
+    from upapasta.tui.widgets.dashboard import compute_fs_stats
+
+    media = tmp_path / "media"
+    _release(media, "Done.Movie")
+    _release(media / "radarr", "Pending.Movie", size=20)
+    partial = media / "Partial.Series"
+    partial.mkdir()
+    (partial / "ep01.mkv").write_bytes(b"x")
+    (partial / "ep02.mkv").write_bytes(b"x")
+    idx = _catalog(tmp_path, ["Done.Movie", "ep01.mkv"])
+
+    cache = DirCache()
+    assert compute_fs_stats(media, idx, cache) == compute_fs_stats(media, idx)
+    assert compute_fs_stats(media, idx, cache) == (1, 20, ["Partial.Series"])
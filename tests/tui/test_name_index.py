@@ -0,0 +1,105 @@
+"""Testes para upapasta.tui.name_index (match de nomes de release normalizados/similares)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from upapasta.tui.catalog_index import CatalogIndex
+from upapasta.tui.external_nzb import ExternalNzbIndex
+from upapasta.tui.name_index import NameIndex, release_key
+
+# ── release_key ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Show.S01E01.1080p.mkv", "show s01e01"),
+        ("Show S01E01 1080p", "show s01e01"),
+        ("The.Last.of.Us.S01E03.720p.WEB-DL.DDP5.1.H.264-NTb", "the last of us s01e03"),
+        ("Movie.2021.1080p.BluRay.x264-GRP", "movie 2021"),
+        ("Spider-Man.2002.mkv", "spider man 2002"),
+        # Pasta sem extensão de mídia: o último token com ponto é preservado.
+        ("Breaking.Bad.S01", "breaking bad s01"),
+    ],
+)
+def test_release_key(name: str, expected: str) -> None:
+    assert release_key(name) == expected
+
+
+# ── NameIndex ─────────────────────────────────────────────────────────────────
+
+
+def test_exact_key_match_across_separators_and_tags() -> None:
+    idx: NameIndex[int] = NameIndex()
+    idx.add("Show.S01E01.1080p.mkv", 1)
+    assert idx.get("Show S01E01 1080p") == 1
+    assert idx.get("show_s01e01_720p_WEB-DL") == 1
+
+
+def test_fuzzy_match_tolerates_small_differences() -> None:
+    idx: NameIndex[str] = NameIndex()
+    idx.add("The.Grand.Budapest.Hotel.2014.1080p.BluRay", "a")
+    assert idx.get("The Grand Budapest Hotell 2014") == "a"
+
+
+def test_fuzzy_never_crosses_episode_or_year() -> None:
+    idx: NameIndex[str] = NameIndex()
+    idx.add("Some.Long.Series.Name.S01E01.1080p", "ep1")
+    idx.add("A.Long.Movie.Title.2019.1080p", "m2019")
+    assert idx.get("Some.Long.Series.Name.S01E02.1080p") is None
+    assert idx.get("A.Long.Movie.Title.2020.1080p") is None
+
+
+def test_unrelated_or_extra_tokens_not_matched() -> None:
+    idx: NameIndex[str] = NameIndex()
+    idx.add("Game.of.Thrones.S01.1080p", "got")
+    assert idx.get("Game of Thrones S01 Extras") is None
+    assert idx.get("Completely Different Show S01") is None
+
+
+def test_first_insertion_wins_and_add_resets_memo() -> None:
+    idx: NameIndex[int] = NameIndex()
+    assert idx.get("Movie.2021.1080p") is None
+    idx.add("Movie.2021.1080p", 1)
+    idx.add("Movie 2021 720p", 2)
+    assert idx.get("Movie.2021.1080p") == 1
+    assert len(idx) == 1
+
+
+# ── Integração ────────────────────────────────────────────────────────────────
+
+
+def test_catalog_matches_renamed_release(tmp_path: Path) -> None:
+    history = tmp_path / "history.jsonl"
+    history.write_text(
+        json.dumps({"nome_original": "Show.S01E01.1080p", "data_upload": "2025-01-15T10:00:00"})
+        + "\n"
+    )
+    idx = CatalogIndex(history)
+    idx.load()
+
+    assert idx.has("Show S01E01 1080p.mkv")
+    entry = idx.lookup_own("show_s01e01_720p")
+    assert entry is not None and entry.nome_original == "Show.S01E01.1080p"
+    assert not idx.has("Show S01E02 1080p.mkv")
+
+
+def test_external_index_matches_normalized_name(tmp_path: Path) -> None:
+    store = tmp_path / "nzbs"
+    store.mkdir()
+    (store / "Movie.Title.2021.1080p.BluRay.x264-GRP.nzb").write_text("<nzb/>")
+    cache = tmp_path / "external_nzb_cache.json"
+
+    idx = ExternalNzbIndex([store], cache_path=cache)
+    idx.scan()
+    info = idx.lookup("Movie Title (2021).mkv")
+    assert info is not None and info.path.name.startswith("Movie.Title.2021")
+
+    # Chaves vêm do cache persistido numa nova instância.
+    again = ExternalNzbIndex([store], cache_path=cache)
+    again.scan()
+    assert again.is_present("movie.title.2021.720p.web-dl")
@@ -396,6 +396,7 @@ class PipelineReporter:
         tmdb_id: Optional[int] = None,
         compressor: Optional[str] = None,
     ) -> None:
+        from .balancer import account_key
         from .catalog import detect_category, record_upload, run_post_upload_hook
         from .hooks import run_python_hooks
         from .nzb import resolve_nzb_out
@@ -432,6 +433,7 @@ class PipelineReporter:
                 tmdb_id=str(tmdb_id) if tmdb_id else None,
                 grupo_usenet=effective_group or None,
                 servidor_nntp=env_vars.get("NNTP_HOST") or os.environ.get("NNTP_HOST"),
+                conta_nntp=account_key(env_vars),
                 redundancia_par2=f"{redundancy}%" if redundancy else None,
                 duracao_upload_s=round(elapsed, 1),
                 num_arquivos_rar=int(stats["par2_file_count"])
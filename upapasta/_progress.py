@@ -94,10 +94,13 @@ def _process_output(
     queue: Queue[Optional[str]],
     bar: Optional[PhaseBar] = None,
     captured_lines: Optional[list[str]] = None,
+    echo: bool = True,
 ) -> tuple[int, bool]:
     """Consome tokens da fila e atualiza o progresso.
 
     Se 'bar' for fornecido, atualiza a barra Rich (com throttle de 10Hz).
+    echo=False: no modo porcelain não repassa as linhas cruas (processos em
+    paralelo, cujo progresso é agregado pelo próprio 'bar').
     """
     last_percent = -1
     teve_percentual = False
@@ -126,7 +129,7 @@ def _process_output(
         if not line:
             continue
 
-        if os.environ.get("UPAPASTA_PORCELAIN") == "1":
+        if echo and os.environ.get("UPAPASTA_PORCELAIN") == "1":
             print(line)
             sys.stdout.flush()
             # Ainda detectamos porcentagem para caso precise (mas a TUI parseia a linha impressa)
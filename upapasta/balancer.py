@@ -0,0 +1,176 @@
+"""
+balancer.py
+
+Distribui jobs de upload entre contas NNTP (perfis ~/.config/upapasta/<perfil>.env).
+
+Cada conta tem:
+  - slots: jobs simultâneos = NNTP_MAX_CONNECTIONS (limite do plano) ÷
+    NNTP_CONNECTIONS (conexões por job); sem NNTP_MAX_CONNECTIONS, 1 job por vez.
+  - cota diária: DAILY_UPLOAD_QUOTA (ex.: 500G; vazio = sem limite).
+  - bytes já postados hoje (UTC), somados do history.jsonl pelo campo conta_nntp.
+
+Um job vai para a conta menos ocupada (slots em uso, depois fração da cota
+consumida) que ainda comporte o seu tamanho; se todas estiverem cheias, espera
+um slot liberar.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Mapping, Optional
+
+from .config import load_settings, resolve_env_file
+from .i18n import _
+from .par_utils import parse_size
+
+
+def account_key(env_vars: Mapping[str, str]) -> Optional[str]:
+    """Identificador da conta gravado no histórico (conta_nntp): 'usuário@host'."""
+    host = env_vars.get("NNTP_HOST") or os.environ.get("NNTP_HOST", "")
+    user = env_vars.get("NNTP_USER") or os.environ.get("NNTP_USER", "")
+    return f"{user}@{host}" if host else None
+
+
+@dataclass
+class Account:
+    profile: str
+    env_file: str
+    key: str
+    host: str
+    slots: int = 1
+    quota_bytes: int = 0  # 0 = sem limite
+    used_today: int = 0
+    active: int = 0
+    reserved: int = 0  # bytes de jobs em andamento
+
+    def fits(self, size: int, *, with_reserved: bool = True) -> bool:
+        if not self.quota_bytes:
+            return True
+        pending = self.reserved if with_reserved else 0
+        return self.used_today + pending + size <= self.quota_bytes
+
+    def pressure(self) -> tuple[float, float]:
+        quota = (self.used_today + self.reserved) / self.quota_bytes if self.quota_bytes else 0.0
+        return self.active / self.slots, quota
+
+
+class AccountBalancer:
+    """Atribui jobs a contas; seguro entre as threads de --jobs."""
+
+    def __init__(self, accounts: list[Account]) -> None:
+        self.accounts = accounts
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        """Total de jobs simultâneos somando todas as contas."""
+        return sum(a.slots for a in self.accounts)
+
+    @classmethod
+    def from_profiles(
+        cls, profiles: list[str], history_path: Optional[Path] = None
+    ) -> AccountBalancer:
+        """Monta as contas a partir dos perfis; ValueError se algum não existir."""
+        accounts: list[Account] = []
+        for profile in profiles:
+            env_file = resolve_env_file(profile)
+            if not os.path.exists(env_file):
+                raise ValueError(
+                    _("perfil '{profile}' não encontrado ({path})").format(
+                        profile=profile, path=env_file
+                    )
+                )
+            settings = load_settings(env_file)
+            env = settings.to_dict()
+            key = account_key(env) or profile
+            per_job = max(1, settings.nntp_connections)
+            limit = settings.get_int("NNTP_MAX_CONNECTIONS", per_job)
+            try:
+                quota = parse_size(settings.get_str("DAILY_UPLOAD_QUOTA", "0"))
+            except ValueError:
+                quota = 0
+            accounts.append(
+                Account(
+                    profile=profile,
+                    env_file=env_file,
+                    key=key,
+                    host=settings.get_str("NNTP_HOST"),
+                    slots=max(1, limit // per_job),
+                    quota_bytes=quota,
+                )
+            )
+        usage = posted_today(accounts, history_path)
+        for account in accounts:
+            account.used_today = usage.get(account.profile, 0)
+        return cls(accounts)
+
+    def acquire(self, size: int) -> Optional[Account]:
+        """
+        Reserva a melhor conta para um job de size bytes, esperando um slot se preciso.
+
+        Retorna None se nenhuma conta comporta o job, nem após os jobs em andamento.
+        """
+        with self._cond:
+            while True:
+                free = [a for a in self.accounts if a.active < a.slots and a.fits(size)]
+                if free:
+                    best = min(free, key=lambda a: (a.pressure(), self.accounts.index(a)))
+                    best.active += 1
+                    best.reserved += size
+                    return best
+                # Jobs em andamento podem falhar e devolver a reserva de cota.
+                if not any(a.active and a.fits(size, with_reserved=False) for a in self.accounts):
+                    if not any(a.fits(size) for a in self.accounts):
+                        return None
+                self._cond.wait()
+
+    def release(self, account: Account, size: int, uploaded: bool) -> None:
+        with self._cond:
+            account.active -= 1
+            account.reserved -= size
+            if uploaded:
+                account.used_today += size
+            self._cond.notify_all()
+
+
+def posted_today(accounts: list[Account], history_path: Optional[Path] = None) -> dict[str, int]:
+    """
+    Bytes postados hoje (UTC) por perfil, lidos do history.jsonl.
+
+    Registros antigos, sem conta_nntp, contam para todas as contas do mesmo
+    servidor_nntp — estimativa conservadora.
+    """
+    if history_path is None:
+        from .catalog import _history_path
+
+        history_path = _history_path()
+    today = datetime.now(timezone.utc).date().isoformat()
+    usage = {a.profile: 0 for a in accounts}
+    try:
+        fh = history_path.open(encoding="utf-8")
+    except OSError:
+        return usage
+    with fh:
+        for line in fh:
+            # data_upload é ISO em UTC: filtra pelo prefixo antes de parsear.
+            if today not in line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not str(record.get("data_upload", "")).startswith(today):
+                continue
+            size = record.get("tamanho_bytes")
+            if not isinstance(size, int):
+                continue
+            conta = record.get("conta_nntp")
+            for a in accounts:
+                if conta == a.key or (conta is None and record.get("servidor_nntp") == a.host):
+                    usage[a.profile] += size
+    return usage
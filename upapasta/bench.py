@@ -0,0 +1,200 @@
+"""
+bench.py
+
+--bench-backends: compara os posters (pesto, nyuu) contra o servidor NNTP
+local de nntp_sink, sem rede nem conta Usenet.
+
+Um release sintético (dados aleatórios, incompressíveis) é postado por cada
+backend instalado; mede-se a vazão (MB/s) e o tempo de CPU do processo do
+poster por MB postado. Latência e teto de banda do servidor simulam um
+provedor real.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .i18n import _
+from .nntp_sink import NNTPSink
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+_CHUNK = 4 * 1024 * 1024
+_BENCH_FILES = 4
+
+
+@dataclass
+class BenchResult:
+    backend: str
+    path: str
+    rc: int
+    seconds: float
+    bytes_posted: int
+    articles: int
+    rejected: int
+    cpu_seconds: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.rc == 0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_posted / (1024 * 1024) / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def cpu_per_mb(self) -> Optional[float]:
+        if self.cpu_seconds is None or not self.bytes_posted:
+            return None
+        return self.cpu_seconds / (self.bytes_posted / (1024 * 1024))
+
+
+def make_release(directory: str, size_bytes: int, files: int = _BENCH_FILES) -> list[str]:
+    """Cria `files` arquivos aleatórios somando size_bytes; retorna os nomes."""
+    names = []
+    per_file = max(1, size_bytes // files)
+    for n in range(1, files + 1):
+        name = f"bench.release.part{n:02d}.bin"
+        with open(os.path.join(directory, name), "wb") as fh:
+            left = per_file
+            while left > 0:
+                chunk = os.urandom(min(_CHUNK, left))
+                fh.write(chunk)
+                left -= len(chunk)
+        names.append(name)
+    return names
+
+
+def _children_cpu() -> Optional[float]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return float(usage.ru_utime + usage.ru_stime)
+
+
+def _available_backends() -> list[tuple[str, str]]:
+    from .tools import tool_path
+
+    found = []
+    for name in ("pesto", "nyuu"):
+        path = tool_path(name)
+        if path:
+            found.append((name, path))
+    return found
+
+
+def _run_backend(
+    backend: str,
+    path: str,
+    srv: dict[str, object],
+    article_size: str,
+    nzb_target: str,
+    files: list[str],
+    working_dir: str,
+) -> int:
+    from .upfolder import _run_nyuu, _run_pesto
+
+    if backend == "pesto":
+        return _run_pesto(
+            path,
+            srv,
+            "alt.binaries.test",
+            article_size,
+            nzb_target,
+            "bench",
+            files,
+            working_dir,
+            porcelain=False,
+        )
+    return _run_nyuu(
+        path,
+        srv,
+        "alt.binaries.test",
+        article_size,
+        nzb_target,
+        "bench",
+        files,
+        working_dir,
+        echo=False,
+    )
+
+
+def bench_backends(
+    size_bytes: int = 256 * 1024 * 1024,
+    connections: int = 20,
+    article_size: str = "700K",
+    latency: float = 0.0,
+    bandwidth: float = 0.0,
+    backends: Optional[list[tuple[str, str]]] = None,
+) -> list[BenchResult]:
+    """
+    Posta o mesmo release sintético por cada backend num NNTPSink local.
+
+    backends: [(nome, caminho)]; por padrão os encontrados pelo registro de
+    ferramentas. latency em segundos, bandwidth em bytes/s (0 = sem teto).
+    """
+    if backends is None:
+        backends = _available_backends()
+    results: list[BenchResult] = []
+    if not backends:
+        return results
+
+    work = tempfile.mkdtemp(prefix="upapasta-bench-")
+    try:
+        files = make_release(work, size_bytes)
+        with NNTPSink(latency=latency, bandwidth=bandwidth, retain="none") as sink:
+            srv = sink.server(connections)
+            for backend, path in backends:
+                before = (sink.stats.posted, sink.stats.bytes_received, sink.stats.rejected)
+                cpu_before = _children_cpu()
+                nzb_target = os.path.join(work, f"{backend}.nzb")
+                start = time.monotonic()
+                try:
+                    rc = _run_backend(backend, path, srv, article_size, nzb_target, files, work)
+                except FileNotFoundError:
+                    rc = 4
+                seconds = time.monotonic() - start
+                cpu_after = _children_cpu()
+                results.append(
+                    BenchResult(
+                        backend=backend,
+                        path=path,
+                        rc=rc,
+                        seconds=seconds,
+                        bytes_posted=sink.stats.bytes_received - before[1],
+                        articles=sink.stats.posted - before[0],
+                        rejected=sink.stats.rejected - before[2],
+                        cpu_seconds=(
+                            cpu_after - cpu_before
+                            if cpu_after is not None and cpu_before is not None
+                            else None
+                        ),
+                    )
+                )
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def print_bench_results(results: list[BenchResult]) -> None:
+    if not results:
+        print(_("Nenhum backend de upload encontrado (pesto ou nyuu)."))
+        return
+    print(
+        f"  {_('Backend'):<8} {_('MB/s'):>8} {_('CPU s/MB'):>9} {_('Artigos'):>8} {_('Tempo'):>8}"
+    )
+    for r in results:
+        cpu = f"{r.cpu_per_mb:.3f}" if r.cpu_per_mb is not None else "—"
+        status = "" if r.ok else "  " + _("❌ código {rc}").format(rc=r.rc)
+        print(
+            f"  {r.backend:<8} {r.mb_per_s:>8.1f} {cpu:>9} {r.articles:>8} "
+            f"{r.seconds:>7.1f}s{status}"
+        )
@@ -108,6 +108,7 @@ def record_upload(
     tmdb_id: Optional[str] = None,
     grupo_usenet: Optional[str] = None,
     servidor_nntp: Optional[str] = None,
+    conta_nntp: Optional[str] = None,
     redundancia_par2: Optional[str] = None,
     duracao_upload_s: Optional[float] = None,
     num_arquivos_rar: Optional[int] = None,
@@ -133,6 +134,7 @@ def record_upload(
         "tmdb_id": tmdb_id,
         "grupo_usenet": grupo_usenet,
         "servidor_nntp": servidor_nntp,
+        "conta_nntp": conta_nntp,
         "redundancia_par2": redundancia_par2,
         "duracao_upload_s": duracao_upload_s,
         "num_arquivos_rar": num_arquivos_rar,
@@ -0,0 +1,197 @@
+"""
+checksums.py
+
+--checksums: manifesto .sfv/.md5 da entrada, calculado numa única leitura.
+
+Cada arquivo é lido uma vez, em blocos grandes, e o mesmo bloco alimenta
+CRC32 (SFV), MD5 completo e o MD5 dos primeiros 16 KiB — o par que o PAR2
+grava por arquivo — e, com o pacote opcional `xxhash` instalado, um XXH3-128
+para comparações rápidas. zlib e hashlib soltam o GIL em blocos grandes,
+então os arquivos são processados em paralelo por threads.
+
+O hashing roda em background junto com o parpar: os dois leem os mesmos
+arquivos ao mesmo tempo, e o que um trouxe do disco o outro encontra no page
+cache — na prática o disco é lido uma vez só para PAR2 e manifesto.
+
+Os digests ficam em cache (checksum_cache.json, por caminho, tamanho e
+mtime, por 30 dias); cached_digest() os devolve às fases seguintes sem reler
+o arquivo — o --repair usa o CRC32 para escolher entre arquivos do mesmo
+tamanho.
+
+Um threading.Event passado a compute_digests interrompe o hashing no próximo
+bloco (job abortado), com HashCancelled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .json_cache import TTLCache
+
+# Bloco de leitura: grande o bastante para o hashing soltar o GIL e o disco
+# ler em sequência.
+BLOCK_SIZE = 8 * 1024 * 1024
+
+# O PAR2 identifica cada arquivo pelo MD5 dos primeiros 16 KiB.
+PAR2_HEAD_BYTES = 16 * 1024
+
+_CACHE_TTL = 30 * 24 * 3600
+
+
+class HashCancelled(Exception):
+    """O hashing foi interrompido pelo evento de cancelamento."""
+
+
+@dataclass
+class FileDigest:
+    path: str
+    size: int
+    mtime_ns: int
+    crc32: str
+    md5: str
+    md5_16k: str
+    fast: Optional[str] = None  # XXH3-128, se xxhash estiver instalado
+    hashed_at: float = 0.0
+
+
+_DIGESTS: TTLCache[FileDigest] = TTLCache(
+    "checksum_cache.json", FileDigest, _CACHE_TTL, stamp="hashed_at"
+)
+
+
+def _fast_hasher() -> Any:
+    try:
+        import xxhash  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return xxhash.xxh3_128()
+
+
+def hash_file(
+    path: str, block_size: int = BLOCK_SIZE, cancel: Optional[threading.Event] = None
+) -> FileDigest:
+    """Calcula todos os digests de `path` numa leitura só (HashCancelled se `cancel`)."""
+    st = os.stat(path)
+    crc = 0
+    md5 = hashlib.md5(usedforsecurity=False)
+    head = hashlib.md5(usedforsecurity=False)
+    head_left = PAR2_HEAD_BYTES
+    fast = _fast_hasher()
+    buf = bytearray(block_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as fh:
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise HashCancelled(path)
+            n = fh.readinto(buf)
+            if not n:
+                break
+            chunk = view[:n]
+            crc = zlib.crc32(chunk, crc)
+            md5.update(chunk)
+            if head_left:
+                head.update(chunk[:head_left])
+                head_left = max(0, head_left - n)
+            if fast is not None:
+                fast.update(chunk)
+    return FileDigest(
+        path=os.path.abspath(path),
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        crc32=f"{crc & 0xFFFFFFFF:08X}",
+        md5=md5.hexdigest(),
+        md5_16k=head.hexdigest(),
+        fast=fast.hexdigest() if fast is not None else None,
+        hashed_at=time.time(),
+    )
+
+
+def cached_digest(path: str) -> Optional[FileDigest]:
+    """Digest em cache de `path`, se o arquivo não mudou (tamanho e mtime)."""
+    path = os.path.abspath(path)
+    hit = _DIGESTS.get(path)
+    if hit is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_size != hit.size or st.st_mtime_ns != hit.mtime_ns:
+        return None
+    return hit
+
+
+def compute_digests(
+    files: list[str], jobs: Optional[int] = None, cancel: Optional[threading.Event] = None
+) -> list[FileDigest]:
+    """Digests de `files` (na mesma ordem), do cache ou lidos em `jobs` threads."""
+    results: dict[str, FileDigest] = {}
+    missing: list[str] = []
+    for f in files:
+        hit = cached_digest(f)
+        if hit is not None:
+            results[f] = hit
+        else:
+            missing.append(f)
+    if missing:
+        workers = max(1, min(jobs or os.cpu_count() or 4, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="checksum") as pool:
+            fresh = list(pool.map(lambda f: hash_file(f, BLOCK_SIZE, cancel), missing))
+        results.update(zip(missing, fresh))
+        _DIGESTS.put_many({d.path: d for d in fresh})
+    return [results[f] for f in files]
+
+
+# ── Manifestos ───────────────────────────────────────────────────────────────
+
+
+def write_manifests(digests: list[FileDigest], base_dir: str, out_base: str) -> list[str]:
+    """
+    Grava {out_base}.sfv e {out_base}.md5 com os caminhos relativos a
+    base_dir (separador "/"). Retorna os caminhos gravados.
+    """
+    rels = [os.path.relpath(d.path, base_dir).replace(os.sep, "/") for d in digests]
+    sfv = out_base + ".sfv"
+    md5 = out_base + ".md5"
+    with open(sfv, "w", encoding="utf-8", newline="\r\n") as fh:
+        fh.write("; Generated by UpaPasta\n")
+        for rel, d in zip(rels, digests):
+            fh.write(f"{rel} {d.crc32}\n")
+    with open(md5, "w", encoding="utf-8", newline="\n") as fh:
+        for rel, d in zip(rels, digests):
+            fh.write(f"{d.md5} *{rel}\n")
+    return [sfv, md5]
+
+
+def generate_manifests(
+    target: str,
+    out_base: str,
+    jobs: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> list[str]:
+    """Calcula os digests dos arquivos do alvo (pasta, volumes ou arquivo) e grava os manifestos."""
+    from .par_split import input_files
+
+    files = input_files(target)
+    base_dir = target if os.path.isdir(target) else os.path.dirname(os.path.abspath(target))
+    return write_manifests(compute_digests(files, jobs, cancel), base_dir, out_base)
+
+
+def start_manifests(
+    target: str,
+    out_base: str,
+    jobs: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Future[list[str]]:
+    """Dispara generate_manifests em background (para rodar junto com o PAR2)."""
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checksums")
+    future = pool.submit(generate_manifests, target, out_base, jobs, cancel)
+    pool.shutdown(wait=False)
+    return future
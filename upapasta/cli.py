@@ -116,6 +116,32 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help=_("Testa conectividade com o servidor NNTP (valida host, porta e credenciais)"),
     )
+    p.add_argument(
+        "--verify-nzb",
+        metavar=_("NZB"),
+        dest="verify_nzb",
+        help=_(
+            "Verifica com STAT, em paralelo, se os artigos do NZB estão disponíveis no servidor "
+            "(--check-host ou o principal) e lista os segmentos ausentes por arquivo"
+        ),
+    )
+    p.add_argument(
+        "--bench-backends",
+        action="store_true",
+        help=_(
+            "Compara pesto e nyuu (MB/s e CPU por MB) postando um release sintético "
+            "num servidor NNTP local, sem rede"
+        ),
+    )
+    p.add_argument(
+        "--repair",
+        metavar=_("NZB"),
+        dest="repair_nzb",
+        help=_(
+            "Reenvia só os artigos ausentes do NZB a partir dos arquivos originais em <input> "
+            "e atualiza os <segment> do NZB"
+        ),
+    )
     p.add_argument(
         "--insecure",
         action="store_true",
@@ -141,6 +167,16 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help=_("Usa um perfil de configuração nomeado (~/.config/upapasta/<profile>.env)"),
     )
+    essential.add_argument(
+        "--profiles",
+        type=str,
+        default=None,
+        metavar=_("P1,P2,..."),
+        help=_(
+            "Distribui os jobs entre vários perfis (contas NNTP) conforme slots livres, "
+            "cota diária (DAILY_UPLOAD_QUOTA) e bytes já postados hoje"
+        ),
+    )
     essential.add_argument(
         "--watch",
         action="store_true",
@@ -167,6 +203,15 @@ def parse_args() -> argparse.Namespace:
             "Downloaders modernos (SABnzbd/NZBGet) usam PAR2 para renomear automaticamente após download."
         ),
     )
+    essential.add_argument(
+        "--obfuscate-metadata",
+        action="store_true",
+        help=_(
+            "Como --obfuscate, mas sem tocar no disco: os arquivos não são renomeados nem "
+            "linkados; os nomes aleatórios só existem nos artigos, subjects e NZB. "
+            "Implica --obfuscate."
+        ),
+    )
     essential.add_argument(
         "--password",
         nargs="?",
@@ -236,6 +281,72 @@ def parse_args() -> argparse.Namespace:
         metavar=_("PERCENT"),
         help=_("Redundância PAR2 em %% (sobrescreve --par-profile)"),
     )
+    tuning.add_argument(
+        "--par2-overlap",
+        nargs="?",
+        type=int,
+        const=4,
+        default=0,
+        metavar=_("N"),
+        help=_(
+            "Gera o PAR2 durante o RAR, em N conjuntos independentes por lote de volumes "
+            "(padrão: 4; só pastas grandes em volumes, com parpar)"
+        ),
+    )
+    tuning.add_argument(
+        "--par2-split",
+        default=None,
+        metavar=_("MODE"),
+        help=_(
+            "Divide o PAR2 em conjuntos independentes, gerados em paralelo e refeitos "
+            "um a um se falharem: folder (por subpasta), volumes:N ou size:SIZE (só parpar)"
+        ),
+    )
+    tuning.add_argument(
+        "--par2-jobs",
+        type=int,
+        default=2,
+        metavar=_("N"),
+        help=_("Conjuntos do --par2-split gerados ao mesmo tempo (padrão: 2)"),
+    )
+    tuning.add_argument(
+        "--par2-batch",
+        nargs="?",
+        const="2G",
+        default=None,
+        metavar=_("SIZE"),
+        help=_(
+            "Com --each/--watch, gera em lote, à frente do upload, o PAR2 dos arquivos "
+            "de até SIZE (padrão: 2G), --par2-jobs por vez"
+        ),
+    )
+    tuning.add_argument(
+        "--checksums",
+        action="store_true",
+        help=_(
+            "Grava manifestos .sfv e .md5 ao lado do NZB, calculados em paralelo com o "
+            "PAR2 (uma leitura do disco para os dois)"
+        ),
+    )
+    tuning.add_argument(
+        "--stream-upload",
+        action="store_true",
+        help=_(
+            "Posta cada volume RAR assim que fechado, enquanto os seguintes são criados; "
+            "o PAR2 vai no fim (pastas grandes em volumes, sem ofuscação)"
+        ),
+    )
+    tuning.add_argument(
+        "--pack-small",
+        nargs="?",
+        const="10M",
+        default=None,
+        metavar=_("SIZE"),
+        help=_(
+            "Upload sem compactação: junta os arquivos menores que SIZE (padrão: 10M) num "
+            "único arquivo store-mode e posta os grandes direto (pastas com muitos arquivos)"
+        ),
+    )
     tuning.add_argument(
         "--keep-files",
         action="store_true",
@@ -446,6 +557,46 @@ def parse_args() -> argparse.Namespace:
             "Aumenta confiança de entrega. Usa banda de download da conta Usenet."
         ),
     )
+    advanced.add_argument(
+        "--verify-articles",
+        action="store_true",
+        help=_(
+            "Após o upload, verifica com STAT (pipeline, várias conexões) os artigos do NZB "
+            "gerado e lista os segmentos ausentes por arquivo"
+        ),
+    )
+    advanced.add_argument(
+        "--bench-size",
+        type=int,
+        default=256,
+        metavar=_("MB"),
+        help=_("Tamanho do release sintético de --bench-backends (padrão: 256)"),
+    )
+    advanced.add_argument(
+        "--bench-latency",
+        type=float,
+        default=0.0,
+        metavar=_("MS"),
+        help=_("Latência simulada por comando no servidor de --bench-backends (padrão: 0)"),
+    )
+    advanced.add_argument(
+        "--repair-whole-files",
+        action="store_true",
+        help=_(
+            "Com --repair, reposta pelo poster (pesto/nyuu) os arquivos afetados inteiros "
+            "em vez de só os segmentos ausentes"
+        ),
+    )
+    advanced.add_argument(
+        "--verify-sample",
+        type=float,
+        default=100.0,
+        metavar=_("PCT"),
+        help=_(
+            "Porcentagem dos segmentos verificada por --verify-articles/--verify-nzb "
+            "(padrão: 100 = todos; o 1º segmento de cada arquivo sempre entra)"
+        ),
+    )
     advanced.add_argument(
         "--check-delay",
         type=int,
@@ -511,6 +662,17 @@ def parse_args() -> argparse.Namespace:
             "Útil para forçar geração de PAR2 em disco."
         ),
     )
+    advanced.add_argument(
+        "--scratch-dir",
+        action="append",
+        default=None,
+        metavar=_("DIR"),
+        help=_(
+            "Diretório de trabalho candidato para volumes e PAR2 (repetível; soma-se a "
+            "SCRATCH_DIRS do .env). O destino é escolhido por espaço livre e velocidade, "
+            "evitando o mesmo HDD da entrada"
+        ),
+    )
 
     advanced.add_argument(
         "--porcelain",
@@ -523,8 +685,9 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         dest="check_indexer",
         help=_(
-            "Busca o conteúdo no indexador Newznab configurado (INDEXER_URL/INDEXER_APIKEY) "
-            "antes de fazer upload. Se encontrado, pergunta se deseja baixar o NZB ou pular."
+            "Busca o conteúdo nos indexadores Newznab configurados (INDEXER_URL/INDEXER_APIKEY, "
+            "INDEXER_URL_2...) em paralelo com PACK/PAR2. Se encontrado, pergunta antes do "
+            "upload se deseja baixar o NZB ou pular."
         ),
     )
 
@@ -623,6 +786,45 @@ def _validate_flags(args: argparse.Namespace) -> bool:
     # --strong-obfuscate é deprecated desde v0.28.0; --obfuscate já aplica ofuscação máxima
     if getattr(args, "strong_obfuscate", False):
         args.obfuscate = True
+    if getattr(args, "obfuscate_metadata", False):
+        args.obfuscate = True
+
+    if getattr(args, "pack_small", None):
+        from .par_utils import parse_size
+
+        try:
+            parse_size(args.pack_small)
+        except ValueError:
+            print(_("❌  --pack-small: tamanho inválido '{size}'.").format(size=args.pack_small))
+            return False
+
+    if getattr(args, "par2_split", None):
+        from .par_split import parse_split_spec
+
+        try:
+            parse_split_spec(args.par2_split)
+        except ValueError:
+            print(
+                _(
+                    "❌  --par2-split: use folder, volumes:N ou size:SIZE (recebido '{spec}')."
+                ).format(spec=args.par2_split)
+            )
+            return False
+    if getattr(args, "par2_batch", None):
+        from .par_utils import parse_size
+
+        try:
+            parse_size(args.par2_batch)
+        except ValueError:
+            print(_("❌  --par2-batch: tamanho inválido '{size}'.").format(size=args.par2_batch))
+            return False
+    if getattr(args, "par2_jobs", 2) < 1:
+        print(_("❌  --par2-jobs deve ser ≥ 1."))
+        return False
+
+    if not 0 < getattr(args, "verify_sample", 100.0) <= 100:
+        print(_("❌  --verify-sample deve estar entre 0 e 100."))
+        return False
 
     # --jobs requer múltiplos inputs
     jobs = getattr(args, "jobs", 1)
@@ -632,6 +834,18 @@ def _validate_flags(args: argparse.Namespace) -> bool:
     if jobs > 1 and len(inputs) < 2:
         print(_("⚠️  --jobs > 1 é ignorado com apenas um input."))
 
+    # --profiles: lista de perfis para o balanceador de contas
+    raw_profiles = getattr(args, "profiles", None)
+    if isinstance(raw_profiles, str):
+        args.profiles = [p.strip() for p in raw_profiles.split(",") if p.strip()]
+    if getattr(args, "profiles", None):
+        if getattr(args, "profile", None):
+            print(_("❌  --profiles é incompatível com --profile."))
+            return False
+        if args.watch or getattr(args, "each", False):
+            print(_("❌  --profiles é incompatível com --watch/--each."))
+            return False
+
     # --each e --watch requerem exatamente um input
     if getattr(args, "each", False):
         if len(inputs) > 1:
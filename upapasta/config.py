@@ -9,9 +9,12 @@ from __future__ import annotations
 import getpass
 import os
 import sys
-from typing import Callable, Optional
+import threading
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable, Optional
 
 from .i18n import _
+from .par_utils import parse_size
 from .profiles import DEFAULT_PROFILE, PROFILES  # noqa: E402
 
 
@@ -42,6 +45,14 @@ def resolve_env_file(profile: str | None = None) -> str:
     return os.path.join(CONFIG_DIR, f"{profile}.env")
 
 
+def env_file_for_args(args: Any) -> str:
+    """Arquivo .env de uma invocação da CLI: --profile > --env-file > padrão."""
+    profile = getattr(args, "profile", None)
+    if profile:
+        return resolve_env_file(profile)
+    return str(getattr(args, "env_file", None) or DEFAULT_ENV_FILE)
+
+
 # Pool de grupos populares para aumentar obfuscação e redundância
 DEFAULT_GROUP_POOL = (
     "alt.binaries.boneless,"
@@ -126,6 +137,16 @@ def _write_full_env(env_file: str, values: dict[str, str]) -> None:
         "# Número de conexões simultâneas (verifique o limite do seu plano)",
         f"NNTP_CONNECTIONS={v('NNTP_CONNECTIONS')}",
         "",
+        "# Ajustar as conexões pela vazão medida (NNTP_CONNECTIONS vira o teto)",
+        f"NNTP_ADAPTIVE_CONNECTIONS={v('NNTP_ADAPTIVE_CONNECTIONS') or 'true'}",
+        "",
+        "# Postar em todos os servidores (NNTP_HOST_2...) ao mesmo tempo em vez de failover",
+        f"NNTP_STRIPE={v('NNTP_STRIPE') or 'false'}",
+        "",
+        "# Com --profiles: conexões totais do plano e cota diária (ex.: 500G, vazio = sem limite)",
+        f"NNTP_MAX_CONNECTIONS={v('NNTP_MAX_CONNECTIONS')}",
+        f"DAILY_UPLOAD_QUOTA={v('DAILY_UPLOAD_QUOTA')}",
+        "",
         "# *** Article Options ***",
         "# Grupo Usenet para upload (alt.binaries.boneless é amplamente retido)",
         f"USENET_GROUP={v('USENET_GROUP')}",
@@ -193,6 +214,10 @@ def _write_full_env(env_file: str, values: dict[str, str]) -> None:
         "# Compressor padrão (rar/7z) usado quando a compactação é necessária",
         f"DEFAULT_COMPRESSOR={v('DEFAULT_COMPRESSOR')}",
         "",
+        "# Diretórios de trabalho (separados por vírgula) para volumes e PAR2,",
+        "# ex: um SSD/NVMe quando a biblioteca está em HDD. Vazio: ao lado da entrada",
+        f"SCRATCH_DIRS={v('SCRATCH_DIRS')}",
+        "",
         "# Modo silencioso: suprime saída do nyuu (true/false)",
         f"QUIET={v('QUIET')}",
         "",
@@ -221,6 +246,11 @@ def _write_full_env(env_file: str, values: dict[str, str]) -> None:
         "# Validade do cache de busca (dias). Padrão: 30",
         f"INDEXER_CACHE_DAYS={v('INDEXER_CACHE_DAYS') or '30'}",
         "",
+        "# Máximo de requisições simultâneas por indexador (busca em lote). Padrão: 2",
+        f"INDEXER_MAX_CONCURRENT={v('INDEXER_MAX_CONCURRENT') or '2'}",
+        "",
+        "# Indexadores adicionais: INDEXER_URL_2 / INDEXER_APIKEY_2 ... até _9",
+        "",
     ]
 
     os.makedirs(os.path.dirname(env_file), exist_ok=True)
@@ -232,7 +262,11 @@ __all__ = ["DEFAULT_PROFILE", "PROFILES"]
 
 
 def load_env_file(env_path: str = DEFAULT_ENV_FILE) -> dict[str, str]:
-    """Carrega variáveis de ambiente de um arquivo .env simples."""
+    """Carrega variáveis de ambiente de um arquivo .env simples (cópia do cache de load_settings)."""
+    return load_settings(env_path).to_dict()
+
+
+def _parse_env_file(env_path: str) -> dict[str, str]:
     env_vars = {}
     if os.path.exists(env_path):
         with open(env_path, "r", encoding="utf-8") as f:
@@ -245,6 +279,101 @@ def load_env_file(env_path: str = DEFAULT_ENV_FILE) -> dict[str, str]:
     return env_vars
 
 
+# ── Settings: .env parseado uma vez ──────────────────────────────────────────
+
+DEFAULT_ARTICLE_SIZE = "700K"
+DEFAULT_NNTP_CONNECTIONS = 50
+
+
+class Settings(Mapping[str, str]):
+    """
+    Valores de um .env, parseados uma vez e compartilhados entre as fases do
+    pipeline, jobs paralelos e a TUI (obtidos via load_settings).
+
+    Como Mapping expõe só o conteúdo do arquivo — o mesmo que load_env_file
+    retorna —, então serve onde se espera env_vars. Os acessores tipados seguem a
+    precedência que o pipeline já usava: valor não vazio do arquivo, depois a
+    variável de ambiente do processo, depois o default.
+    """
+
+    def __init__(self, env_file: str, values: dict[str, str]) -> None:
+        self.env_file = env_file
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        # Sem os valores: o .env contém senhas.
+        return f"Settings({self.env_file!r}, {len(self._values)} chaves)"
+
+    def to_dict(self) -> dict[str, str]:
+        """Cópia mutável dos valores do arquivo."""
+        return dict(self._values)
+
+    def get_str(self, key: str, default: str = "") -> str:
+        return self._values.get(key) or os.environ.get(key) or default
+
+    def get_int(self, key: str, default: int) -> int:
+        try:
+            return int(self.get_str(key) or default)
+        except ValueError:
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        raw = self.get_str(key)
+        return raw.lower() in ("true", "1", "yes") if raw else default
+
+    @property
+    def article_size(self) -> str:
+        """ARTICLE_SIZE como configurado (ex.: '700K')."""
+        return self.get_str("ARTICLE_SIZE", DEFAULT_ARTICLE_SIZE)
+
+    @property
+    def article_size_bytes(self) -> int:
+        try:
+            return parse_size(self.article_size)
+        except ValueError:
+            return parse_size(DEFAULT_ARTICLE_SIZE)
+
+    @property
+    def nntp_connections(self) -> int:
+        return self.get_int("NNTP_CONNECTIONS", DEFAULT_NNTP_CONNECTIONS)
+
+
+_SETTINGS: dict[str, tuple[tuple[int, int], Settings]] = {}
+_SETTINGS_LOCK = threading.Lock()
+
+
+def load_settings(env_file: Optional[str] = None) -> Settings:
+    """
+    Retorna as Settings de env_file (padrão: DEFAULT_ENV_FILE).
+
+    O arquivo só é relido quando (mtime_ns, tamanho) muda — reconfigurar pelo
+    wizard ou editar o .env invalida o cache. Seguro entre threads.
+    """
+    path = os.path.abspath(env_file or DEFAULT_ENV_FILE)
+    try:
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        sig = (-1, -1)
+    with _SETTINGS_LOCK:
+        cached = _SETTINGS.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+    settings = Settings(path, _parse_env_file(path))
+    with _SETTINGS_LOCK:
+        _SETTINGS[path] = (sig, settings)
+    return settings
+
+
 def prompt_for_credentials(env_file: str, force: bool = False) -> dict[str, str]:
     """Solicita credenciais ao usuário e salva um .env completo com todos os campos."""
     existing = load_env_file(env_file) if (force and os.path.exists(env_file)) else {}
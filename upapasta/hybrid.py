@@ -0,0 +1,140 @@
+"""
+hybrid.py
+
+--pack-small: empacotamento híbrido no upload de pasta sem compactação.
+
+Com --skip-rar cada arquivo vira uma entrada <file> no NZB e ocupa ao menos
+um artigo e um slice de PAR2 — numa pasta com milhares de legendas, NFOs e
+amostras, o overhead por arquivo domina o post, o NZB e o downloader. Aqui os
+arquivos abaixo do limite vão para um único arquivo em modo store
+({pasta}.small.rar ou .7z, caminhos relativos preservados) e os grandes
+continuam sendo postados crus.
+
+A pasta de entrada não é alterada: o upload parte de uma cópia em hardlinks
+(reflinks, ou symlinks se o filesystem não aceitar nenhum dos dois) com o
+arquivo dos pequenos no lugar deles.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ._process import managed_popen
+from .i18n import _
+from .staging import link_or_clone
+from .tools import tool_path
+from .ui import PhaseBar
+
+logger = logging.getLogger("upapasta")
+
+# Abaixo disto o ganho (artigos, slices e entradas no NZB) não paga o arquivo extra.
+MIN_SMALL_FILES = 8
+
+
+@dataclass
+class HybridPlan:
+    small: list[str] = field(default_factory=list)  # caminhos relativos, vão para o arquivo
+    large: list[str] = field(default_factory=list)  # postados crus
+    small_bytes: int = 0
+
+
+def plan_hybrid(
+    folder: str, threshold: int, min_files: int = MIN_SMALL_FILES
+) -> Optional[HybridPlan]:
+    """Separa os arquivos de `folder` pelo limite; None se não houver pequenos suficientes."""
+    plan = HybridPlan()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, folder)
+            size = os.path.getsize(path)
+            if size < threshold:
+                plan.small.append(rel)
+                plan.small_bytes += size
+            else:
+                plan.large.append(rel)
+    if len(plan.small) < max(min_files, 1):
+        return None
+    return plan
+
+
+def _link(src: str, dst: str) -> None:
+    try:
+        link_or_clone(src, dst)
+    except OSError:
+        os.symlink(src, dst)
+
+
+def _pack(folder: str, files: list[str], archive: str, compressor: str, list_file: str) -> int:
+    exe = tool_path("7z" if compressor == "7z" else "rar")
+    if not exe:
+        print(
+            _("Erro: utilitário '{tool}' não encontrado.").format(
+                tool="7z" if compressor == "7z" else "rar"
+            )
+        )
+        return 4
+    with open(list_file, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(files) + "\n")
+    if compressor == "7z":
+        cmd = [exe, "a", "-mx0", "-y", "-scsUTF-8", archive, f"@{list_file}"]
+    else:
+        # -scfl: lista em UTF-8; sem -ep os caminhos relativos ficam no arquivo.
+        cmd = [exe, "a", "-m0", "-ma5", "-scfl", "-idq", archive, f"@{list_file}"]
+    with managed_popen(cmd, cwd=folder, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        output = proc.stdout.read() if proc.stdout else b""
+        rc = proc.wait()
+    if rc != 0:
+        for line in output.decode("utf-8", "replace").splitlines()[-10:]:
+            if line.strip():
+                print(f"  {line}")
+    return int(rc)
+
+
+def build_hybrid_tree(
+    folder: str,
+    plan: HybridPlan,
+    dest_parent: str,
+    compressor: str = "rar",
+    bar: Optional[PhaseBar] = None,
+) -> Optional[str]:
+    """
+    Monta dest_parent/<pasta>: arquivos grandes em link, pequenos num único
+    arquivo na raiz. Retorna o caminho da pasta montada, ou None se o
+    compactador falhar.
+    """
+    folder = os.path.abspath(folder)
+    name = os.path.basename(os.path.normpath(folder))
+    tree = os.path.join(dest_parent, name)
+    os.makedirs(tree)
+    for rel in plan.large:
+        dst = os.path.join(tree, rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        _link(os.path.join(folder, rel), dst)
+
+    ext = ".7z" if compressor == "7z" else ".rar"
+    archive = os.path.join(tree, f"{name}.small{ext}")
+    msg = _("📦 {count} arquivo(s) pequeno(s) ({size:.1f} MB) → {archive}").format(
+        count=len(plan.small), size=plan.small_bytes / (1024 * 1024), archive=archive
+    )
+    if bar:
+        bar.log(msg)
+    else:
+        print(msg)
+    list_file = os.path.join(dest_parent, ".upapasta_small.lst")
+    try:
+        rc = _pack(folder, plan.small, archive, compressor, list_file)
+    finally:
+        try:
+            os.remove(list_file)
+        except OSError:
+            pass
+    if rc != 0:
+        logger.warning(_("Empacotamento dos arquivos pequenos falhou (rc={rc})").format(rc=rc))
+        return None
+    return tree
@@ -5,7 +5,9 @@ Busca em indexadores compatíveis com o protocolo Newznab (incluindo Prowlarr)
 antes de fazer upload — se o conteúdo já está na Usenet, baixa só o .nzb
 como backup local e pula o upload. Zero downloads de conteúdo.
 
-Rate limiting embutido + cache JSONL local com TTL configurável.
+Rate limiting embutido (token bucket por indexador, compartilhado entre threads)
++ cache JSONL local com TTL configurável. batch_search() verifica muitos nomes
+de uma vez, com requisições concorrentes dentro do limite de cada indexador.
 """
 
 from __future__ import annotations
@@ -13,12 +15,15 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Iterator, Mapping, Optional, Sequence
 from xml.etree import ElementTree
 
 from .config import CONFIG_DIR
@@ -28,7 +33,15 @@ INDEXER_NZB_DIR = os.path.join(CONFIG_DIR, "nzb", "indexer")
 
 _DEFAULT_RATE_SECS = 2.0
 _DEFAULT_CACHE_DAYS = 30
-_LAST_REQUEST: dict[str, float] = {}
+_DEFAULT_MAX_CONCURRENT = 2
+# Maior pausa aceita de um aviso de rate limit; cota que só volta depois disso
+# faz as buscas no indexador falharem em vez de segurar o upload.
+_MAX_RATE_LIMIT_WAIT = 120.0
+# Um limitador por URL de indexador, compartilhado por todos os clientes/threads.
+_LIMITERS: dict[str, _RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+# Serializa leitura/append do cache JSONL entre threads do batch.
+_CACHE_LOCK = threading.Lock()
 
 
 @dataclass
@@ -42,6 +55,14 @@ class IndexerResult:
     grabs: int = 0
 
 
+class SearchCancelled(Exception):
+    """A busca foi abandonada antes de sair (outro indexador já respondeu)."""
+
+
+class RateLimited(Exception):
+    """A cota do indexador acabou e só volta depois de _MAX_RATE_LIMIT_WAIT."""
+
+
 @dataclass
 class _CacheEntry:
     query: str
@@ -87,7 +108,7 @@ def _load_cache(max_age_days: int = _DEFAULT_CACHE_DAYS) -> dict[tuple[str, str]
 
 def _save_entry(entry: _CacheEntry) -> None:
     os.makedirs(os.path.dirname(INDEXER_CACHE_FILE), exist_ok=True)
-    with open(INDEXER_CACHE_FILE, "a", encoding="utf-8") as fh:
+    with _CACHE_LOCK, open(INDEXER_CACHE_FILE, "a", encoding="utf-8") as fh:
         fh.write(
             json.dumps(
                 {
@@ -141,36 +162,109 @@ _NOISE = re.compile(
 )
 
 
+def strip_release_noise(text: str) -> str:
+    """Remove separadores, ano isolado e tags de qualidade/codec; colapsa espaços."""
+    q = _NOISE.sub(" ", text)
+    return re.sub(r"\s+", " ", q).strip()
+
+
 def normalize_query(name: str) -> str:
     """Limpa nome de arquivo/pasta para query de busca."""
     # Remove extensão se for arquivo
     base = os.path.splitext(name)[0]
-    q = _NOISE.sub(" ", base)
-    # Colapsa espaços
-    q = re.sub(r"\s+", " ", q).strip()
-    return q
+    return strip_release_noise(base)
 
 
 # ── Rate limiting ────────────────────────────────────────────────────────────
 
 
-def _rate_limit(indexer_url: str, min_interval: float) -> None:
+class _RateLimiter:
+    """
+    Token bucket de um indexador + limite de requisições simultâneas.
+
+    Um token é reposto a cada min_interval segundos (até `burst` acumulados);
+    cada requisição consome um. pause() suspende a emissão de tokens — usado
+    quando o servidor avisa que a cota acabou (X-RateLimit-*, 429).
+    """
+
+    def __init__(self, min_interval: float, max_concurrent: int, burst: int = 1) -> None:
+        self.min_interval = max(0.0, min_interval)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+
+    def acquire(self) -> None:
+        """Bloqueia até haver um token disponível e o consome."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.min_interval > 0:
+                    refill = (now - self._stamp) / self.min_interval
+                    self._tokens = min(float(self.burst), self._tokens + refill)
+                else:
+                    self._tokens = float(self.burst)
+                self._stamp = now
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self._tokens) * self.min_interval
+                self._cond.wait(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Nenhuma requisição sai pelos próximos `seconds` segundos."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._cond.notify_all()
+
+    def block(self, seconds: float) -> None:
+        """Cota esgotada: requisições falham (RateLimited) pelos próximos `seconds` segundos."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def blocked_for(self) -> float:
+        """Segundos até a cota voltar (0 se não está bloqueado)."""
+        with self._cond:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Ocupa uma vaga de requisição simultânea e consome um token."""
+        with self._slots:
+            self.acquire()
+            yield
+
+
+def _limiter_for(indexer_url: str, min_interval: float, max_concurrent: int) -> _RateLimiter:
     key = indexer_url.rstrip("/").lower()
-    last = _LAST_REQUEST.get(key, 0.0)
-    elapsed = time.time() - last
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed)
-    _LAST_REQUEST[key] = time.time()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _RateLimiter(min_interval, max_concurrent)
+            _LIMITERS[key] = limiter
+        return limiter
 
 
 # ── HTTP helpers ─────────────────────────────────────────────────────────────
 
 
-def _http_get(url: str, timeout: int = 15) -> bytes:
+def _http_fetch(url: str, timeout: int = 15) -> tuple[bytes, object]:
+    """GET simples; retorna (corpo, headers da resposta)."""
     req = urllib.request.Request(url, headers={"User-Agent": "UpaPasta/0.31 (Newznab client)"})
     with urllib.request.urlopen(req, timeout=timeout) as resp:
         data: bytes = resp.read()
-    return data
+        headers = resp.headers
+    return data, headers
+
+
+def _http_get(url: str, timeout: int = 15) -> bytes:
+    return _http_fetch(url, timeout)[0]
 
 
 def _extract_rate_limit(headers: object) -> Optional[float]:
@@ -258,7 +352,13 @@ def _parse_newznab_xml(data: bytes, indexer_url: str) -> list[IndexerResult]:
 
 
 class NewznabClient:
-    """Cliente Newznab com rate limiting e cache JSONL."""
+    """
+    Cliente Newznab com rate limiting e cache JSONL.
+
+    Thread-safe: várias threads podem chamar search()/download_nzb() no mesmo
+    cliente; o limitador do indexador garante o intervalo entre requisições e
+    no máximo max_concurrent em voo.
+    """
 
     def __init__(
         self,
@@ -267,25 +367,71 @@ class NewznabClient:
         rate_secs: float = _DEFAULT_RATE_SECS,
         cache_days: int = _DEFAULT_CACHE_DAYS,
         use_cache: bool = True,
+        max_concurrent: int = _DEFAULT_MAX_CONCURRENT,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.rate_secs = rate_secs
         self.cache_days = cache_days
         self.use_cache = use_cache
+        self.max_concurrent = max(1, max_concurrent)
         self._cache: Optional[dict[tuple[str, str], _CacheEntry]] = None
+        self._limiter = _limiter_for(self.base_url, rate_secs, self.max_concurrent)
 
     def _get_cache(self) -> dict[tuple[str, str], _CacheEntry]:
-        if self._cache is None:
-            self._cache = _load_cache(self.cache_days)
-        return self._cache
-
-    def search(self, query: str, limit: int = 10, normalize: bool = True) -> list[IndexerResult]:
+        with _CACHE_LOCK:
+            if self._cache is None:
+                self._cache = _load_cache(self.cache_days)
+            return self._cache
+
+    def _fetch(
+        self, url: str, timeout: int = 15, cancel: Optional[threading.Event] = None
+    ) -> bytes:
+        """
+        GET respeitando o limitador; honra X-RateLimit-* e re-tenta uma vez em 429.
+        Levanta RateLimited se a cota do indexador só volta depois de
+        _MAX_RATE_LIMIT_WAIT.
+        """
+        for attempt in (1, 2):
+            with self._limiter.slot():
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled(url)
+                blocked = self._limiter.blocked_for()
+                if blocked > 0:
+                    raise RateLimited(
+                        f"{self.base_url}: rate limit, cota volta em {int(blocked) + 1}s"
+                    )
+                try:
+                    raw, headers = _http_fetch(url, timeout=timeout)
+                except urllib.error.HTTPError as exc:
+                    if exc.code != 429 or attempt == 2:
+                        raise
+                    # Rate limit do servidor — segura o indexador inteiro e re-tenta
+                    retry_after = float(exc.headers.get("Retry-After", "60"))
+                    self._limiter.pause(min(retry_after, _MAX_RATE_LIMIT_WAIT))
+                    continue
+            wait = _extract_rate_limit(headers)
+            if wait is not None and wait > _MAX_RATE_LIMIT_WAIT:
+                self._limiter.block(wait)
+            elif wait is not None:
+                self._limiter.pause(wait)
+            return raw
+        raise AssertionError("unreachable")
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        normalize: bool = True,
+        cancel: Optional[threading.Event] = None,
+    ) -> list[IndexerResult]:
         """
         Busca no indexador. Usa cache se disponível e não expirado.
 
         normalize=False envia o nome literal (sem remover ano/codec/grupo) — use
         quando o objetivo é casar o arquivo exato, com o mesmo grupo/versão.
+        Se `cancel` for setado enquanto a requisição espera o limitador, ela não
+        é enviada e SearchCancelled é levantada.
         """
         norm_query = normalize_query(query) if normalize else query.strip()
         if not norm_query:
@@ -308,8 +454,6 @@ class NewznabClient:
                     for r in entry.results
                 ]
 
-        _rate_limit(self.base_url, self.rate_secs)
-
         params = urllib.parse.urlencode(
             {
                 "t": "search",
@@ -321,26 +465,12 @@ class NewznabClient:
         )
         url = f"{self.base_url}?{params}"
 
-        results: list[IndexerResult] = []
+        raw = self._fetch(url, cancel=cancel)
+        # Tenta JSON primeiro, fallback para XML
         try:
-            raw = _http_get(url)
-            # Tenta JSON primeiro, fallback para XML
-            try:
-                results = _parse_newznab_json(raw, self.base_url)
-            except (json.JSONDecodeError, KeyError):
-                results = _parse_newznab_xml(raw, self.base_url)
-        except urllib.error.HTTPError as exc:
-            if exc.code == 429:
-                # Rate limit do servidor — espera e re-tenta uma vez
-                retry_after = float(exc.headers.get("Retry-After", "60"))
-                time.sleep(min(retry_after, 120))
-                raw = _http_get(url)
-                try:
-                    results = _parse_newznab_json(raw, self.base_url)
-                except (json.JSONDecodeError, KeyError):
-                    results = _parse_newznab_xml(raw, self.base_url)
-            else:
-                raise
+            results = _parse_newznab_json(raw, self.base_url)
+        except (json.JSONDecodeError, KeyError):
+            results = _parse_newznab_xml(raw, self.base_url)
 
         if self.use_cache:
             entry = _CacheEntry(
@@ -361,7 +491,8 @@ class NewznabClient:
             )
             _save_entry(entry)
             cache = self._get_cache()
-            cache[_cache_key(norm_query, self.base_url)] = entry
+            with _CACHE_LOCK:
+                cache[_cache_key(norm_query, self.base_url)] = entry
 
         return results
 
@@ -372,56 +503,232 @@ class NewznabClient:
             sep = "&" if "?" in nzb_url else "?"
             nzb_url = f"{nzb_url}{sep}apikey={self.api_key}"
 
-        _rate_limit(self.base_url, self.rate_secs)
-        data = _http_get(nzb_url, timeout=30)
+        data = self._fetch(nzb_url, timeout=30)
         os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
         with open(dest_path, "wb") as fh:
             fh.write(data)
         return dest_path
 
 
-# ── High-level helper ────────────────────────────────────────────────────────
+# ── Batch ────────────────────────────────────────────────────────────────────
 
 
-def build_client_from_env(env_vars: dict[str, str]) -> Optional[NewznabClient]:
-    """Cria NewznabClient a partir das variáveis de ambiente. Retorna None se não configurado."""
-    base_url = env_vars.get("INDEXER_URL", "").strip()
-    api_key = env_vars.get("INDEXER_APIKEY", "").strip()
-    if not base_url or not api_key:
-        return None
+@dataclass
+class BatchHit:
+    """Resultado de batch_search() para um nome."""
+
+    name: str
+    # Resultados do primeiro indexador que encontrou o nome (melhor primeiro).
+    results: list[IndexerResult] = field(default_factory=list)
+    nzb_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def result(self) -> Optional[IndexerResult]:
+        return self.results[0] if self.results else None
+
+    @property
+    def found(self) -> bool:
+        return bool(self.results)
+
+
+def batch_search(
+    clients: Sequence[NewznabClient],
+    names: Sequence[str],
+    *,
+    limit: int = 3,
+    normalize: bool = True,
+    dest_for: Optional[Callable[[str, IndexerResult], str]] = None,
+    on_start: Optional[Callable[[str], None]] = None,
+    on_result: Optional[Callable[[BatchHit], None]] = None,
+) -> list[BatchHit]:
+    """
+    Busca vários nomes em um ou mais indexadores, concorrentemente.
+
+    Cada nome percorre os indexadores na ordem de `clients` até o primeiro com
+    resultado; nomes diferentes correm em paralelo, cada indexador limitado pelo
+    próprio token bucket e por max_concurrent requisições em voo. Com dest_for,
+    o .nzb do melhor resultado é baixado logo em seguida (no mesmo worker), de
+    modo que downloads se intercalam com as buscas restantes em vez de esperar
+    o fim da fase de busca.
+
+    on_start/on_result são chamados das threads de trabalho. Retorna um BatchHit
+    por nome, na ordem de entrada.
+    """
+    if not clients or not names:
+        return []
+
+    def _one(name: str) -> BatchHit:
+        if on_start is not None:
+            on_start(name)
+        hit = BatchHit(name=name)
+        for client in clients:
+            try:
+                results = client.search(name, limit=limit, normalize=normalize)
+            except Exception as exc:
+                hit.error = str(exc)
+                continue
+            if not results:
+                continue
+            hit.results = results
+            hit.error = None
+            if dest_for is not None:
+                best = results[0]
+                try:
+                    hit.nzb_path = client.download_nzb(best.nzb_url, dest_for(name, best))
+                except Exception as exc:
+                    hit.error = str(exc)
+            break
+        if on_result is not None:
+            on_result(hit)
+        return hit
+
+    workers = min(len(names), sum(c.max_concurrent for c in clients))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(_one, names))
+
+
+def search_first(
+    clients: Sequence[NewznabClient],
+    name: str,
+    *,
+    limit: int = 5,
+    normalize: bool = True,
+) -> BatchHit:
+    """
+    Consulta todos os indexadores ao mesmo tempo e retorna no primeiro acerto.
+
+    As consultas restantes são abandonadas: as que ainda aguardam o limitador
+    não chegam a sair e as já em voo têm a resposta descartada. Sem acerto,
+    espera todas e devolve um BatchHit vazio (com o último erro, se houver).
+    """
+    hit = BatchHit(name=name)
+    if not clients:
+        return hit
+    cancel = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=len(clients))
     try:
-        rate_secs = float(env_vars.get("INDEXER_RATE_SECS", str(_DEFAULT_RATE_SECS)))
-    except ValueError:
-        rate_secs = _DEFAULT_RATE_SECS
+        futures = [pool.submit(c.search, name, limit, normalize, cancel) for c in clients]
+        for fut in as_completed(futures):
+            try:
+                results = fut.result()
+            except SearchCancelled:
+                continue
+            except Exception as exc:
+                hit.error = str(exc)
+                continue
+            if results:
+                hit.results = results
+                hit.error = None
+                break
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+    return hit
+
+
+# ── High-level helper ────────────────────────────────────────────────────────
+
+
+def _env_number(env_vars: Mapping[str, str], key: str, default: float) -> float:
     try:
-        cache_days = int(env_vars.get("INDEXER_CACHE_DAYS", str(_DEFAULT_CACHE_DAYS)))
+        return float(env_vars.get(key, "") or default)
     except ValueError:
-        cache_days = _DEFAULT_CACHE_DAYS
-    return NewznabClient(base_url, api_key, rate_secs=rate_secs, cache_days=cache_days)
+        return default
+
+
+def build_clients_from_env(env_vars: Mapping[str, str]) -> list[NewznabClient]:
+    """
+    Cria um NewznabClient por indexador configurado, na ordem de prioridade.
+
+    Indexador primário: INDEXER_URL, INDEXER_APIKEY, INDEXER_RATE_SECS, ...
+    Indexadores adicionais: INDEXER_URL_2, INDEXER_APIKEY_2, ... INDEXER_URL_9, ...
+    INDEXER_RATE_SECS_N / INDEXER_MAX_CONCURRENT_N não definidos herdam do primário;
+    INDEXER_CACHE_DAYS vale para todos.
+    """
+    rate_secs = _env_number(env_vars, "INDEXER_RATE_SECS", _DEFAULT_RATE_SECS)
+    max_concurrent = int(_env_number(env_vars, "INDEXER_MAX_CONCURRENT", _DEFAULT_MAX_CONCURRENT))
+    cache_days = int(_env_number(env_vars, "INDEXER_CACHE_DAYS", _DEFAULT_CACHE_DAYS))
+
+    clients: list[NewznabClient] = []
+    for i in range(1, 10):
+        suffix = "" if i == 1 else f"_{i}"
+        base_url = env_vars.get(f"INDEXER_URL{suffix}", "").strip()
+        api_key = env_vars.get(f"INDEXER_APIKEY{suffix}", "").strip()
+        if not base_url:
+            if i == 1:
+                continue
+            break
+        if not api_key:
+            continue
+        clients.append(
+            NewznabClient(
+                base_url,
+                api_key,
+                rate_secs=_env_number(env_vars, f"INDEXER_RATE_SECS{suffix}", rate_secs),
+                cache_days=cache_days,
+                max_concurrent=int(
+                    _env_number(env_vars, f"INDEXER_MAX_CONCURRENT{suffix}", max_concurrent)
+                ),
+            )
+        )
+    return clients
+
+
+def build_client_from_env(env_vars: Mapping[str, str]) -> Optional[NewznabClient]:
+    """Cria o NewznabClient do indexador primário. Retorna None se não configurado."""
+    clients = build_clients_from_env(env_vars)
+    return clients[0] if clients else None
+
+
+def client_for_nzb_url(clients: Sequence[NewznabClient], nzb_url: str) -> NewznabClient:
+    """Escolhe o cliente cujo host serve nzb_url (para usar o apikey certo); senão o primário."""
+    host = urllib.parse.urlsplit(nzb_url).netloc.lower()
+    for client in clients:
+        if urllib.parse.urlsplit(client.base_url).netloc.lower() == host:
+            return client
+    return clients[0]
+
+
+def find_on_indexers(name: str, env_vars: Mapping[str, str]) -> Optional[BatchHit]:
+    """
+    Parte de rede do --check-indexer: busca name em todos os indexadores e
+    retorna no primeiro acerto. Não escreve no terminal, então pode rodar em
+    background (o orchestrator a sobrepõe a PACK/PAR2). None se não configurado.
+    """
+    clients = build_clients_from_env(env_vars)
+    if not clients:
+        return None
+    return search_first(clients, name, limit=5)
 
 
 def check_and_prompt(
     name: str,
     env_vars: dict[str, str],
+    hit: Optional[BatchHit] = None,
 ) -> bool:
     """
-    Busca no indexador. Se encontrar, exibe os resultados, baixa o .nzb
+    Busca nos indexadores. Se encontrar, exibe os resultados, baixa o .nzb
     como backup local e pula o upload.
 
+    hit: resultado de find_on_indexers() já obtido em background; se None, a
+    busca é feita agora.
+
     Retorna True se o upload deve ser PULADO.
     Retorna False se deve continuar com o upload normalmente.
     """
-    client = build_client_from_env(env_vars)
-    if client is None:
+    clients = build_clients_from_env(env_vars)
+    if not clients:
         print("⚠️  Indexador não configurado (INDEXER_URL / INDEXER_APIKEY ausentes).")
         return False
 
-    print(f"\n🔍 Buscando '{name}' no indexador...", flush=True)
-    try:
-        results = client.search(name, limit=5)
-    except Exception as exc:
-        print(f"⚠️  Erro ao buscar no indexador: {exc}")
+    if hit is None:
+        print(f"\n🔍 Buscando '{name}' no indexador...", flush=True)
+        hit = search_first(clients, name, limit=5)
+    if hit.error and not hit.found:
+        print(f"⚠️  Erro ao buscar no indexador: {hit.error}")
         return False
+    results = hit.results
 
     if not results:
         print("   Não encontrado no indexador. Prosseguindo com upload.")
@@ -459,6 +766,10 @@ def check_and_prompt(
     else:
         selected = results[0]
 
+    client = next(
+        (c for c in clients if c.base_url == selected.indexer),
+        client_for_nzb_url(clients, selected.nzb_url),
+    )
     safe_name = re.sub(r'[\\/*?"<>|]', "_", selected.title[:60])
     dest = os.path.join(INDEXER_NZB_DIR, f"{safe_name}.nzb")
     try:
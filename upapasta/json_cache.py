@@ -0,0 +1,130 @@
+"""
+json_cache.py
+
+Caches JSON em ~/.config/upapasta compartilhados entre processos (a TUI
+dispara um processo por item da fila).
+
+read_json / write_json: leitura tolerante e gravação atômica (arquivo
+temporário + os.replace), usadas por todos os caches em disco.
+
+TTLCache: entradas dataclass por chave, válidas por `ttl` segundos a partir
+de um campo de timestamp da própria entrada. O arquivo é lido na primeira
+consulta e regravado a cada put()/put_many(), só com as entradas ainda válidas.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from _typeshed import DataclassInstance
+
+T = TypeVar("T", bound="DataclassInstance")
+
+# Todos os TTLCache do processo (os testes os esvaziam entre um caso e outro).
+_CACHES: list[TTLCache[Any]] = []
+
+
+def _cache_dir() -> Optional[str]:
+    from .tools import get_app_data_dir
+
+    return get_app_data_dir()
+
+
+def read_json(path: Optional[str]) -> Any:
+    """Conteúdo de `path`, ou None se não existir ou não for JSON válido."""
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, payload: Any) -> None:
+    """Grava `payload` em `path` atomicamente; falhas de I/O são ignoradas."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+class TTLCache(Generic[T]):
+    """Entradas `cls` por chave em {app data}/`filename`, válidas por `ttl` segundos."""
+
+    def __init__(self, filename: str, cls: type[T], ttl: float, stamp: str) -> None:
+        """stamp: campo da entrada com o time.time() da medição."""
+        self.filename = filename
+        self.ttl = ttl
+        self._cls = cls
+        self._stamp = stamp
+        self._entries: dict[str, T] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        _CACHES.append(self)
+
+    def _path(self) -> Optional[str]:
+        base = _cache_dir()
+        return os.path.join(base, self.filename) if base else None
+
+    def _fresh(self, entry: T, now: float) -> bool:
+        return now - float(getattr(entry, self._stamp)) <= self.ttl
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = read_json(self._path())
+        if not isinstance(data, dict):
+            return
+        for key, fields in data.items():
+            try:
+                self._entries.setdefault(key, self._cls(**fields))
+            except TypeError:
+                continue
+
+    def get(self, key: str) -> Optional[T]:
+        """Entrada de `key`, se ainda dentro do TTL."""
+        with self._lock:
+            self._load()
+            hit = self._entries.get(key)
+        if hit is None or not self._fresh(hit, time.time()):
+            return None
+        return hit
+
+    def put(self, key: str, entry: T) -> None:
+        """Grava `entry` em `key` (e no arquivo, com as entradas ainda válidas)."""
+        self.put_many({key: entry})
+
+    def put_many(self, entries: dict[str, T]) -> None:
+        """Várias entradas numa gravação só."""
+        with self._lock:
+            self._load()
+            self._entries.update(entries)
+            path = self._path()
+            if not path:
+                return
+            now = time.time()
+            write_json(
+                path,
+                {k: asdict(v) for k, v in self._entries.items() if self._fresh(v, now)},
+            )
+
+    def clear(self) -> None:
+        """Esquece o que está em memória (o arquivo é relido na próxima consulta)."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded = False
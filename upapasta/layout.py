@@ -0,0 +1,69 @@
+"""
+layout.py
+
+Escolhe juntos o tamanho do artigo, o slice do PAR2 e o tamanho dos volumes
+de um job, para que um encaixe no outro:
+
+- artigo: ARTICLE_SIZE; com --obfuscate, o jitter de ±1% é sorteado uma vez
+  por job (e não só no upload) e arredondado para múltiplo de 4, exigência
+  do PAR2 para o slice;
+- slice: múltiplo inteiro do artigo (par_utils.compute_dynamic_slice); o
+  parpar recebe --slice-size-multiple com o artigo, então o -S também escala
+  em artigos inteiros;
+- volume: múltiplo do slice e, portanto, do artigo.
+
+Antes, volumes em múltiplos de 5 MB contra artigos de 700K terminavam num
+artigo quase vazio cada, o último slice de cada volume era preenchido com
+zeros e um slice podia cobrir pedaços de dois artigos — um artigo perdido
+estragava dois slices.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from .makerar import _volume_size_bytes
+from .par_utils import compute_dynamic_slice, parse_size
+
+
+@dataclass(frozen=True)
+class Layout:
+    article_size: int
+    slice_size: int
+    volume_size: Optional[int]  # None = arquivo único
+
+    def articles_per_slice(self) -> int:
+        return max(1, self.slice_size // self.article_size)
+
+    def articles_per_volume(self) -> int:
+        return -(-(self.volume_size or 0) // self.article_size)
+
+    def volume_multiple(self) -> Optional[int]:
+        """Passo dos volumes: o slice, se ele for feito de artigos inteiros."""
+        return self.slice_size if self.slice_size % self.article_size == 0 else None
+
+
+def _jitter(article_size: int) -> int:
+    variation = int(article_size * 0.01)
+    size = article_size + random.randint(-variation, variation)
+    return max(4, size - size % 4)
+
+
+def plan_layout(
+    total_bytes: int,
+    article_size: int,
+    jitter: bool = False,
+    slice_size: Optional[int] = None,
+) -> Layout:
+    """
+    Layout para total_bytes de entrada (volumes só acima do limite de
+    makerar). slice_size: escolhido pelo usuário (--par-slice-size).
+    """
+    article = _jitter(article_size) if jitter else article_size
+    if slice_size is None:
+        slice_size = parse_size(compute_dynamic_slice(total_bytes, article)[0])
+    layout = Layout(article, slice_size, None)
+    volume = _volume_size_bytes(total_bytes, layout.volume_multiple())
+    return Layout(article, slice_size, volume)
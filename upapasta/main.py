@@ -7,48 +7,133 @@ Ponto de entrada do UpaPasta.
 
 from __future__ import annotations
 
+import importlib
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
 from . import __version__
-from .catalog import print_stats
 from .cli import _USAGE_SHORT, _validate_flags, check_dependencies, parse_args
-from .config import check_or_prompt_credentials, load_env_file, resolve_env_file
+from .config import (
+    check_or_prompt_credentials,
+    env_file_for_args,
+    load_env_file,
+    load_settings,
+)
 from .i18n import _
-from .nntp_test import check_nntp_connection
-from .orchestrator import UpaPastaOrchestrator, UpaPastaSession
-from .ui import setup_logging, setup_session_log, teardown_session_log
-from .watch import _watch_loop
+
+# Nomes resolvidos só no primeiro uso: orchestrator (makepar, upfolder, nzb, ...),
+# nntp_test (nntplib/ssl), watch e catalog custam dezenas de ms para importar, e a
+# TUI dispara um processo `upapasta` por item da fila. --version, --stats,
+# --test-connection etc. carregam apenas o que usam.
+_LAZY = {
+    "print_stats": ".catalog",
+    "check_nntp_connection": ".nntp_test",
+    "UpaPastaOrchestrator": ".orchestrator",
+    "UpaPastaSession": ".orchestrator",
+    "setup_logging": ".ui",
+    "setup_session_log": ".ui",
+    "teardown_session_log": ".ui",
+    "_watch_loop": ".watch",
+    "start_parity_batch": ".par_batch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Resolve um nome de _LAZY; um valor já presente no módulo (ex.: patch) tem precedência."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def _check_server(args: Any, primary: dict[str, object]) -> dict[str, object]:
+    """upfolder._check_server com as opções --check-* da linha de comando."""
+    from .upfolder import _check_server as check_server
+
+    return check_server(
+        primary,
+        host=getattr(args, "check_host", None),
+        port=getattr(args, "check_port", None),
+        user=getattr(args, "check_user", None),
+        password=getattr(args, "check_password", None),
+        insecure=getattr(args, "insecure", False),
+    )
 
 
 def _run_single_input(args: Any, item_path: str, env_file: str) -> int:
     """Processa um único input e retorna o código de saída."""
     input_name = Path(item_path).name
     print(f"UpaPasta v{__version__}")
-    log_path, log_fh = setup_session_log(input_name, env_file=env_file)
+    log_path, log_fh = _lazy("setup_session_log")(input_name, env_file=env_file)
     rc = 1
     try:
-        orchestrator = UpaPastaOrchestrator.from_args(args, item_path)
-        with UpaPastaSession(orchestrator) as orch:
+        orchestrator = _lazy("UpaPastaOrchestrator").from_args(args, item_path)
+        with _lazy("UpaPastaSession")(orchestrator) as orch:
             rc = orch.run()
     except KeyboardInterrupt:
         rc = 130
-        teardown_session_log(log_fh, log_path)
+        _lazy("teardown_session_log")(log_fh, log_path)
         raise
     except Exception:
         import traceback
 
         traceback.print_exc()
     finally:
-        teardown_session_log(log_fh, log_path)
+        _lazy("teardown_session_log")(log_fh, log_path)
+    return rc
+
+
+def _run_balanced(args: Any, item_path: str, env_file: str, balancer: Any) -> int:
+    """Processa um input na conta escolhida pelo AccountBalancer (--profiles)."""
+    import copy
+
+    from .resources import get_total_size
+
+    size = get_total_size(item_path)
+    account = balancer.acquire(size)
+    if account is None:
+        print(
+            _("❌  {name}: nenhum perfil tem cota diária livre para o job.").format(
+                name=Path(item_path).name
+            )
+        )
+        return 1
+    print(
+        _("👥 {name} → perfil {profile} ({key})").format(
+            name=Path(item_path).name, profile=account.profile, key=account.key
+        )
+    )
+    job_args = copy.copy(args)
+    job_args.profile = account.profile
+    rc = 1
+    try:
+        rc = _run_single_input(job_args, item_path, account.env_file)
+    finally:
+        balancer.release(account, size, uploaded=rc == 0)
     return rc
 
 
-def _run_multi_input(args: Any, inputs: list[str], env_file: str, jobs: int) -> int:
+def _run_multi_input(
+    args: Any, inputs: list[str], env_file: str, jobs: int, balancer: Any = None
+) -> int:
     """Processa múltiplos inputs em sequência (jobs=1) ou em paralelo (jobs>1)."""
+
+    def _run(item_path: str) -> int:
+        if balancer is not None:
+            return _run_balanced(args, item_path, env_file, balancer)
+        return _run_single_input(args, item_path, env_file)
+
     total = len(inputs)
     mode = _("parallel ×{jobs}").format(jobs=jobs) if jobs > 1 else _("sequential")
     print(_("📦 Multi-input: {total} item(s) — {mode}").format(total=total, mode=mode))
@@ -60,7 +145,7 @@ def _run_multi_input(args: Any, inputs: list[str], env_file: str, jobs: int) ->
             print(f"[{i}/{total}] {Path(item_path).name}")
             print("=" * 60)
             try:
-                rc = _run_single_input(args, item_path, env_file)
+                rc = _run(item_path)
             except KeyboardInterrupt:
                 print(_("\n⚠️  Interrupted by user."))
                 return 130
@@ -68,11 +153,13 @@ def _run_multi_input(args: Any, inputs: list[str], env_file: str, jobs: int) ->
                 failed.append(Path(item_path).name)
     else:
         # Paralelo: ThreadPoolExecutor com jobs workers
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
         lock_print = __import__("threading").Lock()
 
         def _worker(item_path: str) -> tuple[str, int]:
             try:
-                rc = _run_single_input(args, item_path, env_file)
+                rc = _run(item_path)
             except KeyboardInterrupt:
                 rc = 130
             return item_path, rc
@@ -106,16 +193,7 @@ def _run_multi_input(args: Any, inputs: list[str], env_file: str, jobs: int) ->
 def main() -> None:
     args = parse_args()
 
-    # Resolver arquivo de env: --profile > --env-file > padrão
-    profile: str | None = getattr(args, "profile", None)
-    if profile:
-        env_file: str = resolve_env_file(profile)
-    else:
-        env_file_arg = getattr(args, "env_file", None)
-        if env_file_arg:
-            env_file = str(env_file_arg)
-        else:
-            env_file = resolve_env_file()
+    env_file = env_file_for_args(args)
 
     if getattr(args, "tui", False):
         try:
@@ -137,7 +215,7 @@ def main() -> None:
         sys.exit(0)
 
     if getattr(args, "stats", False):
-        print_stats()
+        _lazy("print_stats")()
         sys.exit(0)
 
     if getattr(args, "test_connection", False):
@@ -145,7 +223,7 @@ def main() -> None:
         if not all(env_vars.get(k) for k in ["NNTP_HOST", "NNTP_PORT", "NNTP_USER", "NNTP_PASS"]):
             print(_("❌ Incomplete credentials. Run 'upapasta --config' first."))
             sys.exit(1)
-        success, message = check_nntp_connection(
+        success, message = _lazy("check_nntp_connection")(
             host=env_vars["NNTP_HOST"],
             port=int(env_vars["NNTP_PORT"]),
             use_ssl=env_vars.get("NNTP_SSL", "true").lower() in ("true", "1", "yes"),
@@ -156,6 +234,86 @@ def main() -> None:
         print(message)
         sys.exit(0 if success else 1)
 
+    if getattr(args, "verify_nzb", None):
+        from .nntp_verify import print_verify_report, verify_nzb_articles
+        from .upfolder import _build_server_list
+
+        if not os.path.isfile(args.verify_nzb):
+            print(_("❌ NZB não encontrado: {path}").format(path=args.verify_nzb))
+            sys.exit(1)
+        servers = _build_server_list(load_env_file(env_file))
+        if not servers:
+            print(_("❌ Incomplete credentials. Run 'upapasta --config' first."))
+            sys.exit(1)
+        server = _check_server(args, servers[0])
+        settings = load_settings(env_file)
+        print(
+            _("🔎 Verificando {name} em {host}...").format(
+                name=os.path.basename(args.verify_nzb), host=server["host"]
+            ),
+            flush=True,
+        )
+        report = verify_nzb_articles(
+            args.verify_nzb,
+            server,
+            connections=settings.get_int("VERIFY_CONNECTIONS", 4),
+            sample=getattr(args, "verify_sample", 100.0) / 100,
+        )
+        print_verify_report(report)
+        sys.exit(0 if report.ok else 1)
+
+    if getattr(args, "bench_backends", False):
+        from .bench import bench_backends, print_bench_results
+
+        settings = load_settings(env_file)
+        size_mb = max(1, getattr(args, "bench_size", 256))
+        print(_("⏱  Benchmark dos posters com {size} MB no servidor local...").format(size=size_mb))
+        runs = bench_backends(
+            size_bytes=size_mb * 1024 * 1024,
+            connections=settings.nntp_connections,
+            article_size=settings.article_size,
+            latency=getattr(args, "bench_latency", 0.0) / 1000,
+        )
+        print_bench_results(runs)
+        sys.exit(0 if runs and all(r.ok for r in runs) else 1)
+
+    if getattr(args, "repair_nzb", None):
+        from .nntp_verify import print_verify_report, verify_nzb_articles
+        from .repair import print_repair_result, repair_nzb
+        from .upfolder import _build_server_list
+
+        if not os.path.isfile(args.repair_nzb):
+            print(_("❌ NZB não encontrado: {path}").format(path=args.repair_nzb))
+            sys.exit(1)
+        if not args.input or not os.path.exists(args.input):
+            print(_("❌  --repair requer o caminho dos arquivos originais como <input>."))
+            sys.exit(1)
+        servers = _build_server_list(load_env_file(env_file))
+        if not servers:
+            print(_("❌ Incomplete credentials. Run 'upapasta --config' first."))
+            sys.exit(1)
+        settings = load_settings(env_file)
+        connections = settings.get_int("VERIFY_CONNECTIONS", 4)
+        report = verify_nzb_articles(
+            args.repair_nzb, _check_server(args, servers[0]), connections=connections
+        )
+        print_verify_report(report)
+        if report.error:
+            sys.exit(1)
+        if report.ok:
+            sys.exit(0)
+        repaired = repair_nzb(
+            args.repair_nzb,
+            args.input,
+            servers[0],
+            report,
+            article_size=settings.get("ARTICLE_SIZE") or "700K",
+            connections=connections,
+            whole_files=getattr(args, "repair_whole_files", False),
+        )
+        print_repair_result(repaired)
+        sys.exit(0 if repaired.ok else 1)
+
     if getattr(args, "tmdb_search", None):
         from .tmdb import parse_title_and_year, search_media
 
@@ -240,13 +398,15 @@ def main() -> None:
         print(_USAGE_SHORT)
         sys.exit(0)
 
-    setup_logging(verbose=getattr(args, "verbose", False), log_file=getattr(args, "log_file", None))
+    _lazy("setup_logging")(
+        verbose=getattr(args, "verbose", False), log_file=getattr(args, "log_file", None)
+    )
 
     if not _validate_flags(args):
         sys.exit(1)
 
     # Carrega env_vars antecipadamente para decidir dependências e compressor
-    env_vars = load_env_file(resolve_env_file(getattr(args, "env_file", None)))
+    env_vars = load_env_file(env_file)
 
     # Decisão do compressor
     if getattr(args, "rar", False):
@@ -274,9 +434,21 @@ def main() -> None:
 
     # ── Modo multi-input: múltiplos caminhos posicionais ─────────────────────
     all_inputs: list[str] = getattr(args, "inputs", []) or []
+    balancer = None
+    if getattr(args, "profiles", None):
+        from .balancer import AccountBalancer
+
+        try:
+            balancer = AccountBalancer.from_profiles(args.profiles)
+        except ValueError as e:
+            print(f"❌  {e}")
+            sys.exit(1)
     if len(all_inputs) > 1:
         jobs = getattr(args, "jobs", 1)
-        rc = _run_multi_input(args, all_inputs, env_file, jobs)
+        if balancer is not None and jobs == 1:
+            # Sem --jobs explícito, ocupa todos os slots das contas.
+            jobs = balancer.capacity
+        rc = _run_multi_input(args, all_inputs, env_file, jobs, balancer)
         sys.exit(rc)
 
     # ── Modo --each: processa itens individualmente ──────────────
@@ -306,6 +478,7 @@ def main() -> None:
             )
         )
         failed: list[str] = []
+        batch, prepared = _lazy("start_parity_batch")(args, items)
 
         for i, item_path in enumerate(items, 1):
             print(f"\n{'=' * 60}")
@@ -313,16 +486,20 @@ def main() -> None:
             print("=" * 60)
 
             input_name = item_path.name
-            log_path, log_fh = setup_session_log(input_name, env_file=env_file)
+            log_path, log_fh = _lazy("setup_session_log")(input_name, env_file=env_file)
             rc = 1
             try:
-                orchestrator = UpaPastaOrchestrator.from_args(args, str(item_path))
+                orchestrator = prepared.pop(item_path, None) or _lazy(
+                    "UpaPastaOrchestrator"
+                ).from_args(args, str(item_path))
 
-                with UpaPastaSession(orchestrator) as orch:
+                with _lazy("UpaPastaSession")(orchestrator) as orch:
                     rc = orch.run()
             except KeyboardInterrupt:
                 rc = 130
-                teardown_session_log(log_fh, log_path)
+                _lazy("teardown_session_log")(log_fh, log_path)
+                if batch is not None:
+                    batch.close()
                 print(_("\n⚠️  Interrupted by user."))
                 sys.exit(rc)
             except Exception:
@@ -330,11 +507,14 @@ def main() -> None:
 
                 traceback.print_exc()
             finally:
-                teardown_session_log(log_fh, log_path)
+                _lazy("teardown_session_log")(log_fh, log_path)
 
             if rc != 0:
                 failed.append(item_path.name)
 
+        if batch is not None:
+            batch.close()
+
         # No --each, falhas são fatais
         if failed:
             print(_("\n❌  {count} item(s) failed:").format(count=len(failed)))
@@ -347,14 +527,17 @@ def main() -> None:
     # ── Modo --watch: daemon de monitoramento ────────────────────────────────
     if args.watch:
         try:
-            _watch_loop(args, Path(args.input), args.watch_interval, args.watch_stable)
+            _lazy("_watch_loop")(args, Path(args.input), args.watch_interval, args.watch_stable)
         except KeyboardInterrupt:
             print(_("\n👁  --watch closed by user."))
         sys.exit(0)
 
     # ── Modo normal: um único input ──────────────────────────────────────────
     try:
-        rc = _run_single_input(args, args.input, env_file)
+        if balancer is not None:
+            rc = _run_balanced(args, args.input, env_file, balancer)
+        else:
+            rc = _run_single_input(args, args.input, env_file)
     except KeyboardInterrupt:
         rc = 130
 
@@ -34,7 +34,7 @@ from typing import TYPE_CHECKING, Optional, Tuple
 from ._process import managed_popen
 from ._progress import _process_output, _read_output
 from .i18n import _
-from .tools import get_tool_path
+from .tools import get_tool_path, tool_path
 
 if TYPE_CHECKING:
     from .ui import PhaseBar
@@ -66,16 +66,16 @@ def _folder_size(path: str) -> int:
     return total
 
 
-def _volume_size_bytes(total_bytes: int) -> Optional[int]:
-    """Calcula o tamanho ideal de cada volume 7z em bytes."""
+def _volume_size_bytes(total_bytes: int, multiple: Optional[int] = None) -> Optional[int]:
+    """Calcula o tamanho ideal de cada volume 7z em bytes (múltiplo de `multiple` ou de 5 MB)."""
     if total_bytes < _MIN_SPLIT_SIZE:
         return None
 
     raw = math.ceil(total_bytes / _MAX_VOLUMES)
     vol = max(_MIN_VOLUME_SIZE, raw)
 
-    five_mb = 5 * 1024 * 1024
-    vol = math.ceil(vol / five_mb) * five_mb
+    step = multiple or 5 * 1024 * 1024
+    vol = math.ceil(vol / step) * step
     return vol
 
 
@@ -85,8 +85,10 @@ def make_7z(
     threads: Optional[int] = None,
     password: Optional[str] = None,
     bar: Optional[PhaseBar] = None,
+    output_dir: Optional[str] = None,
+    volume_multiple: Optional[int] = None,
 ) -> Tuple[int, Optional[str]]:
-    """Cria um arquivo 7z para a pasta ou arquivo fornecido."""
+    """Cria um arquivo 7z para a pasta ou arquivo fornecido (em output_dir, se dado)."""
     input_path = os.path.abspath(input_path)
     is_file = os.path.isfile(input_path)
     is_dir = os.path.isdir(input_path)
@@ -96,6 +98,7 @@ def make_7z(
         return 2, None
 
     parent = os.path.dirname(input_path)
+    out_dir = os.path.abspath(output_dir) if output_dir else parent
 
     if is_dir:
         base = os.path.basename(os.path.normpath(input_path))
@@ -104,9 +107,9 @@ def make_7z(
         base = os.path.splitext(os.path.basename(input_path))[0]
         archive_target = os.path.basename(input_path)
 
-    out_7z = os.path.join(parent, base + ".7z")
+    out_7z = os.path.join(out_dir, base + ".7z")
     # 7z volumes são .7z.001, .7z.002...
-    existing_parts = glob.glob(os.path.join(parent, glob.escape(base) + ".7z.[0-9][0-9][0-9]"))
+    existing_parts = glob.glob(os.path.join(out_dir, glob.escape(base) + ".7z.[0-9][0-9][0-9]"))
 
     if (os.path.exists(out_7z) or existing_parts) and not force:
         print(
@@ -128,7 +131,7 @@ def make_7z(
             except OSError:
                 pass
 
-    exe_7z = find_7z()
+    exe_7z = tool_path("7z")
     if not exe_7z:
         print(_("Erro: utilitário '7z' não encontrado. Instale p7zip-full."))
         return 4, None
@@ -144,7 +147,7 @@ def make_7z(
 
     if is_dir:
         total_bytes = _folder_size(input_path)
-        vol_bytes = _volume_size_bytes(total_bytes)
+        vol_bytes = _volume_size_bytes(total_bytes, volume_multiple)
         if vol_bytes is not None:
             cmd.append(f"-v{vol_bytes}b")
             num_vols = max(1, -(-total_bytes // vol_bytes))
@@ -207,7 +210,7 @@ def make_7z(
                 print(_("Arquivo .7z criado com sucesso."))
             if vol_bytes is None:
                 return 0, out_7z
-            matches = glob.glob(os.path.join(parent, glob.escape(base) + ".7z.001"))
+            matches = glob.glob(os.path.join(out_dir, glob.escape(base) + ".7z.001"))
             if matches:
                 return 0, matches[0]
             return 0, out_7z
@@ -57,7 +57,8 @@ from .par_utils import (
     parse_size,
 )
 from .profiles import DEFAULT_PROFILE, PROFILES
-from .tools import get_tool_path
+from .staging import stage_files, stage_tree
+from .tools import get_tool_path, tool_info, tool_path
 
 if TYPE_CHECKING:
     from .ui import PhaseBar
@@ -76,21 +77,12 @@ def generate_random_name(min_len: int = 10, max_len: int = 30) -> str:
 
 
 def link_tree(src: str, dst: str) -> None:
-    """Cria uma árvore de hardlinks espelhando a estrutura de src em dst."""
-    os.makedirs(dst, exist_ok=True)
-    for root, dirs, files in os.walk(src):
-        rel_path = os.path.relpath(root, src)
-        dest_root = os.path.join(dst, rel_path)
-        for d in dirs:
-            os.makedirs(os.path.join(dest_root, d), exist_ok=True)
-        for f in files:
-            src_file = os.path.join(root, f)
-            dst_file = os.path.join(dest_root, f)
-            try:
-                os.link(src_file, dst_file)
-            except OSError as e:
-                # Se falhar hardlink (ex: cross-device), deixa subir para o fallback no obfuscate_and_par
-                raise e
+    """
+    Espelha src em dst sem tocar nos originais: hardlink, reflink ou cópia
+    pelo kernel (staging.stage_tree). Se nada disso for possível (ex: sem
+    espaço para a cópia), o OSError sobe para o fallback de rename.
+    """
+    stage_tree(src, dst)
 
 
 def _deep_obfuscate_tree(path: str) -> dict[str, str]:
@@ -240,7 +232,7 @@ def _obfuscate_folder(
         was_linked = True
     except OSError:
         print(
-            _("  ⚠️ Hardlink falhou (possível cross-device). Usando rename (seeding pode quebrar).")
+            _("  ⚠️ Hardlink, reflink e cópia indisponíveis. Usando rename (seeding pode quebrar).")
         )
         # Se o link_tree criou o diretório de destino antes de falhar,
         # precisamos removê-lo para que o os.replace funcione no Windows.
@@ -294,12 +286,20 @@ def _obfuscate_rar_vol_set(
         )
     )
     try:
-        for vol in volumes:
-            suffix = os.path.basename(vol)[len(original_base) :]
-            os.link(vol, os.path.join(parent_dir, random_base + suffix))
+        stage_files(
+            [
+                (
+                    vol,
+                    os.path.join(
+                        parent_dir, random_base + os.path.basename(vol)[len(original_base) :]
+                    ),
+                )
+                for vol in volumes
+            ]
+        )
         was_linked = True
     except OSError:
-        print(_("  ⚠️ Hardlink falhou. Usando rename."))
+        print(_("  ⚠️ Hardlink, reflink e cópia indisponíveis. Usando rename."))
         for v in glob.glob(os.path.join(parent_dir, random_base + ".part*.rar")):
             try:
                 os.remove(v)
@@ -329,10 +329,12 @@ def _obfuscate_single_file(
         )
     )
     try:
-        os.link(input_path, obfuscated_path)
+        stage_files([(input_path, obfuscated_path)])
         was_linked = True
     except OSError:
-        print(_("  ⚠️ Hardlink falhou. Usando rename."))
+        print(_("  ⚠️ Hardlink, reflink e cópia indisponíveis. Usando rename."))
+        if os.path.exists(obfuscated_path):
+            os.remove(obfuscated_path)
         os.replace(input_path, obfuscated_path)
         was_linked = False
     par_input = input_path if was_linked else obfuscated_path
@@ -374,6 +376,64 @@ def perform_obfuscation(
     return obfuscated_path, obfuscated_map, was_linked
 
 
+def plan_post_names(
+    input_path: str, random_base: Optional[str] = None
+) -> Tuple[dict[str, str], dict[str, str]]:
+    """
+    Ofuscação só de metadados (--obfuscate-metadata): sorteia o nome com que
+    cada arquivo será postado, sem renomear nem linkar nada no disco.
+
+    Os nomes seguem o que perform_obfuscation + deep_obfuscate_tree +
+    rename_par2_files produziriam: arquivo único → {random_base}{ext}; volumes
+    → {random_base}.partNN.rar; pasta → diretórios e arquivos aleatórios
+    (extensões mantidas); PAR2 → {random_base}{sufixo}. O PAR2 já grava os
+    nomes reais — os do disco —, e é por ele que o downloader os restaura.
+
+    Retorna (post_names, obfuscated_map): post_names indexado pelo caminho
+    absoluto de cada arquivo; obfuscated_map no formato de perform_obfuscation
+    (primeiro item {random_base: nome_original}) mais o mapa da árvore.
+    """
+    input_path = os.path.abspath(input_path)
+    parent_dir = os.path.dirname(input_path)
+    base = os.path.basename(input_path)
+    random_base = random_base or generate_random_name()
+    post_names: dict[str, str] = {}
+
+    if os.path.isdir(input_path):
+        orig_stem = base
+        obfuscated_map = {random_base: base}
+        dir_names = {".": "."}
+        for root, dirs, files in os.walk(input_path):
+            dirs.sort()
+            rel_root = os.path.relpath(root, input_path)
+            new_root = dir_names[rel_root]
+            for d in dirs:
+                new_rel = os.path.normpath(os.path.join(new_root, generate_random_name()))
+                dir_names[os.path.normpath(os.path.join(rel_root, d))] = new_rel
+                obfuscated_map[new_rel] = os.path.normpath(os.path.join(rel_root, d))
+            for f in sorted(files):
+                new_rel = os.path.normpath(
+                    os.path.join(new_root, generate_random_name() + os.path.splitext(f)[1])
+                )
+                post_names[os.path.join(root, f)] = new_rel
+                obfuscated_map[new_rel] = os.path.normpath(os.path.join(rel_root, f))
+    else:
+        name_no_ext, ext = os.path.splitext(base)
+        if base.endswith(".rar") and ".part" in name_no_ext:
+            orig_stem = name_no_ext.rsplit(".part", 1)[0]
+            volumes = glob.glob(os.path.join(parent_dir, glob.escape(orig_stem) + ".part*.rar"))
+            for vol in volumes or [input_path]:
+                post_names[vol] = random_base + os.path.basename(vol)[len(orig_stem) :]
+        else:
+            orig_stem = name_no_ext
+            post_names[input_path] = random_base + ext
+        obfuscated_map = {random_base: orig_stem}
+
+    for p_file in glob.glob(os.path.join(parent_dir, glob.escape(orig_stem) + "*.par2")):
+        post_names[p_file] = random_base + os.path.basename(p_file)[len(orig_stem) :]
+    return post_names, obfuscated_map
+
+
 def rename_par2_files(
     parent_dir: str, actual_par_input: str, is_rar_vol_set: bool, random_base: str
 ) -> None:
@@ -584,6 +644,12 @@ def parse_args() -> argparse.Namespace:
 # ── make_parity ───────────────────────────────────────────────────────────────
 
 
+def _supports_file_list(exe_path: str) -> bool:
+    """--file-list é do parpar; find_parpar também aceita um binário 'par2' como fallback."""
+    info = tool_info("parpar", probe=True)
+    return info is None or info.path != exe_path or info.supports("file-list")
+
+
 def make_parity(
     rar_path: str,
     redundancy: Optional[int] = None,
@@ -603,12 +669,16 @@ def make_parity(
     bar: Optional[PhaseBar] = None,
     output_dir: Optional[str] = None,
     input_names: Optional[list[str]] = None,
+    article_size: Optional[int] = None,
+    input_files: Optional[list[str]] = None,
+    par2_name: Optional[str] = None,
+    filepath_base: Optional[str] = None,
 ) -> int:
     """
     Gera arquivos .par2 para rar_path (arquivo único, volume set ou pasta).
 
     Para parpar, o slice size é calculado automaticamente:
-      - Lê ARTICLE_SIZE de ~/.config/upapasta/.env (fallback 768K)
+      - Usa article_size (bytes) ou lê ARTICLE_SIZE de ~/.config/upapasta/.env (fallback 700K)
       - base_slice = ARTICLE_SIZE * 2
       - Escala conforme o tamanho total: ≤50GB→base, ≤100GB→1.5x, ≤200GB→2x, >200GB→2.5x
       - Clamp: 1M–4M
@@ -624,6 +694,12 @@ def make_parity(
       threads      : threads para parpar (None = nº de CPUs)
       profile      : perfil de configuração (fast / balanced / safe)
       memory_mb    : limite de RAM para parpar em MB (None = auto)
+      article_size : ARTICLE_SIZE em bytes já resolvido pelo chamador (None = lê o .env)
+      input_files  : arquivos exatos a proteger (ignora a coleta a partir de rar_path)
+      par2_name    : nome base do conjunto gerado (padrão: derivado de rar_path)
+      filepath_base: com filepath_format='common', grava os caminhos relativos a esta
+                     pasta (parpar -f path -B) — conjuntos parciais de uma pasta
+                     mantêm os mesmos caminhos do conjunto único
 
     Retorna: 0=ok, 2=entrada inválida, 3=par2 existe, 4=binário não encontrado, 5=erro
     """
@@ -656,6 +732,8 @@ def make_parity(
     is_rar_volume_set = (not is_folder) and base.endswith(".rar") and ".part" in name_no_ext
     if is_rar_volume_set:
         name_no_ext = name_no_ext.rsplit(".part", 1)[0]
+    if par2_name:
+        name_no_ext = par2_name
 
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
@@ -668,7 +746,9 @@ def make_parity(
         return 3
 
     # ── Coleta de arquivos de entrada ─────────────────────────────────────────
-    if is_folder:
+    if input_files:
+        files_to_process = [os.path.abspath(f) for f in input_files]
+    elif is_folder:
         files_to_process = []
         for root, _d, files in os.walk(rar_path):
             for f in files:
@@ -683,8 +763,11 @@ def make_parity(
         files_to_process = [rar_path]
 
     # ── Detecção de backend ───────────────────────────────────────────────────
-    parpar_found = find_parpar()
-    par2_found = find_par2()
+    # Resolvidos uma vez por processo pelo registro de ferramentas (find_parpar/find_par2).
+    parpar_path = tool_path("parpar")
+    par2_path = tool_path("par2")
+    parpar_found = ("parpar", parpar_path) if parpar_path else None
+    par2_found = ("par2", par2_path) if par2_path else None
 
     if backend == "parpar":
         if not parpar_found:
@@ -715,7 +798,8 @@ def make_parity(
     if chosen == "parpar":
         total_bytes = sum(os.path.getsize(f) for f in files_to_process if os.path.isfile(f))
         if used_slice is None:
-            article_size = get_article_size_bytes()
+            if article_size is None:
+                article_size = get_article_size_bytes()
             used_slice, min_input_slices, max_input_slices = compute_dynamic_slice(
                 total_bytes, article_size
             )
@@ -751,6 +835,9 @@ def make_parity(
             cmd.append(f"--min-input-slices={min_input_slices}")
         if max_input_slices is not None:
             cmd.append(f"--max-input-slices={max_input_slices}")
+        # Slice calculado aqui: o -S só escala em artigos inteiros (ver layout.py).
+        if slice_size is None and article_size and article_size % 4 == 0:
+            cmd.append(f"--slice-size-multiple={fmt_size(article_size)}")
 
         mem_limit = f"{memory_mb}M" if memory_mb is not None else get_parpar_memory_limit()
         if mem_limit:
@@ -758,7 +845,10 @@ def make_parity(
 
         num_threads = threads if threads is not None else (os.cpu_count() or 4)
         cmd.extend([f"-t{num_threads}", f"-r{redundancy}%"])
-        cmd.extend(["-f", filepath_format])
+        if filepath_base and filepath_format == "common":
+            cmd.extend(["-f", "path", "-B", filepath_base])
+        else:
+            cmd.extend(["-f", filepath_format])
         if parpar_extra_args:
             cmd.extend(parpar_extra_args)
         cmd.extend(["-o", out_par2])
@@ -805,7 +895,7 @@ def make_parity(
     try:
         # Com muitos arquivos a linha de comando pode ultrapassar ARG_MAX do kernel.
         # parpar suporta --file-list=FILE; usamos quando há risco de E2BIG.
-        if chosen == "parpar" and len(files_to_process) > 500:
+        if chosen == "parpar" and len(files_to_process) > 500 and _supports_file_list(exe_path):
             # Só aplicável quando os arquivos foram adicionados diretamente (sem --input-name)
             # Identifica os arquivos no cmd (tudo após "-o <out>") e substitui por --file-list
             out_idx = cmd.index("-o")
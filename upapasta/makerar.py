@@ -34,7 +34,7 @@ from typing import TYPE_CHECKING, Optional, Tuple
 from ._process import managed_popen
 from ._progress import _process_output, _read_output
 from .i18n import _
-from .tools import get_tool_path
+from .tools import get_tool_path, tool_path
 
 if TYPE_CHECKING:
     from .ui import PhaseBar
@@ -66,7 +66,7 @@ def _folder_size(path: str) -> int:
     return total
 
 
-def _volume_size_bytes(total_bytes: int) -> Optional[int]:
+def _volume_size_bytes(total_bytes: int, multiple: Optional[int] = None) -> Optional[int]:
     """
     Calcula o tamanho ideal de cada volume RAR em bytes.
     Retorna None quando o conteúdo é pequeno o suficiente para um RAR único.
@@ -74,7 +74,8 @@ def _volume_size_bytes(total_bytes: int) -> Optional[int]:
     Regras:
       - Abaixo de _MIN_SPLIT_SIZE → sem volumes (None)
       - Tamanho = max(_MIN_VOLUME_SIZE, ceil(total / _MAX_VOLUMES))
-      - Arredondado para o próximo múltiplo de 5 MB para ficar redondo
+      - Arredondado para o próximo múltiplo de `multiple` (layout.plan_layout
+        passa o slice do PAR2) ou, sem ele, de 5 MB para ficar redondo
     """
     if total_bytes < _MIN_SPLIT_SIZE:
         return None
@@ -82,23 +83,38 @@ def _volume_size_bytes(total_bytes: int) -> Optional[int]:
     raw = math.ceil(total_bytes / _MAX_VOLUMES)
     vol = max(_MIN_VOLUME_SIZE, raw)
 
-    five_mb = 5 * 1024 * 1024
-    vol = math.ceil(vol / five_mb) * five_mb
+    step = multiple or 5 * 1024 * 1024
+    vol = math.ceil(vol / step) * step
     return vol
 
 
+def planned_volumes(input_path: str, multiple: Optional[int] = None) -> int:
+    """Número de volumes que make_rar vai gerar para input_path (1 = RAR único)."""
+    if not os.path.isdir(input_path):
+        return 1
+    total_bytes = _folder_size(input_path)
+    vol_bytes = _volume_size_bytes(total_bytes, multiple)
+    if vol_bytes is None:
+        return 1
+    return max(1, -(-total_bytes // vol_bytes))
+
+
 def make_rar(
     input_path: str,
     force: bool = False,
     threads: Optional[int] = None,
     password: Optional[str] = None,
     bar: Optional[PhaseBar] = None,
+    output_dir: Optional[str] = None,
+    volume_multiple: Optional[int] = None,
 ) -> Tuple[int, Optional[str]]:
     """Cria um arquivo RAR para a pasta ou arquivo fornecido.
 
     Aceita tanto diretórios quanto arquivos únicos.
     Para diretórios: inclui conteúdo recursivamente, divide em volumes se > 10 GB.
     Para arquivos: cria RAR sem volume splitting (útil para obfuscação ou senha).
+    output_dir: onde gravar o RAR (padrão: ao lado da entrada).
+    volume_multiple: tamanho dos volumes em múltiplos disto (ver _volume_size_bytes).
 
     Retorna (código_de_retorno, primeiro_arquivo_gerado).
     Sem volumes: ("nome.rar",). Com volumes: primeiro é "nome.part001.rar".
@@ -113,6 +129,7 @@ def make_rar(
         return 2, None
 
     parent = os.path.dirname(input_path)
+    out_dir = os.path.abspath(output_dir) if output_dir else parent
 
     if is_dir:
         base = os.path.basename(os.path.normpath(input_path))
@@ -122,8 +139,8 @@ def make_rar(
         base = os.path.splitext(os.path.basename(input_path))[0]
         archive_target = os.path.basename(input_path)
 
-    out_rar = os.path.join(parent, base + ".rar")
-    existing_parts = glob.glob(os.path.join(parent, glob.escape(base) + ".part*.rar"))
+    out_rar = os.path.join(out_dir, base + ".rar")
+    existing_parts = glob.glob(os.path.join(out_dir, glob.escape(base) + ".part*.rar"))
     if (os.path.exists(out_rar) or existing_parts) and not force:
         print(
             _(
@@ -143,7 +160,7 @@ def make_rar(
             except OSError:
                 pass
 
-    rar_exec = find_rar()
+    rar_exec = tool_path("rar")
     if not rar_exec:
         print(_("Erro: utilitário 'rar' não encontrado. Instale-o (ex: sudo apt install rar)"))
         return 4, None
@@ -155,7 +172,7 @@ def make_rar(
     # -hp cifra conteúdo E nomes de arquivo internos (mais forte que -p)
     if is_dir:
         total_bytes = _folder_size(input_path)
-        vol_bytes = _volume_size_bytes(total_bytes)
+        vol_bytes = _volume_size_bytes(total_bytes, volume_multiple)
         cmd = [rar_exec, "a", "-r", "-m0", f"-mt{num_threads}", "-ma5"]
         if password:
             cmd.append(f"-hp{password}")
@@ -239,7 +256,7 @@ def make_rar(
                 print(_("Arquivo .rar criado com sucesso."))
             if vol_bytes is None:
                 return 0, out_rar
-            matches = glob.glob(os.path.join(parent, glob.escape(base) + ".part*.rar"))
+            matches = glob.glob(os.path.join(out_dir, glob.escape(base) + ".part*.rar"))
             if matches:
                 return 0, sorted(matches)[0]
             # Volumes esperados mas não encontrados — rar gerou arquivo único
@@ -17,7 +17,7 @@ from typing import Any, Optional
 
 from ._process import managed_popen
 from .i18n import _
-from .tools import get_tool_path
+from .tools import get_tool_path, tool_path
 
 
 def find_mediainfo() -> str | None:
@@ -79,7 +79,7 @@ def _get_video_info(file_path: str) -> tuple[float, dict[str, Any]]:
         "subtitle_tracks": [],
     }
     try:
-        ffprobe_exe = find_ffprobe()
+        ffprobe_exe = tool_path("ffprobe")
         if not ffprobe_exe:
             return 0.0, metadata
 
@@ -330,7 +330,7 @@ def generate_nfo_from_template(
         # 4. Mediainfo
         mediainfo_content = "N/A"
         if mi_target:
-            mi_exe = find_mediainfo()
+            mi_exe = tool_path("mediainfo")
             if mi_exe:
                 mediainfo_content = _run_command([mi_exe, mi_target]) or "N/A"
 
@@ -367,7 +367,7 @@ def generate_nfo_single_file(
     input_path: str, nfo_path: str, tmdb_metadata: Optional[dict[str, Any]] = None
 ) -> bool:
     """Gera .nfo com saída do mediainfo para um arquivo único."""
-    mediainfo_path = find_mediainfo()
+    mediainfo_path = tool_path("mediainfo")
     if not mediainfo_path:
         print(_("Atenção: 'mediainfo' não encontrado. Pulando geração de .nfo."))
         return False
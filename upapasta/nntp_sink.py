@@ -0,0 +1,364 @@
+"""
+nntp_sink.py
+
+Servidor NNTP local (asyncio) para benchmark e testes offline dos posters.
+
+Aceita AUTHINFO, POST, STAT, ARTICLE/HEAD/BODY e os comandos de cortesia que
+nyuu e pesto enviam (CAPABILITIES, MODE READER, DATE, GROUP). Permite simular
+um provedor real: latência por comando, teto de banda (agregado entre as
+conexões), limite de conexões e injeção de erros — POST recusado (441) ou
+conexão derrubada no meio do artigo.
+
+Retenção dos artigos: "memory" (dict), "none" (guarda só os Message-IDs, para
+benchmarks grandes; STAT funciona, ARTICLE não) ou um diretório (um arquivo
+por artigo).
+
+Uso em código (roda numa thread com loop próprio):
+
+    with NNTPSink(latency=0.02) as sink:
+        srv = sink.server()   # dict no formato de upfolder._build_server_list
+
+Uso avulso:
+
+    python -m upapasta.nntp_sink --port 1119 --latency 20 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from .i18n import _
+
+# O teto de banda é aplicado a cada bloco deste tamanho lido do artigo: sem
+# ler, o buffer do StreamReader enche e o TCP segura o envio do poster.
+_THROTTLE_BYTES = 64 * 1024
+
+
+@dataclass
+class SinkStats:
+    connections: int = 0
+    posted: int = 0
+    bytes_received: int = 0
+    rejected: int = 0
+    dropped: int = 0
+
+
+class NNTPSink:
+    """Servidor NNTP de mentira; veja o docstring do módulo."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        bandwidth: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        retain: str = "memory",
+        max_connections: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        latency: segundos antes de cada resposta. bandwidth: bytes/s de POST
+        somando todas as conexões (0 = sem teto). error_rate/drop_rate: fração
+        dos POSTs recusados com 441 / cortados fechando a conexão.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.user = user
+        self.password = password
+        self.retain = retain
+        self.max_connections = max_connections
+        self.stats = SinkStats()
+        self._rng = random.Random(seed)
+        self._articles: dict[str, bytes] = {}
+        self._ids: set[str] = set()
+        self._active = 0
+        self._next_free = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        if retain not in ("memory", "none"):
+            os.makedirs(retain, exist_ok=True)
+
+    # ── Ciclo de vida ────────────────────────────────────────────────────────
+
+    async def start_async(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = int(self._server.sockets[0].getsockname()[1])
+
+    def start(self) -> NNTPSink:
+        """Sobe o servidor numa thread própria e retorna quando já aceita conexões."""
+        ready = threading.Event()
+        errors: list[OSError] = []
+
+        def _run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self.start_async())
+            except OSError as e:
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            loop.run_forever()
+            if self._server is not None:
+                self._server.close()
+                loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=_run, name="nntp-sink", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> NNTPSink:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def server(self, connections: int = 10) -> dict[str, object]:
+        """Config de servidor para os posters (_run_pesto/_run_nyuu) e verificadores."""
+        return {
+            "host": self.host,
+            "port": str(self.port),
+            "ssl": False,
+            "ignore_cert": False,
+            "user": self.user or "bench",
+            "password": self.password or "bench",
+            "connections": str(connections),
+        }
+
+    # ── Armazenamento ────────────────────────────────────────────────────────
+
+    def _path(self, message_id: str) -> str:
+        return os.path.join(self.retain, hashlib.sha1(message_id.encode()).hexdigest())
+
+    def _store(self, message_id: str, article: bytes) -> None:
+        self._ids.add(message_id)
+        if self.retain == "memory":
+            self._articles[message_id] = article
+        elif self.retain != "none":
+            with open(self._path(message_id), "wb") as fh:
+                fh.write(article)
+
+    def has(self, message_id: str) -> bool:
+        return message_id in self._ids
+
+    def article(self, message_id: str) -> Optional[bytes]:
+        """Artigo completo (cabeçalhos + corpo), se retido."""
+        if self.retain == "memory":
+            return self._articles.get(message_id)
+        if self.retain == "none" or message_id not in self._ids:
+            return None
+        with open(self._path(message_id), "rb") as fh:
+            return fh.read()
+
+    # ── Protocolo ────────────────────────────────────────────────────────────
+
+    async def _throttle(self, size: int) -> None:
+        if self.bandwidth <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_free)
+        self._next_free = start + size / self.bandwidth
+        if self._next_free > now:
+            await asyncio.sleep(self._next_free - now)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats.connections += 1
+        self._active += 1
+        try:
+            if self.max_connections and self._active > self.max_connections:
+                writer.write(b"502 too many connections\r\n")
+                await writer.drain()
+                return
+            writer.write(b"200 upapasta sink ready\r\n")
+            await writer.drain()
+            await self._session(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._active -= 1
+            writer.close()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        authed = self.user is None
+        pending_user: Optional[str] = None
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", errors="replace").strip()
+            verb, _sep, arg = line.partition(" ")
+            verb = verb.upper()
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            if verb == "QUIT":
+                writer.write(b"205 bye\r\n")
+                await writer.drain()
+                return
+            if verb == "AUTHINFO":
+                kind, _sep, value = arg.partition(" ")
+                if kind.upper() == "USER":
+                    pending_user = value
+                    reply = "381 password required"
+                elif self.user is None or (pending_user == self.user and value == self.password):
+                    authed = True
+                    reply = "281 authentication accepted"
+                else:
+                    reply = "481 authentication failed"
+            elif verb == "CAPABILITIES":
+                reply = "101 capabilities\r\nVERSION 2\r\nREADER\r\nPOST\r\nAUTHINFO USER\r\n."
+            elif verb == "MODE":
+                reply = "200 posting allowed"
+            elif verb == "DATE":
+                reply = "111 " + datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+            elif not authed:
+                reply = "480 authentication required"
+            elif verb == "GROUP":
+                reply = f"211 0 0 0 {arg}"
+            elif verb == "POST":
+                writer.write(b"340 send article\r\n")
+                await writer.drain()
+                reply = await self._post(reader)
+                if not reply:
+                    self.stats.dropped += 1
+                    return
+            elif verb in ("STAT", "HEAD", "BODY", "ARTICLE"):
+                reply = self._retrieve(verb, arg.strip().strip("<>"))
+            else:
+                reply = "500 command not recognized"
+            writer.write(reply.encode("utf-8", errors="surrogateescape") + b"\r\n")
+            await writer.drain()
+
+    async def _post(self, reader: asyncio.StreamReader) -> str:
+        """
+        Lê o artigo até '.' no ritmo do teto de banda; retorna a resposta ou ""
+        para derrubar a conexão (no primeiro bloco, no meio do artigo).
+        """
+        roll = self._rng.random()
+        drop = roll < self.drop_rate
+        chunks = []
+        unpaced = 0
+        while True:
+            data = await reader.readline()
+            if not data:
+                raise asyncio.IncompleteReadError(b"", None)
+            if data == b".\r\n":
+                break
+            chunks.append(data[1:] if data.startswith(b"..") else data)
+            self.stats.bytes_received += len(data)
+            unpaced += len(data)
+            if unpaced >= _THROTTLE_BYTES:
+                await self._throttle(unpaced)
+                unpaced = 0
+                if drop:
+                    return ""
+        await self._throttle(unpaced)
+        if drop:
+            return ""
+        article = b"".join(chunks)
+        if roll < self.drop_rate + self.error_rate:
+            self.stats.rejected += 1
+            return "441 posting failed (injected)"
+        message_id = _message_id(article) or f"{uuid.uuid4().hex}@sink"
+        self._store(message_id, article)
+        self.stats.posted += 1
+        return f"240 article posted <{message_id}>"
+
+    def _retrieve(self, verb: str, message_id: str) -> str:
+        if not self.has(message_id):
+            return "430 no such article"
+        if verb == "STAT":
+            return f"223 0 <{message_id}>"
+        article = self.article(message_id)
+        if article is None:
+            return "430 article not retained"
+        head, _sep, body = article.partition(b"\r\n\r\n")
+        code, payload = {
+            "HEAD": ("221", head + b"\r\n"),
+            "BODY": ("222", body),
+            "ARTICLE": ("220", article),
+        }[verb]
+        stuffed = (b"\r\n" + payload).replace(b"\r\n.", b"\r\n..")[2:]
+        text = stuffed.decode("utf-8", errors="surrogateescape")
+        return f"{code} 0 <{message_id}>\r\n{text}."
+
+
+def _message_id(article: bytes) -> str:
+    for line in article.partition(b"\r\n\r\n")[0].split(b"\r\n"):
+        name, sep, value = line.partition(b":")
+        if sep and name.strip().lower() == b"message-id":
+            return value.decode("utf-8", errors="replace").strip().strip("<>")
+    return ""
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=_("Servidor NNTP local para testes e benchmark"))
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=1119)
+    p.add_argument("--latency", type=float, default=0.0, help=_("ms antes de cada resposta"))
+    p.add_argument("--bandwidth", type=float, default=0.0, help=_("teto em MB/s (0 = sem teto)"))
+    p.add_argument("--error-rate", type=float, default=0.0, help=_("fração de POSTs recusados"))
+    p.add_argument("--drop-rate", type=float, default=0.0, help=_("fração de conexões cortadas"))
+    p.add_argument("--user", default=None)
+    p.add_argument("--password", default=None)
+    p.add_argument("--retain", default="memory", help=_("memory, none ou um diretório"))
+    p.add_argument("--max-connections", type=int, default=0)
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sink = NNTPSink(
+        host=args.host,
+        port=args.port,
+        latency=args.latency / 1000,
+        bandwidth=args.bandwidth * 1024 * 1024,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        user=args.user,
+        password=args.password,
+        retain=args.retain,
+        max_connections=args.max_connections,
+    )
+
+    async def _serve() -> None:
+        await sink.start_async()
+        print(_("Servidor NNTP local em {host}:{port}").format(host=sink.host, port=sink.port))
+        assert sink._server is not None
+        await sink._server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
@@ -6,12 +6,17 @@ Utilitário para testar conectividade com servidor NNTP.
 
 from __future__ import annotations
 
+import socket
 import ssl
 import sys
+import time
 import warnings
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
 
 from .i18n import _
+from .json_cache import TTLCache
 
 warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*nntplib.*")
 try:
@@ -72,26 +77,178 @@ def check_nntp_connection(
         nntp.quit()
         return True, _("✅ Successfully connected to {host}:{port}").format(host=host, port=port)
 
-    except nntplib.NNTPPermanentError as e:
+    except Exception as e:
+        return False, _describe_error(e, host, port)
+
+
+def _describe_error(e: BaseException, host: str, port: int) -> str:
+    """Mensagem amigável para uma falha de conexão/autenticação NNTP."""
+    if isinstance(e, nntplib.NNTPPermanentError):
         if "authentication" in str(e).lower() or "login" in str(e).lower():
-            return False, _("❌ Authentication error: {error}").format(error=e)
-        return False, _("❌ Permanent server error: {error}").format(error=e)
+            return _("❌ Authentication error: {error}").format(error=e)
+        return _("❌ Permanent server error: {error}").format(error=e)
+    if isinstance(e, nntplib.NNTPTemporaryError):
+        return _("❌ Temporary server error: {error}").format(error=e)
+    if isinstance(e, TimeoutError):
+        return _("❌ Timeout connecting to {host}:{port} (check if server is available)").format(
+            host=host, port=port
+        )
+    if isinstance(e, ConnectionRefusedError):
+        return _("❌ Connection refused at {host}:{port}").format(host=host, port=port)
+    if isinstance(e, OSError):
+        if "Name or service not known" in str(e):
+            return _("❌ Host not resolvable: {host}").format(host=host)
+        return _("❌ Connection error: {error}").format(error=e)
+    return _("❌ Unexpected error: {error}").format(error=e)
 
-    except nntplib.NNTPTemporaryError as e:
-        return False, _("❌ Temporary server error: {error}").format(error=e)
 
-    except TimeoutError:
-        return False, _(
-            "❌ Timeout connecting to {host}:{port} (check if server is available)"
-        ).format(host=host, port=port)
+# ── Sondagem paralela de servidores ──────────────────────────────────────────
+#
+# Mede conexão TCP (+ banner), handshake TLS, autenticação e a ida e volta de um
+# STAT por um Message-ID inexistente (resposta 430, sem postar nada). Resultados
+# valem _PROBE_TTL segundos, em memória e em ~/.config/upapasta/nntp_probe_cache.json
+# (a TUI dispara um processo por item da fila).
 
-    except ConnectionRefusedError:
-        return False, _("❌ Connection refused at {host}:{port}").format(host=host, port=port)
+_PROBE_TTL = 600
+_PROBE_MSGID = "<upapasta-probe@invalid>"
+
+
+@dataclass
+class ProbeResult:
+    host: str
+    port: int
+    ok: bool
+    message: str = ""
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    auth_ms: float = 0.0
+    rtt_ms: float = 0.0
+    checked_at: float = 0.0
+
+    @property
+    def latency_ms(self) -> float:
+        return self.connect_ms + self.tls_ms + self.auth_ms + self.rtt_ms
+
+
+_PROBES: TTLCache[ProbeResult] = TTLCache(
+    "nntp_probe_cache.json", ProbeResult, _PROBE_TTL, stamp="checked_at"
+)
 
-    except OSError as e:
-        if "Name or service not known" in str(e):
-            return False, _("❌ Host not resolvable: {host}").format(host=host)
-        return False, _("❌ Connection error: {error}").format(error=e)
 
+def _connected_nntp(sock: socket.socket, host: str, port: int, timeout: int) -> Any:
+    """nntplib.NNTP sobre um socket já aberto (lê o banner e CAPABILITIES)."""
+
+    class _Connected(nntplib.NNTP):
+        def _create_socket(self, timeout: Any) -> socket.socket:
+            return sock
+
+    return _Connected(host, port, timeout=timeout)
+
+
+def probe_server(
+    host: str,
+    port: int,
+    use_ssl: bool,
+    user: str,
+    password: str,
+    timeout: int = 10,
+    insecure: bool = False,
+) -> ProbeResult:
+    """Conecta a um servidor e mede a latência de cada fase."""
+    result = ProbeResult(host, port, False, checked_at=time.time())
+    if nntplib is None:
+        result.message = _("❌ nntplib not available in your environment.")
+        return result
+
+    sock: Optional[socket.socket] = None
+    nntp: Any = None
+    try:
+        t0 = time.perf_counter()
+        sock = socket.create_connection((host, port), timeout)
+        t1 = time.perf_counter()
+        if use_ssl:
+            context = ssl.create_default_context()
+            if insecure:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=host)
+        t2 = time.perf_counter() if use_ssl else t1
+        nntp = _connected_nntp(sock, host, port, timeout)
+        t3 = time.perf_counter()
+        if user:
+            nntp.login(user, password)
+        t4 = time.perf_counter()
+        try:
+            nntp.stat(_PROBE_MSGID)
+        except nntplib.NNTPTemporaryError:
+            pass  # 430 No such article: o esperado
+        t5 = time.perf_counter()
+        result.connect_ms = ((t1 - t0) + (t3 - t2)) * 1000
+        result.tls_ms = (t2 - t1) * 1000
+        result.auth_ms = (t4 - t3) * 1000
+        result.rtt_ms = (t5 - t4) * 1000
+        result.ok = True
+        result.message = _("✅ Successfully connected to {host}:{port}").format(
+            host=host, port=port
+        )
     except Exception as e:
-        return False, _("❌ Unexpected error: {error}").format(error=e)
+        result.message = _describe_error(e, host, port)
+    finally:
+        if nntp is not None:
+            try:
+                nntp.quit()
+            except Exception:
+                pass
+        elif sock is not None:
+            sock.close()
+    return result
+
+
+def _probe_key(host: object, port: object, user: object) -> str:
+    return f"{user}@{host}:{port}"
+
+
+def probe_servers(
+    servers: Sequence[Mapping[str, object]], timeout: int = 5, use_cache: bool = True
+) -> dict[str, ProbeResult]:
+    """
+    Sonda todos os servidores ao mesmo tempo (dicts de upfolder._build_server_list).
+
+    Retorna {"usuário@host:porta": ProbeResult}; resultados recentes vêm do cache.
+    """
+
+    def _one(srv: Mapping[str, object]) -> tuple[str, ProbeResult]:
+        key = _probe_key(srv.get("host"), srv.get("port"), srv.get("user"))
+        if use_cache and (hit := _PROBES.get(key)) is not None:
+            return key, hit
+        result = probe_server(
+            str(srv.get("host")),
+            int(str(srv.get("port") or 119)),
+            bool(srv.get("ssl")),
+            str(srv.get("user") or ""),
+            str(srv.get("password") or ""),
+            timeout=timeout,
+            insecure=bool(srv.get("ignore_cert")),
+        )
+        _PROBES.put(key, result)
+        return key, result
+
+    unique = {_probe_key(s.get("host"), s.get("port"), s.get("user")): s for s in servers}
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(unique), thread_name_prefix="nntp-probe") as pool:
+        return dict(pool.map(_one, unique.values()))
+
+
+def rank_servers(
+    servers: list[dict[str, object]], results: Mapping[str, ProbeResult]
+) -> list[dict[str, object]]:
+    """Saudáveis primeiro, do mais rápido ao mais lento; os demais mantêm a ordem do .env."""
+
+    def _result(srv: Mapping[str, object]) -> Optional[ProbeResult]:
+        return results.get(_probe_key(srv.get("host"), srv.get("port"), srv.get("user")))
+
+    healthy = [s for s in servers if (r := _result(s)) is not None and r.ok]
+    healthy.sort(key=lambda s: _result(s).latency_ms)  # type: ignore[union-attr]
+    chosen = {id(s) for s in healthy}
+    return healthy + [s for s in servers if id(s) not in chosen]
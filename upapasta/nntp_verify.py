@@ -0,0 +1,325 @@
+"""
+nntp_verify.py
+
+Verificação de disponibilidade dos artigos de um NZB, sem nyuu/pesto.
+
+Os Message-IDs são lidos do NZB em streaming (iterparse) e enviados em lotes
+de STAT em pipeline (vários comandos antes de ler as respostas) por um pool de
+conexões. Com sample < 1.0 verifica-se só uma amostra — sempre incluindo o
+primeiro segmento de cada arquivo. O relatório lista os segmentos ausentes por
+arquivo e a vazão (artigos/s).
+"""
+
+from __future__ import annotations
+
+import random
+import socket
+import ssl
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from typing import Optional
+
+from .i18n import _
+
+_PIPELINE = 64  # STATs por lote (por ida e volta)
+
+
+class VerifyError(Exception):
+    """Falha de conexão, autenticação ou protocolo no servidor de verificação."""
+
+
+@dataclass(frozen=True)
+class Segment:
+    file_index: int
+    subject: str
+    number: int
+    message_id: str
+
+
+@dataclass
+class FileReport:
+    subject: str
+    segments: int = 0
+    checked: int = 0
+    missing: list[int] = field(default_factory=list)
+    index: int = -1  # posição do <file> no NZB
+
+
+@dataclass
+class VerifyReport:
+    files: list[FileReport] = field(default_factory=list)
+    checked: int = 0
+    missing: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.missing == 0
+
+    @property
+    def throughput(self) -> float:
+        """Artigos verificados por segundo."""
+        return self.checked / self.elapsed if self.elapsed > 0 else 0.0
+
+    def damaged(self) -> list[FileReport]:
+        return [f for f in self.files if f.missing]
+
+
+def iter_segments(nzb_path: str) -> Iterator[Segment]:
+    """Message-IDs do NZB em streaming, sem carregar a árvore inteira."""
+    for item in _walk(nzb_path):
+        if isinstance(item, Segment):
+            yield item
+
+
+def _walk(nzb_path: str) -> Iterator[Segment | tuple[int, str, int]]:
+    """Segment a cada <segment>; (índice, subject, nº de segmentos) ao fechar cada <file>."""
+    file_index = -1
+    subject = ""
+    count = 0
+    for event, elem in ET.iterparse(nzb_path, events=("start", "end")):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            if tag == "file":
+                file_index += 1
+                subject = elem.get("subject", "")
+                count = 0
+            continue
+        if tag == "segment" and elem.text:
+            count += 1
+            try:
+                number = int(elem.get("number", count))
+            except ValueError:
+                number = count
+            yield Segment(file_index, subject, number, elem.text.strip().strip("<>"))
+            elem.clear()
+        elif tag == "file":
+            yield (file_index, subject, count)
+            elem.clear()
+
+
+class _StatConnection:
+    """Conexão NNTP mínima para STAT em pipeline."""
+
+    def __init__(self, server: Mapping[str, object], timeout: float) -> None:
+        host = str(server.get("host", ""))
+        port = int(str(server.get("port") or 119))
+        try:
+            sock = socket.create_connection((host, port), timeout)
+            if server.get("ssl"):
+                context = ssl.create_default_context()
+                if server.get("ignore_cert"):
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                sock = context.wrap_socket(sock, server_hostname=host)
+        except OSError as e:
+            raise VerifyError(
+                _("conexão com {host}:{port} falhou: {error}").format(host=host, port=port, error=e)
+            ) from e
+        self._sock = sock
+        self._file = sock.makefile("rb")
+        self._expect(self._readline(), ("200", "201"))
+        user = str(server.get("user") or "")
+        if user:
+            reply = self._command(f"AUTHINFO USER {user}")
+            if reply.startswith("381"):
+                reply = self._command(f"AUTHINFO PASS {server.get('password') or ''}")
+            self._expect(reply, ("281",))
+
+    def _readline(self) -> str:
+        try:
+            line = self._file.readline()
+        except OSError as e:
+            raise VerifyError(str(e)) from e
+        if not line:
+            raise VerifyError(_("conexão encerrada pelo servidor"))
+        return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def _command(self, line: str) -> str:
+        try:
+            self._sock.sendall(f"{line}\r\n".encode())
+        except OSError as e:
+            raise VerifyError(str(e)) from e
+        return self._readline()
+
+    @staticmethod
+    def _expect(reply: str, codes: tuple[str, ...]) -> None:
+        if not reply.startswith(codes):
+            raise VerifyError(_("resposta inesperada do servidor: {reply}").format(reply=reply))
+
+    def stat_many(self, message_ids: list[str]) -> list[bool]:
+        """Envia todos os STAT de uma vez e lê as respostas em ordem."""
+        payload = "".join(f"STAT <{m}>\r\n" for m in message_ids).encode()
+        try:
+            self._sock.sendall(payload)
+        except OSError as e:
+            raise VerifyError(str(e)) from e
+        found = []
+        for _m in message_ids:
+            reply = self._readline()
+            if reply.startswith("223"):
+                found.append(True)
+            elif reply.startswith(("430", "423")):
+                found.append(False)
+            else:
+                raise VerifyError(_("resposta inesperada ao STAT: {reply}").format(reply=reply))
+        return found
+
+    def close(self) -> None:
+        try:
+            self._command("QUIT")
+        except VerifyError:
+            pass
+        finally:
+            self._sock.close()
+
+
+def verify_nzb_articles(
+    nzb_path: str,
+    server: Mapping[str, object],
+    connections: int = 4,
+    sample: float = 1.0,
+    timeout: float = 30,
+    seed: Optional[int] = None,
+) -> VerifyReport:
+    """
+    Verifica com STAT os artigos do NZB no servidor (dict de upfolder._build_server_list).
+
+    sample: fração dos segmentos verificada (1.0 = todos). Conexões que não abrem
+    (limite do plano) só reduzem o paralelismo; sem nenhuma, report.error explica.
+    """
+    rng = random.Random(seed)
+    report = VerifyReport()
+    by_index: dict[int, FileReport] = {}
+    lock = threading.Lock()
+    n_workers = max(1, connections)
+    batches: Queue[Optional[list[Segment]]] = Queue(maxsize=n_workers * 2)
+    errors: list[str] = []
+    alive = [n_workers]
+    abort = threading.Event()
+
+    def _fail(message: str) -> None:
+        with lock:
+            errors.append(message)
+
+    def _worker() -> None:
+        try:
+            conn = _StatConnection(server, timeout)
+        except VerifyError as e:
+            _fail(str(e))
+            with lock:
+                alive[0] -= 1
+                if not alive[0]:
+                    abort.set()
+            return
+        try:
+            while True:
+                try:
+                    batch = batches.get(timeout=0.2)
+                except Empty:
+                    if abort.is_set():
+                        return
+                    continue
+                if batch is None:
+                    return
+                try:
+                    found = conn.stat_many([s.message_id for s in batch])
+                except VerifyError as e:
+                    _fail(str(e))
+                    abort.set()
+                    return
+                with lock:
+                    for seg, present in zip(batch, found):
+                        rep = by_index.setdefault(
+                            seg.file_index, FileReport(seg.subject, index=seg.file_index)
+                        )
+                        rep.checked += 1
+                        report.checked += 1
+                        if not present:
+                            rep.missing.append(seg.number)
+                            report.missing += 1
+        finally:
+            conn.close()
+
+    def _put(item: Optional[list[Segment]]) -> bool:
+        while not abort.is_set():
+            try:
+                batches.put(item, timeout=0.2)
+                return True
+            except Full:
+                continue
+        return False
+
+    start = time.monotonic()
+    workers = [
+        threading.Thread(target=_worker, name=f"nntp-verify-{n}", daemon=True)
+        for n in range(n_workers)
+    ]
+    for w in workers:
+        w.start()
+
+    batch: list[Segment] = []
+    try:
+        for item in _walk(nzb_path):
+            if isinstance(item, tuple):
+                index, subject, count = item
+                with lock:
+                    by_index.setdefault(index, FileReport(subject, index=index)).segments = count
+                continue
+            if item.number != 1 and sample < 1.0 and rng.random() >= sample:
+                continue
+            batch.append(item)
+            if len(batch) >= _PIPELINE:
+                if not _put(batch):
+                    break
+                batch = []
+        else:
+            if batch:
+                _put(batch)
+    except ET.ParseError as e:
+        _fail(_("NZB inválido: {error}").format(error=e))
+        abort.set()
+    finally:
+        for _w in workers:
+            _put(None)
+        for w in workers:
+            w.join()
+
+    report.elapsed = time.monotonic() - start
+    report.files = [by_index[i] for i in sorted(by_index)]
+    for rep in report.files:
+        rep.missing.sort()
+    # Conexões recusadas com outras ativas não invalidam a verificação.
+    if errors and (abort.is_set() or not report.checked):
+        report.error = errors[0]
+    return report
+
+
+def print_verify_report(report: VerifyReport) -> None:
+    """Resumo legível: total, vazão e os segmentos ausentes por arquivo."""
+    print(
+        _("🔎 {checked} artigo(s) verificados em {elapsed:.1f}s ({rate:.0f}/s)").format(
+            checked=report.checked, elapsed=report.elapsed, rate=report.throughput
+        )
+    )
+    if report.error:
+        print(_("❌ Verificação incompleta: {error}").format(error=report.error))
+    for rep in report.damaged():
+        shown = ", ".join(str(n) for n in rep.missing[:10])
+        more = "…" if len(rep.missing) > 10 else ""
+        print(
+            _("  ❌ {subject}: {missing}/{checked} ausente(s) — segmentos {numbers}{more}").format(
+                subject=rep.subject,
+                missing=len(rep.missing),
+                checked=rep.checked,
+                numbers=shown,
+                more=more,
+            )
+        )
+    if report.ok:
+        print(_("✅ Todos os artigos verificados estão disponíveis."))
@@ -11,7 +11,9 @@ import shlex
 import shutil
 import string
 import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
@@ -27,8 +29,10 @@ from ._pipeline import (
     revert_extensionless,
     revert_obfuscation,
 )
-from .config import check_or_prompt_credentials
+from .config import Settings, check_or_prompt_credentials, env_file_for_args, load_settings
+from .hybrid import build_hybrid_tree, plan_hybrid
 from .i18n import _
+from .layout import Layout, plan_layout
 from .make7z import make_7z
 from .makepar import (
     deep_obfuscate_tree,
@@ -36,13 +40,27 @@ from .makepar import (
     handle_par_failure,
     make_parity,
     perform_obfuscation,
+    plan_post_names,
     rename_par2_files,
 )
-from .makerar import make_rar
+from .makerar import make_rar, planned_volumes
 from .nzb import enrich_nzb_metadata, resolve_nzb_out
+from .pacing import estimate_upload_bps
+from .par_overlap import OverlappedParity, QuietBar
+from .par_split import SplitParity, parse_split_spec, partition
+from .par_utils import get_parpar_memory_limit, parse_size
 from .resources import get_total_size
+from .scratch import (
+    ScratchPlan,
+    discover_locations,
+    free_bytes,
+    out_of_space,
+    parse_scratch_dirs,
+    plan_scratch,
+)
 from .ui import PhaseBar, format_time
 from .upfolder import upload_to_usenet
+from .volume_feed import VolumeFeed
 
 logger = logging.getLogger("upapasta")
 
@@ -91,6 +109,7 @@ class UpaPastaOrchestrator:
         par_profile: str = "balanced",
         nzb_conflict: Optional[str] = None,
         obfuscate: bool = False,
+        obfuscate_metadata: bool = False,
         rar_password: Optional[str] = None,
         par_slice_size: Optional[str] = None,
         upload_timeout: Optional[int] = None,
@@ -109,6 +128,7 @@ class UpaPastaOrchestrator:
         tmdb_id: Optional[int] = None,
         nfo_template: Optional[str] = None,
         verify_uploads: bool = False,
+        verify_articles: float = 0.0,
         check_delay: int = 5,
         check_retry_delay: int = 30,
         check_tries: int = 5,
@@ -118,6 +138,13 @@ class UpaPastaOrchestrator:
         check_password: Optional[str] = None,
         use_ramdisk: bool = False,
         check_indexer: bool = False,
+        par2_overlap: int = 0,
+        stream_upload: bool = False,
+        scratch_dirs: Optional[list[str]] = None,
+        pack_small: Optional[int] = None,
+        par2_split: Optional[str] = None,
+        par2_jobs: int = 2,
+        checksums: bool = False,
     ):
         self.input_path = Path(input_path).absolute()
         self.dry_run = dry_run
@@ -149,6 +176,8 @@ class UpaPastaOrchestrator:
         self.obfuscate = obfuscate
         self.obfuscated_map: dict[str, str] = {}
         self.obfuscate_was_linked = False
+        self.obfuscate_metadata = obfuscate_metadata
+        self._post_names: dict[str, str] = {}
         self.rar_password = rar_password
         self.par_slice_size = par_slice_size
         self.upload_timeout = upload_timeout
@@ -168,9 +197,11 @@ class UpaPastaOrchestrator:
         self.nfo_file: Optional[str] = None
         self.input_target: Optional[str] = None
         self.env_vars: dict[str, str] = {}
+        self._settings: Optional[Settings] = None
         self.generated_nzb: Optional[str] = None
         self.tmdb_data: Optional[dict[str, Any]] = None
         self.verify_uploads = verify_uploads
+        self.verify_articles = verify_articles
         self.check_delay = check_delay
         self.check_retry_delay = check_retry_delay
         self.check_tries = check_tries
@@ -181,8 +212,26 @@ class UpaPastaOrchestrator:
         self.use_ramdisk = use_ramdisk
         self.ramdisk_path: Optional[str] = None
         self.check_indexer = check_indexer
+        self.par2_overlap = par2_overlap
+        self._overlap: Optional[OverlappedParity] = None
+        self.stream_upload = stream_upload
+        self._streaming = False
+        self._feed: Optional[VolumeFeed] = None
+        self._streamed_upload: Optional[Future[bool]] = None
+        self.scratch_dirs = scratch_dirs or []
+        self._scratch: Optional[ScratchPlan] = None
+        self._staging_dir: Optional[str] = None
+        self.pack_small = pack_small
+        self.par2_split = par2_split
+        self.par2_jobs = par2_jobs
+        self._parity_prefetch: Optional[Future[int]] = None
+        self.checksums = checksums
+        self._manifests: Optional[Future[list[str]]] = None
+        self._manifests_cancel = threading.Event()
+        self._layout: Optional[Layout] = None
         self.pesto_par2 = False
         self._manual_obf_needed = obfuscate
+        self._server_probe: Optional[Future[Any]] = None
 
     @classmethod
     def from_args(
@@ -192,11 +241,9 @@ class UpaPastaOrchestrator:
         env_vars: Optional[dict[str, str]] = None,
     ) -> "UpaPastaOrchestrator":
         """Cria instância a partir do namespace retornado por parse_args()."""
+        env_file = env_file_for_args(args)
         if env_vars is None:
-            from .config import load_env_file, resolve_env_file
-
-            env_file = getattr(args, "env", None)
-            env_vars = load_env_file(resolve_env_file(env_file))
+            env_vars = load_settings(env_file).to_dict()
 
         # Decisão do compressor: apenas define se houver flag explícita de compressão
         if getattr(args, "rar", False):
@@ -237,13 +284,14 @@ class UpaPastaOrchestrator:
             skip_par=args.skip_par,
             skip_upload=args.skip_upload,
             force=args.force,
-            env_file=args.env_file,
+            env_file=env_file,
             keep_files=args.keep_files,
             rar_threads=args.rar_threads,
             par_threads=args.par_threads,
             par_profile=args.par_profile,
             nzb_conflict=args.nzb_conflict,
             obfuscate=args.obfuscate,
+            obfuscate_metadata=getattr(args, "obfuscate_metadata", False),
             rar_password=args.password,
             par_slice_size=args.par_slice_size,
             upload_timeout=args.upload_timeout,
@@ -267,6 +315,11 @@ class UpaPastaOrchestrator:
             tmdb_id=getattr(args, "tmdb_id", None),
             nfo_template=getattr(args, "nfo_template", None) or env_vars.get("NFO_TEMPLATE"),
             verify_uploads=getattr(args, "verify_uploads", False),
+            verify_articles=(
+                getattr(args, "verify_sample", 100.0) / 100
+                if getattr(args, "verify_articles", False)
+                else 0.0
+            ),
             check_delay=getattr(args, "check_delay", 5),
             check_retry_delay=getattr(args, "check_retry_delay", 30),
             check_tries=getattr(args, "check_tries", 5),
@@ -276,6 +329,13 @@ class UpaPastaOrchestrator:
             check_password=getattr(args, "check_password", None),
             use_ramdisk=getattr(args, "use_ramdisk", False),
             check_indexer=getattr(args, "check_indexer", False),
+            par2_overlap=getattr(args, "par2_overlap", 0) or 0,
+            stream_upload=getattr(args, "stream_upload", False),
+            scratch_dirs=getattr(args, "scratch_dir", None),
+            pack_small=(parse_size(args.pack_small) if getattr(args, "pack_small", None) else None),
+            par2_split=getattr(args, "par2_split", None),
+            par2_jobs=getattr(args, "par2_jobs", 2) or 2,
+            checksums=getattr(args, "checksums", False),
         )
 
         # ── Validação e auto-ativação de ramdisk ──────────────────────────────
@@ -592,6 +652,8 @@ class UpaPastaOrchestrator:
                 print_skip_rar_hints(self.input_path, self.filepath_format, self.backend)
             self.rar_file = None
             self.input_target = str(self.input_path)
+            if self.pack_small and not self.dry_run and not self._pack_small_files(bar):
+                return False
             if not bar:
                 label = _("pasta") if self.input_path.is_dir() else _("arquivo")
                 print(
@@ -621,22 +683,19 @@ class UpaPastaOrchestrator:
             print(_("📥 Compactando {name}...").format(name=self.input_path.name))
             print("-" * 60)
         try:
-            if self.compressor == "7z":
-                rc, generated_archive = make_7z(
-                    str(self.input_path),
-                    self.force,
-                    threads=self.rar_threads,
-                    password=self.rar_password,
-                    bar=bar,
-                )
-            else:
-                rc, generated_archive = make_rar(
+            make_archive = make_7z if self.compressor == "7z" else make_rar
+            while True:
+                rc, generated_archive = make_archive(
                     str(self.input_path),
                     self.force,
                     threads=self.rar_threads,
                     password=self.rar_password,
                     bar=bar,
+                    output_dir=self._staging_dir,
+                    volume_multiple=self._volume_multiple(),
                 )
+                if rc == 0 or not self._spill_archive(bar):
+                    break
 
             if not bar:
                 print("-" * 60)
@@ -716,6 +775,9 @@ class UpaPastaOrchestrator:
         assert self.input_target is not None, _("input_target não foi configurado")
         input_target_before = self.input_target
 
+        if self.obfuscate_metadata:
+            return self._plan_metadata_obfuscation(bar)
+
         try:
             # 1. Ofusca arquivos principais
             random_base = generate_random_name()
@@ -764,12 +826,42 @@ class UpaPastaOrchestrator:
                 print(_("❌ Erro ao ofuscar: {error}").format(error=e))
             return False
 
+    def _plan_metadata_obfuscation(self, bar: Optional[PhaseBar] = None) -> bool:
+        """
+        --obfuscate-metadata: só sorteia os nomes postados. Nada é renomeado
+        ou linkado no disco; o uploader aplica os nomes na hora de postar.
+        """
+        assert self.input_target is not None, _("input_target não foi configurado")
+        random_base = generate_random_name()
+        self._post_names, self.obfuscated_map = plan_post_names(self.input_target, random_base)
+        self.subject = random_base
+        msg = _("✨ Nomes ofuscados só na postagem ({count} arquivo(s)); disco intocado").format(
+            count=len(self._post_names)
+        )
+        if bar:
+            bar.log(msg)
+        else:
+            print(msg)
+            print("-" * 60)
+        return True
+
     def _run_makepar_plain(self, resolver: PathResolver, bar: Optional[PhaseBar] = None) -> bool:
         if not bar:
             print(_("🔐 Gerando paridade (perfil: {profile})...").format(profile=self.par_profile))
             print("-" * 60)
         assert self.input_target is not None, _("input_target não foi configurado")
 
+        force = self.force
+        if self._parity_prefetch is not None:
+            if self._use_prefetched_parity(bar):
+                return True
+            force = True  # o lote pode ter deixado um PAR2 parcial
+
+        if self.par2_split and not self.dry_run:
+            split_ok = self._run_split_parity(bar)
+            if split_ok is not None:
+                return split_ok
+
         # Se ramdisk foi configurado, o PAR2 será gerado lá
         if self.ramdisk_path:
             base = os.path.basename(self.input_target)
@@ -788,7 +880,7 @@ class UpaPastaOrchestrator:
             rc = make_parity(
                 self.input_target,
                 redundancy=self.redundancy,
-                force=self.force,
+                force=force,
                 backend=self.backend,
                 usenet=True,
                 post_size=self.post_size,
@@ -801,6 +893,7 @@ class UpaPastaOrchestrator:
                 dry_run=self.dry_run,
                 bar=bar,
                 output_dir=self.ramdisk_path,
+                article_size=self._article_size(),
             )
         except (FileNotFoundError, PermissionError, OSError) as e:
             if not bar:
@@ -814,8 +907,8 @@ class UpaPastaOrchestrator:
 
         if rc != 0:
             if self.ramdisk_path:
-                dev_shm_stat = os.statvfs("/dev/shm")
-                available = dev_shm_stat.f_bavail * dev_shm_stat.f_frsize
+                ramdisk_stat = os.statvfs(self.ramdisk_path)
+                available = ramdisk_stat.f_bavail * ramdisk_stat.f_frsize
                 estimated_used = self._estimate_par2_size()
 
                 if available < (estimated_used * 0.1):
@@ -855,6 +948,7 @@ class UpaPastaOrchestrator:
                         dry_run=self.dry_run,
                         bar=bar,
                         output_dir=None,
+                        article_size=self._article_size(),
                     )
 
                     if rc != 0:
@@ -906,8 +1000,9 @@ class UpaPastaOrchestrator:
             print("-" * 60)
         return True
 
-    def run_upload(self, bar: Optional[PhaseBar] = None) -> bool:
-        if not self.input_target:
+    def run_upload(self, bar: Optional[PhaseBar] = None, feed: Optional[VolumeFeed] = None) -> bool:
+        target = feed.archive_path if feed is not None else self.input_target
+        if not target:
             if not bar:
                 print(_("Erro: caminho de entrada não definido."))
             return False
@@ -917,17 +1012,17 @@ class UpaPastaOrchestrator:
             print("=" * 60)
 
         try:
-            assert self.input_target is not None, _("input_target não foi configurado")
             if self.nzb_conflict:
                 self.env_vars["NZB_CONFLICT"] = self.nzb_conflict
 
-            # Resolve NZB uma única vez aqui
+            # O NZB fica ao lado da entrada mesmo com os volumes num scratch dir.
+            nzb_dir = str(self.input_path.parent) if self._staging_dir else os.path.dirname(target)
             nzb_rel, nzb_abs = resolve_nzb_out(
-                self.input_target,
+                target,
                 self.env_vars,
-                os.path.isdir(self.input_target),
+                os.path.isdir(target),
                 self.skip_rar,
-                os.path.dirname(self.input_target),
+                nzb_dir,
                 self.obfuscated_map or None,
             )
 
@@ -936,7 +1031,7 @@ class UpaPastaOrchestrator:
             from .nzb import handle_nzb_conflict
 
             _nzb_rel, nzb_abs, _nzb_overwrite, ok = handle_nzb_conflict(
-                nzb_rel, nzb_abs, self.env_vars, working_dir=os.path.dirname(self.input_target)
+                nzb_rel, nzb_abs, self.env_vars, working_dir=nzb_dir
             )
             if not ok:
                 return False
@@ -944,7 +1039,7 @@ class UpaPastaOrchestrator:
             self.generated_nzb = nzb_abs
 
             rc = upload_to_usenet(
-                self.input_target,
+                target,
                 env_vars=self.env_vars,
                 dry_run=self.dry_run,
                 subject=self.subject,
@@ -961,6 +1056,7 @@ class UpaPastaOrchestrator:
                 bar=bar,
                 nzb_out_abs=self.generated_nzb,
                 verify_uploads=self.verify_uploads,
+                verify_articles=self.verify_articles,
                 check_delay=self.check_delay,
                 check_retry_delay=self.check_retry_delay,
                 check_tries=self.check_tries,
@@ -968,8 +1064,13 @@ class UpaPastaOrchestrator:
                 check_port=self.check_port,
                 check_user=self.check_user,
                 check_password=self.check_password,
-                redundancy=self.redundancy or 0,
+                # No streaming o PAR2 é local e postado no fim; pesto não gera outro.
+                redundancy=0 if feed is not None else self.redundancy or 0,
                 obfuscate=self.obfuscate,
+                server_probe=self._server_probe,
+                feed=feed,
+                article_size_bytes=self._layout.article_size if self._layout else None,
+                post_names=self._post_names or None,
             )
             return rc == 0
         except (FileNotFoundError, PermissionError, OSError) as e:
@@ -984,14 +1085,21 @@ class UpaPastaOrchestrator:
         self._cleanup_par2_symlinks()
         self._cleanup_ramdisk()
         self._do_cleanup(on_error=False)
+        self._cleanup_staging(discard=not self.keep_files)
 
     def _cleanup_on_error(self, preserve_rar: bool = False) -> None:
+        if self._feed is not None and self._streamed_upload is not None:
+            # Para o upload em streaming antes de apagar os volumes.
+            self._feed.abort()
+            self._streamed_upload.result()
+        self._discard_manifests()
         if self._extensionless_map:
             revert_extensionless(self._extensionless_map)
             self._extensionless_map = {}
         self._cleanup_par2_symlinks()
         self._cleanup_ramdisk()
         self._do_cleanup(on_error=True, preserve_rar=preserve_rar)
+        self._cleanup_staging(discard=not preserve_rar)
         self._revert_obfuscation()
 
     def _revert_extension_normalization(self) -> None:
@@ -1005,6 +1113,9 @@ class UpaPastaOrchestrator:
             self._extensionless_map = {}
 
     def _revert_obfuscation(self) -> None:
+        if self.obfuscate_metadata:
+            # --obfuscate-metadata: nada foi renomeado no disco.
+            return
         self.input_target = revert_obfuscation(
             self.obfuscate,
             self.input_target,
@@ -1014,6 +1125,123 @@ class UpaPastaOrchestrator:
             self.keep_files,
         )
 
+    @property
+    def settings(self) -> Settings:
+        """Configuração do .env desta execução (carregada uma vez, via cache de load_settings)."""
+        if self._settings is None:
+            self._settings = load_settings(self.env_file)
+        return self._settings
+
+    def _start_indexer_check(self, name: str) -> Optional[Future[Any]]:
+        """
+        Dispara a busca do --check-indexer em background e devolve o Future.
+
+        Só a parte de rede roda fora da thread principal; o prompt interativo
+        acontece antes do UPLOAD, quando o resultado já costuma estar pronto.
+        """
+        if not self.check_indexer or self.skip_upload or self.dry_run:
+            return None
+        from .indexer import find_on_indexers
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="indexer-check")
+        future = pool.submit(find_on_indexers, name, self.env_vars)
+        pool.shutdown(wait=False)
+        return future
+
+    def _start_server_probe(self) -> Optional[Future[Any]]:
+        """
+        Sonda em background todos os servidores NNTP (failover e --check-host)
+        enquanto PACK/PAR2 rodam; o upload usa o resultado para ordenar o failover.
+        """
+        if self.skip_upload or self.dry_run:
+            return None
+        from .upfolder import _build_server_list
+
+        servers: list[dict[str, object]] = list(_build_server_list(self.env_vars))
+        if self.check_host:
+            primary = servers[0] if servers else {}
+            servers.append(
+                {
+                    "host": self.check_host,
+                    "port": self.check_port or primary.get("port", 119),
+                    "ssl": primary.get("ssl", False),
+                    "user": self.check_user or primary.get("user", ""),
+                    "password": self.check_password or primary.get("password", ""),
+                }
+            )
+        # Um servidor só não tem o que ordenar: o próprio upload reporta a falha.
+        if len(servers) < 2:
+            return None
+        from .nntp_test import probe_servers
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nntp-probe")
+        future = pool.submit(probe_servers, servers)
+        pool.shutdown(wait=False)
+        return future
+
+    def _start_manifests(self) -> Optional[Future[list[str]]]:
+        """
+        --checksums: calcula os digests em background enquanto o PAR2 lê os
+        mesmos arquivos (um aproveita o page cache do outro). Os manifestos
+        ficam ao lado do NZB, com o nome do NFO.
+        """
+        if not self.input_target:
+            return None
+        nfo_path, nzb_dir = self._resolve_nfo_path()
+        try:
+            os.makedirs(nzb_dir, exist_ok=True)
+        except OSError:
+            pass
+        from .checksums import start_manifests
+
+        # Metade das threads: o parpar está lendo e calculando ao mesmo tempo.
+        self._manifests_cancel.clear()
+        return start_manifests(
+            self.input_target,
+            os.path.splitext(nfo_path)[0],
+            jobs=max(1, self.par_threads // 2),
+            cancel=self._manifests_cancel,
+        )
+
+    def _finish_manifests(self, bar: Optional[PhaseBar] = None) -> None:
+        """Espera os manifestos; falha neles não interrompe o upload."""
+        if self._manifests is None:
+            return
+        future, self._manifests = self._manifests, None
+        try:
+            written = future.result()
+        except (OSError, ValueError) as e:
+            logger.warning(_("Manifestos de checksum não gerados: {error}").format(error=e))
+            return
+        msg = _("Manifestos de checksum: {names}").format(
+            names=", ".join(os.path.basename(p) for p in written)
+        )
+        if bar:
+            bar.log(msg)
+        else:
+            print(msg)
+
+    def _discard_manifests(self) -> None:
+        """
+        Job abortado: interrompe o hashing (no próximo bloco lido) e apaga os
+        manifestos, se já tinham sido gravados.
+        """
+        if self._manifests is None:
+            return
+        from .checksums import HashCancelled
+
+        future, self._manifests = self._manifests, None
+        self._manifests_cancel.set()
+        try:
+            written = future.result()
+        except (HashCancelled, OSError, ValueError):
+            return
+        for path in written:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
     def check_nzb_conflict_early(self) -> bool:
         return self._path_resolver().check_nzb_conflict(
             self.input_target, self.skip_upload, self.dry_run
@@ -1208,29 +1436,454 @@ class UpaPastaOrchestrator:
             finally:
                 self.ramdisk_path = None
 
+    def _plan_layout(self) -> Layout:
+        """Artigo, slice do PAR2 e volumes alinhados para este job (ver layout.py)."""
+        user_slice = parse_size(self.par_slice_size) if self.par_slice_size else None
+        layout = plan_layout(
+            get_total_size(str(self.input_path)),
+            self.settings.article_size_bytes,
+            jitter=self.obfuscate,
+            slice_size=user_slice,
+        )
+        logger.debug(
+            "Layout: artigo=%d slice=%d (%d artigos) volume=%s (%d artigos)",
+            layout.article_size,
+            layout.slice_size,
+            layout.articles_per_slice(),
+            layout.volume_size,
+            layout.articles_per_volume(),
+        )
+        return layout
+
+    def _article_size(self) -> int:
+        return self._layout.article_size if self._layout else self.settings.article_size_bytes
+
+    def _volume_multiple(self) -> Optional[int]:
+        return self._layout.volume_multiple() if self._layout else None
+
+    def _archive_dir(self) -> str:
+        """Onde o rar/7z grava os volumes: o scratch escolhido ou a pasta da entrada."""
+        return self._staging_dir or str(self.input_path.parent)
+
+    def _plan_scratch(self, bar: PhaseBar) -> Optional[ScratchPlan]:
+        """
+        SCRATCH_DIRS / --scratch-dir: escolhe onde gravar volumes e PAR2 deste
+        job. Sem diretórios configurados vale o comportamento de sempre
+        (volumes ao lado da entrada, PAR2 no ramdisk quando ativo).
+        """
+        dirs = self.scratch_dirs + parse_scratch_dirs(self.settings.get_str("SCRATCH_DIRS"))
+        if not dirs or self.dry_run or (self.skip_rar and self.skip_par):
+            return None
+        total = get_total_size(str(self.input_path))
+        archive_bytes = 0 if self.skip_rar else total
+        parity_bytes = (
+            0
+            if self.skip_par or self.pesto_par2
+            else max(int(total * (self.redundancy or 10) / 100), 50 * 1024 * 1024)
+        )
+        locations = discover_locations(
+            str(self.input_path.parent), dirs, use_tmpfs=self.use_ramdisk
+        )
+        plan = plan_scratch(locations, archive_bytes, parity_bytes)
+        for loc in locations:
+            logger.debug("Scratch: %s", loc.label())
+        bar.log(
+            _("🗂️  Scratch: volumes → {archive} | PAR2 → {parity}").format(
+                archive=plan.archive[0].path if plan.archive else "-",
+                parity=plan.parity[0].path if plan.parity else "-",
+            )
+        )
+        return plan
+
+    def _stage_archive(self, bar: PhaseBar) -> None:
+        """Cria o diretório de volumes no primeiro destino do plano que aceitar."""
+        assert self._scratch is not None
+        self._staging_dir = None
+        while self._scratch.archive and self._scratch.archive[0].kind != "input":
+            loc = self._scratch.archive[0]
+            try:
+                self._staging_dir = tempfile.mkdtemp(prefix="upapasta_pack_", dir=loc.path)
+            except OSError as e:
+                logger.warning(
+                    _("Scratch {path} indisponível ({error})").format(path=loc.path, error=e)
+                )
+                self._scratch.archive.pop(0)
+                continue
+            bar.log(_("📦 Volumes serão gravados em {path}").format(path=self._staging_dir))
+            return
+
+    def _spill_archive(self, bar: Optional[PhaseBar]) -> bool:
+        """
+        O rar/7z falhou com o scratch cheio (estimativa errada): descarta os
+        volumes parciais e passa para o próximo destino. Não vale com
+        --stream-upload, que já pode ter postado volumes do destino atual.
+        """
+        if self._scratch is None or self._staging_dir is None or self._feed is not None:
+            return False
+        if not out_of_space(self._staging_dir):
+            return False
+        msg = _("⚠️ Sem espaço em {path}. Refazendo os volumes no próximo destino...").format(
+            path=self._staging_dir
+        )
+        if bar:
+            bar.log(msg)
+        else:
+            print(msg)
+        if self._overlap is not None:
+            self._overlap.cancel()
+            self._overlap = None
+        shutil.rmtree(self._staging_dir, ignore_errors=True)
+        self._scratch.archive.pop(0)
+        self._stage_archive(bar or QuietBar())
+        return True
+
+    def _stage_parity(self, bar: PhaseBar) -> None:
+        """
+        Escolhe o diretório do PAR2 pelo plano, já com o tamanho real dos
+        volumes. Fora da pasta dos volumes, o PAR2 volta para ela por symlink,
+        como no ramdisk (ramdisk_path); sem espaço ou symlinks, fica ao lado
+        dos volumes.
+        """
+        assert self._scratch is not None and self.input_target is not None
+        archive_dir = os.path.dirname(self.input_target)
+        staged_root = os.path.dirname(self._staging_dir) if self._staging_dir else None
+        required = int(self._estimate_par2_size() * 1.2)
+        for loc in self._scratch.parity:
+            if loc.kind == "input" or loc.path == staged_root:
+                return
+            try:
+                if free_bytes(loc.path) < required:
+                    continue
+            except OSError:
+                continue
+            if not self._test_symlink_support(archive_dir):
+                return
+            try:
+                self.ramdisk_path = tempfile.mkdtemp(prefix="upapasta_par2_", dir=loc.path)
+            except OSError:
+                continue
+            bar.log(_("🛡️  PAR2 será gravado em {path}").format(path=self.ramdisk_path))
+            return
+
+    def _pack_small_files(self, bar: Optional[PhaseBar]) -> bool:
+        """
+        --pack-small: sobe uma cópia da pasta em hardlinks onde os arquivos
+        abaixo do limite viram um único arquivo store-mode. Retorna False só
+        se o compactador falhar.
+        """
+        assert self.pack_small is not None
+        if self.obfuscate or self.resume or not self.input_path.is_dir():
+            logger.info(_("--pack-small ignorado: requer pasta, sem ofuscação nem --resume."))
+            return True
+        plan = plan_hybrid(str(self.input_path), self.pack_small)
+        if plan is None:
+            return True
+        staging = tempfile.mkdtemp(prefix="upapasta_hybrid_", dir=str(self.input_path.parent))
+        tree = build_hybrid_tree(str(self.input_path), plan, staging, self.compressor, bar)
+        if tree is None:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        self._staging_dir = staging
+        self.input_target = tree
+        return True
+
+    def _cleanup_staging(self, discard: bool = False) -> None:
+        """Remove o diretório de volumes do scratch (discard: mesmo com arquivos dentro)."""
+        if not self._staging_dir:
+            return
+        if discard:
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+        else:
+            try:
+                os.rmdir(self._staging_dir)
+            except OSError:
+                print(_("📁 Arquivos mantidos em {path}").format(path=self._staging_dir))
+        self._staging_dir = None
+
+    def _start_par2_overlap(self, bar: PhaseBar) -> Optional[OverlappedParity]:
+        """
+        --par2-overlap: inicia a geração de PAR2 por lotes de volumes RAR em
+        paralelo ao PACK. Só vale para RAR em volumes com parpar (os nomes
+        finais dos volumes vão para o PAR2 via --input-name).
+        """
+        if (
+            self.par2_overlap < 1
+            or self.skip_rar
+            or self.skip_par
+            or self.pesto_par2
+            or self.dry_run
+            or self.compressor != "rar"
+            or self.backend != "parpar"
+            or not self.input_path.is_dir()
+        ):
+            return None
+        expected = planned_volumes(str(self.input_path), self._volume_multiple())
+        if expected < 2:
+            return None
+
+        quiet = QuietBar(bar)
+
+        def make_set(files: list[str], names: list[str], set_name: str) -> int:
+            return make_parity(
+                files[0],
+                redundancy=self.redundancy,
+                force=True,
+                backend=self.backend,
+                usenet=True,
+                post_size=self.post_size,
+                threads=self.par_threads,
+                profile=self.par_profile,
+                slice_size=self.par_slice_size,
+                memory_mb=self.par_memory_mb,
+                filepath_format=self.filepath_format,
+                parpar_extra_args=self.parpar_extra_args,
+                bar=quiet,
+                input_names=names,
+                article_size=self._article_size(),
+                input_files=files,
+                par2_name=set_name,
+            )
+
+        bar.log(
+            _("🛡️  PAR2 sobreposto ao PACK: {sets} conjunto(s) para ~{vols} volumes").format(
+                sets=min(self.par2_overlap, expected), vols=expected
+            )
+        )
+        rar_base = os.path.join(self._archive_dir(), self.input_path.name)
+        return OverlappedParity(
+            rar_base, expected, make_set, sets=self.par2_overlap, bar=bar
+        ).start()
+
+    def _finish_par2_overlap(self, overlap: OverlappedParity, bar: PhaseBar) -> bool:
+        """Conclui os conjuntos sobrepostos; se falharem, gera o PAR2 do jeito normal."""
+        if overlap.finish():
+            self.par_file = overlap.par2_files()[0]
+            return True
+        bar.log(_("⚠️ PAR2 sobreposto incompleto. Gerando paridade única..."))
+        for f in glob.glob(glob.escape(overlap.rar_base) + ".set*.par2"):
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+        return self.run_makepar(bar=bar)
+
+    def _run_split_parity(self, bar: Optional[PhaseBar]) -> Optional[bool]:
+        """
+        --par2-split: gera um conjunto PAR2 independente por parte da entrada,
+        em paralelo. None quando a divisão não se aplica (parte única, backend
+        par2) — o chamador gera o conjunto único de sempre.
+        """
+        assert self.input_target is not None
+        assert self.par2_split is not None
+        from .tools import tool_path
+
+        if self.backend not in ("parpar", "auto") or tool_path("parpar") is None:
+            logger.warning(_("--par2-split requer parpar; gerando conjunto único."))
+            return None
+        mode, value = parse_split_spec(self.par2_split)
+        parts = partition(self.input_target, mode, value)
+        if len(parts) < 2:
+            return None
+
+        target = self.input_target
+        name = os.path.basename(target)
+        if not os.path.isdir(target):
+            name = re.sub(r"\.part\d+$", "", os.path.splitext(name)[0])
+        out_dir = self.ramdisk_path or os.path.dirname(target)
+        # Caminhos gravados como no conjunto único (prefixo comum da entrada inteira).
+        base_dir = os.path.commonpath([os.path.dirname(f) for part in parts for f in part])
+        quiet = QuietBar(bar)
+
+        def make_set(
+            files: list[str], set_name: str, threads: int, memory_mb: Optional[int]
+        ) -> int:
+            return make_parity(
+                files[0],
+                redundancy=self.redundancy,
+                force=True,
+                backend="parpar",
+                usenet=True,
+                post_size=self.post_size,
+                threads=threads,
+                profile=self.par_profile,
+                slice_size=self.par_slice_size,
+                memory_mb=memory_mb,
+                filepath_format=self.filepath_format,
+                parpar_extra_args=self.parpar_extra_args,
+                bar=quiet,
+                output_dir=out_dir,
+                article_size=self._article_size(),
+                input_files=files,
+                par2_name=set_name,
+                filepath_base=base_dir,
+            )
+
+        memory_mb = self.par_memory_mb
+        if memory_mb is None:
+            limit = get_parpar_memory_limit()
+            memory_mb = parse_size(limit) // (1024 * 1024) if limit else None
+        split = SplitParity(
+            name,
+            parts,
+            make_set,
+            jobs=self.par2_jobs,
+            threads=self.par_threads,
+            memory_mb=memory_mb,
+            bar=bar,
+        )
+        msg = _("🛡️  PAR2 dividido: {sets} conjunto(s) ({mode}), {jobs} por vez").format(
+            sets=len(split.sets), mode=mode, jobs=split.jobs
+        )
+        if bar:
+            bar.log(msg)
+        else:
+            print(msg)
+        ok = split.run()
+        self.par_file = os.path.join(out_dir, split.sets[0].name + ".par2")
+        return ok
+
+    def can_prefetch_parity(self, max_bytes: int) -> bool:
+        """
+        --par2-batch: o PAR2 deste item pode ser gerado antes de run()? Só
+        arquivos únicos até max_bytes postados sem compactação nem ofuscação —
+        o caso em que o PAR2 depende apenas do arquivo de entrada. Um PAR2 já
+        existente só é refeito com --force.
+        """
+        from .tools import tool_path
+
+        if (
+            not self.skip_rar
+            or self.skip_par
+            or self.dry_run
+            or self.obfuscate
+            or self.resume
+            or self.pack_small
+            or self.par2_split
+            or not self.input_path.is_file()
+        ):
+            return False
+        if not self.skip_upload and tool_path("pesto") is not None:
+            return False  # o pesto gera o PAR2 durante o upload
+        if self.rename_extensionless and not self.input_path.suffix:
+            return False  # o arquivo será renomeado antes da etapa PAR2
+        if not self.force and os.path.exists(PathResolver.par_file_path(str(self.input_path))):
+            return False
+        try:
+            return self.input_path.stat().st_size <= max_bytes
+        except OSError:
+            return False
+
+    def prefetch_parity(self, threads: int, memory_mb: Optional[int]) -> int:
+        """Gera o PAR2 do item ao lado da entrada (worker do lote; sem saída no terminal)."""
+        return make_parity(
+            str(self.input_path),
+            redundancy=self.redundancy,
+            force=self.force,
+            backend=self.backend,
+            usenet=True,
+            post_size=self.post_size,
+            threads=threads,
+            profile=self.par_profile,
+            slice_size=self.par_slice_size,
+            memory_mb=memory_mb,
+            filepath_format=self.filepath_format,
+            parpar_extra_args=self.parpar_extra_args,
+            bar=QuietBar(),
+            article_size=self._article_size(),
+        )
+
+    def attach_parity_prefetch(self, future: Future[int]) -> None:
+        self._parity_prefetch = future
+
+    def parity_prefetch_pending(self) -> bool:
+        """True se o PAR2 do lote ainda não foi consumido por run()."""
+        return self._parity_prefetch is not None
+
+    def _use_prefetched_parity(self, bar: Optional[PhaseBar]) -> bool:
+        """Usa o PAR2 gerado pelo lote; False (e geração normal) se ele falhou."""
+        assert self._parity_prefetch is not None and self.input_target is not None
+        future, self._parity_prefetch = self._parity_prefetch, None
+        try:
+            rc: Optional[int] = future.result()
+        except Exception:
+            rc = None
+        par_file = PathResolver.par_file_path(self.input_target)
+        if rc == 0 and self.input_target == str(self.input_path) and os.path.exists(par_file):
+            self.par_file = par_file
+            msg = _("🛡️  PAR2 gerado em lote: {name}").format(name=os.path.basename(par_file))
+            if bar:
+                bar.log(msg)
+            else:
+                print(msg)
+            return True
+        logger.warning(_("PAR2 do lote indisponível (código {rc}); gerando agora.").format(rc=rc))
+        return False
+
+    def _can_stream_upload(self) -> bool:
+        """--stream-upload vale para RAR em volumes postado sem ofuscação nem resume."""
+        if not self.stream_upload:
+            return False
+        if (
+            self.skip_rar
+            or self.skip_upload
+            or self.dry_run
+            or self.compressor != "rar"
+            or self.obfuscate
+            or self.resume
+            or self.check_indexer
+            or not self.input_path.is_dir()
+        ):
+            logger.info(
+                _(
+                    "--stream-upload ignorado: requer pasta compactada com RAR, upload ativo, "
+                    "sem ofuscação, --resume ou --check-indexer."
+                )
+            )
+            return False
+        return planned_volumes(str(self.input_path), self._volume_multiple()) > 1
+
+    def _start_stream_upload(self, bar: PhaseBar) -> tuple[VolumeFeed, Future[bool]]:
+        """Dispara o upload em background; ele posta os volumes à medida que o rar os fecha."""
+        feed = VolumeFeed(
+            os.path.join(self._archive_dir(), self.input_path.name),
+            expected_bytes=get_total_size(str(self.input_path)),
+            expected_volumes=planned_volumes(str(self.input_path), self._volume_multiple()),
+        )
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-upload")
+        future = pool.submit(self.run_upload, QuietBar(bar), feed)
+        pool.shutdown(wait=False)
+        bar.log(_("📤 Upload em streaming: volumes serão postados assim que fechados."))
+        return feed, future
+
     def run(self) -> int:
         total_start = time.time()
 
-        from .config import load_env_file
-
-        self.env_vars = load_env_file(self.env_file)
+        self._settings = load_settings(self.env_file)
+        self.env_vars = self._settings.to_dict()
 
         if not self.skip_upload:
             self.env_vars = check_or_prompt_credentials(self.env_file)
             if not self.env_vars:
                 return 3
+            # O wizard pode ter (re)escrito o .env.
+            self._settings = load_settings(self.env_file)
 
         if not self.validate():
             return 1
 
-        from .upfolder import find_pesto
+        from .tools import tool_path
 
-        pesto_path = find_pesto()
+        pesto_path = tool_path("pesto")
         use_pesto = pesto_path is not None and not self.skip_upload
 
+        self._layout = self._plan_layout()
+
+        # No streaming o PAR2 é gerado localmente e postado depois dos volumes.
+        self._streaming = self._can_stream_upload()
+
         # Se pesto for usado, ele cuida do PAR2 e OBF nativamente
         if use_pesto:
-            if not self.skip_par:
+            if not self.skip_par and not self._streaming:
                 logger.info(_("🛡️  Pesto detectado: geração de PAR2 será delegada ao uploader."))
                 self.skip_par = True
                 self.pesto_par2 = True
@@ -1251,11 +1904,9 @@ class UpaPastaOrchestrator:
             self._manual_obf_needed = self.obfuscate
 
         res, rar_src, par_src = self._recalculate_resources()
-        nntp_connections = int(
-            self.env_vars.get("NNTP_CONNECTIONS") or os.environ.get("NNTP_CONNECTIONS", "10")
-        )
+        nntp_connections = self.settings.nntp_connections
         total_bytes = get_total_size(str(self.input_path))
-        eta_s = int(total_bytes / (nntp_connections * 500 * 1024))
+        eta_s = int(total_bytes / estimate_upload_bps(self.settings, nntp_connections))
         eta_str = format_time(eta_s) if eta_s > 0 else _("N/A")
 
         PipelineReporter.print_header(
@@ -1311,14 +1962,32 @@ class UpaPastaOrchestrator:
             if not self.check_nzb_conflict_early():
                 return 3
 
+            # ── Indexer check (rede em background, sobreposta a PACK/PAR2) ───────
+            # Usa o subject antes da ofuscação, que o substituiria por um nome aleatório.
+            indexer_query = self.subject
+            indexer_check = self._start_indexer_check(indexer_query)
+            self._server_probe = self._start_server_probe()
+
+            # ── SCRATCH (onde gravar volumes e PAR2) ─────────────────────────────
+            self._scratch = self._plan_scratch(bar)
+            if self._scratch is not None and not self.skip_rar:
+                self._stage_archive(bar)
+
             # ── COMPRESSION ──────────────────────────────────────────────────────
             will_create_rar = not self.skip_rar
             if will_create_rar:
                 bar.start("PACK")
+                self._overlap = self._start_par2_overlap(bar)
+                if self._streaming:
+                    self._feed, self._streamed_upload = self._start_stream_upload(bar)
                 if not self.run_compression(bar=bar):
+                    if self._overlap is not None:
+                        self._overlap.cancel()
                     bar.error("PACK")
                     self._cleanup_on_error()
                     return 1
+                if self._feed is not None:
+                    self._feed.mark_packed(True)
                 bar.log(_("Arquivo compactado criado com sucesso."))
                 bar.done("PACK")
             else:
@@ -1332,13 +2001,28 @@ class UpaPastaOrchestrator:
                 self._extensionless_map = normalize_extensionless(target)
 
             # ── PAR2 ─────────────────────────────────────────────────────────────
-            if self.use_ramdisk and not self.skip_par:
+            if self._scratch is not None:
+                if not self.skip_par and self._overlap is None and self._parity_prefetch is None:
+                    self._stage_parity(bar)
+            elif (
+                self.use_ramdisk
+                and not self.skip_par
+                and self._overlap is None
+                and self._parity_prefetch is None
+            ):
                 bar.log(_("💾 Configurando ramdisk para PAR2 (zero-copy)..."))
                 self._setup_ramdisk()
 
+            if self.checksums and not self.dry_run:
+                self._manifests = self._start_manifests()
+
             if not self.skip_par:
                 bar.start("PAR2")
-                if not self.run_makepar(bar=bar):
+                if self._overlap is not None:
+                    par_ok = self._finish_par2_overlap(self._overlap, bar)
+                else:
+                    par_ok = self.run_makepar(bar=bar)
+                if not par_ok:
                     bar.error("PAR2")
                     self._cleanup_on_error(preserve_rar=True)
                     return 2
@@ -1348,6 +2032,7 @@ class UpaPastaOrchestrator:
                 if not self.run_makepar(bar=bar):
                     self._cleanup_on_error()
                     return 2
+            self._finish_manifests(bar)
 
             # ── SYMLINKS DO RAMDISK (zero-copy) ─────────────────────────────────
             # Sempre criar symlinks se ramdisk está ativo, para que upload/obfuscation
@@ -1358,6 +2043,10 @@ class UpaPastaOrchestrator:
                     self._cleanup_on_error()
                     return 2
 
+            if self._feed is not None:
+                rar_base = self._feed.rar_base
+                self._feed.set_parity(sorted(glob.glob(glob.escape(rar_base) + "*.par2")))
+
             # ── OBFUSCATION ──────────────────────────────────────────────────────
             if self._manual_obf_needed and not self.dry_run:
                 bar.start("OBF")
@@ -1373,10 +2062,14 @@ class UpaPastaOrchestrator:
             stats = PipelineReporter.collect_stats(self.input_target, self.rar_file, self.par_file)
 
             # ── Indexer check ────────────────────────────────────────────────────
-            if self.check_indexer and not self.skip_upload and not self.dry_run:
+            if indexer_check is not None:
                 from .indexer import check_and_prompt
 
-                skip = check_and_prompt(self.subject, self.env_vars)
+                try:
+                    hit = indexer_check.result()
+                except Exception:
+                    hit = None  # check_and_prompt refaz a busca e reporta o erro
+                skip = check_and_prompt(indexer_query, self.env_vars, hit=hit)
                 if skip:
                     bar.skip("UPLOAD")
                     bar.done("DONE")
@@ -1385,7 +2078,11 @@ class UpaPastaOrchestrator:
             # ── Upload ───────────────────────────────────────────────────────────
             if not self.skip_upload:
                 bar.start("UPLOAD")
-                if not self.run_upload(bar=bar):
+                if self._streamed_upload is not None:
+                    upload_ok = self._streamed_upload.result()
+                else:
+                    upload_ok = self.run_upload(bar=bar)
+                if not upload_ok:
                     bar.error("UPLOAD")
                     self._cleanup_on_error()
                     return 3
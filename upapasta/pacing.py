@@ -0,0 +1,263 @@
+"""
+pacing.py
+
+Ajuste adaptativo (AIMD) do número de conexões do poster, por servidor NNTP.
+
+NNTP_CONNECTIONS passa a ser o teto (limite do plano). A cada execução do
+poster (arquivo, stripe, nova tentativa ou job seguinte) mede-se a vazão —
+velocidade dos eventos segment_done do pesto, ou bytes/tempo no nyuu — e os
+erros reportados:
+
+  - taxa de erros acima de _ERROR_RATE, ou falha por timeout / excesso de
+    conexões → redução multiplicativa (falhas de outro tipo — autenticação,
+    NZB, disco — não entram na conta);
+  - vazão melhor que a do melhor ponto conhecido → aumento aditivo;
+  - mais conexões sem ganho de vazão (joelho da curva) → volta ao melhor ponto.
+
+O estado fica em ~/.config/upapasta/pacing_cache.json e alimenta também a
+estimativa de ETA do orquestrador. NNTP_ADAPTIVE_CONNECTIONS=false desliga.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Mapping, Optional
+
+from .json_cache import read_json, write_json
+from .tools import get_app_data_dir
+
+_CACHE_VERSION = 1
+_DECREASE = 0.75  # fator da redução multiplicativa
+_STEP_FRACTION = 0.1  # aumento aditivo: 10% do teto (mín. 1 conexão)
+_KNEE_MARGIN = 0.05  # ganho mínimo de vazão para manter o aumento
+_ERROR_RATE = 0.01  # erros por segmento acima disso contam como congestionamento
+_EWMA = 0.5  # peso da nova medida de vazão por conexão
+_MIN_SAMPLE_BYTES = 64 * 1024 * 1024  # uploads menores não medem a vazão de forma útil
+_DEFAULT_CONN_BPS = 500 * 1024  # estimativa sem histórico: 500 KB/s por conexão
+
+_SPEED_RE = re.compile(r"([\d.]+)\s*([KMGT]?)(i?)B/s", re.I)
+_UNITS = {"": 0, "K": 1, "M": 2, "G": 3, "T": 4}
+# Mensagens do poster que indicam limite de conexões ou de vazão do servidor.
+_CONGESTION_RE = re.compile(
+    r"time[d ]?\s?out|too many connections|connection limit|ECONNRESET|socket hang up|\b502\b",
+    re.I,
+)
+
+
+def parse_speed(text: str) -> Optional[float]:
+    """Converte '12.3 MB/s', '850 KiB/s' etc. em bytes/s."""
+    m = _SPEED_RE.search(text)
+    if not m:
+        return None
+    try:
+        value = float(m.group(1))
+    except ValueError:
+        return None
+    scale: int = 1024 ** _UNITS[m.group(2).upper()]
+    return value * scale
+
+
+def server_key(host: object, port: object, user: object) -> str:
+    return f"{user}@{host}:{port}"
+
+
+def _srv_key(srv: Mapping[str, object]) -> str:
+    return server_key(srv.get("host", ""), srv.get("port", "119"), srv.get("user", ""))
+
+
+def _srv_limit(srv: Mapping[str, object]) -> int:
+    try:
+        return max(1, int(str(srv.get("connections") or 1)))
+    except ValueError:
+        return 1
+
+
+@dataclass
+class UploadSample:
+    """Observações de uma execução do poster num servidor."""
+
+    connections: int
+    total_bytes: int = 0
+    speeds: list[float] = field(default_factory=list)
+    errors: int = 0
+    congested: bool = False
+    started: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    def observe(self, ev: Mapping[str, Any]) -> None:
+        """Consome um evento JSON do pesto."""
+        ev_type = ev.get("type", "")
+        if ev_type == "started":
+            total = ev.get("total_bytes")
+            if isinstance(total, (int, float)) and total > 0:
+                self.total_bytes = int(total)
+        elif ev_type == "segment_done":
+            bps = ev.get("speed_bps")
+            if not isinstance(bps, (int, float)):
+                bps = parse_speed(str(ev.get("speed_human", "")))
+            if bps:
+                self.speeds.append(float(bps))
+            # Contadores cumulativos, quando a versão do pesto os informa.
+            for key in ("errors", "retries"):
+                value = ev.get(key)
+                if isinstance(value, int):
+                    self.errors = max(self.errors, value)
+        elif ev_type in ("segment_failed", "retry"):
+            self.errors += 1
+        elif ev_type == "failed":
+            self.note(str(ev.get("description", "")))
+
+    def note(self, text: str) -> None:
+        """Linha de erro do poster; marca congestionamento se for de conexão/vazão."""
+        if _CONGESTION_RE.search(text):
+            self.congested = True
+
+    def finish(self) -> UploadSample:
+        self.elapsed = time.monotonic() - self.started
+        return self
+
+    def throughput(self) -> float:
+        """Vazão em bytes/s: mediana das velocidades do pesto, ou bytes/tempo."""
+        if self.speeds:
+            # A primeira metade inclui o handshake das conexões.
+            return statistics.median(self.speeds[len(self.speeds) // 2 :])
+        if self.elapsed > 0:
+            return self.total_bytes / self.elapsed
+        return 0.0
+
+    def error_rate(self) -> float:
+        return self.errors / max(1, len(self.speeds))
+
+
+@dataclass
+class ServerPacing:
+    connections: int
+    best_connections: int
+    best_bps: float = 0.0
+    per_conn_bps: float = 0.0
+
+
+class ConnectionTuner:
+    """Estado AIMD por servidor, compartilhado pelas threads do processo."""
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._servers: Optional[dict[str, ServerPacing]] = None
+
+    def connections_for(self, srv: Mapping[str, object]) -> int:
+        """Conexões para a próxima execução: o valor aprendido, limitado pelo teto."""
+        limit = _srv_limit(srv)
+        with self._lock:
+            state = self._load().get(_srv_key(srv))
+        return min(limit, state.connections) if state else limit
+
+    def estimate_bps(self, key: str, connections: int) -> Optional[float]:
+        """Vazão esperada (bytes/s) com até `connections` conexões, se já medida."""
+        with self._lock:
+            state = self._load().get(key)
+        if state is None or not state.per_conn_bps:
+            return None
+        return state.per_conn_bps * min(connections, state.connections)
+
+    def record(self, srv: Mapping[str, object], sample: UploadSample, failed: bool) -> int:
+        """
+        Atualiza o servidor com uma execução e retorna as conexões da próxima.
+        Uma falha sem sinal de congestionamento (sample.congested) não é medida.
+        """
+        limit = _srv_limit(srv)
+        n = max(1, min(sample.connections, limit))
+        with self._lock:
+            servers = self._load()
+            key = _srv_key(srv)
+            state = servers.get(key) or ServerPacing(connections=n, best_connections=n)
+            if sample.congested or sample.error_rate() > _ERROR_RATE:
+                state.connections = max(1, int(n * _DECREASE))
+                if n <= state.best_connections:
+                    state.best_connections = state.connections
+                    state.best_bps = 0.0
+            elif failed:
+                return min(limit, state.connections)
+            elif sample.total_bytes >= _MIN_SAMPLE_BYTES and (bps := sample.throughput()) > 0:
+                state.per_conn_bps = (
+                    bps / n
+                    if not state.per_conn_bps
+                    else _EWMA * (bps / n) + (1 - _EWMA) * state.per_conn_bps
+                )
+                if n > state.best_connections and bps <= state.best_bps * (1 + _KNEE_MARGIN):
+                    # Passou do joelho: mais conexões não renderam mais vazão.
+                    state.connections = state.best_connections
+                else:
+                    # Mesmo ponto medido de novo substitui a medida antiga (a
+                    # vazão do provedor varia com a hora do dia).
+                    if n == state.best_connections or bps > state.best_bps:
+                        state.best_connections, state.best_bps = n, bps
+                    state.connections = min(limit, n + max(1, int(limit * _STEP_FRACTION)))
+            else:
+                return min(limit, state.connections)
+            state.connections = min(limit, state.connections)
+            servers[key] = state
+            self._persist()
+            return state.connections
+
+    # ── Cache em disco ───────────────────────────────────────────────────────
+
+    def _load(self) -> dict[str, ServerPacing]:
+        if self._servers is None:
+            self._servers = {}
+            data = read_json(self._cache_path)
+            if isinstance(data, dict) and data.get("version") == _CACHE_VERSION:
+                for key, entry in (data.get("servers") or {}).items():
+                    try:
+                        self._servers[key] = ServerPacing(**entry)
+                    except TypeError:
+                        continue
+        return self._servers
+
+    def _persist(self) -> None:
+        if not self._cache_path or self._servers is None:
+            return
+        payload = {
+            "version": _CACHE_VERSION,
+            "servers": {k: asdict(v) for k, v in self._servers.items()},
+        }
+        write_json(self._cache_path, payload)
+
+
+_TUNER: Optional[ConnectionTuner] = None
+_TUNER_LOCK = threading.Lock()
+
+
+def get_tuner() -> ConnectionTuner:
+    """Controlador do processo, com cache em ~/.config/upapasta/pacing_cache.json."""
+    global _TUNER
+    with _TUNER_LOCK:
+        if _TUNER is None:
+            _TUNER = ConnectionTuner(os.path.join(get_app_data_dir(), "pacing_cache.json"))
+        return _TUNER
+
+
+def adaptive_enabled(env_vars: Mapping[str, str]) -> bool:
+    value = env_vars.get("NNTP_ADAPTIVE_CONNECTIONS") or os.environ.get(
+        "NNTP_ADAPTIVE_CONNECTIONS", ""
+    )
+    return value.strip().lower() not in ("false", "0", "no")
+
+
+def estimate_upload_bps(env_vars: Mapping[str, str], connections: int) -> float:
+    """Vazão esperada do servidor primário: medida pelo controlador ou 500 KB/s por conexão."""
+    if adaptive_enabled(env_vars):
+        key = server_key(
+            env_vars.get("NNTP_HOST") or os.environ.get("NNTP_HOST", ""),
+            env_vars.get("NNTP_PORT") or os.environ.get("NNTP_PORT", "119"),
+            env_vars.get("NNTP_USER") or os.environ.get("NNTP_USER", ""),
+        )
+        measured = get_tuner().estimate_bps(key, connections)
+        if measured:
+            return measured
+    return float(connections * _DEFAULT_CONN_BPS)
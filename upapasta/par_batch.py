@@ -0,0 +1,140 @@
+"""
+par_batch.py
+
+--par2-batch: PAR2 dos itens pequenos do --each / --watch gerado em lote,
+à frente do pipeline.
+
+Cada item pequeno (um episódio de 200 MB) paga o custo fixo do parpar —
+subir o Node, montar as tabelas GF, planejar memória — que chega a rivalizar
+com o cálculo em si, e esse custo ficava no caminho crítico entre o upload
+de um item e o do seguinte. Nem o parpar nem o par2cmdline geram vários
+conjuntos independentes numa só chamada, então o lote é um escalonador do
+lado Python: os itens elegíveis entram numa fila de `jobs` workers logo que
+a lista de itens é conhecida, e o PAR2 de cada um fica pronto enquanto os
+anteriores ainda estão sendo postados. Cada worker roda com a sua fatia de
+threads e de memória.
+
+O orquestrador do item consome o resultado na etapa PAR2 (ver
+UpaPastaOrchestrator.prefetch_parity); se o PAR2 do lote falhou, gera do
+jeito normal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .i18n import _
+from .par_utils import get_parpar_memory_limit, parse_size
+
+if TYPE_CHECKING:
+    from .orchestrator import UpaPastaOrchestrator
+
+logger = logging.getLogger("upapasta")
+
+# Itens até este tamanho entram no lote (--par2-batch sem valor).
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+class ParityBatch:
+    """Fila de geração antecipada de PAR2 para os orquestradores de um lote."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        jobs: int = 2,
+        threads: Optional[int] = None,
+        memory_mb: Optional[int] = None,
+    ) -> None:
+        """
+        threads / memory_mb: orçamento total, dividido entre os `jobs` workers
+        (memory_mb=None → o limite automático do parpar, dividido também).
+        """
+        if memory_mb is None:
+            limit = get_parpar_memory_limit()
+            memory_mb = parse_size(limit) // (1024 * 1024) if limit else None
+        self.max_bytes = max_bytes
+        self.jobs = max(1, jobs)
+        self.threads = max(1, (threads or os.cpu_count() or 4) // self.jobs)
+        self.memory_mb = max(256, memory_mb // self.jobs) if memory_mb else None
+        self._pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="par2-batch")
+        self._queued: list[tuple[UpaPastaOrchestrator, Future[int]]] = []
+        self._created: dict[UpaPastaOrchestrator, list[str]] = {}
+
+    def add(self, orch: UpaPastaOrchestrator) -> bool:
+        """Enfileira o PAR2 do item, se ele for elegível. True se entrou no lote."""
+        if not orch.can_prefetch_parity(self.max_bytes):
+            return False
+        future = self._pool.submit(self._generate, orch)
+        orch.attach_parity_prefetch(future)
+        self._queued.append((orch, future))
+        return True
+
+    def _generate(self, orch: UpaPastaOrchestrator) -> int:
+        """Worker: gera o PAR2 do item e anota os arquivos que ele criou."""
+        before = set(_parity_files(orch))
+        try:
+            return orch.prefetch_parity(self.threads, self.memory_mb)
+        finally:
+            self._created[orch] = [f for f in _parity_files(orch) if f not in before]
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def close(self) -> None:
+        """
+        Cancela o que não começou e apaga o PAR2 que o lote gerou para itens
+        que não chegaram a consumi-lo (lote interrompido), para não sobrar .par2
+        órfão ao lado da entrada. Arquivos que já existiam ficam.
+        """
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for orch, _future in self._queued:
+            if not orch.parity_prefetch_pending():
+                continue
+            for f in self._created.get(orch, []):
+                try:
+                    os.remove(f)
+                except OSError:
+                    logger.debug(_("Falha ao remover PAR2 do lote: {path}").format(path=f))
+        self._queued.clear()
+        self._created.clear()
+
+
+def _parity_files(orch: UpaPastaOrchestrator) -> list[str]:
+    stem = glob.escape(os.path.splitext(str(orch.input_path))[0])
+    return glob.glob(stem + ".par2") + glob.glob(stem + ".vol*.par2")
+
+
+def start_parity_batch(
+    args: argparse.Namespace, items: list[Path]
+) -> tuple[Optional[ParityBatch], dict[Path, UpaPastaOrchestrator]]:
+    """
+    Com --par2-batch, cria já os orquestradores dos itens e enfileira o PAR2
+    dos elegíveis. Retorna o lote (None sem --par2-batch) e os orquestradores
+    por item, para o laço do --each / --watch reaproveitar.
+    """
+    raw = getattr(args, "par2_batch", None)
+    if not raw or getattr(args, "dry_run", False):
+        return None, {}
+    from .orchestrator import UpaPastaOrchestrator
+
+    orchs = {item: UpaPastaOrchestrator.from_args(args, str(item)) for item in items}
+    batch = ParityBatch(
+        parse_size(raw),
+        jobs=getattr(args, "par2_jobs", 2) or 2,
+        threads=getattr(args, "par_threads", None),
+    )
+    for orch in orchs.values():
+        batch.add(orch)
+    if len(batch):
+        print(
+            _("🛡️  PAR2 em lote: {count} item(s) pequeno(s), {jobs} por vez").format(
+                count=len(batch), jobs=batch.jobs
+            )
+        )
+    return batch, orchs
@@ -0,0 +1,222 @@
+"""
+par_overlap.py
+
+--par2-overlap: gera a paridade enquanto o RAR ainda está sendo criado.
+
+parpar precisa conhecer todos os arquivos de entrada antes de começar (o
+slice é calculado sobre o total), então não dá para alimentá-lo com um
+volume set que ainda cresce. Em vez disso os volumes são divididos em N
+lotes e cada lote ganha um conjunto PAR2 independente ({base}.set01.par2,
+{base}.set02.par2, ...), gerado assim que o rar fecha o último volume do
+lote. O volume k está fechado quando o k+1 já existe; os restantes, quando o
+rar termina.
+
+O PAR2 de um lote lê volumes recém-escritos (ainda no page cache) enquanto o
+rar escreve os seguintes, e PACK+PAR2 passa a levar perto de max(PACK, PAR2)
+em vez da soma. O custo: cada conjunto só repara o próprio lote — a
+redundância em % é a mesma, mas não é compartilhada entre lotes.
+
+Se o rar renomear volumes já protegidos (part1 → part01 ao passar de 9
+partes) ou um volume mudar depois de lido, o conjunto afetado é regerado em
+finish().
+"""
+
+from __future__ import annotations
+
+import glob
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .i18n import _
+from .ui import PhaseBar
+
+# make_set(arquivos, nomes_gravados_no_par2, nome_do_conjunto) -> código de retorno.
+# Os nomes são os finais previstos (ver final_name) e precisam ir para o PAR2
+# mesmo que o arquivo ainda tenha outro nome (parpar --input-name).
+MakeSet = Callable[[list[str], list[str], str], int]
+
+_VOLUME_RE = re.compile(r"\.part(\d+)\.rar$")
+
+
+@dataclass
+class ParSet:
+    name: str
+    indexes: list[int]
+    names: list[str] = field(default_factory=list)
+    stamps: list[tuple[int, int]] = field(default_factory=list)
+    rc: Optional[int] = None
+
+
+class QuietBar(PhaseBar):
+    """PhaseBar para trabalho em segundo plano: repassa logs, não mexe no progresso."""
+
+    def __init__(self, parent: Optional[PhaseBar] = None) -> None:
+        super().__init__()
+        self._parent = parent
+
+    def log(self, message: str) -> None:
+        if self._parent is not None:
+            self._parent.log(message)
+
+    def update_progress(self, percentage: float, description: str = "") -> None:
+        pass
+
+
+def list_volumes(rar_base: str) -> dict[int, str]:
+    """Volumes {rar_base}.partN.rar existentes, por índice (1, 2, ...)."""
+    found: dict[int, str] = {}
+    for path in glob.glob(glob.escape(rar_base) + ".part*.rar"):
+        m = _VOLUME_RE.search(path)
+        if m:
+            found[int(m.group(1))] = path
+    return found
+
+
+def _stamp(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class OverlappedParity:
+    """Gera conjuntos PAR2 por lote de volumes RAR enquanto o rar trabalha."""
+
+    def __init__(
+        self,
+        rar_base: str,
+        expected_volumes: int,
+        make_set: MakeSet,
+        sets: int = 4,
+        poll_interval: float = 1.0,
+        bar: Optional[PhaseBar] = None,
+    ) -> None:
+        """
+        rar_base: caminho sem ".partNNN.rar" (ex: /dados/Filme). expected_volumes:
+        estimativa de makerar.planned_volumes, usada para o tamanho dos lotes e
+        para o nome final dos volumes.
+        """
+        self.rar_base = rar_base
+        self.expected_volumes = max(1, expected_volumes)
+        self.make_set = make_set
+        self.batch_size = max(1, math.ceil(self.expected_volumes / max(1, sets)))
+        self.poll_interval = poll_interval
+        self.bar = bar
+        self.sets: list[ParSet] = []
+        self._next_index = 1
+        self._packed = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── Volumes ──────────────────────────────────────────────────────────────
+
+    def volumes(self) -> dict[int, str]:
+        return list_volumes(self.rar_base)
+
+    def final_name(self, index: int, total: Optional[int] = None) -> str:
+        """Nome do volume depois que o rar fixar o número de dígitos."""
+        width = len(str(total or self.expected_volumes))
+        return f"{os.path.basename(self.rar_base)}.part{index:0{width}d}.rar"
+
+    def _log(self, message: str) -> None:
+        if self.bar is not None:
+            self.bar.log(message)
+
+    # ── Execução ─────────────────────────────────────────────────────────────
+
+    def start(self) -> OverlappedParity:
+        self._thread = threading.Thread(target=self._run, name="par2-overlap", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run_set(self, par_set: ParSet, vols: dict[int, str], total: Optional[int]) -> None:
+        files = [vols[i] for i in par_set.indexes]
+        par_set.names = [self.final_name(i, total) for i in par_set.indexes]
+        par_set.stamps = [_stamp(f) for f in files]
+        try:
+            par_set.rc = self.make_set(files, par_set.names, par_set.name)
+        except OSError:
+            par_set.rc = 5
+
+    def _new_set(self, indexes: list[int]) -> ParSet:
+        name = f"{os.path.basename(self.rar_base)}.set{len(self.sets) + 1:02d}"
+        par_set = ParSet(name, indexes)
+        self.sets.append(par_set)
+        return par_set
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            packed = self._packed.is_set()
+            vols = self.volumes()
+            last = max(vols, default=0)
+            closed = last if packed else last - 1
+            batch = list(range(self._next_index, self._next_index + self.batch_size))
+            if packed:
+                batch = [i for i in batch if i <= last]
+            if not batch:
+                return
+            if batch[-1] > closed or any(i not in vols for i in batch):
+                if packed:
+                    return  # lacuna na numeração: finish() decide
+                self._stop.wait(self.poll_interval)
+                continue
+            par_set = self._new_set(batch)
+            self._run_set(par_set, vols, last if packed else None)
+            self._log(
+                _("PAR2 sobreposto: {name} (volumes {first}–{last}) → código {rc}").format(
+                    name=par_set.name, first=batch[0], last=batch[-1], rc=par_set.rc
+                )
+            )
+            self._next_index = batch[-1] + 1
+
+    def cancel(self) -> None:
+        """Interrompe após o conjunto em andamento (PACK falhou)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _stale(self, par_set: ParSet, vols: dict[int, str]) -> bool:
+        if par_set.rc != 0:
+            return True
+        for i, name, stamp in zip(par_set.indexes, par_set.names, par_set.stamps):
+            path = vols.get(i)
+            if path is None or os.path.basename(path) != name:
+                return True
+            try:
+                if _stamp(path) != stamp:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def finish(self) -> bool:
+        """
+        Chamado com o rar já concluído: protege os volumes restantes e regera
+        os conjuntos desatualizados. Retorna True se todos os volumes estão
+        cobertos por conjuntos gerados com sucesso.
+        """
+        self._packed.set()
+        if self._thread is not None:
+            self._thread.join()
+        vols = self.volumes()
+        if not vols or sorted(vols) != list(range(1, len(vols) + 1)):
+            return False
+        total = len(vols)
+        self.expected_volumes = total
+        covered = {i for s in self.sets for i in s.indexes}
+        missing = [i for i in sorted(vols) if i not in covered]
+        for start in range(0, len(missing), self.batch_size):
+            self._new_set(missing[start : start + self.batch_size])
+        for par_set in self.sets:
+            if par_set.rc is None or self._stale(par_set, vols):
+                if par_set.rc is not None:
+                    self._log(_("PAR2 sobreposto: regerando {name}").format(name=par_set.name))
+                self._run_set(par_set, vols, total)
+        return all(s.rc == 0 for s in self.sets)
+
+    def par2_files(self) -> list[str]:
+        """Arquivos de índice .par2 dos conjuntos, na ordem."""
+        parent = os.path.dirname(self.rar_base)
+        return [os.path.join(parent, s.name + ".par2") for s in self.sets]
@@ -0,0 +1,178 @@
+"""
+par_split.py
+
+--par2-split: divide a entrada em conjuntos PAR2 independentes, gerados em
+paralelo por processos parpar separados.
+
+Com um conjunto único, o parpar de um job de 500 GB que morre a 90% refaz
+tudo, e um processo só não aproveita bem duas CPUs/nós NUMA. Aqui a entrada
+é particionada e cada parte ganha o seu conjunto ({base}.set01.par2,
+{base}.set02.par2, ... — o mesmo esquema do --par2-overlap, que SABnzbd e
+NZBGet tratam como conjuntos separados):
+
+- folder     : uma parte por subpasta de primeiro nível (arquivos soltos na
+               raiz formam uma parte própria);
+- volumes:N  : N arquivos (volumes) por parte;
+- size:SIZE  : partes de até SIZE bytes (ao menos um arquivo cada).
+
+Até `jobs` conjuntos rodam ao mesmo tempo, cada um com a sua fatia de
+threads e de memória; um conjunto que falha é refeito sozinho.
+
+Cada conjunto só repara a própria parte: a redundância em % é a mesma, mas
+não é compartilhada entre as partes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .i18n import _
+from .par_overlap import list_volumes
+from .par_utils import parse_size
+from .ui import PhaseBar
+
+logger = logging.getLogger("upapasta")
+
+# make_set(arquivos, nome_do_conjunto, threads, memória_mb) -> código de retorno.
+MakeSplitSet = Callable[[list[str], str, int, Optional[int]], int]
+
+
+@dataclass
+class SplitSet:
+    name: str
+    files: list[str]
+    rc: Optional[int] = None
+    attempts: int = 0
+
+
+def parse_split_spec(spec: str) -> tuple[str, int]:
+    """
+    "folder" | "volumes:N" | "size:SIZE" → (modo, valor). Levanta ValueError
+    se a especificação for inválida.
+    """
+    mode, _sep, raw = spec.strip().partition(":")
+    mode = mode.lower()
+    if mode == "folder" and not raw:
+        return mode, 0
+    if mode == "volumes" and raw.isdigit() and int(raw) > 0:
+        return mode, int(raw)
+    if mode == "size" and raw:
+        size = parse_size(raw)
+        if size > 0:
+            return mode, size
+    raise ValueError(spec)
+
+
+def input_files(target: str) -> list[str]:
+    """Arquivos que o PAR2 do alvo protege: pasta, volume set ou arquivo único."""
+    if os.path.isdir(target):
+        files: list[str] = []
+        for root, dirs, names in os.walk(target):
+            dirs.sort()
+            files.extend(os.path.join(root, n) for n in sorted(names))
+        return files
+    m = re.search(r"\.part\d+\.rar$", target)
+    if m:
+        vols = list_volumes(target[: m.start()])
+        return [vols[i] for i in sorted(vols)] or [target]
+    return [target]
+
+
+def partition(target: str, mode: str, value: int) -> list[list[str]]:
+    """Divide os arquivos do alvo em partes, na ordem de input_files."""
+    files = input_files(target)
+    if mode == "folder":
+        if not os.path.isdir(target):
+            return [files]
+        groups: dict[str, list[str]] = {}
+        for f in files:
+            rel = os.path.relpath(f, target)
+            top = rel.split(os.sep, 1)[0] if os.sep in rel else ""
+            groups.setdefault(top, []).append(f)
+        # Arquivos da raiz ("") primeiro, depois as subpastas em ordem.
+        return [groups[k] for k in sorted(groups)]
+    if mode == "volumes":
+        return [files[i : i + value] for i in range(0, len(files), value)]
+
+    parts: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for f in files:
+        size = os.path.getsize(f)
+        if current and used + size > value:
+            parts.append(current)
+            current, used = [], 0
+        current.append(f)
+        used += size
+    if current:
+        parts.append(current)
+    return parts
+
+
+class SplitParity:
+    """Gera os conjuntos em paralelo e refaz individualmente os que falharem."""
+
+    def __init__(
+        self,
+        base: str,
+        parts: list[list[str]],
+        make_set: MakeSplitSet,
+        jobs: int = 2,
+        threads: Optional[int] = None,
+        memory_mb: Optional[int] = None,
+        retries: int = 1,
+        bar: Optional[PhaseBar] = None,
+    ) -> None:
+        """
+        base: nome base dos conjuntos (ex: "Filme" → Filme.set01.par2).
+        threads / memory_mb: orçamento total, dividido entre os `jobs`
+        processos simultâneos.
+        """
+        self.sets = [SplitSet(f"{base}.set{i + 1:02d}", files) for i, files in enumerate(parts)]
+        self.jobs = max(1, min(jobs, len(self.sets)))
+        total_threads = threads or os.cpu_count() or 4
+        self.threads = max(1, total_threads // self.jobs)
+        self.memory_mb = max(256, memory_mb // self.jobs) if memory_mb else None
+        self.retries = retries
+        self.make_set = make_set
+        self.bar = bar
+
+    def _log(self, message: str) -> None:
+        if self.bar is not None:
+            self.bar.log(message)
+        else:
+            print(message)
+
+    def _run_set(self, par_set: SplitSet) -> None:
+        while par_set.attempts <= self.retries:
+            par_set.attempts += 1
+            try:
+                par_set.rc = self.make_set(
+                    par_set.files, par_set.name, self.threads, self.memory_mb
+                )
+            except OSError:
+                par_set.rc = 5
+            if par_set.rc == 0:
+                return
+            if par_set.attempts <= self.retries:
+                self._log(
+                    _(
+                        "PAR2 dividido: {name} falhou (código {rc}); refazendo só este conjunto"
+                    ).format(name=par_set.name, rc=par_set.rc)
+                )
+
+    def run(self) -> bool:
+        """Gera todos os conjuntos; True se todos terminaram com sucesso."""
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="par2-split") as pool:
+            list(pool.map(self._run_set, self.sets))
+        failed = [s.name for s in self.sets if s.rc != 0]
+        if failed:
+            logger.error(
+                _("PAR2 dividido: conjuntos com falha: {names}").format(names=", ".join(failed))
+            )
+        return not failed
@@ -38,21 +38,17 @@ def fmt_size(b: int) -> str:
 # ── Leitura de ARTICLE_SIZE do .env ──────────────────────────────────────────
 
 
-def get_article_size_bytes() -> int:
+def get_article_size_bytes(env_file: Optional[str] = None) -> int:
     """
-    Lê ARTICLE_SIZE do ~/.config/upapasta/.env.
-    Retorna o valor em bytes. Fallback: 786432 (768K).
+    Lê ARTICLE_SIZE do .env (padrão: ~/.config/upapasta/.env).
+    Retorna o valor em bytes. Fallback: 716800 (700K, o mesmo default do upload).
     """
     try:
-        from .config import DEFAULT_ENV_FILE, load_env_file
+        from .config import load_settings
 
-        env = load_env_file(DEFAULT_ENV_FILE)
-        raw = env.get("ARTICLE_SIZE", "").strip()
-        if raw:
-            return parse_size(raw)
+        return load_settings(env_file).article_size_bytes
     except Exception:
-        pass
-    return 786432  # 768K
+        return 716800  # 700K
 
 
 # ── Cálculo dinâmico de slice size ────────────────────────────────────────────
@@ -69,7 +65,8 @@ def compute_dynamic_slice(total_bytes: int, article_size: int) -> Tuple[str, int
       ≤ 200 GB → base_slice * 2       (min_slices=100)
       > 200 GB → base_slice * 2.5     (min_slices=120)
 
-    Clamp final: mínimo 1 MiB, máximo 4 MiB.
+    Clamp final: mínimo 1 MiB, máximo 4 MiB, em artigos inteiros quando o
+    artigo cabe no intervalo (cada slice cobre exatamente N artigos).
     max_input_slices fixo em 12000 (limite seguro para NZBGet/SABnzbd).
 
     Retorna (slice_str, min_slices, max_slices).
@@ -91,7 +88,11 @@ def compute_dynamic_slice(total_bytes: int, article_size: int) -> Tuple[str, int
         min_slices = 120
 
     # Clamp: 1 MiB ≤ slice ≤ 4 MiB
-    slice_bytes = max(1024 * 1024, min(slice_bytes, 4 * 1024 * 1024))
+    low, high = 1024 * 1024, 4 * 1024 * 1024
+    slice_bytes = max(low, min(slice_bytes, high))
+    if 0 < article_size <= high and article_size % 4 == 0:
+        articles = max(-(-low // article_size), slice_bytes // article_size)
+        slice_bytes = min(articles, high // article_size) * article_size
 
     return fmt_size(slice_bytes), min_slices, 12000
 
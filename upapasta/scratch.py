@@ -0,0 +1,236 @@
+"""
+scratch.py
+
+Planejador de espaço de trabalho: decide, por job, onde gravar os volumes
+do arquivo compactado e o PAR2.
+
+Candidatos: o tmpfs (/dev/shm, quando o ramdisk está ativo), os diretórios
+de SCRATCH_DIRS / --scratch-dir e, sempre por último, a pasta da entrada.
+De cada um o planner conhece o espaço livre, o dispositivo (st_dev), se o
+disco é rotacional e a velocidade de escrita medida (cache em disco por 7
+dias, em scratch_speed_cache.json).
+
+Regras:
+- o PAR2 vai para o candidato mais rápido onde a estimativa caiba com margem;
+- os volumes vão para o mais rápido que caiba, evitando o mesmo HDD da
+  entrada — ler a biblioteca e escrever os volumes no mesmo disco rotacional
+  faz o cabeçote alternar entre os dois fluxos, e o PAR2 e o upload ainda
+  releem os volumes de lá;
+- a pasta da entrada fica sempre no fim da lista.
+
+As estimativas podem errar: ScratchPlan.archive e ScratchPlan.parity são
+listas ordenadas, e o orquestrador passa para o candidato seguinte quando o
+atual fica sem espaço (spill-over).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from .i18n import _
+from .json_cache import TTLCache
+
+logger = logging.getLogger("upapasta")
+
+_TMPFS = "/dev/shm"
+_PROBE_BYTES = 32 * 1024 * 1024
+_SPEED_TTL = 7 * 24 * 3600
+_MARGIN = 0.2
+# Abaixo disto o destino é considerado cheio (falha por espaço, não do rar/parpar).
+_FULL_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class SpeedSample:
+    mb_per_s: float
+    measured_at: float
+
+
+_SPEEDS: TTLCache[SpeedSample] = TTLCache(
+    "scratch_speed_cache.json", SpeedSample, _SPEED_TTL, stamp="measured_at"
+)
+
+
+@dataclass
+class ScratchLocation:
+    path: str
+    kind: str  # "tmpfs", "scratch" ou "input"
+    free_bytes: int
+    device: int
+    rotational: Optional[bool] = None
+    write_mb_s: float = 0.0
+
+    def label(self) -> str:
+        speed = f"{self.write_mb_s:.0f} MB/s" if self.write_mb_s else "?"
+        return f"{self.path} ({self.kind}, {self.free_bytes / 1024**3:.1f} GB, {speed})"
+
+
+@dataclass
+class ScratchPlan:
+    archive: list[ScratchLocation]
+    parity: list[ScratchLocation]
+
+
+def parse_scratch_dirs(raw: str) -> list[str]:
+    """SCRATCH_DIRS: diretórios separados por vírgula."""
+    return [os.path.expanduser(p.strip()) for p in raw.split(",") if p.strip()]
+
+
+def free_bytes(path: str) -> int:
+    st = os.statvfs(path)
+    return st.f_bavail * st.f_frsize
+
+
+def out_of_space(path: str) -> bool:
+    """True se o destino está (quase) cheio — a falha anterior foi por espaço."""
+    try:
+        return free_bytes(path) < _FULL_BYTES
+    except OSError:
+        return False
+
+
+def _rotational(device: int) -> Optional[bool]:
+    """Lê /sys/dev/block/MAJ:MIN (ou o disco pai, para partições). None se desconhecido."""
+    try:
+        node = os.path.realpath(f"/sys/dev/block/{os.major(device)}:{os.minor(device)}")
+    except (OSError, ValueError):
+        return None
+    for base in (node, os.path.dirname(node)):
+        try:
+            with open(os.path.join(base, "queue", "rotational"), encoding="ascii") as fh:
+                return fh.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+# ── Velocidade de escrita ────────────────────────────────────────────────────
+
+
+def measure_write_speed(path: str, size: int = _PROBE_BYTES) -> float:
+    """Grava `size` bytes com fsync em `path` e devolve MB/s (0.0 se falhar)."""
+    block = b"\0" * (1024 * 1024)
+    try:
+        fd, probe = tempfile.mkstemp(prefix=".upapasta_probe_", dir=path)
+    except OSError:
+        return 0.0
+    try:
+        start = time.perf_counter()
+        with os.fdopen(fd, "wb") as fh:
+            written = 0
+            while written < size:
+                written += fh.write(block[: size - written])
+            fh.flush()
+            os.fsync(fh.fileno())
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        return size / (1024 * 1024) / elapsed
+    except OSError:
+        return 0.0
+    finally:
+        try:
+            os.unlink(probe)
+        except OSError:
+            pass
+
+
+def write_speed(path: str, device: int) -> float:
+    """Velocidade de escrita de `path`, do cache quando recente."""
+    key = f"{device}:{os.path.realpath(path)}"
+    cached = _SPEEDS.get(key)
+    if cached is not None:
+        return cached.mb_per_s
+    speed = measure_write_speed(path)
+    if speed > 0:
+        _SPEEDS.put(key, SpeedSample(speed, time.time()))
+    return speed
+
+
+# ── Planejamento ─────────────────────────────────────────────────────────────
+
+
+def _location(path: str, kind: str, measure: bool) -> Optional[ScratchLocation]:
+    try:
+        st = os.stat(path)
+        free = free_bytes(path)
+    except OSError as e:
+        logger.warning(
+            _("Diretório de trabalho ignorado: {path} ({error})").format(path=path, error=e)
+        )
+        return None
+    if not os.access(path, os.W_OK):
+        logger.warning(
+            _("Diretório de trabalho sem permissão de escrita: {path}").format(path=path)
+        )
+        return None
+    loc = ScratchLocation(path, kind, free, st.st_dev, _rotational(st.st_dev))
+    if measure:
+        loc.write_mb_s = write_speed(path, st.st_dev)
+    return loc
+
+
+def discover_locations(
+    input_dir: str,
+    scratch_dirs: list[str],
+    use_tmpfs: bool = False,
+    measure: bool = True,
+) -> list[ScratchLocation]:
+    """Candidatos existentes e graváveis; a pasta da entrada é sempre o último."""
+    paths: list[tuple[str, str]] = []
+    if use_tmpfs and os.path.isdir(_TMPFS):
+        paths.append((_TMPFS, "tmpfs"))
+    paths += [(os.path.abspath(p), "scratch") for p in scratch_dirs]
+
+    # Um scratch dir igual à pasta da entrada não é candidato à parte.
+    seen = {os.path.realpath(input_dir)}
+    paths.append((os.path.abspath(input_dir), "input"))
+    locations: list[ScratchLocation] = []
+    for path, kind in paths:
+        real = os.path.realpath(path)
+        if kind != "input":
+            if real in seen:
+                continue
+            seen.add(real)
+        loc = _location(path, kind, measure and kind != "input")
+        if loc is not None:
+            locations.append(loc)
+    return locations
+
+
+def _ranked(
+    locations: list[ScratchLocation], need: int, avoid_device: Optional[int]
+) -> list[ScratchLocation]:
+    """Candidatos onde `need` cabe com margem: primeiro fora de `avoid_device`, depois por velocidade."""
+    required = int(need * (1 + _MARGIN))
+    fits = [loc for loc in locations if loc.kind != "input" and loc.free_bytes >= required]
+    fits.sort(key=lambda loc: (loc.device == avoid_device, -loc.write_mb_s))
+    return fits + [loc for loc in locations if loc.kind == "input"]
+
+
+def plan_scratch(
+    locations: list[ScratchLocation], archive_bytes: int, parity_bytes: int
+) -> ScratchPlan:
+    """
+    Distribui volumes e PAR2 entre os candidatos. archive_bytes=0 → sem
+    compactação; parity_bytes=0 → sem PAR2.
+    """
+    source = next((loc for loc in locations if loc.kind == "input"), None)
+    spindle = source.device if source is not None and source.rotational else None
+
+    parity = _ranked(locations, parity_bytes, None) if parity_bytes else []
+    if not archive_bytes:
+        return ScratchPlan([], parity)
+
+    # O PAR2 principal reserva o seu espaço antes de os volumes serem distribuídos.
+    reserved = [
+        ScratchLocation(**{**asdict(loc), "free_bytes": loc.free_bytes - int(parity_bytes)})
+        if parity and loc is parity[0]
+        else loc
+        for loc in locations
+    ]
+    archive = _ranked(reserved, archive_bytes, spindle)
+    return ScratchPlan(archive, parity)
@@ -0,0 +1,228 @@
+"""
+staging.py
+
+Visão da entrada sob outro nome sem tocar nos originais (ofuscação em
+hardlink, cópia do --pack-small): hardlink → reflink → cópia pelo kernel.
+
+Hardlink só existe dentro do mesmo filesystem e em filesystems que o
+suportam; quando falha, o caminho antigo era renomear a entrada (quebra o
+seeding até o revert). Em btrfs/XFS/bcachefs o reflink (ioctl FICLONE)
+compartilha os extents — instantâneo e sem I/O de dados, como o hardlink,
+mas com inode próprio. Sem reflink, a cópia é feita pelo kernel
+(os.copy_file_range, sendfile como reserva), sem passar os dados pelo espaço
+do usuário, em `jobs` threads e com progresso a cada 10%.
+
+A cópia dobra o espaço ocupado; só é tentada se o filesystem de destino
+comportar o que falta (com folga), senão levanta OSError e o chamador segue
+com o fallback dele.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .i18n import _
+
+logger = logging.getLogger("upapasta")
+
+# _IOW(0x94, 9, int) — o mesmo valor em x86_64 e arm64.
+FICLONE = 0x40049409
+
+# Bloco por chamada de copy_file_range/sendfile.
+COPY_CHUNK = 64 * 1024 * 1024
+
+# Folga exigida no destino antes de copiar (metadados, arquivos que crescem).
+COPY_HEADROOM = 1.05
+
+# Erros que significam "este atalho não existe aqui", não falha de I/O.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+}
+
+HARDLINK = "hardlink"
+REFLINK = "reflink"
+COPY = "copy"
+
+
+@dataclass
+class StageStats:
+    methods: dict[str, int] = field(default_factory=dict)
+    bytes_copied: int = 0
+
+    def count(self, method: str) -> None:
+        self.methods[method] = self.methods.get(method, 0) + 1
+
+
+def reflink(src: str, dst: str) -> None:
+    """Clona src em dst com FICLONE (Linux). Levanta OSError se não houver suporte."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink indisponível", dst)
+    import fcntl
+
+    with open(src, "rb") as fsrc:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+        except OSError:
+            os.close(fd)
+            os.remove(dst)
+            raise
+        os.close(fd)
+    shutil.copystat(src, dst)
+
+
+def kernel_copy(src: str, dst: str, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Copia src para dst com copy_file_range (sendfile se o kernel recusar).
+    Retorna os bytes copiados; progress recebe o incremento a cada bloco.
+    """
+    if not hasattr(os, "sendfile"):
+        # Sem os atalhos do kernel (Windows): cópia comum.
+        shutil.copy2(src, dst)
+        size = os.path.getsize(dst)
+        if progress is not None:
+            progress(size)
+        return size
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        sfd, dfd = fsrc.fileno(), fdst.fileno()
+        copier = getattr(os, "copy_file_range", None)
+        done = 0
+        while done < size:
+            count = min(COPY_CHUNK, size - done)
+            try:
+                if copier is not None:
+                    n = copier(sfd, dfd, count)
+                else:
+                    n = os.sendfile(dfd, sfd, done, count)
+            except OSError as e:
+                if copier is None or e.errno not in _UNSUPPORTED:
+                    raise
+                # Ex: copy_file_range entre filesystems em kernels < 5.3.
+                copier = None
+                continue
+            if n == 0:
+                break
+            done += n
+            if progress is not None:
+                progress(n)
+    shutil.copystat(src, dst)
+    return done
+
+
+def link_or_clone(src: str, dst: str) -> str:
+    """Hardlink, ou reflink se o hardlink não for possível. Retorna o método usado."""
+    try:
+        os.link(src, dst)
+        return HARDLINK
+    except OSError as e:
+        link_error = e
+    try:
+        reflink(src, dst)
+        return REFLINK
+    except OSError:
+        raise link_error from None
+
+
+def _ensure_room(dst_dir: str, needed: int) -> None:
+    free = shutil.disk_usage(dst_dir).free
+    if free < needed * COPY_HEADROOM:
+        raise OSError(
+            errno.ENOSPC,
+            _("espaço insuficiente para copiar {need} MB (livre: {free} MB)").format(
+                need=needed // (1024 * 1024), free=free // (1024 * 1024)
+            ),
+            dst_dir,
+        )
+
+
+class _CopyProgress:
+    """Imprime o avanço da cópia a cada 10% do total."""
+
+    def __init__(self, total: int) -> None:
+        self.total = max(total, 1)
+        self.done = 0
+        self._next = 10
+        self._lock = threading.Lock()
+
+    def __call__(self, n: int) -> None:
+        with self._lock:
+            self.done += n
+            pct = self.done * 100 // self.total
+            if pct < self._next:
+                return
+            self._next = pct // 10 * 10 + 10
+        print(
+            _("  Copiando: {pct}% ({done}/{total} MB)").format(
+                pct=min(pct, 100),
+                done=self.done // (1024 * 1024),
+                total=self.total // (1024 * 1024),
+            )
+        )
+
+
+def stage_files(pairs: list[tuple[str, str]], allow_copy: bool = True, jobs: int = 4) -> StageStats:
+    """
+    Cria cada dst a partir do seu src: hardlink ou reflink; o que sobrar é
+    copiado pelo kernel em `jobs` threads (se allow_copy e houver espaço).
+    Levanta OSError se algum arquivo não puder ser criado.
+    """
+    stats = StageStats()
+    pending: list[tuple[str, str]] = []
+    for src, dst in pairs:
+        try:
+            stats.count(link_or_clone(src, dst))
+        except OSError as e:
+            if not allow_copy or e.errno not in _UNSUPPORTED:
+                raise
+            pending.append((src, dst))
+    if not pending:
+        return stats
+
+    needed = sum(os.path.getsize(src) for src, _dst in pending)
+    _ensure_room(os.path.dirname(pending[0][1]), needed)
+    print(
+        _("  Hardlink/reflink indisponível: copiando {count} arquivo(s), {size} MB").format(
+            count=len(pending), size=needed // (1024 * 1024)
+        )
+    )
+    progress = _CopyProgress(needed)
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="stage") as pool:
+        copied = list(pool.map(lambda p: kernel_copy(p[0], p[1], progress), pending))
+    stats.bytes_copied = sum(copied)
+    stats.methods[COPY] = len(pending)
+    return stats
+
+
+def stage_tree(src: str, dst: str, allow_copy: bool = True, jobs: int = 4) -> StageStats:
+    """Espelha a árvore de src em dst com stage_files (diretórios recriados)."""
+    os.makedirs(dst, exist_ok=True)
+    pairs: list[tuple[str, str]] = []
+    for root, dirs, files in os.walk(src):
+        dest_root = os.path.join(dst, os.path.relpath(root, src))
+        for d in dirs:
+            os.makedirs(os.path.join(dest_root, d), exist_ok=True)
+        pairs.extend((os.path.join(root, f), os.path.join(dest_root, f)) for f in files)
+    stats = stage_files(pairs, allow_copy=allow_copy, jobs=jobs)
+    if len(stats.methods) > 1 or HARDLINK not in stats.methods:
+        logger.info(
+            _("Staging de {src}: {methods}").format(
+                src=os.path.basename(src),
+                methods=", ".join(f"{k}={v}" for k, v in sorted(stats.methods.items())),
+            )
+        )
+    return stats
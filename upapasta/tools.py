@@ -3,16 +3,27 @@ tools.py
 
 Gerenciamento centralizado de binários externos (nyuu, parpar, 7z, rar, etc.).
 Suporta busca em pasta bin/ local para portabilidade e futuramente auto-download.
+
+O ToolRegistry resolve cada binário uma vez por processo e persiste o resultado
+(caminho, versão, capacidades) em disco, keyed pelo PATH e pelo mtime do binário.
 """
 
 from __future__ import annotations
 
+import importlib
 import os
+import re
 import shutil
+import subprocess
 import sys
 import tempfile
+import threading
 import urllib.request
 import zipfile
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+from .json_cache import read_json, write_json
 
 
 def get_base_dir() -> str:
@@ -32,6 +43,14 @@ def get_app_data_dir() -> str:
     return os.path.expanduser("~/.config/upapasta")
 
 
+def _search_dirs() -> list[str]:
+    return [
+        os.path.join(get_base_dir(), "bin"),
+        os.path.join(os.getcwd(), "bin"),
+        os.path.join(get_app_data_dir(), "bin"),
+    ]
+
+
 def get_tool_path(tool_name: str) -> str | None:
     """
     Localiza o caminho de um binário.
@@ -47,13 +66,7 @@ def get_tool_path(tool_name: str) -> str | None:
     else:
         executable_name = tool_name
 
-    search_dirs = [
-        os.path.join(get_base_dir(), "bin"),
-        os.path.join(os.getcwd(), "bin"),
-        os.path.join(get_app_data_dir(), "bin"),
-    ]
-
-    for bin_dir in search_dirs:
+    for bin_dir in _search_dirs():
         local_bin = os.path.join(bin_dir, executable_name)
         if os.path.exists(local_bin) and os.access(local_bin, os.X_OK):
             return local_bin
@@ -97,6 +110,7 @@ def download_tool(tool_name: str) -> str | None:
                 )
 
             os.remove(local_zip)
+            get_registry().invalidate("rar")
             return os.path.join(bin_dir, "rar.exe")
 
         elif sys.platform == "linux":
@@ -116,9 +130,232 @@ def download_tool(tool_name: str) -> str | None:
 
             os.remove(local_tgz)
             os.chmod(os.path.join(bin_dir, "rar"), 0o755)
+            get_registry().invalidate("rar")
             return os.path.join(bin_dir, "rar")
 
     except Exception as e:
         print(f"❌ Falha ao baixar '{tool_name}': {e}")
 
     return None
+
+
+# ── Registro de ferramentas ───────────────────────────────────────────────────
+
+# Nome lógico → (módulo, função find_*). A busca continua nos find_* de cada
+# módulo (e nos seus fallbacks); o registro só memoriza o resultado.
+_LOCATORS: dict[str, tuple[str, str]] = {
+    "pesto": ("upapasta.upfolder", "find_pesto"),
+    "nyuu": ("upapasta.upfolder", "find_nyuu"),
+    "parpar": ("upapasta.makepar", "find_parpar"),
+    "par2": ("upapasta.makepar", "find_par2"),
+    "rar": ("upapasta.makerar", "find_rar"),
+    "7z": ("upapasta.make7z", "find_7z"),
+    "ffprobe": ("upapasta.nfo", "find_ffprobe"),
+    "mediainfo": ("upapasta.nfo", "find_mediainfo"),
+}
+
+# Nome lógico → {capacidade: opção procurada no --help}. Só estes são sondados.
+_PROBES: dict[str, dict[str, str]] = {
+    "parpar": {"file-list": "--file-list"},
+    "pesto": {"resume": "--resume", "verify": "--verify"},
+    "nyuu": {},
+}
+
+_VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+_PROBE_TIMEOUT = 10
+_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ToolInfo:
+    """Binário resolvido. capabilities=None: não sondado (ou a sondagem falhou)."""
+
+    name: str
+    path: str
+    mtime_ns: int = 0
+    version: Optional[str] = None
+    capabilities: Optional[frozenset[str]] = None
+
+    def supports(self, capability: str) -> bool:
+        """Sem resultado de sondagem, presume suporte (comportamento de antes do registro)."""
+        return self.capabilities is None or capability in self.capabilities
+
+
+def _locate(name: str) -> Optional[str]:
+    spec = _LOCATORS.get(name)
+    if spec is None:
+        return get_tool_path(name)
+    found = getattr(importlib.import_module(spec[0]), spec[1])()
+    if isinstance(found, tuple):  # find_parpar/find_par2 → (backend, caminho)
+        found = found[1]
+    return str(found) if found else None
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _run_probe(path: str, arg: str) -> str:
+    proc = subprocess.run(
+        [path, arg],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+        timeout=_PROBE_TIMEOUT,
+    )
+    return proc.stdout or ""
+
+
+def _probe(info: ToolInfo) -> ToolInfo:
+    """Executa --version e --help do binário e extrai versão e capacidades."""
+    try:
+        version_out = _run_probe(info.path, "--version")
+        help_out = _run_probe(info.path, "--help")
+    except (OSError, subprocess.SubprocessError):
+        return info
+    match = _VERSION_RE.search(version_out)
+    caps = frozenset(cap for cap, flag in _PROBES.get(info.name, {}).items() if flag in help_out)
+    return replace(info, version=match.group(0) if match else None, capabilities=caps)
+
+
+class ToolRegistry:
+    """
+    Resolução de binários compartilhada pelo processo (threads de jobs paralelos
+    incluídas) e, via cache em disco, entre processos.
+
+    O cache só vale para o mesmo PATH e as mesmas pastas bin/; cada entrada é
+    descartada se o mtime do binário mudou (atualização → nova sondagem).
+    Binários ausentes não são persistidos: instalar um deles não exige limpar nada.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._tools: dict[str, Optional[ToolInfo]] = {}
+        self._probed: set[str] = set()
+        self._disk: Optional[dict[str, Any]] = None
+
+    def get(self, name: str) -> Optional[ToolInfo]:
+        """Retorna o binário resolvido (sem sondagem), ou None se não encontrado."""
+        with self._lock:
+            if name in self._tools:
+                return self._tools[name]
+            info = self._from_disk(name)
+            if info is None:
+                path = _locate(name)
+                info = ToolInfo(name, path, _mtime_ns(path)) if path else None
+                if info is not None:
+                    self._persist(info)
+            self._tools[name] = info
+            return info
+
+    def path(self, name: str) -> Optional[str]:
+        info = self.get(name)
+        return info.path if info else None
+
+    def probe(self, name: str) -> Optional[ToolInfo]:
+        """Como get(), mas garante versão/capacidades (uma sondagem por binário)."""
+        info = self.get(name)
+        if info is None or info.capabilities is not None or name not in _PROBES:
+            return info
+        with self._lock:
+            if name in self._probed:
+                return self._tools.get(name)
+            self._probed.add(name)
+        probed = _probe(info)  # fora do lock: executa o binário
+        with self._lock:
+            self._tools[name] = probed
+            if probed.capabilities is not None:
+                self._persist(probed)
+        return probed
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Esquece um binário (ou todos), p.ex. após baixá-lo."""
+        with self._lock:
+            if name is None:
+                self._tools.clear()
+                self._probed.clear()
+            else:
+                self._tools.pop(name, None)
+                self._probed.discard(name)
+
+    # ── Cache em disco ───────────────────────────────────────────────────────
+
+    def _cache_key(self) -> dict[str, Any]:
+        return {"path": os.environ.get("PATH", ""), "dirs": _search_dirs()}
+
+    def _entries(self) -> dict[str, Any]:
+        if self._disk is None:
+            self._disk = {}
+            if self._cache_path:
+                data = read_json(self._cache_path)
+                if (
+                    isinstance(data, dict)
+                    and data.get("version") == _CACHE_VERSION
+                    and data.get("key") == self._cache_key()
+                    and isinstance(data.get("tools"), dict)
+                ):
+                    self._disk = data["tools"]
+        return self._disk
+
+    def _from_disk(self, name: str) -> Optional[ToolInfo]:
+        entry = self._entries().get(name)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            path = str(entry["path"])
+            mtime_ns = int(entry["mtime_ns"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not mtime_ns or _mtime_ns(path) != mtime_ns:
+            return None
+        caps = entry.get("capabilities")
+        return ToolInfo(
+            name,
+            path,
+            mtime_ns,
+            version=entry.get("version"),
+            capabilities=frozenset(caps) if isinstance(caps, list) else None,
+        )
+
+    def _persist(self, info: ToolInfo) -> None:
+        if not self._cache_path or not info.mtime_ns:
+            return
+        entries = self._entries()
+        entries[info.name] = {
+            "path": info.path,
+            "mtime_ns": info.mtime_ns,
+            "version": info.version,
+            "capabilities": sorted(info.capabilities) if info.capabilities is not None else None,
+        }
+        payload = {"version": _CACHE_VERSION, "key": self._cache_key(), "tools": entries}
+        write_json(self._cache_path, payload)
+
+
+_REGISTRY: Optional[ToolRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ToolRegistry:
+    """Registro do processo, com cache em ~/.config/upapasta/tools_cache.json."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ToolRegistry(os.path.join(get_app_data_dir(), "tools_cache.json"))
+        return _REGISTRY
+
+
+def tool_path(name: str) -> Optional[str]:
+    """Caminho do binário pelo nome lógico (pesto, nyuu, parpar, par2, rar, 7z, ...)."""
+    return get_registry().path(name)
+
+
+def tool_info(name: str, probe: bool = False) -> Optional[ToolInfo]:
+    """ToolInfo do binário; probe=True garante versão e capacidades."""
+    registry = get_registry()
+    return registry.probe(name) if probe else registry.get(name)
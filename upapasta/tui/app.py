@@ -20,6 +20,7 @@ from textual.screen import ModalScreen
 from textual.widgets import Button, Footer, Header, Input, Label, Tree
 
 from .catalog_index import load_catalog
+from .fs_cache import default_cache_path
 from .screens.confirm import ConfirmScreen
 from .screens.pattern_select import PatternSelectScreen, RuleKind, SelectionRule
 from .screens.upload_progress import UploadProgressScreen
@@ -123,10 +124,9 @@ class UpaPastaApp(App[None]):
         super().__init__()
         self.root_path = root_path
 
-        from ..config import load_env_file, resolve_env_file
+        from ..config import load_settings
 
-        env_vars = load_env_file(resolve_env_file())
-        nzb_dirs_raw = env_vars.get("EXTERNAL_NZB_DIR", "")
+        nzb_dirs_raw = load_settings().get("EXTERNAL_NZB_DIR", "")
         nzb_paths = [Path(p.strip()) for p in nzb_dirs_raw.split(",") if p.strip()]
 
         self._index = load_catalog(external_nzb_paths=nzb_paths)
@@ -143,7 +143,12 @@ class UpaPastaApp(App[None]):
                 self._index,
                 id="file-tree",
             )
-            yield DashboardWidget(self._index, self.root_path, id="dashboard")
+            yield DashboardWidget(
+                self._index,
+                self.root_path,
+                fs_cache_path=default_cache_path(),
+                id="dashboard",
+            )
         yield Input(placeholder="Buscar... (Enter ou Esc para fechar)", id="search-input")
         yield StatusBar(id="status-bar")
         yield Footer()
@@ -5,6 +5,8 @@ tui/catalog_index.py
 
 O catálogo armazena apenas o nome do item (input_path.name), não o path completo.
 O lookup é case-insensitive e retorna sempre a entrada mais recente para cada nome.
+Nomes sem match exato caem num NameIndex: o mesmo release com outra grafia
+(``Show.S01E01.1080p.mkv`` vs ``Show S01E01 1080p``) também é reconhecido.
 """
 
 from __future__ import annotations
@@ -15,7 +17,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from .external_nzb import ExternalNzbIndex, ExternalNzbInfo
+from .external_nzb import ExternalNzbIndex, ExternalNzbInfo, default_cache_path
+from .name_index import NameIndex
 
 
 @dataclass(frozen=True)
@@ -42,11 +45,20 @@ class CatalogIndex:
     se o tamanho em bytes mudou desde a última leitura.
     """
 
-    def __init__(self, history_path: Path, external_nzb_paths: Optional[list[Path]] = None) -> None:
+    def __init__(
+        self,
+        history_path: Path,
+        external_nzb_paths: Optional[list[Path]] = None,
+        external_cache_path: Optional[Path] = None,
+    ) -> None:
         self._path = history_path
         self._index: dict[str, list[CatalogEntry]] = {}
+        # Chave normalizada → chave de _index; montado na primeira consulta sem match exato.
+        self._fuzzy: Optional[NameIndex[str]] = None
         self._loaded_size: int = -1
-        self._external_idx = ExternalNzbIndex(external_nzb_paths or [])
+        self._external_idx = ExternalNzbIndex(
+            external_nzb_paths or [], cache_path=external_cache_path
+        )
 
     # ── Carregamento ─────────────────────────────────────────────────────────
 
@@ -56,6 +68,7 @@ class CatalogIndex:
 
         if not self._path.exists():
             self._index = {}
+            self._fuzzy = None
             self._loaded_size = 0
             return
 
@@ -98,13 +111,14 @@ class CatalogIndex:
             entries.sort(key=lambda e: e.upload_date, reverse=True)
 
         self._index = index
+        self._fuzzy = None
         self._loaded_size = current_size
 
     # ── Consulta ─────────────────────────────────────────────────────────────
 
     def lookup(self, name: str) -> Optional[CatalogEntry]:
         """Retorna a entrada mais recente para o nome, ou uma entrada virtual externa."""
-        entries = self._index.get(name.lower())
+        entries = self._own_entries(name)
         if entries:
             return entries[0]
 
@@ -126,7 +140,7 @@ class CatalogIndex:
 
     def lookup_own(self, name: str) -> Optional[CatalogEntry]:
         """Retorna a entrada mais recente do history.jsonl (NZB próprio), ou None."""
-        entries = self._index.get(name.lower())
+        entries = self._own_entries(name)
         return entries[0] if entries else None
 
     def external_match(self, name: str) -> Optional[ExternalNzbInfo]:
@@ -135,18 +149,30 @@ class CatalogIndex:
 
     def lookup_all(self, name: str) -> list[CatalogEntry]:
         """Retorna todas as entradas para o nome, ordenadas por data decrescente."""
-        entries = list(self._index.get(name.lower(), []))
+        entries = list(self._own_entries(name))
         if not entries and self._external_idx.is_present(name):
             return [self.lookup(name)]  # type: ignore
         return entries
 
     def has(self, name: str) -> bool:
-        return name.lower() in self._index or self._external_idx.is_present(name)
+        return bool(self._own_entries(name)) or self._external_idx.is_present(name)
 
     def all_names(self) -> set[str]:
         """Retorna o conjunto de nomes normalizados (lowercase) no índice."""
         return set(self._index.keys())
 
+    def _own_entries(self, name: str) -> list[CatalogEntry]:
+        entries = self._index.get(name.lower())
+        if entries or not self._index:
+            return entries or []
+        if self._fuzzy is None:
+            fuzzy: NameIndex[str] = NameIndex()
+            for key, own in self._index.items():
+                fuzzy.add(own[0].nome_original, key)
+            self._fuzzy = fuzzy
+        match = self._fuzzy.get(name)
+        return self._index[match] if match is not None else []
+
     # ── Métricas ──────────────────────────────────────────────────────────────
 
     def total_entries(self) -> int:
@@ -193,11 +219,22 @@ def _parse_date(value: object) -> datetime:
 def load_catalog(
     history_path: Optional[Path] = None, external_nzb_paths: Optional[list[Path]] = None
 ) -> CatalogIndex:
-    """Cria e carrega um CatalogIndex do path padrão ou do path fornecido."""
+    """
+    Cria e carrega um CatalogIndex do path padrão ou do path fornecido.
+
+    No path padrão, o índice de NZBs externos é persistido em CONFIG_DIR para que
+    diretórios inalterados não sejam revarridos a cada execução.
+    """
+    external_cache_path: Optional[Path] = None
     if history_path is None:
         from ..config import CONFIG_DIR
 
         history_path = Path(CONFIG_DIR) / "history.jsonl"
-    idx = CatalogIndex(history_path, external_nzb_paths=external_nzb_paths)
+        external_cache_path = default_cache_path()
+    idx = CatalogIndex(
+        history_path,
+        external_nzb_paths=external_nzb_paths,
+        external_cache_path=external_cache_path,
+    )
     idx.load()
     return idx
@@ -3,6 +3,12 @@ tui/external_nzb.py
 
 Mecanismo para escanear diretórios em busca de arquivos .nzb externos
 e mapear quais arquivos locais possuem backup.
+
+O scan é cacheado em ~/.config/upapasta/external_nzb_cache.json: um diretório
+com o mesmo mtime não é listado de novo. Limitação: um .nzb reescrito no lugar
+(senha adicionada ou removida) não altera o mtime do diretório, e o
+has_password antigo continua valendo até o diretório mudar por outro motivo.
+Para forçar a releitura, apague external_nzb_cache.json.
 """
 
 from __future__ import annotations
@@ -13,6 +19,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from ..json_cache import read_json, write_json
+from .name_index import NameIndex, release_key
+
 # A senha de um NZB fica em <meta type="password"> dentro de <head>, sempre
 # antes do primeiro <file>. Lemos só esse prefixo — nunca o arquivo inteiro,
 # que pode ter dezenas de MB.
@@ -21,6 +30,9 @@ _PASSWORD_META = re.compile(
     rb"<meta[^>]*\btype=[\"']password[\"'][^>]*>([^<]*)</meta>", re.IGNORECASE
 )
 
+# Versão do formato de ~/.config/upapasta/external_nzb_cache.json
+_CACHE_VERSION = 2
+
 
 @dataclass(frozen=True)
 class ExternalNzbInfo:
@@ -53,51 +65,70 @@ def nzb_has_password(nzb_path: Path) -> bool:
     return bool(match and match.group(1).strip())
 
 
+@dataclass
+class _DirState:
+    """Estado cacheado de um diretório externo: mtime, subpastas e .nzb diretos."""
+
+    mtime_ns: int
+    subdirs: list[str]
+    # nome do .nzb -> (st_mtime, st_size, has_password, release_key do stem)
+    nzbs: dict[str, tuple[float, int, bool, str]]
+
+
+def default_cache_path() -> Path:
+    from ..config import CONFIG_DIR
+
+    return Path(CONFIG_DIR) / "external_nzb_cache.json"
+
+
 class ExternalNzbIndex:
     """
     Índice de arquivos .nzb encontrados em diretórios externos.
     Mapeia os nomes dos arquivos (stem) para o respectivo ExternalNzbInfo.
+
+    Cada diretório visitado guarda seu mtime: se não mudou desde o último scan,
+    a lista de .nzb diretos (e o resultado de detecção de senha) é reaproveitada
+    sem listar nem dar stat nos arquivos — um re-scan de um acervo inalterado
+    custa um stat por diretório. Com cache_path, esse estado é persistido em JSON
+    e sobrevive entre execuções.
+
+    Nomes que não batem exatamente caem num NameIndex (chave normalizada e
+    similaridade), montado na primeira consulta a partir das chaves já gravadas
+    no cache e descartado quando um scan encontra mudanças.
     """
 
-    def __init__(self, search_paths: list[Path]) -> None:
+    def __init__(self, search_paths: list[Path], cache_path: Optional[Path] = None) -> None:
         self.search_paths = search_paths
+        self._cache_path = cache_path
         self._known: dict[str, ExternalNzbInfo] = {}
-        # Cache de senha por path: evita reler .nzb inalterado em cada scan.
-        self._pw_cache: dict[Path, tuple[tuple[float, int], bool]] = {}
+        self._keys: dict[str, str] = {}
+        self._fuzzy: Optional[NameIndex[ExternalNzbInfo]] = None
+        self._dirs: dict[str, _DirState] = {}
+        self._cache_loaded = False
 
     def scan(self) -> None:
         """Varre os diretórios configurados em busca de .nzb."""
+        if not self._cache_loaded:
+            self._load_cache()
         found: dict[str, ExternalNzbInfo] = {}
-        fresh_cache: dict[Path, tuple[tuple[float, int], bool]] = {}
+        keys: dict[str, str] = {}
+        fresh: dict[str, _DirState] = {}
+        changed = False
         for path in self.search_paths:
             if not path.exists() or not path.is_dir():
                 continue
             try:
-                for root, _dirs, files in os.walk(path):
-                    for file in files:
-                        if not file.lower().endswith(".nzb"):
-                            continue
-                        # "Filme.mkv.nzb" -> stem "Filme.mkv"; "Filme.nzb" -> "Filme"
-                        full = Path(root) / file
-                        try:
-                            st = full.stat()
-                        except OSError:
-                            continue
-                        sig = (st.st_mtime, st.st_size)
-                        cached = self._pw_cache.get(full)
-                        if cached is not None and cached[0] == sig:
-                            has_pw = cached[1]
-                        else:
-                            has_pw = nzb_has_password(full)
-                        fresh_cache[full] = (sig, has_pw)
-                        found[Path(file).stem.lower()] = ExternalNzbInfo(
-                            path=full, has_password=has_pw
-                        )
+                changed |= self._scan_dir(path, found, keys, fresh)
             except Exception:
                 # Ignora erros de permissão etc durante o scan
                 pass
+        changed |= fresh.keys() != self._dirs.keys()
         self._known = found
-        self._pw_cache = fresh_cache
+        self._keys = keys
+        self._dirs = fresh
+        if changed:
+            self._fuzzy = None
+            self._save_cache()
 
     def lookup(self, filename: str) -> Optional[ExternalNzbInfo]:
         """Retorna o ExternalNzbInfo correspondente a um nome, ou None."""
@@ -105,8 +136,121 @@ class ExternalNzbIndex:
         if info is not None:
             return info
         # Se for um arquivo com extensão, tenta o stem
-        return self._known.get(Path(filename).stem.lower())
+        info = self._known.get(Path(filename).stem.lower())
+        if info is not None or not self._known:
+            return info
+        return self._name_index().get(filename)
 
     def is_present(self, filename: str) -> bool:
         """Verifica se um arquivo/pasta (pelo nome) possui um NZB externo."""
         return self.lookup(filename) is not None
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _name_index(self) -> NameIndex[ExternalNzbInfo]:
+        if self._fuzzy is None:
+            fuzzy: NameIndex[ExternalNzbInfo] = NameIndex()
+            for stem, info in self._known.items():
+                fuzzy.add_key(self._keys[stem], info)
+            self._fuzzy = fuzzy
+        return self._fuzzy
+
+    def _scan_dir(
+        self,
+        path: Path,
+        found: dict[str, ExternalNzbInfo],
+        keys: dict[str, str],
+        fresh: dict[str, _DirState],
+    ) -> bool:
+        """Indexa path e subpastas. Retorna True se algum diretório foi relido."""
+        key = str(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+
+        changed = False
+        state = self._dirs.get(key)
+        if state is None or state.mtime_ns != mtime_ns:
+            read = _read_dir(path, mtime_ns, state)
+            if read is None:
+                return False
+            state = read
+            changed = True
+        fresh[key] = state
+
+        for file, (_mtime, _size, has_pw, rkey) in state.nzbs.items():
+            # "Filme.mkv.nzb" -> stem "Filme.mkv"; "Filme.nzb" -> "Filme"
+            stem = Path(file).stem.lower()
+            found[stem] = ExternalNzbInfo(path=path / file, has_password=has_pw)
+            keys[stem] = rkey
+        for sub in state.subdirs:
+            changed |= self._scan_dir(path / sub, found, keys, fresh)
+        return changed
+
+    def _load_cache(self) -> None:
+        self._cache_loaded = True
+        data = read_json(str(self._cache_path)) if self._cache_path is not None else None
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return
+        dirs: dict[str, _DirState] = {}
+        for key, raw in (data.get("dirs") or {}).items():
+            try:
+                dirs[key] = _DirState(
+                    mtime_ns=int(raw["m"]),
+                    subdirs=[str(d) for d in raw.get("d", [])],
+                    nzbs={
+                        str(name): (float(v[0]), int(v[1]), bool(v[2]), str(v[3]))
+                        for name, v in raw.get("n", {}).items()
+                    },
+                )
+            except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+                continue
+        self._dirs = dirs
+
+    def _save_cache(self) -> None:
+        if self._cache_path is None:
+            return
+        payload = {
+            "version": _CACHE_VERSION,
+            "dirs": {
+                key: {"m": st.mtime_ns, "d": st.subdirs, "n": st.nzbs}
+                for key, st in self._dirs.items()
+            },
+        }
+        write_json(str(self._cache_path), payload)
+
+
+def _read_dir(path: Path, mtime_ns: int, previous: Optional[_DirState]) -> Optional[_DirState]:
+    """
+    Lista path; reaproveita a detecção de senha (e a chave normalizada) de .nzb
+    com (mtime, size) inalterados.
+    """
+    old = previous.nzbs if previous is not None else {}
+    subdirs: list[str] = []
+    nzbs: dict[str, tuple[float, int, bool, str]] = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        # Como os.walk(followlinks=False): não desce em symlinks de pasta.
+                        if not entry.is_symlink():
+                            subdirs.append(entry.name)
+                        continue
+                    if not entry.name.lower().endswith(".nzb"):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                cached = old.get(entry.name)
+                if cached is not None and cached[:2] == (st.st_mtime, st.st_size):
+                    nzbs[entry.name] = cached
+                else:
+                    has_pw = nzb_has_password(Path(entry.path))
+                    rkey = release_key(Path(entry.name).stem)
+                    nzbs[entry.name] = (st.st_mtime, st.st_size, has_pw, rkey)
+    except OSError:
+        return None
+    subdirs.sort()
+    return _DirState(mtime_ns=mtime_ns, subdirs=subdirs, nzbs=nzbs)
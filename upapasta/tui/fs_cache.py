@@ -0,0 +1,207 @@
+"""
+tui/fs_cache.py
+
+Cache persistente de listagens de diretório usado pelas estatísticas do dashboard.
+
+Cada diretório visitado é guardado com a assinatura (st_mtime_ns, st_ino) e a
+listagem dos filhos diretos: arquivos (nome → tamanho) e subpastas. Como o mtime
+de um diretório só muda quando um filho direto é criado, removido ou renomeado,
+uma assinatura igual permite reutilizar a listagem sem ``scandir`` nem ``stat``
+dos arquivos — uma re-varredura de uma biblioteca inalterada custa um ``stat``
+por diretório.
+
+Limitação: crescimento de um arquivo já existente (append in-place) não altera o
+mtime do diretório pai e só é percebido quando o diretório mudar por outro motivo.
+
+O status (enviado/pendente/parcial) não é cacheado: ele é derivado do catálogo a
+cada cálculo, que é barato e muda independentemente do filesystem.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from ..json_cache import read_json, write_json
+
+_CACHE_VERSION = 1
+
+
+@dataclass
+class DirListing:
+    """Filhos diretos de um diretório, com a assinatura usada para validação."""
+
+    mtime_ns: int
+    ino: int
+    files: dict[str, int] = field(default_factory=dict)
+    subdirs: list[str] = field(default_factory=list)
+    # Symlinks para diretórios: contam como filhos, mas não entram na soma de tamanho
+    # (mesmo comportamento de os.walk com followlinks=False).
+    linked_dirs: list[str] = field(default_factory=list)
+
+    @property
+    def child_names(self) -> list[str]:
+        return [*self.files, *self.subdirs, *self.linked_dirs]
+
+
+def default_cache_path() -> Path:
+    from ..config import CONFIG_DIR
+
+    return Path(CONFIG_DIR) / "fs_stats_cache.json"
+
+
+class DirCache:
+    """
+    Cache de DirListing por caminho absoluto, opcionalmente persistido em JSON.
+
+    Thread-safe: o dashboard calcula as estatísticas em worker thread.
+    Sem cache_path o cache vive só em memória (útil em testes).
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None) -> None:
+        self._path = cache_path
+        self._dirs: dict[str, DirListing] = {}
+        # Tamanho recursivo por diretório, válido enquanto nenhuma listagem abaixo mudar.
+        self._sizes: dict[str, int] = {}
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # ── Persistência ──────────────────────────────────────────────────────────
+
+    def load(self) -> None:
+        """Carrega o cache do disco. Arquivo ausente ou corrompido = cache vazio."""
+        with self._lock:
+            self._loaded = True
+            data = read_json(str(self._path)) if self._path is not None else None
+            if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+                return
+            dirs: dict[str, DirListing] = {}
+            for key, raw in (data.get("dirs") or {}).items():
+                try:
+                    dirs[key] = DirListing(
+                        mtime_ns=int(raw["m"]),
+                        ino=int(raw["i"]),
+                        files={str(k): int(v) for k, v in raw.get("f", {}).items()},
+                        subdirs=[str(d) for d in raw.get("d", [])],
+                        linked_dirs=[str(d) for d in raw.get("l", [])],
+                    )
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+            self._dirs = dirs
+            self._sizes = {}
+
+    def save(self) -> None:
+        """Grava o cache (atomicamente) se houve mudança desde o último load/save."""
+        with self._lock:
+            if self._path is None or not self._dirty:
+                return
+            payload = {
+                "version": _CACHE_VERSION,
+                "dirs": {
+                    key: {
+                        "m": lst.mtime_ns,
+                        "i": lst.ino,
+                        "f": lst.files,
+                        "d": lst.subdirs,
+                        "l": lst.linked_dirs,
+                    }
+                    for key, lst in self._dirs.items()
+                },
+            }
+            write_json(str(self._path), payload)
+            self._dirty = False
+
+    # ── Consulta ──────────────────────────────────────────────────────────────
+
+    def listing(self, path: Path) -> Optional[DirListing]:
+        """
+        Retorna a listagem de path, relendo o diretório só se a assinatura mudou.
+        Retorna None se path não existe ou não é legível.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            key = str(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._forget(key)
+                return None
+
+            cached = self._dirs.get(key)
+            if cached is not None and cached.mtime_ns == st.st_mtime_ns and cached.ino == st.st_ino:
+                return cached
+
+            fresh = _read_listing(path, st.st_mtime_ns, st.st_ino)
+            if fresh is None:
+                self._forget(key)
+                return None
+            if cached is not None:
+                for gone in set(cached.subdirs) - set(fresh.subdirs):
+                    self._forget(os.path.join(key, gone))
+            self._dirs[key] = fresh
+            self._invalidate_size(key)
+            self._dirty = True
+            return fresh
+
+    def total_size(self, path: Path) -> int:
+        """Soma recursiva dos tamanhos dos arquivos sob path (sem seguir symlinks de pasta)."""
+        with self._lock:
+            return self._total_size(path)
+
+    def _total_size(self, path: Path) -> int:
+        lst = self.listing(path)
+        if lst is None:
+            return 0
+        key = str(path)
+        # Revalida os filhos antes de confiar no tamanho memorizado: uma mudança em
+        # qualquer nível abaixo invalida a cadeia de ancestrais em listing().
+        sub_total = sum(self._total_size(path / d) for d in lst.subdirs)
+        cached = self._sizes.get(key)
+        if cached is not None:
+            return cached
+        total = sum(lst.files.values()) + sub_total
+        self._sizes[key] = total
+        return total
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _forget(self, key: str) -> None:
+        if self._dirs.pop(key, None) is not None:
+            self._dirty = True
+        self._invalidate_size(key)
+
+    def _invalidate_size(self, key: str) -> None:
+        """Remove o tamanho memorizado de key e de todos os ancestrais."""
+        while True:
+            self._sizes.pop(key, None)
+            parent = os.path.dirname(key)
+            if not parent or parent == key:
+                break
+            key = parent
+
+
+def _read_listing(path: Path, mtime_ns: int, ino: int) -> Optional[DirListing]:
+    files: dict[str, int] = {}
+    subdirs: list[str] = []
+    linked: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if entry.is_symlink():
+                            linked.append(entry.name)
+                        else:
+                            subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files[entry.name] = entry.stat().st_size
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return DirListing(mtime_ns=mtime_ns, ino=ino, files=files, subdirs=subdirs, linked_dirs=linked)
@@ -0,0 +1,191 @@
+"""
+tui/name_index.py
+
+Índice secundário de nomes de release normalizados, para detectar duplicatas
+que o lookup exato (case-insensitive) não pega: ``Show.S01E01.1080p.mkv`` e
+``Show S01E01 1080p`` são o mesmo release.
+
+Dois níveis de tolerância:
+
+1. Chave normalizada — remove extensão de mídia, separadores e tags de
+   qualidade/codec (``strip_release_noise`` do indexer) e mantém o ano
+   (``parse_title_and_year`` do tmdb). Lookup O(1).
+2. Trigramas — para diferenças residuais (grupo, tag esquecida, typo). Usa um
+   índice invertido trigrama → chaves e *prefix filtering*: só as postings dos
+   trigramas mais raros da consulta são lidas, o suficiente para garantir que
+   nenhum candidato acima do limiar de similaridade (Dice) fique de fora.
+
+Números e tokens curtos identificam o item (episódio, temporada, parte, ano), então
+um match por trigrama exige que esses tokens sejam idênticos: ``S01E01`` nunca casa
+com ``S01E02``, nem ``Movie 2`` com ``Movie 3``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Generic, Optional, TypeVar
+
+from ..indexer import strip_release_noise
+from ..tmdb import parse_title_and_year
+
+T = TypeVar("T")
+
+# Similaridade Dice mínima entre conjuntos de trigramas para considerar duplicata.
+DEFAULT_THRESHOLD = 0.88
+# Chaves muito curtas têm poucos trigramas e geram falsos positivos: só match exato.
+_MIN_FUZZY_LEN = 8
+
+_MEDIA_EXT = re.compile(
+    r"\.(mkv|mp4|avi|mov|wmv|m4v|mpg|mpeg|ts|m2ts|webm|flv|iso|"
+    r"rar|7z|zip|nzb|par2|srt|sub|idx|ass|nfo|mp3|flac|m4a|epub|pdf)$",
+    re.IGNORECASE,
+)
+# Tags que strip_release_noise não cobre (áudio com canais, codec pontuado, HDR,
+# serviço de streaming). Aplicado antes dela, enquanto os pontos ainda existem, e
+# antes de cortar o grupo, para que "WEB-DL-GRUPO" não esconda o sufixo.
+_EXTRA_NOISE = re.compile(
+    r"\b(?:DDP?|EAC3|E-?AC-?3|AAC|AC3|DTS(?:-HD)?(?:[\s.]MA)?|TrueHD|FLAC|OPUS)[\s.]?\d[\s.]\d\b"
+    r"|\bH[\s.]?26[45]\b"
+    r"|\b\d{1,2}bit\b"
+    r"|\b(?:HDR10\+?|HDR|DV|DoVi|SDR|Atmos|REMUX|IMAX|NF|AMZN|DSNP|HMAX|ATVP|WEB(?:-?DL|-?Rip)?)\b",
+    re.IGNORECASE,
+)
+# "-GRUPO" no fim de nome com cara de release (ao menos dois separadores antes).
+_GROUP_SUFFIX = re.compile(r"^(.*[\s._].*[\s._][^-]*)-[A-Za-z0-9]+$")
+_NON_WORD = re.compile(r"[^\w\s]+")
+_YEAR_HINT = re.compile(r"(?:19|20)\d\d")
+_DIGIT = re.compile(r"\d")
+
+
+def release_key(name: str) -> str:
+    """Chave normalizada de um nome de arquivo/pasta (minúsculas, tokens por espaço)."""
+    # "_" é caractere de palavra para \b: vira separador antes dos regex de ruído.
+    base = _MEDIA_EXT.sub("", name.strip()).replace("_", ".")
+    year: Optional[str] = None
+    if _YEAR_HINT.search(base):
+        _title, year = parse_title_and_year(base)
+    base = _EXTRA_NOISE.sub(" ", base)
+    base = _GROUP_SUFFIX.sub(r"\1", base)
+    tokens = _NON_WORD.sub(" ", strip_release_noise(base)).lower().split()
+    if year and year not in tokens:
+        tokens.append(year)
+    return " ".join(tokens)
+
+
+def _identity_tokens(key: str) -> frozenset[str]:
+    """Tokens que precisam bater exatamente: com dígitos ou de até 2 caracteres."""
+    return frozenset(t for t in key.split() if len(t) <= 2 or _DIGIT.search(t))
+
+
+def _trigrams(key: str) -> frozenset[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class _Bucket:
+    """Chaves com os mesmos tokens de identidade e o índice invertido de trigramas delas."""
+
+    __slots__ = ("keys", "grams", "postings")
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.grams: Optional[dict[str, frozenset[str]]] = None
+        self.postings: dict[str, list[str]] = {}
+
+    def build(self) -> dict[str, frozenset[str]]:
+        grams: dict[str, frozenset[str]] = {}
+        postings: dict[str, list[str]] = {}
+        for key in self.keys:
+            g = _trigrams(key)
+            grams[key] = g
+            for tri in g:
+                postings.setdefault(tri, []).append(key)
+        # postings antes de grams: outra thread só usa o balde quando grams != None.
+        self.postings = postings
+        self.grams = grams
+        return grams
+
+
+class NameIndex(Generic[T]):
+    """
+    Índice nome → valor com lookup por chave normalizada e por similaridade.
+
+    add() só registra a chave; as estruturas do nível fuzzy são montadas sob
+    demanda: os baldes por tokens de identidade na primeira consulta fuzzy, e os
+    trigramas de cada balde na primeira consulta que cair nele. Como o match
+    fuzzy exige tokens de identidade iguais, só o balde da consulta é comparado.
+    Resultados são memorizados por nome até o próximo add().
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._by_key: dict[str, T] = {}
+        self._buckets: Optional[dict[frozenset[str], _Bucket]] = None
+        self._memo: dict[str, Optional[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def add(self, name: str, value: T) -> None:
+        """Registra value sob a chave normalizada de name (a primeira inserção prevalece)."""
+        self.add_key(release_key(name), value)
+
+    def add_key(self, key: str, value: T) -> None:
+        """Como add(), com a chave já calculada por release_key() (ex.: vinda de cache)."""
+        if not key or key in self._by_key:
+            return
+        self._by_key[key] = value
+        self._buckets = None
+        self._memo.clear()
+
+    def get(self, name: str) -> Optional[T]:
+        """Retorna o valor cuja chave normalizada é igual, ou o mais similar acima do limiar."""
+        if name in self._memo:
+            return self._memo[name]
+        key = release_key(name)
+        value = self._by_key.get(key) if key else None
+        if value is None and len(key) >= _MIN_FUZZY_LEN:
+            match = self._best_fuzzy(key)
+            value = self._by_key[match] if match is not None else None
+        self._memo[name] = value
+        return value
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _bucket_for(self, key: str) -> Optional[_Bucket]:
+        if self._buckets is None:
+            buckets: dict[frozenset[str], _Bucket] = {}
+            for k in self._by_key:
+                if len(k) >= _MIN_FUZZY_LEN:
+                    buckets.setdefault(_identity_tokens(k), _Bucket()).keys.append(k)
+            self._buckets = buckets
+        return self._buckets.get(_identity_tokens(key))
+
+    def _best_fuzzy(self, key: str) -> Optional[str]:
+        bucket = self._bucket_for(key)
+        if bucket is None:
+            return None
+        grams = bucket.grams if bucket.grams is not None else bucket.build()
+        query = _trigrams(key)
+        t = self.threshold
+        # Dice(A, B) >= t implica |A ∩ B| >= t·|A| / (2 - t); logo um candidato pode
+        # faltar no máximo `slack` trigramas de A e precisa conter ao menos um dos
+        # slack + 1 trigramas mais raros de A (prefix filtering).
+        min_overlap = math.ceil(t * len(query) / (2 - t))
+        slack = len(query) - min_overlap
+        if slack < 0:
+            return None
+        rarest = sorted(query, key=lambda g: len(bucket.postings.get(g, ())))
+        candidates: set[str] = set()
+        for g in rarest[: slack + 1]:
+            candidates.update(bucket.postings.get(g, ()))
+
+        best: Optional[str] = None
+        best_score = t
+        for cand in sorted(candidates):
+            cand_grams = grams[cand]
+            score = 2 * len(query & cand_grams) / (len(query) + len(cand_grams))
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = cand, score
+        return best
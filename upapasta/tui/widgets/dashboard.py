@@ -7,7 +7,6 @@ Toggle com [D] no app principal. Teclas [ / ] para ajustar timeframe do sparklin
 
 from __future__ import annotations
 
-import os
 from collections import Counter
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
@@ -21,7 +20,7 @@ from textual.message import Message
 from textual.widgets import Static
 
 from ..catalog_index import CatalogEntry, CatalogIndex
-from ..fs_scanner import scan_directory
+from ..fs_cache import DirCache
 from ..status import UploadStatus
 
 # ── Data ──────────────────────────────────────────────────────────────────────
@@ -111,27 +110,9 @@ def compute_catalog_stats(index: CatalogIndex, days: int = 30) -> DashboardStats
 _FS_STATS_MAX_DEPTH = 10
 
 
-def _dir_has_direct_files(path: Path) -> bool:
-    """True se o diretório contém ao menos um arquivo diretamente (não em subpastas)."""
-    try:
-        return any(child.is_file() for child in path.iterdir())
-    except OSError:
-        return False
-
-
-def _dir_total_size(path: Path) -> int:
-    """Soma recursiva dos tamanhos de todos os arquivos sob path."""
-    total = 0
-    for root, _dirs, files in os.walk(path):
-        for f in files:
-            try:
-                total += os.path.getsize(os.path.join(root, f))
-            except OSError:
-                continue
-    return total
-
-
-def compute_fs_stats(root_path: Path, index: CatalogIndex) -> tuple[int, int, list[str]]:
+def compute_fs_stats(
+    root_path: Path, index: CatalogIndex, cache: Optional[DirCache] = None
+) -> tuple[int, int, list[str]]:
     """
     Conta itens pendentes/parciais cruzando o filesystem com o catálogo.
 
@@ -140,43 +121,67 @@ def compute_fs_stats(root_path: Path, index: CatalogIndex) -> tuple[int, int, li
     pasta com arquivos diretos ou qualquer arquivo solto. Não desce em itens já
     enviados. Assim a contagem funciona mesmo abrindo a TUI na raiz do disco.
 
+    As listagens vêm de ``cache`` (DirCache): diretórios com a mesma assinatura
+    (mtime, inode) da última varredura não são relidos. Sem cache, usa um
+    DirCache em memória descartável — equivalente a uma varredura completa.
+
     Retorna (pending_count, pending_bytes, partial_items).
     """
+    if cache is None:
+        cache = DirCache()
     pending_count = 0
     pending_bytes = 0
     partial_items: list[str] = []
 
+    def child_status(path: Path) -> UploadStatus:
+        """Status de uma pasta fora do catálogo, pelos filhos diretos (cf. fs_scanner)."""
+        lst = cache.listing(path)
+        names = lst.child_names if lst is not None else []
+        uploaded = sum(1 for n in names if index.has(n))
+        if not names or uploaded == 0:
+            return UploadStatus.PENDING
+        if uploaded == len(names):
+            return UploadStatus.UPLOADED
+        return UploadStatus.PARTIAL
+
     def visit(path: Path, depth: int) -> None:
         nonlocal pending_count, pending_bytes
-        for node in scan_directory(path, index):
-            if not node.is_dir:
-                if node.status == UploadStatus.PENDING:
-                    pending_count += 1
-                    pending_bytes += node.size
-                continue
+        lst = cache.listing(path)
+        if lst is None:
+            return
+        for name, size in lst.files.items():
+            if not index.has(name):
+                pending_count += 1
+                pending_bytes += size
 
+        for name in sorted([*lst.subdirs, *lst.linked_dirs], key=str.lower):
             # Diretório já enviado: não desce nem conta.
-            if node.status in (UploadStatus.UPLOADED, UploadStatus.EXTERNAL):
+            if index.has(name):
+                continue
+            child = path / name
+            status = child_status(child)
+            if status == UploadStatus.UPLOADED:
                 continue
 
-            has_files = _dir_has_direct_files(node.path)
+            child_lst = cache.listing(child)
+            has_files = bool(child_lst and child_lst.files)
             is_release = has_files or depth >= _FS_STATS_MAX_DEPTH
 
-            if node.status == UploadStatus.PARTIAL:
+            if status == UploadStatus.PARTIAL:
                 if is_release:
                     # Release parcialmente enviado (ex.: temporada com --each).
-                    partial_items.append(node.name)
+                    partial_items.append(name)
                 else:
                     # Pasta-categoria parcial: desce para contar os pendentes.
-                    visit(node.path, depth + 1)
+                    visit(child, depth + 1)
                 continue
 
             # PENDING
             if is_release:
                 pending_count += 1
-                pending_bytes += _dir_total_size(node.path)
+                pending_bytes += cache.total_size(child)
             else:
-                visit(node.path, depth + 1)
+                visit(child, depth + 1)
 
     visit(root_path, 0)
     return pending_count, pending_bytes, partial_items
@@ -265,6 +270,7 @@ class DashboardWidget(Static):
         index: CatalogIndex,
         root_path: Path,
         *,
+        fs_cache_path: Optional[Path] = None,
         name: Optional[str] = None,
         id: Optional[str] = None,
         classes: Optional[str] = None,
@@ -272,6 +278,9 @@ class DashboardWidget(Static):
         super().__init__("", name=name, id=id, classes=classes)
         self._index = index
         self._root_path = root_path
+        # Listagens de diretório persistidas entre sessões: após a primeira
+        # varredura, só diretórios alterados são relidos.
+        self._fs_cache = DirCache(fs_cache_path)
         self._stats = DashboardStats()
         self._tf_idx: int = 2  # default: 30 dias
 
@@ -300,9 +309,12 @@ class DashboardWidget(Static):
 
     # ── Worker ────────────────────────────────────────────────────────────────
 
-    @work(thread=True)
+    @work(thread=True, exclusive=True, group="fs_stats")
     def _load_fs_stats(self) -> None:
-        pending_count, pending_bytes, partial_items = compute_fs_stats(self._root_path, self._index)
+        pending_count, pending_bytes, partial_items = compute_fs_stats(
+            self._root_path, self._index, self._fs_cache
+        )
+        self._fs_cache.save()
         self.post_message(DashboardWidget.FsStatsReady(pending_count, pending_bytes, partial_items))
 
     def on_dashboard_widget_fs_stats_ready(self, event: FsStatsReady) -> None:
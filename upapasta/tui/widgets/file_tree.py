@@ -10,7 +10,7 @@ from __future__ import annotations
 import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional
 
 from rich.text import Text
 from textual import on, work
@@ -266,16 +266,16 @@ class FileTreeWidget(Tree[FileNode]):
         import os
         import re
 
-        from ...config import load_env_file, resolve_env_file
-        from ...indexer import INDEXER_NZB_DIR, build_client_from_env
+        from ...config import load_settings
+        from ...indexer import INDEXER_NZB_DIR, build_clients_from_env, client_for_nzb_url
 
-        env_vars = load_env_file(resolve_env_file())
-        client = build_client_from_env(env_vars)
-        if client is None or not node.indexer_nzb_url:
+        clients = build_clients_from_env(load_settings())
+        if not clients or not node.indexer_nzb_url:
             self.app.call_from_thread(
                 self.app.notify, "Indexador não configurado.", severity="error"
             )
             return
+        client = client_for_nzb_url(clients, node.indexer_nzb_url)
 
         safe = re.sub(r'[\\/*?"<>|]', "_", (node.indexer_title or node.name)[:60])
         dest = os.path.join(INDEXER_NZB_DIR, f"{safe}.nzb")
@@ -297,20 +297,22 @@ class FileTreeWidget(Tree[FileNode]):
     @work(thread=True)
     def start_indexer_search(self) -> None:
         """
-        Busca no indexador os itens selecionados com espaço.
+        Busca nos indexadores os itens selecionados com espaço (na ordem de
+        prioridade: INDEXER_URL, INDEXER_URL_2, ...).
 
         Pastas selecionadas são varridas recursivamente: só os arquivos
         pendentes (vermelho) são buscados — enviados (✅) e externos (🌐)
         são pulados, pois já se sabe que estão na Usenet.
 
         Rate limiting gerenciado pelo NewznabClient — seguro chamar sem throttle externo.
+        Itens com o mesmo nome geram uma só busca.
         """
-        from ...config import load_env_file, resolve_env_file
-        from ...indexer import build_client_from_env
+        from ...config import load_settings
+        from ...indexer import BatchHit, batch_search, build_clients_from_env
 
-        env_vars = load_env_file(resolve_env_file())
-        client = build_client_from_env(env_vars)
-        if client is None:
+        settings = load_settings()
+        clients = build_clients_from_env(settings)
+        if not clients:
             self.app.call_from_thread(
                 self.app.notify,
                 "Indexador não configurado (INDEXER_URL / INDEXER_APIKEY ausentes).",
@@ -339,7 +341,7 @@ class FileTreeWidget(Tree[FileNode]):
             )
             return
 
-        dest_dir, persistent = self._resolve_nzb_backup_dir(env_vars)
+        dest_dir, persistent = self._resolve_nzb_backup_dir(settings)
 
         self.app.call_from_thread(
             self.app.notify,
@@ -348,42 +350,36 @@ class FileTreeWidget(Tree[FileNode]):
             timeout=4,
         )
 
-        downloaded = 0
-        errors = 0
+        by_name: dict[str, list[FileNode]] = {}
         for file_node in nodes:
-            # Marca como buscando — feedback ao vivo nos nós visíveis na árvore.
-            self.post_message(
-                self.IndexerStatusUpdated(file_node.path, IndexerStatus.SEARCHING, "", "")
-            )
-            try:
-                # normalize=False: casa o arquivo exato, mesmo grupo/versão.
-                results = client.search(file_node.name, limit=3, normalize=False)
-            except Exception:
-                results = []
-
-            if not results:
-                self.post_message(
-                    self.IndexerStatusUpdated(file_node.path, IndexerStatus.NOT_FOUND, "", "")
-                )
-                continue
+            by_name.setdefault(file_node.name, []).append(file_node)
+
+        def _post(name: str, status: IndexerStatus, url: str = "", title: str = "") -> None:
+            for file_node in by_name[name]:
+                self.post_message(self.IndexerStatusUpdated(file_node.path, status, url, title))
 
-            best = results[0]
-            # O .nzb é nomeado com stem == nome do item para que o
-            # ExternalNzbIndex o reconheça e marque o item como 🌐 externo.
-            dest = os.path.join(dest_dir, f"{file_node.name}.nzb")
-            try:
-                client.download_nzb(best.nzb_url, dest)
-                downloaded += 1
-                self.post_message(
-                    self.IndexerStatusUpdated(
-                        file_node.path, IndexerStatus.FOUND, best.nzb_url, best.title
-                    )
-                )
-            except Exception:
-                errors += 1
-                self.post_message(
-                    self.IndexerStatusUpdated(file_node.path, IndexerStatus.NOT_FOUND, "", "")
-                )
+        def _on_result(hit: BatchHit) -> None:
+            if hit.found and hit.nzb_path and hit.result is not None:
+                _post(hit.name, IndexerStatus.FOUND, hit.result.nzb_url, hit.result.title)
+            else:
+                _post(hit.name, IndexerStatus.NOT_FOUND)
+
+        # Buscas concorrentes dentro do limite do indexador; o .nzb de cada acerto
+        # é baixado logo em seguida, intercalado com as buscas restantes.
+        # normalize=False: casa o arquivo exato, mesmo grupo/versão. O .nzb é
+        # nomeado com stem == nome do item para que o ExternalNzbIndex o
+        # reconheça e marque o item como 🌐 externo.
+        hits = batch_search(
+            clients,
+            list(by_name),
+            limit=3,
+            normalize=False,
+            dest_for=lambda name, _result: os.path.join(dest_dir, f"{name}.nzb"),
+            on_start=lambda name: _post(name, IndexerStatus.SEARCHING),
+            on_result=_on_result,
+        )
+        downloaded = sum(1 for h in hits if h.nzb_path)
+        errors = sum(1 for h in hits if h.found and not h.nzb_path)
 
         # Recarrega o catálogo (rescaneia EXTERNAL_NZB_DIR) e a árvore na
         # thread principal — os itens baixados passam a aparecer como externos.
@@ -391,7 +387,7 @@ class FileTreeWidget(Tree[FileNode]):
             self._finish_indexer_search, downloaded, errors, len(nodes), persistent, dest_dir
         )
 
-    def _resolve_nzb_backup_dir(self, env_vars: dict[str, str]) -> tuple[str, bool]:
+    def _resolve_nzb_backup_dir(self, env_vars: Mapping[str, str]) -> tuple[str, bool]:
         """
         Decide onde gravar os .nzb baixados do indexador.
 
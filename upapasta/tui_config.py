@@ -61,6 +61,14 @@ _HELP: dict[str, tuple[str, str]] = {
         "SSL/TLS",
         "Ativa criptografia na conexão.\n\nRecomendado: Sim.\nDesative apenas se o seu provedor não suportar SSL na porta escolhida.",
     ),
+    "NNTP_STRIPE": (
+        "Striping",
+        "Reparte cada upload entre o servidor principal e o secundário, postando nos dois ao mesmo tempo (proporcional às conexões de cada um).\n\nA vazão total é a soma das contas. Os NZBs das partes são mesclados em um só.\n\nDesligado: o secundário só é usado como failover.",
+    ),
+    "NNTP_ADAPTIVE_CONNECTIONS": (
+        "Conexões adaptativas",
+        "Ajusta as conexões a cada upload conforme a vazão e os erros medidos (AIMD), usando 'Conexões' como teto.\n\nO melhor valor de cada servidor é lembrado entre execuções.\n\nDesligado: usa sempre o valor fixo.",
+    ),
     "NNTP_IGNORE_CERT": (
         "Ignorar certificado",
         "Ignora erros de verificação SSL.\n\nUse apenas em redes privadas ou provedores com cert auto-assinado.\n\nNão use em produção.",
@@ -286,6 +294,13 @@ def _make_tab_servidor(env: dict[str, str]) -> FormPage:
             maximum=100,
             default=int(env.get("NNTP_CONNECTIONS_2", "50") or "50"),
         ),
+        CheckBox(
+            "NNTP_STRIPE",
+            "Striping",
+            default=env.get("NNTP_STRIPE", "false").lower() == "true",
+            help_text=_HELP["NNTP_STRIPE"][1],
+            description="Postar nos dois servidores ao mesmo tempo",
+        ),
     ]
 
     return FormPage(
@@ -299,6 +314,13 @@ def _make_tab_servidor(env: dict[str, str]) -> FormPage:
             tf_user,
             pw_pass,
             sl_conns,
+            CheckBox(
+                "NNTP_ADAPTIVE_CONNECTIONS",
+                "Adaptativo",
+                default=env.get("NNTP_ADAPTIVE_CONNECTIONS", "true").lower() != "false",
+                help_text=_HELP["NNTP_ADAPTIVE_CONNECTIONS"][1],
+                description="Ajustar conexões pela vazão medida",
+            ),
             btn_test,
             CollapsibleSection("[+] Servidor de Failover (opcional)", failover_children),
         ]
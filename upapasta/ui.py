@@ -3,6 +3,9 @@ ui.py
 
 Componentes de interface de usuário (barra de progresso) e sistema de logging/sessão.
 Utiliza a biblioteca 'rich' para uma interface de terminal (TUI) moderna e robusta.
+
+Rich só é importado quando a PhaseBar de fato renderiza: logging, sessão e o
+modo porcelain (processos filhos da TUI) não pagam o custo de importação.
 """
 
 from __future__ import annotations
@@ -15,21 +18,15 @@ import sys
 import threading
 import time
 from datetime import datetime
-from typing import Any, Optional, cast
-
-from rich.console import Console, Group
-from rich.live import Live
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeRemainingColumn,
-)
-from rich.table import Table
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 from .i18n import _
 
+if TYPE_CHECKING:
+    from rich.console import Console, Group
+    from rich.live import Live
+    from rich.progress import Progress
+
 logger = logging.getLogger("upapasta")
 
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*[mABCDEFGHJKSTfhilmns]")
@@ -214,31 +211,54 @@ class PhaseBar:
         console: Optional[Console] = None,
         metadata: Optional[dict[str, Any]] = None,
     ) -> None:
-        self.console = console or Console()
+        self._console = console
+        self._progress: Optional[Progress] = None
         self._state: dict[str, str] = {p: "pending" for p in self.PHASES}
         self._elapsed: dict[str, float] = {}
         self._start_time: dict[str, float] = {}
         self.metadata = metadata or {}
         self._logs: list[str] = []
         self._max_logs = 3
-
-        # Progresso rico
-        self.progress = Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(bar_width=None, pulse_style="bright_blue"),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeRemainingColumn(),
-            expand=True,
-            console=self.console,
-        )
         self.active_task: Optional[Any] = None
         self._live: Optional[Live] = None
 
+    @property
+    def console(self) -> Console:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    @property
+    def progress(self) -> Progress:
+        """Progresso rico da fase ativa (criado no primeiro uso)."""
+        if self._progress is None:
+            from rich.progress import (
+                BarColumn,
+                Progress,
+                SpinnerColumn,
+                TextColumn,
+                TimeRemainingColumn,
+            )
+
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(bar_width=None, pulse_style="bright_blue"),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TimeRemainingColumn(),
+                expand=True,
+                console=self.console,
+            )
+        return self._progress
+
     def __enter__(self) -> PhaseBar:
         _thread_local.bar_active = True
         self._porcelain = os.environ.get("UPAPASTA_PORCELAIN") == "1"
         if not self._porcelain:
+            from rich.live import Live
+
             self._live = Live(self._render_group(), console=self.console, refresh_per_second=10)
             self._live.start()
         return self
@@ -304,6 +324,9 @@ class PhaseBar:
             self._live.update(self._render_group())
 
     def _render_group(self) -> Group:
+        from rich.console import Group
+        from rich.table import Table
+
         renderables: list[Any] = []
 
         # Header de Metadados (opcional)
@@ -27,11 +27,13 @@ Retornos:
 from __future__ import annotations
 
 import argparse
+import functools
 import glob
 import json
 import os
 import random
 import re
+import shlex
 import shutil
 import string
 import subprocess
@@ -39,18 +41,20 @@ import sys
 import threading
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from queue import Queue
-from typing import TYPE_CHECKING, Any, Optional, cast
-
-from upapasta import nfo
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Optional, cast
 
 from ._process import managed_popen
 from ._progress import _process_output, _read_output
 from .i18n import _
-from .tools import get_tool_path
+from .pacing import UploadSample, adaptive_enabled, get_tuner
+from .tools import get_tool_path, tool_info, tool_path
 
 if TYPE_CHECKING:
     from .ui import PhaseBar
+    from .volume_feed import VolumeFeed
 from .nzb import (
     fix_nzb_subjects,
     handle_nzb_conflict,
@@ -151,6 +155,24 @@ def _build_server_list(env_vars: dict[str, str]) -> list[dict[str, object]]:
     return servers
 
 
+def _check_server(
+    primary: Mapping[str, object],
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    user: Optional[str] = None,
+    password: Optional[str] = None,
+    insecure: bool = False,
+) -> dict[str, object]:
+    """Servidor de verificação: --check-host/--check-port/... sobre o servidor principal."""
+    server = dict(primary)
+    for key, value in (("host", host), ("port", port), ("user", user), ("password", password)):
+        if value:
+            server[key] = value
+    if insecure:
+        server["ignore_cert"] = True
+    return server
+
+
 def _get_uploaded_files_from_nzb(nzb_path: str) -> set[str]:
     """Lê NZB parcial e retorna o conjunto de nomes de arquivo já postados."""
     if not os.path.exists(nzb_path) or os.path.getsize(nzb_path) == 0:
@@ -307,9 +329,15 @@ def _run_pesto(
     verify: bool = False,
     pesto_extra_args: Optional[list[str]] = None,
     resume: bool = False,
+    porcelain: bool = True,
+    monitor: Optional[UploadSample] = None,
 ) -> int:
     """Executa pesto com --output-format json e parseia eventos de progresso.
 
+    porcelain=False suprime os marcadores @@PROGRESS@@ (stripes paralelos: o
+    progresso agregado é emitido por _StripeProgress). monitor recebe os
+    eventos para o ajuste adaptativo de conexões.
+
     Retorna o código de saída (0 = sucesso).
     """
     cmd: list[str] = [
@@ -337,10 +365,19 @@ def _run_pesto(
         cmd.append("--no-ssl")
     if obfuscated:
         cmd.extend(["--obfuscate=full"])
-    if verify:
-        cmd.append("--verify")
-    if resume:
-        cmd.append("--resume")
+    # Versões antigas do pesto não têm --verify/--resume: a sondagem do registro decide.
+    probed = tool_info("pesto", probe=True) if verify or resume else None
+    for flag, wanted in (("verify", verify), ("resume", resume)):
+        if not wanted:
+            continue
+        if probed is not None and probed.path == pesto_path and not probed.supports(flag):
+            print(
+                _("Aviso: esta versão do pesto não suporta --{flag}; opção ignorada.").format(
+                    flag=flag
+                )
+            )
+            continue
+        cmd.append(f"--{flag}")
     if pesto_extra_args:
         cmd.extend(pesto_extra_args)
     if dry_run:
@@ -383,6 +420,8 @@ def _run_pesto(
             for raw_line in proc.stdout:
                 ev = _parse_pesto_json_line(raw_line)
                 ev_type = ev.get("type", "")
+                if monitor is not None and ev_type:
+                    monitor.observe(ev)
 
                 if not ev_type and bar and not raw_line.strip().startswith("{"):
                     # Se não for JSON, ignoramos mensagens puras de terminal do pesto
@@ -395,7 +434,7 @@ def _run_pesto(
                     )
                 elif ev_type == "segment_done" and bar:
                     current_pct = float(ev.get("progress_pct", current_pct))
-                    if os.environ.get("UPAPASTA_PORCELAIN") == "1":
+                    if porcelain and os.environ.get("UPAPASTA_PORCELAIN") == "1":
                         sys.stdout.write(f"@@PROGRESS:{current_pct:.1f}@@\n")
                         speed = ev.get("speed_human", "")
                         eta = ev.get("eta_human", "")
@@ -415,7 +454,7 @@ def _run_pesto(
                         bar.update_progress(current_pct, text)
                 elif ev_type == "finished" and bar:
                     current_pct = 100.0
-                    if os.environ.get("UPAPASTA_PORCELAIN") == "1":
+                    if porcelain and os.environ.get("UPAPASTA_PORCELAIN") == "1":
                         sys.stdout.write("@@PROGRESS:100.0@@\n")
                         sys.stdout.flush()
                     bar.update_progress(100, _("Upload concluído."))
@@ -426,6 +465,10 @@ def _run_pesto(
             rc = proc.wait()
             err_thread.join()
 
+            if rc != 0 and monitor is not None:
+                for line in captured_stderr:
+                    monitor.note(line)
+
             if rc != 0 and captured_stderr:
                 print(_("\n--- Log de erro (stderr) do Pesto ---"), file=sys.stderr)
                 for line in captured_stderr:
@@ -441,6 +484,534 @@ def _run_pesto(
     return rc
 
 
+def _run_nyuu(
+    nyuu_path: str,
+    srv: dict[str, object],
+    usenet_group: str,
+    article_size: str,
+    nzb_target: Optional[str],
+    subject: str,
+    files: list[str],
+    working_dir: str,
+    obfuscated: bool = False,
+    js_config: Optional[str] = None,
+    overwrite: bool = False,
+    bar: Optional["PhaseBar"] = None,
+    upload_timeout: Optional[int] = None,
+    check_args: Optional[list[str]] = None,
+    nyuu_extra_args: Optional[list[str]] = None,
+    echo: bool = True,
+    post_names: Optional[dict[str, str]] = None,
+    groups: Optional[list[str]] = None,
+    monitor: Optional[UploadSample] = None,
+) -> int:
+    """Executa nyuu num servidor e traduz os erros conhecidos.
+
+    post_names: nome postado de cada arquivo de `files` (--obfuscate-metadata);
+    gera uma config própria com esses nomes (e a fragmentação de `groups`).
+    monitor: recebe a saída de uma execução que falhou (sinais de congestionamento).
+
+    Retorna o código de saída (0 = sucesso). FileNotFoundError (binário ausente)
+    é repassado ao chamador, que aborta sem novas tentativas.
+    """
+    # Identidade: Schizo/Token-based se ofuscado, senão anônimo padrão.
+    if obfuscated:
+        uploader = "${rand(8)}@${rand(5)}." + random.choice(["com", "net", "org"])
+    else:
+        uploader = generate_anonymous_uploader()
+
+    cmd = [
+        nyuu_path,
+        "--progress",
+        "stderrx",
+        "-h",
+        str(srv["host"]),
+        "-P",
+        str(srv["port"]),
+    ]
+    if srv.get("ssl"):
+        cmd.append("-S")
+    if srv.get("ignore_cert"):
+        cmd.append("-i")
+    if obfuscated:
+        cmd.append("--token-eval")
+    names_config: Optional[str] = None
+    if post_names:
+        names_config = _create_nyuu_config(
+            groups or [], [os.path.basename(post_names.get(f, f)) for f in files]
+        )
+        js_config = names_config
+    if js_config:
+        cmd.extend(["--config", js_config])
+
+    cmd.extend(
+        [
+            "-u",
+            str(srv["user"]),
+            "-p",
+            str(srv["password"]),
+            "-n",
+            str(srv["connections"]),
+            "-g",
+            usenet_group,
+        ]
+    )
+    cmd.extend(
+        [
+            "-a",
+            article_size,
+            "-f",
+            uploader,
+            "--date",
+            "now",
+        ]
+    )
+    if names_config is None:
+        # Com nomes por arquivo o Subject vem da config; -t a sobrescreveria.
+        cmd.extend(["-t", subject])
+    if nzb_target:
+        cmd.extend(["-o", nzb_target])
+    if overwrite:
+        cmd.append("-O")
+    if upload_timeout is not None:
+        cmd.extend(["--timeout", str(upload_timeout)])
+    if check_args:
+        cmd.extend(check_args)
+    if nyuu_extra_args:
+        cmd.extend(nyuu_extra_args)
+    cmd.extend(files)
+
+    try:
+        captured_output: list[str] = []
+        with managed_popen(
+            cmd,
+            cwd=working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        ) as proc:
+            output_queue: Queue[str | None] = Queue()
+            reader_thread = threading.Thread(
+                target=_read_output,
+                args=(proc.stdout, output_queue),
+                daemon=True,
+            )
+            reader_thread.start()
+            _process_output(output_queue, bar=bar, captured_lines=captured_output, echo=echo)
+            rc = proc.wait()
+    except (KeyboardInterrupt, FileNotFoundError):
+        raise
+    except OSError as e:
+        print(_("\nErro de I/O ao executar nyuu: {error}").format(error=e))
+        return 5
+    finally:
+        if names_config:
+            try:
+                os.remove(names_config)
+            except OSError:
+                pass
+
+    if rc == 0:
+        return 0
+
+    full_stderr = "\n".join(captured_output)
+    if monitor is not None:
+        for line in captured_output:
+            monitor.note(line)
+        if rc == 7:
+            monitor.congested = True  # esgotamento do Node: conexões demais
+
+    error_context = "\n".join(captured_output[-30:])
+    if error_context.strip():
+        print(_("\n--- Log de erro do Nyuu ---"))
+        for _l in error_context.splitlines():
+            if _l.strip():
+                print(f"  {_l}")
+        print("---------------------------\n")
+
+    parsed_msg = _parse_nyuu_stderr(full_stderr)
+    if parsed_msg:
+        print(_("\nTradução do erro: {msg}").format(msg=parsed_msg))
+
+    if rc == 7:
+        print(
+            _(
+                "\n💡 Dica: Código 7 geralmente indica esgotamento de recursos do Node.js (falha SSL ou muitas conexões)."
+            )
+        )
+        print(
+            _(
+                "   Recomendação: Reduza NNTP_CONNECTIONS no seu arquivo .env (ex: NNTP_CONNECTIONS=20)."
+            )
+        )
+
+    print(
+        _("\nErro: nyuu retornou código {rc} no servidor {host}.").format(rc=rc, host=srv["host"])
+    )
+    return rc
+
+
+# ── Striping entre servidores ─────────────────────────────────────────────────
+#
+# Com NNTP_STRIPE=true e mais de um servidor, o conjunto de arquivos é repartido
+# entre todos os servidores, postados ao mesmo tempo (um poster por servidor).
+# Os NZBs de cada parte são mesclados no NZB final.
+
+_BACKOFF_BASE = 30
+
+
+def _retry_wait(attempt: int) -> int:
+    """Backoff exponencial entre tentativas: 30s → 90s → 270s com ±10% jitter."""
+    delay: int = _BACKOFF_BASE * 3 ** (attempt - 2)
+    jitter = int(delay * 0.10 * (random.random() * 2 - 1))
+    return max(1, delay + jitter)
+
+
+_PROBE_WAIT = 15  # s de espera pela sondagem, se ainda não terminou
+
+
+def _rank_by_probe(
+    servers: list[dict[str, object]], server_probe: Future[Any]
+) -> list[dict[str, object]]:
+    """Coloca o servidor saudável mais rápido primeiro; avisa dos que falharam."""
+    from .nntp_test import rank_servers
+
+    try:
+        results = server_probe.result(timeout=_PROBE_WAIT)
+    except Exception:
+        return servers
+    for r in results.values():
+        if not r.ok:
+            print(
+                _("  Aviso: {host}:{port} falhou na sondagem — {message}").format(
+                    host=r.host, port=r.port, message=r.message
+                )
+            )
+    ranked = rank_servers(servers, results)
+    if ranked[0] is not servers[0]:
+        print(
+            _("  Servidor mais rápido primeiro: {host} (ordem: {order})").format(
+                host=ranked[0]["host"], order=", ".join(str(s["host"]) for s in ranked)
+            )
+        )
+    return ranked
+
+
+def _verify_articles(
+    nzb_path: str,
+    server: dict[str, object],
+    env_vars: dict[str, str],
+    sample: float,
+    delay: int,
+    input_path: str = "",
+) -> None:
+    """--verify-articles: STAT dos artigos do NZB recém-gerado (após delay s de propagação)."""
+    from .nntp_verify import print_verify_report, verify_nzb_articles
+
+    if delay > 0:
+        time.sleep(delay)
+    try:
+        connections = int(
+            env_vars.get("VERIFY_CONNECTIONS") or os.environ.get("VERIFY_CONNECTIONS") or 4
+        )
+    except ValueError:
+        connections = 4
+    report = verify_nzb_articles(nzb_path, server, connections=connections, sample=sample)
+    print_verify_report(report)
+    if report.missing and input_path:
+        print(
+            _("💡 Para reenviar só os artigos ausentes: upapasta {input} --repair {nzb}").format(
+                input=shlex.quote(input_path), nzb=shlex.quote(nzb_path)
+            )
+        )
+
+
+def _file_size(f: str, working_dir: str) -> int:
+    try:
+        return os.path.getsize(f if os.path.isabs(f) else os.path.join(working_dir, f))
+    except OSError:
+        return 0
+
+
+def _plan_stripes(
+    files: list[str], working_dir: str, servers: list[dict[str, object]]
+) -> list[tuple[int, list[str], int]]:
+    """
+    Reparte files entre servidores proporcionalmente às conexões de cada um.
+
+    Guloso (maior arquivo primeiro → servidor com menor bytes/conexões após
+    recebê-lo). Retorna [(índice do servidor, arquivos, bytes)] só dos servidores
+    que receberam algo; cada parte mantém a ordem original dos arquivos.
+    """
+    weights = []
+    for srv in servers:
+        try:
+            weights.append(max(1, int(str(srv.get("connections") or 1))))
+        except ValueError:
+            weights.append(1)
+
+    loads = [0] * len(servers)
+    buckets: list[list[str]] = [[] for _ in servers]
+    for size, f in sorted(
+        ((_file_size(f, working_dir), f) for f in files), key=lambda x: (-x[0], x[1])
+    ):
+        i = min(range(len(servers)), key=lambda k: ((loads[k] + size) / weights[k], k))
+        buckets[i].append(f)
+        loads[i] += size
+
+    order = {f: n for n, f in enumerate(files)}
+    return [
+        (i, sorted(bucket, key=order.__getitem__), loads[i])
+        for i, bucket in enumerate(buckets)
+        if bucket
+    ]
+
+
+class _StripeProgress:
+    """Agrega o progresso de stripes paralelos (média ponderada por bytes) numa só barra."""
+
+    def __init__(self, bar: Optional["PhaseBar"], weights: list[int]) -> None:
+        total = sum(weights) or 1
+        self._bar = bar
+        self._weights = [w / total for w in weights]
+        self._pct = [0.0] * len(weights)
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+
+    def lane(self, index: int) -> "PhaseBar":
+        # Os posters só chamam update_progress()/log() na barra.
+        return cast("PhaseBar", _StripeLane(self, index))
+
+    def update(self, index: int, percentage: float, description: str) -> None:
+        with self._lock:
+            self._pct[index] = max(0.0, min(100.0, percentage))
+            total = sum(p * w for p, w in zip(self._pct, self._weights))
+            now = time.time()
+            if now - self._last_emit < 0.1 and total < 100:
+                return
+            self._last_emit = now
+            if os.environ.get("UPAPASTA_PORCELAIN") == "1":
+                sys.stdout.write(f"@@PROGRESS:{total:.1f}@@\n")
+                sys.stdout.flush()
+            elif self._bar is None:
+                sys.stdout.write(f"\r  {total:5.1f}%  {description[:50]:<50}")
+                sys.stdout.flush()
+        if self._bar is not None:
+            self._bar.update_progress(total, description)
+
+    def log(self, message: str) -> None:
+        if self._bar is not None:
+            self._bar.log(message)
+        else:
+            print(message)
+
+
+class _StripeLane:
+    def __init__(self, progress: _StripeProgress, index: int) -> None:
+        self._progress = progress
+        self._index = index
+
+    def update_progress(self, percentage: float, description: str = "") -> None:
+        self._progress.update(self._index, percentage, description)
+
+    def log(self, message: str) -> None:
+        self._progress.log(message)
+
+
+def _post_striped(
+    post: Callable[..., int],
+    plan: list[tuple[int, list[str], int]],
+    servers: list[dict[str, object]],
+    nzb_target: Optional[str],
+    bar: Optional["PhaseBar"],
+    max_attempts: int,
+) -> int:
+    """
+    Posta cada parte do plano no seu servidor, todas em paralelo, e mescla os NZBs.
+
+    Uma parte que falha é repostada inteira na tentativa seguinte, no próximo
+    servidor da lista (mesma rotação do failover). FileNotFoundError do poster
+    é repassado ao chamador.
+    """
+    targets = [f"{nzb_target}.stripe{n + 1}.nzb" if nzb_target else None for n in range(len(plan))]
+    progress = _StripeProgress(bar, [size for _i, _files, size in plan])
+    rcs = [5] * len(plan)
+    pending = list(range(len(plan)))
+
+    for attempt in range(1, max_attempts + 1):
+        if attempt > 1:
+            wait = _retry_wait(attempt)
+            print(
+                _("\n⏳ Aguardando {wait}s antes da tentativa {attempt}/{max}...").format(
+                    wait=wait, attempt=attempt, max=max_attempts
+                )
+            )
+            time.sleep(wait)
+
+        def _run(n: int, attempt: int = attempt) -> int:
+            srv = servers[(plan[n][0] + attempt - 1) % len(servers)]
+            target = targets[n]
+            if target and os.path.exists(target):
+                os.remove(target)
+            print(
+                _("  Stripe {n}/{total} → {host}: {count} arquivo(s)").format(
+                    n=n + 1, total=len(plan), host=srv["host"], count=len(plan[n][1])
+                )
+            )
+            return post(srv, plan[n][1], target, progress.lane(n), overwrite=True, porcelain=False)
+
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            for n, rc in zip(pending, list(pool.map(_run, pending))):
+                rcs[n] = rc
+        pending = [n for n in pending if rcs[n] != 0]
+        if not pending:
+            break
+
+    stripe_nzbs = [t for t in targets if t]
+    if pending:
+        for target in stripe_nzbs:
+            if os.path.exists(target):
+                os.remove(target)
+        return rcs[pending[0]]
+    if nzb_target:
+        if not merge_nzbs(stripe_nzbs, nzb_target):
+            print(
+                _("  Aviso: NZBs das partes mantidos em: {paths}").format(
+                    paths=", ".join(stripe_nzbs)
+                )
+            )
+            return 5
+        for target in stripe_nzbs:
+            os.remove(target)
+    return 0
+
+
+@contextmanager
+def _named_view(
+    working_dir: str, files: list[str], post_names: Optional[dict[str, str]]
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Para posters sem nome por arquivo (pesto): diretório temporário (fora da
+    entrada; os symlinks são absolutos) com symlinks nos nomes postados. Sem
+    nomes a trocar, devolve o original.
+    """
+    renamed = {f: post_names[f] for f in files if post_names and post_names.get(f, f) != f}
+    if not renamed:
+        yield working_dir, files
+        return
+    import tempfile
+
+    view = tempfile.mkdtemp(prefix="upapasta-names-")
+    try:
+        view_files = []
+        for f in files:
+            name = renamed.get(f, f)
+            dst = os.path.join(view, name)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.symlink(os.path.abspath(os.path.join(working_dir, f)), dst)
+            view_files.append(name)
+        yield view, view_files
+    finally:
+        shutil.rmtree(view, ignore_errors=True)
+
+
+def _post_stream(
+    post: Callable[..., int],
+    feed: "VolumeFeed",
+    servers: list[dict[str, object]],
+    nzb_target: str,
+    bar: Optional["PhaseBar"],
+    max_attempts: int,
+) -> tuple[int, list[str], list[str]]:
+    """
+    Upload em streaming: posta cada lote de volumes assim que o rar o fecha e,
+    por último, o PAR2. Cada lote gera um NZB parcial ({nzb}.streamNN.nzb),
+    mesclados no NZB final na ordem de postagem.
+
+    Um lote que falha é repostado na tentativa seguinte, no próximo servidor.
+    Os volumes vão com o nome final (feed.final_name), e o caminho de cada um
+    é procurado de novo a cada tentativa — o rar pode tê-los renomeado.
+    Retorna (código, volumes postados, PAR2 postados) — nomes relativos ao
+    diretório dos volumes.
+    """
+    from .volume_feed import StreamAborted
+
+    parts: list[str] = []
+    volumes: list[str] = []
+    par2: list[str] = []
+
+    def _volume_files(indexes: list[int]) -> tuple[list[str], dict[str, str]]:
+        files: list[str] = []
+        post_names: dict[str, str] = {}
+        for index in indexes:
+            path = feed.path(index)
+            if path is None:
+                raise StreamAborted(
+                    _("volume {index} de {base} sumiu").format(index=index, base=feed.rar_base)
+                )
+            name = os.path.basename(path)
+            files.append(name)
+            post_names[name] = feed.final_name(index)
+        return files, post_names
+
+    def _send(resolve: Callable[[], tuple[list[str], dict[str, str]]]) -> int:
+        target = f"{nzb_target}.stream{len(parts) + 1:02d}.nzb"
+        rc = 5
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                wait = _retry_wait(attempt)
+                print(
+                    _("\n⏳ Aguardando {wait}s antes da tentativa {attempt}/{max}...").format(
+                        wait=wait, attempt=attempt, max=max_attempts
+                    )
+                )
+                time.sleep(wait)
+            srv = servers[(attempt - 1) % len(servers)]
+            files, post_names = resolve()
+            rc = post(srv, files, target, bar, overwrite=True, post_names=post_names or None)
+            if rc == 0:
+                parts.append(target)
+                return 0
+        return rc
+
+    def _discard() -> None:
+        for target in parts:
+            if os.path.exists(target):
+                os.remove(target)
+
+    try:
+        for batch in feed.batches():
+            names = [feed.final_name(i) for i in batch]
+            msg = _("📤 Streaming: postando {names}").format(names=", ".join(names))
+            if bar:
+                bar.log(msg)
+            else:
+                print(msg)
+            rc = _send(functools.partial(_volume_files, batch))
+            if rc != 0:
+                feed.abort()
+                _discard()
+                return rc, volumes, par2
+            volumes.extend(names)
+        par2 = [os.path.basename(f) for f in feed.parity()]
+    except StreamAborted as e:
+        print(_("  Upload em streaming interrompido: {error}").format(error=e))
+        _discard()
+        return 5, volumes, par2
+
+    if par2:
+        rc = _send(lambda: (par2, {}))
+        if rc != 0:
+            _discard()
+            return rc, volumes, par2
+
+    if not merge_nzbs(parts, nzb_target):
+        print(_("  Aviso: NZBs parciais mantidos em: {paths}").format(paths=", ".join(parts)))
+        return 5, volumes, par2
+    _discard()
+    return 0, volumes, par2
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description=_("Upload de .rar + .par2 para Usenet com nyuu"))
     p.add_argument("rarfile", help=_("Caminho para o arquivo .rar a fazer upload"))
@@ -484,15 +1055,44 @@ def _create_nyuu_fragmentation_config(groups: list[str]) -> str:
 
     Esta é a técnica de fragmentação multigrupo (Cross-Group Fragmentation).
     """
+    return _create_nyuu_config(groups)
+
+
+def _create_nyuu_config(groups: list[str], names: Optional[list[str]] = None) -> str:
+    """Config JS temporária do nyuu: fragmentação multigrupo e/ou nomes de postagem.
+
+    names: nome postado de cada arquivo, na ordem em que foram passados ao
+    nyuu (--obfuscate-metadata). Vai para o nome yEnc e para o Subject, sem
+    que o arquivo seja renomeado no disco.
+    """
     import tempfile
 
-    js_content = f"""
-module.exports = {{
+    entries: list[str] = []
+    if len(groups) > 1:
+        entries.append(
+            f"""
     newsgroups: function(article, file) {{
         var groups = {json.dumps(groups)};
         // Rotaciona o grupo baseado no número da parte do artigo
         return groups[article.part % groups.length];
-    }}
+    }}"""
+        )
+    if names is not None:
+        entries.append(
+            """
+    // filenum começa em 1, na ordem dos arquivos da linha de comando.
+    yencName: function(filenum, filenumtotal, filename) {
+        return names[filenum - 1] || filename;
+    },
+    postHeaders: {
+        Subject: function(filenum, filenumtotal, filename, filesize, part, parts) {
+            return '"' + (names[filenum - 1] || filename) + '" yEnc (' + part + '/' + parts + ')';
+        }
+    }"""
+        )
+    prelude = f"var names = {json.dumps(names, ensure_ascii=False)};\n" if names is not None else ""
+    js_content = f"""
+{prelude}module.exports = {{{",".join(entries)}
 }};
 """
     with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False, encoding="utf-8") as f:
@@ -581,6 +1181,7 @@ def upload_to_usenet(
     bar: Optional[PhaseBar] = None,
     nzb_out_abs: Optional[str] = None,
     verify_uploads: bool = False,
+    verify_articles: float = 0.0,
     check_delay: int = 5,
     check_retry_delay: int = 30,
     check_tries: int = 5,
@@ -590,15 +1191,30 @@ def upload_to_usenet(
     check_password: Optional[str] = None,
     redundancy: int = 0,
     obfuscate: bool = False,
+    server_probe: Optional[Future[Any]] = None,
+    feed: Optional["VolumeFeed"] = None,
+    article_size_bytes: Optional[int] = None,
+    post_names: Optional[dict[str, str]] = None,
 ) -> int:
     """
     Upload de arquivos para Usenet usando nyuu ou pesto.
+
+    server_probe: Future de nntp_test.probe_servers (disparado pelo orquestrador
+    durante PACK/PAR2); os servidores são reordenados pela latência medida.
+    verify_articles: fração dos artigos do NZB verificada com STAT após o
+    upload (0 = não verifica).
+    feed: upload em streaming (--stream-upload); input_path é feed.archive_path
+    e os volumes chegam à medida que o rar os fecha, com o PAR2 no fim.
+    article_size_bytes: tamanho de artigo já escolhido pelo layout do job
+    (layout.plan_layout, com o jitter incluído); sem ele vale ARTICLE_SIZE.
+    post_names: --obfuscate-metadata — nome postado por caminho absoluto
+    (makepar.plan_post_names); os arquivos ficam com os nomes reais no disco.
     """
 
     input_path = os.path.abspath(input_path)
 
     # Validar entrada
-    if not os.path.exists(input_path):
+    if feed is None and not os.path.exists(input_path):
         print(_("Erro: '{path}' não existe.").format(path=input_path))
         return 1
 
@@ -608,12 +1224,12 @@ def upload_to_usenet(
             print(_("Erro: pesto não encontrado em '{path}'").format(path=pesto_path))
             return 4
     else:
-        pesto_path = find_pesto()
+        pesto_path = tool_path("pesto")
 
     use_pesto = pesto_path is not None
 
     is_folder = os.path.isdir(input_path)
-    if not is_folder and not os.path.isfile(input_path):
+    if feed is None and not is_folder and not os.path.isfile(input_path):
         print(_("Erro: '{path}' não é um arquivo nem pasta.").format(path=input_path))
         return 1
 
@@ -631,11 +1247,20 @@ def upload_to_usenet(
     #
     # Nenhuma cópia é feita em nenhum dos dois casos.
 
-    if is_folder:
+    files_to_upload: list[str]
+    par2_files: list[str]
+    if feed is not None:
+        # CASO 3 — streaming: volumes e PAR2 são conhecidos só durante o upload.
+        working_dir = os.path.dirname(feed.rar_base)
+        files_to_upload = []
+        par2_files = []
+        resume = False
+
+    elif is_folder:
         working_dir = input_path
 
         # Caminhos relativos de todos os arquivos dentro da pasta
-        files_to_upload: list[str] = []
+        files_to_upload = []
         for root, _d, files in os.walk(input_path):
             for file in sorted(files):
                 abs_file = os.path.join(root, file)
@@ -645,7 +1270,7 @@ def upload_to_usenet(
         # PAR2 fica no diretório pai — passamos caminhos absolutos
         base_name = input_path
         par2_pattern = glob.escape(base_name) + "*par2*"
-        par2_files: list[str] = sorted(glob.glob(par2_pattern))
+        par2_files = sorted(glob.glob(par2_pattern))
         # par2_files já são absolutos (resultado de glob com caminho absoluto)
 
     else:
@@ -675,7 +1300,7 @@ def upload_to_usenet(
         # Convertemos para basename pois o working_dir é o mesmo diretório
         par2_files = [os.path.basename(f) for f in par2_files]
 
-    if not (use_pesto and redundancy > 0) and not par2_files:
+    if feed is None and not (use_pesto and redundancy > 0) and not par2_files:
         print(
             _("Erro: nenhum arquivo de paridade encontrado para '{path}'.").format(path=input_path)
         )
@@ -687,6 +1312,14 @@ def upload_to_usenet(
         if par2_files:
             random.shuffle(par2_files)
 
+    # Nome postado de cada entrada das listas acima (relativas a working_dir ou absolutas).
+    names: dict[str, str] = {}
+    if post_names:
+        for f in files_to_upload + par2_files:
+            posted = post_names.get(os.path.normpath(os.path.join(working_dir, f)))
+            if posted:
+                names[f] = posted
+
     # Carrega servidores NNTP (primário + opcionais failover)
     servers = _build_server_list(env_vars)
     if not servers or not servers[0]["host"]:
@@ -708,7 +1341,9 @@ def upload_to_usenet(
             usenet_group = random.choice(group_pool)
 
     article_size = env_vars.get("ARTICLE_SIZE") or os.environ.get("ARTICLE_SIZE", "700K")
-    if obfuscated_map:
+    if article_size_bytes:
+        article_size = str(article_size_bytes)
+    elif obfuscated_map:
         article_size = jitter_article_size(article_size)
 
     nzb_overwrite_env = env_vars.get("NZB_OVERWRITE") or os.environ.get("NZB_OVERWRITE")
@@ -771,12 +1406,33 @@ def upload_to_usenet(
         print(_("  USENET_GROUP=<seu_grupo>"))
         return 2
 
+    if server_probe is not None:
+        servers = _rank_by_probe(servers, server_probe)
+        nntp_host, nntp_port = servers[0]["host"], servers[0]["port"]
+
+    stripe = len(servers) > 1 and (
+        env_vars.get("NNTP_STRIPE") or os.environ.get("NNTP_STRIPE", "")
+    ).lower() in ("true", "1", "yes")
+    if stripe and feed is not None:
+        stripe = False
+    if stripe and use_pesto and redundancy > 0:
+        # Cada parte geraria seu próprio PAR2 — não cobriria o conjunto inteiro.
+        print(_("  Striping desativado: o PAR2 é gerado pelo pesto durante o upload."))
+        stripe = False
+
     if len(servers) > 1:
-        print(
-            _("  Servidores NNTP:  {count} configurados (failover ativo)").format(
-                count=len(servers)
+        if stripe:
+            print(
+                _("  Servidores NNTP:  {count} configurados (striping ativo)").format(
+                    count=len(servers)
+                )
+            )
+        else:
+            print(
+                _("  Servidores NNTP:  {count} configurados (failover ativo)").format(
+                    count=len(servers)
+                )
             )
-        )
 
     if not use_pesto:
         # Encontra nyuu (fallback)
@@ -785,7 +1441,7 @@ def upload_to_usenet(
                 print(_("Erro: nyuu não encontrado em '{path}'").format(path=nyuu_path))
                 return 4
         else:
-            nyuu_path = find_nyuu()
+            nyuu_path = tool_path("nyuu")
             if not nyuu_path:
                 print(
                     _(
@@ -808,7 +1464,7 @@ def upload_to_usenet(
     if not is_folder and nzb_out_abs and os.path.splitext(input_path)[1].lower() in _media_exts:
         nfo_path = os.path.abspath(os.path.splitext(nzb_out_abs)[0] + ".nfo")
         if not os.path.exists(nfo_path):
-            mediainfo_path = nfo.find_mediainfo()
+            mediainfo_path = tool_path("mediainfo")
             if mediainfo_path:
                 try:
                     with managed_popen(
@@ -826,7 +1482,9 @@ def upload_to_usenet(
 
     # ── Lógica de resume (2.10) ──────────────────────────────────────────────
     # State file fica junto ao NZB de saída para fácil localização.
-    state_path: str | None = nzb_out_abs + ".upapasta-state.json" if nzb_out_abs else None
+    state_path: str | None = (
+        nzb_out_abs + ".upapasta-state.json" if nzb_out_abs and feed is None else None
+    )
     remaining_files = list(files_to_upload)
     remaining_par2 = list(par2_files)
     partial_nzb_backup: str | None = None  # caminho do NZB parcial salvo para merge
@@ -866,6 +1524,14 @@ def upload_to_usenet(
             )
         )
 
+    stripe_plan: list[tuple[int, list[str], int]] = []
+    if stripe:
+        stripe_plan = _plan_stripes(
+            list(remaining_files) + list(remaining_par2), working_dir, servers
+        )
+        if len(stripe_plan) < 2:
+            stripe_plan = []
+
     # ── Calcular tamanho total para exibição ─────────────────────────────────
     def format_size(size_bytes: int) -> str:
         if size_bytes < 1024**2:
@@ -892,6 +1558,8 @@ def upload_to_usenet(
             pass
 
     all_file_count = len(remaining_files) + len(remaining_par2)
+    if feed is not None:
+        total_size_bytes = feed.expected_bytes
 
     try:
         term_columns = shutil.get_terminal_size().columns
@@ -904,7 +1572,9 @@ def upload_to_usenet(
             _("Host"),
             f"{nntp_host}:{nntp_port}"
             + (
-                _(" + {count} failover(s)").format(count=len(servers) - 1)
+                _(" + {count} em paralelo").format(count=len(stripe_plan) - 1)
+                if stripe_plan
+                else _(" + {count} failover(s)").format(count=len(servers) - 1)
                 if len(servers) > 1
                 else ""
             ),
@@ -1017,210 +1687,192 @@ def upload_to_usenet(
 
     # ── Configuração de Fragmentação Multigrupo ──────────────────────────────
     tmp_js_config = None
-    if obfuscated_map and group_pool and len(group_pool) > 1:
+    if obfuscated_map and group_pool and len(group_pool) > 1 and not names:
         tmp_js_config = _create_nyuu_fragmentation_config(group_pool)
 
-    try:
-        # ── Executar nyuu com failover de servidor ────────────────────────────────
-        # Em cada tentativa, rotaciona para o próximo servidor disponível.
-        # Backoff exponencial: 30s → 90s → 270s com ±10% jitter.
-        max_attempts = 1 + max(0, upload_retries)
-        last_rc = 5
-        _BACKOFF_BASE = 30
-
-        # NZB de saída para esta rodada de upload
-        nzb_target = nzb_out_abs
-
-        for attempt in range(1, max_attempts + 1):
-            if attempt > 1:
-                delay = _BACKOFF_BASE * (3 ** (attempt - 2))
-                jitter = int(delay * 0.10 * (random.random() * 2 - 1))
-                wait = max(1, delay + jitter)
-                print(
-                    _("\n⏳ Aguardando {wait}s antes da tentativa {attempt}/{max}...").format(
-                        wait=wait, attempt=attempt, max=max_attempts
-                    )
-                )
-                time.sleep(wait)
-
-            srv = servers[(attempt - 1) % len(servers)]
-            if len(servers) > 1:
-                print(
-                    _("\nTentativa {attempt}/{max} — servidor: {host}").format(
-                        attempt=attempt, max=max_attempts, host=srv["host"]
-                    )
-                )
-            elif attempt > 1:
-                print(
-                    _("\nTentativa {attempt}/{max} de upload...").format(
-                        attempt=attempt, max=max_attempts
-                    )
+    check_args: list[str] = []
+    if verify_uploads:
+        check_args.extend(["--check-connections", "1"])
+        check_args.extend(["--check-delay", str(check_delay)])
+        check_args.extend(["--check-retry-delay", str(check_retry_delay)])
+        check_args.extend(["--check-tries", str(check_tries)])
+        if check_host:
+            check_args.extend(["--check-host", check_host])
+        if check_port is not None:
+            check_args.extend(["--check-port", str(check_port)])
+        if check_user:
+            check_args.extend(["--check-user", check_user])
+        if check_password:
+            check_args.extend(["--check-password", check_password])
+
+    tuner = get_tuner() if adaptive_enabled(env_vars) else None
+
+    def _post(
+        srv: dict[str, object],
+        files: list[str],
+        target: Optional[str],
+        progress: Optional[PhaseBar],
+        overwrite: bool = False,
+        porcelain: bool = True,
+        post_names: Optional[dict[str, str]] = None,
+    ) -> int:
+        """
+        Uma execução do poster num servidor, com as conexões do controlador adaptativo.
+        post_names: nome postado por arquivo, no lugar do mapa do job.
+        """
+        if tuner is None:
+            return _post_once(srv, files, target, progress, overwrite, porcelain, None, post_names)
+        connections = tuner.connections_for(srv)
+        if connections != int(str(srv["connections"])):
+            print(
+                _("  Conexões em {host}: {n} (ajuste adaptativo; limite {limit})").format(
+                    host=srv["host"], n=connections, limit=srv["connections"]
                 )
-
-            if use_pesto:
-                # ── pesto (Rust) ─────────────────────────────────────────────
-                all_post_files = list(remaining_files) + list(remaining_par2)
-                last_rc = _run_pesto(
+            )
+        sample = UploadSample(
+            connections, total_bytes=sum(_file_size(f, working_dir) for f in files)
+        )
+        rc = _post_once(
+            {**srv, "connections": connections},
+            files,
+            target,
+            progress,
+            overwrite,
+            porcelain,
+            sample,
+            post_names,
+        )
+        # rc 4 = poster ausente: não diz nada sobre o servidor.
+        if rc != 4:
+            tuner.record(srv, sample.finish(), failed=rc != 0)
+        return rc
+
+    def _post_once(
+        srv: dict[str, object],
+        files: list[str],
+        target: Optional[str],
+        progress: Optional[PhaseBar],
+        overwrite: bool,
+        porcelain: bool,
+        sample: Optional[UploadSample],
+        post_names: Optional[dict[str, str]] = None,
+    ) -> int:
+        file_names = post_names if post_names is not None else names
+        if use_pesto:
+            # pesto não aceita nome por arquivo: os volumes do streaming
+            # (feed.final_name) saem de uma visão em symlinks. O mapa do
+            # --obfuscate-metadata fica de fora — o PAR2 do pesto é gerado dos
+            # arquivos lidos e gravaria os nomes aleatórios.
+            with _named_view(working_dir, files, post_names) as (view_dir, view_files):
+                rc = _run_pesto(
                     pesto_path=pesto_path,  # type: ignore[arg-type]
                     srv=srv,
                     usenet_group=usenet_group or "",
                     article_size=article_size,
-                    nzb_target=nzb_target,
+                    nzb_target=target,
                     subject=subject,
-                    files=all_post_files,
-                    working_dir=working_dir,
+                    files=view_files,
+                    working_dir=view_dir,
                     dry_run=dry_run,
                     obfuscated=bool(obfuscated_map) or obfuscate,
-                    bar=bar,
+                    bar=progress,
                     upload_timeout=upload_timeout,
                     redundancy=redundancy,
                     verify=verify_uploads,
                     pesto_extra_args=pesto_extra_args,
                     resume=resume,
+                    porcelain=porcelain,
+                    monitor=sample,
                 )
-                if last_rc != 0:
-                    print(
-                        _("\nErro: pesto retornou código {rc} no servidor {host}.").format(
-                            rc=last_rc, host=srv["host"]
-                        )
+            if rc != 0:
+                print(
+                    _("\nErro: pesto retornou código {rc} no servidor {host}.").format(
+                        rc=rc, host=srv["host"]
                     )
-                else:
-                    break
-            else:
-                # ── nyuu (Node.js, fallback) ─────────────────────────────────
-                # Identidade: Schizo/Token-based se ofuscado, senão anônimo padrão.
-                if obfuscated_map:
-                    uploader = "${rand(8)}@${rand(5)}." + random.choice(["com", "net", "org"])
-                else:
-                    uploader = generate_anonymous_uploader()
-
-                cmd = [
-                    nyuu_path,
-                    "--progress",
-                    "stderrx",
-                    "-h",
-                    srv["host"],
-                    "-P",
-                    str(srv["port"]),
-                ]
-                if srv.get("ssl"):
-                    cmd.append("-S")
-                if srv.get("ignore_cert"):
-                    cmd.append("-i")
-                if obfuscated_map:
-                    cmd.append("--token-eval")
-                if tmp_js_config:
-                    cmd.extend(["--config", tmp_js_config])
-
-                cmd.extend(
-                    [
-                        "-u",
-                        srv["user"],
-                        "-p",
-                        srv["password"],
-                        "-n",
-                        str(srv["connections"]),
-                        "-g",
-                        usenet_group,
-                    ]
-                )
-                cmd.extend(
-                    [
-                        "-a",
-                        article_size,
-                        "-f",
-                        uploader,
-                        "--date",
-                        "now",
-                        "-t",
-                        subject,
-                    ]
                 )
-                if nzb_target:
-                    cmd.extend(["-o", nzb_target])
-                if nzb_overwrite or (resume and partial_nzb_backup):
-                    cmd.append("-O")
-                if upload_timeout is not None:
-                    cmd.extend(["--timeout", str(upload_timeout)])
-                if verify_uploads:
-                    cmd.extend(["--check-connections", "1"])
-                    cmd.extend(["--check-delay", str(check_delay)])
-                    cmd.extend(["--check-retry-delay", str(check_retry_delay)])
-                    cmd.extend(["--check-tries", str(check_tries)])
-                    if check_host:
-                        cmd.extend(["--check-host", check_host])
-                    if check_port is not None:
-                        cmd.extend(["--check-port", str(check_port)])
-                    if check_user:
-                        cmd.extend(["--check-user", check_user])
-                    if check_password:
-                        cmd.extend(["--check-password", check_password])
-                if nyuu_extra_args:
-                    cmd.extend(nyuu_extra_args)
-                cmd.extend(remaining_files)
-                cmd.extend(remaining_par2)
-
-                try:
-                    captured_output: list[str] = []
-                    with managed_popen(
-                        cmd,
-                        cwd=working_dir,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        bufsize=0,
-                    ) as proc:
-                        output_queue: Queue[str | None] = Queue()
-                        reader_thread = threading.Thread(
-                            target=_read_output,
-                            args=(proc.stdout, output_queue),
-                            daemon=True,
-                        )
-                        reader_thread.start()
-                        _process_output(output_queue, bar=bar, captured_lines=captured_output)
-                        last_rc = proc.wait()
-
-                    if last_rc == 0:
-                        break
-
-                    full_stderr = "\n".join(captured_output)
+            return rc
+        # ── nyuu (Node.js, fallback) ─────────────────────────────────────────
+        return _run_nyuu(
+            nyuu_path,  # type: ignore[arg-type]
+            srv,
+            usenet_group or "",
+            article_size,
+            target,
+            subject,
+            files,
+            working_dir,
+            obfuscated=bool(obfuscated_map),
+            js_config=tmp_js_config,
+            overwrite=overwrite,
+            bar=progress,
+            upload_timeout=upload_timeout,
+            check_args=check_args,
+            nyuu_extra_args=nyuu_extra_args,
+            echo=porcelain,
+            post_names=file_names or None,
+            groups=group_pool,
+            monitor=sample,
+        )
 
-                    error_context = "\n".join(captured_output[-30:])
-                    if error_context.strip():
-                        print(_("\n--- Log de erro do Nyuu ---"))
-                        for _l in error_context.splitlines():
-                            if _l.strip():
-                                print(f"  {_l}")
-                        print("---------------------------\n")
+    try:
+        # ── Executar o poster com failover de servidor ───────────────────────────
+        # Em cada tentativa, rotaciona para o próximo servidor disponível.
+        # Backoff exponencial: 30s → 90s → 270s com ±10% jitter.
+        max_attempts = 1 + max(0, upload_retries)
+        last_rc = 5
 
-                    parsed_msg = _parse_nyuu_stderr(full_stderr)
-                    if parsed_msg:
-                        print(_("\nTradução do erro: {msg}").format(msg=parsed_msg))
+        # NZB de saída para esta rodada de upload
+        nzb_target = nzb_out_abs
+        all_post_files = list(remaining_files) + list(remaining_par2)
 
-                    if last_rc == 7:
+        try:
+            if feed is not None:
+                if not nzb_target:
+                    print(_("Erro: upload em streaming requer um caminho de NZB."))
+                    return 2
+                last_rc, files_to_upload, streamed_par2 = _post_stream(
+                    _post, feed, servers, nzb_target, bar, max_attempts
+                )
+                par2_files = [os.path.join(working_dir, f) for f in streamed_par2]
+            elif stripe_plan:
+                last_rc = _post_striped(_post, stripe_plan, servers, nzb_target, bar, max_attempts)
+            else:
+                for attempt in range(1, max_attempts + 1):
+                    if attempt > 1:
+                        wait = _retry_wait(attempt)
                         print(
                             _(
-                                "\n💡 Dica: Código 7 geralmente indica esgotamento de recursos do Node.js (falha SSL ou muitas conexões)."
+                                "\n⏳ Aguardando {wait}s antes da tentativa {attempt}/{max}..."
+                            ).format(wait=wait, attempt=attempt, max=max_attempts)
+                        )
+                        time.sleep(wait)
+
+                    srv = servers[(attempt - 1) % len(servers)]
+                    if len(servers) > 1:
+                        print(
+                            _("\nTentativa {attempt}/{max} — servidor: {host}").format(
+                                attempt=attempt, max=max_attempts, host=srv["host"]
                             )
                         )
+                    elif attempt > 1:
                         print(
-                            _(
-                                "   Recomendação: Reduza NNTP_CONNECTIONS no seu arquivo .env (ex: NNTP_CONNECTIONS=20)."
+                            _("\nTentativa {attempt}/{max} de upload...").format(
+                                attempt=attempt, max=max_attempts
                             )
                         )
 
-                    print(
-                        _("\nErro: nyuu retornou código {rc} no servidor {host}.").format(
-                            rc=last_rc, host=srv["host"]
-                        )
+                    last_rc = _post(
+                        srv,
+                        all_post_files,
+                        nzb_target,
+                        bar,
+                        overwrite=bool(nzb_overwrite or (resume and partial_nzb_backup)),
                     )
-                except KeyboardInterrupt:
-                    raise
-                except FileNotFoundError:
-                    print(_("\nErro: nyuu não encontrado em '{path}'.").format(path=nyuu_path))
-                    return 4
-                except OSError as e:
-                    print(_("\nErro de I/O ao executar nyuu: {error}").format(error=e))
-                    last_rc = 5
+                    if last_rc == 0:
+                        break
+        except FileNotFoundError:
+            print(_("\nErro: nyuu não encontrado em '{path}'.").format(path=nyuu_path))
+            return 4
 
     finally:
         if tmp_js_config and os.path.exists(tmp_js_config):
@@ -1254,7 +1906,9 @@ def upload_to_usenet(
     # ── Pós-processamento do NZB ─────────────────────────────────────────────
     if nzb_out_abs and os.path.exists(nzb_out_abs) and (is_folder or obfuscated_map or folder_name):
         par2_basenames = [os.path.basename(f) for f in par2_files]
-        all_files = files_to_upload + par2_basenames
+        all_files = [names.get(f, f) for f in files_to_upload] + [
+            os.path.basename(names.get(f, b)) for f, b in zip(par2_files, par2_basenames)
+        ]
 
         # Calcula tamanhos em bytes de cada arquivo para matching por segmentos no NZB.
         # O nyuu não preserva a ordem de upload no NZB, portanto não se pode usar
@@ -1264,12 +1918,13 @@ def upload_to_usenet(
         for f in files_to_upload:
             fp = os.path.join(working_dir, f)
             try:
-                _file_sizes[f] = os.path.getsize(fp)
+                _file_sizes[names.get(f, f)] = os.path.getsize(fp)
             except OSError:
                 pass
-        for abs_path, basename in zip(par2_files, par2_basenames):
+        for par_entry, basename in zip(par2_files, par2_basenames):
             try:
-                _file_sizes[basename] = os.path.getsize(abs_path)
+                size = os.path.getsize(os.path.join(working_dir, par_entry))
+                _file_sizes[os.path.basename(names.get(par_entry, basename))] = size
             except OSError:
                 pass
 
@@ -1304,5 +1959,12 @@ def upload_to_usenet(
                 bar.log(msg)
             else:
                 print(msg)
+            if verify_articles > 0:
+                check_server = _check_server(
+                    servers[0], check_host, check_port, check_user, check_password
+                )
+                _verify_articles(
+                    nzb_out_abs, check_server, env_vars, verify_articles, check_delay, input_path
+                )
 
     return 0
@@ -0,0 +1,136 @@
+"""
+volume_feed.py
+
+--stream-upload: entrega ao upload os volumes RAR já fechados enquanto o rar
+ainda escreve os seguintes.
+
+O orquestrador cria o VolumeFeed antes do PACK e roda o upload numa thread;
+upfolder._post_stream consome batches() (cada volume fechado uma única vez,
+na ordem) e, depois do último volume, parity() — que bloqueia até o PAR2
+ficar pronto. O volume k está fechado quando o k+1 já existe; os restantes,
+quando o orquestrador chama mark_packed(True).
+
+Qualquer falha do lado do orquestrador (PACK ou PAR2) chama abort(), e o
+consumidor recebe StreamAborted na próxima espera.
+
+Passados 9 volumes o rar renomeia os já escritos (part1 → part01), então um
+volume é identificado pelo índice, não pelo caminho: path() o procura de novo
+a cada tentativa, e ele é postado com o nome final (final_name, o mesmo
+esquema de OverlappedParity) — o que o PAR2, gerado depois, grava.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Iterator, Optional
+
+from .i18n import _
+from .par_overlap import list_volumes
+
+
+class StreamAborted(Exception):
+    """PACK ou PAR2 falhou (ou não gerou volumes): o upload em streaming para."""
+
+
+class VolumeFeed:
+    def __init__(
+        self,
+        rar_base: str,
+        expected_bytes: int = 0,
+        poll_interval: float = 1.0,
+        expected_volumes: int = 0,
+    ):
+        """
+        rar_base: caminho sem ".partNNN.rar"; expected_bytes só para exibição.
+        expected_volumes: estimativa de makerar.planned_volumes, que fixa o
+        número de dígitos do nome final.
+        """
+        self.rar_base = rar_base
+        self.expected_bytes = expected_bytes
+        self.expected_volumes = expected_volumes
+        self._highest = 0
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._packed: Optional[bool] = None
+        self._parity: Optional[list[str]] = None
+        self._aborted = False
+        self._next = 1
+
+    @property
+    def archive_path(self) -> str:
+        """Caminho nominal do arquivo (para o nome do NZB)."""
+        return self.rar_base + ".rar"
+
+    # ── Lado do orquestrador ─────────────────────────────────────────────────
+
+    def mark_packed(self, ok: bool) -> None:
+        with self._cond:
+            self._packed = ok
+            self._aborted = self._aborted or not ok
+            self._cond.notify_all()
+
+    def set_parity(self, files: list[str]) -> None:
+        with self._cond:
+            self._parity = list(files)
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    # ── Lado do upload ───────────────────────────────────────────────────────
+
+    def final_name(self, index: int) -> str:
+        """Nome do volume depois que o rar fixar o número de dígitos."""
+        width = len(str(max(self.expected_volumes, self._highest, 1)))
+        return f"{os.path.basename(self.rar_base)}.part{index:0{width}d}.rar"
+
+    def path(self, index: int) -> Optional[str]:
+        """Caminho atual do volume `index` (None se sumiu)."""
+        return list_volumes(self.rar_base).get(index)
+
+    def batches(self) -> Iterator[list[int]]:
+        """
+        Índices dos volumes fechados ainda não entregues (todos os disponíveis
+        de uma vez). O caminho de cada um sai de path(), na hora de postar.
+        """
+        while True:
+            with self._cond:
+                if self._aborted:
+                    raise StreamAborted(_("upload em streaming interrompido"))
+                packed = self._packed
+            vols = list_volumes(self.rar_base)
+            last = max(vols, default=0)
+            self._highest = max(self._highest, last)
+            closed = last if packed else last - 1
+            ready = []
+            index = self._next
+            while index <= closed and index in vols:
+                ready.append(index)
+                index += 1
+            if ready:
+                self._next = index
+                yield ready
+                continue
+            if packed:
+                if self._next <= last or not vols:
+                    raise StreamAborted(
+                        _("volumes RAR ausentes ou fora de sequência em {base}").format(
+                            base=self.rar_base
+                        )
+                    )
+                return
+            with self._cond:
+                if not self._aborted and self._packed is None:
+                    self._cond.wait(self.poll_interval)
+
+    def parity(self) -> list[str]:
+        """Arquivos PAR2, quando prontos (bloqueia)."""
+        with self._cond:
+            while self._parity is None and not self._aborted:
+                self._cond.wait()
+            if self._aborted or self._parity is None:
+                raise StreamAborted(_("upload em streaming interrompido"))
+            return list(self._parity)
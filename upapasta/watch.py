@@ -14,6 +14,7 @@ from pathlib import Path
 
 from .i18n import _
 from .orchestrator import UpaPastaOrchestrator, UpaPastaSession
+from .par_batch import start_parity_batch
 from .ui import setup_session_log, teardown_session_log
 
 
@@ -103,16 +104,21 @@ def _watch_loop(args: argparse.Namespace, folder: Path, interval: int, stable_se
         print(_("\n⚖️  Checking file stability ({stable}s)...").format(stable=stable_secs))
         sizes_before: dict[Path, int] = {item: _item_size(item) for item in new_items}
         time.sleep(stable_secs)
+        sizes_after: dict[Path, int] = {item: _item_size(item) for item in new_items}
+        stable = [i for i in new_items if sizes_before[i] == sizes_after[i] > 0]
+        batch, prepared = start_parity_batch(args, stable)
 
         for item in new_items:
-            size_after = _item_size(item)
-            if sizes_before[item] == size_after and size_after > 0:
+            size_after = sizes_after[item]
+            if item in stable:
                 print(_("\n🚀 Starting process: {name}").format(name=item.name))
                 print("─" * 40)
 
                 log_path, log_fh = setup_session_log(item.name, env_file=args.env_file)
                 try:
-                    orch = UpaPastaOrchestrator.from_args(args, str(item))
+                    orch = prepared.pop(item, None) or UpaPastaOrchestrator.from_args(
+                        args, str(item)
+                    )
                     with UpaPastaSession(orch) as o:
                         rc = o.run()
                         if rc == 0:
@@ -125,6 +131,8 @@ def _watch_loop(args: argparse.Namespace, folder: Path, interval: int, stable_se
                             )
                 except KeyboardInterrupt:
                     teardown_session_log(log_fh, log_path)
+                    if batch is not None:
+                        batch.close()
                     raise
                 except Exception:
                     print(_("\n💥 Unexpected error processing {name}:").format(name=item.name))
@@ -151,5 +159,8 @@ def _watch_loop(args: argparse.Namespace, folder: Path, interval: int, stable_se
                         )
                     )
 
+        if batch is not None:
+            batch.close()
+
         # Força um pequeno delay antes da próxima varredura para não saturar I/O
         time.sleep(2)